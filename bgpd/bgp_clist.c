@@ -23,6 +23,7 @@ Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
 #include "command.h"
 #include "prefix.h"
 #include "memory.h"
+#include "routemap.h"
 
 #include "bgpd/bgpd.h"
 #include "bgpd/bgp_community.h"
@@ -116,6 +117,9 @@ community_list_insert (struct community_list_handler *ch,
   if (!cm)
     return NULL;
 
+  /* Compiled route maps hold the community-lists they resolved. */
+  route_map_compiled_flush_all ();
+
   /* Allocate new community_list and copy given name. */
   new = community_list_new ();
   new->name = XSTRDUP (MTYPE_COMMUNITY_LIST_NAME, name);
@@ -246,6 +250,9 @@ community_list_delete (struct community_list *list)
       community_entry_free (entry);
     }
 
+  /* Compiled route maps hold the community-lists they resolved. */
+  route_map_compiled_flush_all ();
+
   clist = list->parent;
 
   if (list->next)
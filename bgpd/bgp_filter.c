@@ -24,6 +24,9 @@ Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
 #include "log.h"
 #include "memory.h"
 #include "buffer.h"
+#include "prefix.h"
+#include "routemap.h"
+#include "jhash.h"
 
 #include "bgpd/bgpd.h"
 #include "bgpd/bgp_aspath.h"
@@ -72,6 +75,21 @@ struct as_filter
 };
 #endif
 
+/* Number of AS paths whose result is remembered by an AS list. */
+#define AS_LIST_CACHE_SIZE 1024
+
+/* Results of an AS list by interned AS path.  An entry locks its AS
+   path, so that the AS path is not freed and its address reused by
+   another AS path while the result is remembered. */
+struct as_list_cache
+{
+  struct
+  {
+    struct aspath *aspath;
+    enum as_filter_type type;
+  } entry[AS_LIST_CACHE_SIZE];
+};
+
 /* ip as-path access-list 10 permit AS1. */
 
 static struct as_list_master as_list_master =
@@ -143,6 +161,23 @@ as_filter_lookup (struct as_list *aslist, const char *reg_str,
   return NULL;
 }
 
+/* Forget the results of an AS list, when its filters change. */
+static void
+as_list_cache_flush (struct as_list *aslist)
+{
+  int i;
+
+  if (aslist->cache == NULL)
+    return;
+
+  for (i = 0; i < AS_LIST_CACHE_SIZE; i++)
+    if (aslist->cache->entry[i].aspath)
+      aspath_unintern (&aslist->cache->entry[i].aspath);
+
+  XFREE (MTYPE_AS_LIST_CACHE, aslist->cache);
+  aslist->cache = NULL;
+}
+
 #ifdef ENABLE_OVSDB
 void
 #else
@@ -150,6 +185,8 @@ static void
 #endif
 as_list_filter_add (struct as_list *aslist, struct as_filter *asfilter)
 {
+  as_list_cache_flush (aslist);
+
   asfilter->next = NULL;
   asfilter->prev = aslist->tail;
 
@@ -208,6 +245,9 @@ as_list_insert (const char *name)
   struct as_list *point;
   struct as_list_list *list;
 
+  /* Compiled route maps hold the as-path access-lists they resolved. */
+  route_map_compiled_flush_all ();
+
   /* Allocate new access_list and copy given name. */
   aslist = as_list_new ();
   aslist->name = strdup (name);
@@ -326,6 +366,11 @@ as_list_delete (struct as_list *aslist)
   struct as_list_list *list;
   struct as_filter *filter, *next;
 
+  /* Compiled route maps hold the as-path access-lists they resolved. */
+  route_map_compiled_flush_all ();
+
+  as_list_cache_flush (aslist);
+
   for (filter = aslist->head; filter; filter = next)
     {
       next = filter->next;
@@ -366,6 +411,8 @@ static void
 #endif
 as_list_filter_delete (struct as_list *aslist, struct as_filter *asfilter)
 {
+  as_list_cache_flush (aslist);
+
   if (asfilter->next)
     asfilter->next->prev = asfilter->prev;
   else
@@ -395,24 +442,55 @@ as_filter_match (struct as_filter *asfilter, struct aspath *aspath)
   return 0;
 }
 
+static enum as_filter_type
+as_list_apply_filters (struct as_list *aslist, struct aspath *aspath)
+{
+  struct as_filter *asfilter;
+
+  for (asfilter = aslist->head; asfilter; asfilter = asfilter->next)
+    {
+      if (as_filter_match (asfilter, aspath))
+	return asfilter->type;
+    }
+  return AS_FILTER_DENY;
+}
+
 /* Apply AS path filter to AS. */
 enum as_filter_type
 as_list_apply (struct as_list *aslist, void *object)
 {
-  struct as_filter *asfilter;
   struct aspath *aspath;
+  enum as_filter_type type;
+  int i;
 
   aspath = (struct aspath *) object;
 
   if (aslist == NULL)
     return AS_FILTER_DENY;
 
-  for (asfilter = aslist->head; asfilter; asfilter = asfilter->next)
-    {
-      if (as_filter_match (asfilter, aspath))
-	return asfilter->type;
-    }
-  return AS_FILTER_DENY;
+  /* An AS path changed by a route-map is not interned yet, and is
+     matched against the regular expressions every time. */
+  if (! aspath->refcnt)
+    return as_list_apply_filters (aslist, aspath);
+
+  if (aslist->cache == NULL)
+    aslist->cache = XCALLOC (MTYPE_AS_LIST_CACHE,
+                             sizeof (struct as_list_cache));
+
+  i = jhash_1word ((u_int32_t) (unsigned long) aspath, 0)
+      % AS_LIST_CACHE_SIZE;
+  if (aslist->cache->entry[i].aspath == aspath)
+    return aslist->cache->entry[i].type;
+
+  type = as_list_apply_filters (aslist, aspath);
+
+  if (aslist->cache->entry[i].aspath)
+    aspath_unintern (&aslist->cache->entry[i].aspath);
+  aspath->refcnt++;
+  aslist->cache->entry[i].aspath = aspath;
+  aslist->cache->entry[i].type = type;
+
+  return type;
 }
 
 /* Add hook function. */
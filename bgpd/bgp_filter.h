@@ -47,6 +47,9 @@ struct as_list
 
   struct as_filter *head;
   struct as_filter *tail;
+
+  /* Results of the last applies, by interned AS path. */
+  struct as_list_cache *cache;
 };
 
 extern void bgp_filter_init (void);
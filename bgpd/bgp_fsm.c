@@ -934,7 +934,7 @@ bgp_fsm_keepalive (struct peer *peer)
   peer->keepalive_in++;
 
 #ifdef ENABLE_OVSDB
-  bgp_daemon_ovsdb_neighbor_statistics_update(true, NULL, peer);
+  bgp_daemon_ovsdb_neighbor_statistics_changed(peer);
 #endif // ENABLE_OVSDB
 
   BGP_TIMER_OFF (peer->t_holdtime);
@@ -269,6 +269,12 @@ bgp_exit (int status)
     }
   list_free (iflist);
 
+  /* reverse bgp_filter_init, before bgp_attr_finish since the as-path
+     access-list caches hold interned AS paths */
+  as_list_add_hook (NULL);
+  as_list_delete_hook (NULL);
+  bgp_filter_reset ();
+
   /* reverse bgp_attr_init */
   bgp_attr_finish ();
 
@@ -289,11 +295,6 @@ bgp_exit (int status)
   access_list_delete_hook (NULL);
   access_list_reset ();
 
-  /* reverse bgp_filter_init */
-  as_list_add_hook (NULL);
-  as_list_delete_hook (NULL);
-  bgp_filter_reset ();
-
   /* reverse prefix_list_init */
   prefix_list_add_hook (NULL);
   prefix_list_delete_hook (NULL);
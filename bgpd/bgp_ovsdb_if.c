@@ -70,6 +70,7 @@
 #include "bgp_ovsdb_route.h"
 #include "bgp_zebra.h"
 #include "bgp_mpath.h"
+#include "bgp_updgrp.h"
 
 /*
  * Local structure to hold the master thread
@@ -98,6 +99,14 @@ static struct unixctl_server *appctl;
 static int system_configured = false;
 static int diag_buffer_len = BUF_LEN;
 static struct bgp_master *bgpmaster;
+
+/* Export of the changed neighbor statistics, configurable through
+ * ovs-appctl
+ */
+static struct thread *bgp_nbr_stats_thread = NULL;
+static int bgp_nbr_stats_interval_msec = BGP_NBR_STATS_INTERVAL_MSEC_DEFAULT;
+static unsigned long bgp_nbr_stats_exports = 0;
+static unsigned long bgp_nbr_stats_peers_exported = 0;
 /*
  * Global System ECMP status affects maxpath config
  * Keep a local ECMP status to update when needed
@@ -163,6 +172,113 @@ bgp_diag_buff_set(struct unixctl_conn *conn, int argc OVS_UNUSED,
     unixctl_command_reply(conn, buf);
 
 }
+/*
+ * Show or set the batching of the RIB publishing transactions
+ */
+static void
+bgp_rib_txn_batch_set(struct unixctl_conn *conn, int argc,
+    const char *argv[], void *aux OVS_UNUSED)
+{
+    struct ds ds = DS_EMPTY_INITIALIZER;
+
+    if (argc > 1) {
+        bgp_txn_batch_set_params(atoi(argv[1]),
+                                 (argc > 2) ? atoi(argv[2]) :
+                                 BGP_RIB_TXN_BATCH_FLUSH_MSEC_DEFAULT);
+    }
+
+    bgp_txn_batch_dump(&ds);
+    unixctl_command_reply(conn, ds_cstr(&ds));
+    ds_destroy(&ds);
+}
+
+/*
+ * Make the next RIB publishing transaction batches fail, for testing
+ * the recovery of failed batches
+ */
+static void
+bgp_rib_txn_fail_set(struct unixctl_conn *conn, int argc,
+    const char *argv[], void *aux OVS_UNUSED)
+{
+    enum ovsdb_idl_txn_status status = TXN_ERROR;
+    char buf[128];
+
+    if (argc > 2) {
+        if (!strcmp(argv[2], "try-again")) {
+            status = TXN_TRY_AGAIN;
+        } else if (strcmp(argv[2], "error")) {
+            unixctl_command_reply_error(conn,
+                                        "Status must be error or try-again");
+            return;
+        }
+    }
+
+    bgp_txn_batch_fail(atoi(argv[1]), status);
+    snprintf(buf, sizeof(buf), "Failing the next %d RIB txn batches "
+             "with status %s\n", atoi(argv[1]),
+             ovsdb_idl_txn_status_to_string(status));
+    unixctl_command_reply(conn, buf);
+}
+
+/*
+ * Show or set the interval of the neighbor statistics export
+ */
+static void
+bgp_nbr_stats_interval_set(struct unixctl_conn *conn, int argc,
+    const char *argv[], void *aux OVS_UNUSED)
+{
+    struct ds ds = DS_EMPTY_INITIALIZER;
+
+    if (argc > 1) {
+        bgp_nbr_stats_set_interval(atoi(argv[1]));
+    }
+
+    ds_put_format(&ds, "Neighbor statistics export:\n");
+    ds_put_format(&ds, "  Interval: %d msec\n", bgp_nbr_stats_interval_msec);
+    ds_put_format(&ds, "  Exports: %lu\n", bgp_nbr_stats_exports);
+    ds_put_format(&ds, "  Neighbors exported: %lu\n",
+                  bgp_nbr_stats_peers_exported);
+    unixctl_command_reply(conn, ds_cstr(&ds));
+    ds_destroy(&ds);
+}
+
+static void
+bgp_updgrp_dump_group(struct update_group *group, void *arg)
+{
+    struct ds *ds = arg;
+    struct listnode *node;
+    struct peer *peer;
+
+    ds_put_format(ds, "Update group %u: %s %s, %u peers\n", group->id,
+                  group->key.afi == AFI_IP ? "IPv4" : "IPv6",
+                  group->key.safi == SAFI_MULTICAST ? "multicast" :
+                  group->key.safi == SAFI_MPLS_VPN ? "vpn" : "unicast",
+                  listcount(group->peer));
+    ds_put_format(ds, "  Policy: computed %lu, reused %lu\n",
+                  group->policy_computed, group->policy_reused);
+    ds_put_format(ds, "  Encoding: computed %lu, reused %lu\n",
+                  group->encoding_computed, group->encoding_reused);
+    ds_put_cstr(ds, "  Peers:");
+    for (ALL_LIST_ELEMENTS_RO(group->peer, node, peer)) {
+        ds_put_format(ds, " %s", peer->host);
+    }
+    ds_put_cstr(ds, "\n");
+}
+
+/*
+ * Show the update groups of the peers
+ */
+static void
+bgp_updgrp_show(struct unixctl_conn *conn, int argc OVS_UNUSED,
+    const char *argv[] OVS_UNUSED, void *aux OVS_UNUSED)
+{
+    struct ds ds = DS_EMPTY_INITIALIZER;
+
+    ds_put_format(&ds, "Update groups: %lu\n", bgp_updgrp_count());
+    bgp_updgrp_iterate(bgp_updgrp_dump_group, &ds);
+    unixctl_command_reply(conn, ds_cstr(&ds));
+    ds_destroy(&ds);
+}
 boolean get_global_ecmp_status()
 {
    return sys_ecmp_status;
@@ -396,6 +512,13 @@ bgp_ovsdb_tables_init (struct ovsdb_idl *idl)
     ovsdb_idl_add_column(idl, &ovsrec_bgp_nexthop_col_ip_address);
     ovsdb_idl_add_column(idl, &ovsrec_bgp_nexthop_col_type);
 
+    /*
+     * Track the nexthop rows so that the nexthop maps used to publish
+     * routes are updated with the rows changed since the last run only.
+     */
+    ovsdb_idl_track_add_column(idl, &ovsrec_nexthop_col_ip_address);
+    ovsdb_idl_track_add_column(idl, &ovsrec_bgp_nexthop_col_ip_address);
+
     /* BFD Session table */
     ovsdb_idl_add_table(idl, &ovsrec_table_bfd_session);
     ovsdb_idl_add_column(idl, &ovsrec_bfd_session_col_enable);
@@ -435,6 +558,14 @@ ovsdb_init (const char *db_path)
     /* Register ovs-appctl commands for this daemon. */
     unixctl_command_register("bgpd/dump", "", 0, 0, bgp_unixctl_dump, NULL);
     unixctl_command_register("bgpd/diag", "buffer size", 1, 1, bgp_diag_buff_set, NULL);
+    unixctl_command_register("bgpd/rib-txn-batch", "[batch size [flush msec]]",
+                             0, 2, bgp_rib_txn_batch_set, NULL);
+    unixctl_command_register("bgpd/rib-txn-fail", "batches [error|try-again]",
+                             1, 2, bgp_rib_txn_fail_set, NULL);
+    unixctl_command_register("bgpd/neighbor-stats-interval", "[msec]",
+                             0, 1, bgp_nbr_stats_interval_set, NULL);
+    unixctl_command_register("bgpd/update-groups", "", 0, 0,
+                             bgp_updgrp_show, NULL);
 }
 
 /* Show BGP memory usage information */
@@ -1901,6 +2032,9 @@ check_and_delete_bgp_neighbors (struct bgp *bgp,
         if (deleted_from_database) {
             VLOG_DBG("bgp peer %s being deleted", peer->host);
             peer_delete(peer);
+        } else if (!uuid_equals(&peer->ovsdb_uuid, &ovs_nbr->header_.uuid)) {
+            /* the neighbor row was replaced, drop the cached one */
+            uuid_zero(&peer->ovsdb_uuid);
         }
     }
 }
@@ -2004,17 +2138,35 @@ get_bgp_neighbor_with_VrfName_BgpRouterAsn_Ipaddr (struct ovsdb_idl *idl,
     return NULL;
 }
 
+/*
+ * The row found is cached by its UUID in the peer, so that FSM events
+ * and statistics updates do not walk all the neighbors of all the bgp
+ * routers. The cache is dropped when the row is deleted.
+ */
 const struct ovsrec_bgp_neighbor *
 get_bgp_neighbor_db_row (struct peer *peer)
 {
+    const struct ovsrec_bgp_neighbor *ovs_nbr;
     const char *ipaddr;
     char ip_addr_string [64];
 
+    if (!uuid_is_zero(&peer->ovsdb_uuid)) {
+        ovs_nbr = ovsrec_bgp_neighbor_get_for_uuid(idl, &peer->ovsdb_uuid);
+        if (ovs_nbr) {
+            return ovs_nbr;
+        }
+        uuid_zero(&peer->ovsdb_uuid);
+    }
+
     ipaddr = sockunion2str(&peer->su, ip_addr_string, 63);
     if (ipaddr) {
-        return
+        ovs_nbr =
             get_bgp_neighbor_with_VrfName_BgpRouterAsn_Ipaddr(idl, NULL,
                 peer->bgp->as, ipaddr);
+        if (ovs_nbr) {
+            peer->ovsdb_uuid = ovs_nbr->header_.uuid;
+        }
+        return ovs_nbr;
     }
     return NULL;
 }
@@ -2048,6 +2200,7 @@ bgp_daemon_ovsdb_neighbor_statistics_update (bool start_new_db_txn,
 
     /* is this an independent txn or piggybacked onto another txn */
     if (start_new_db_txn) {
+        bgp_txn_batch_flush();
         db_txn = ovsdb_idl_txn_create(idl);
         if (NULL == db_txn) {
             VLOG_ERR("%%ovsdb_idl_txn_create failed in "
@@ -2079,6 +2232,7 @@ bgp_daemon_ovsdb_neighbor_statistics_update (bool start_new_db_txn,
 
     ovsrec_bgp_neighbor_set_statistics(ovs_bgp_neighbor_ptr,
     keywords, values, count);
+    peer->ovsdb_stats_dirty = 0;
 
     if (start_new_db_txn) {
         status = ovsdb_idl_txn_commit(db_txn);
@@ -2111,6 +2265,7 @@ void bgp_daemon_ovsdb_neighbor_update (struct peer *peer,
            ovsdb_nbr_from_row_to_peer_name(idl, ovs_bgp_neighbor_ptr, NULL),
            *ovs_bgp_neighbor_ptr->remote_as);
 
+    bgp_txn_batch_flush();
     db_txn = ovsdb_idl_txn_create(idl);
     if (NULL == db_txn) {
     VLOG_ERR("%%ovsdb_idl_txn_create failed in "
@@ -2146,8 +2301,8 @@ void bgp_daemon_ovsdb_neighbor_update (struct peer *peer,
     bgp_peer_status_to_string(peer->status));
     ovsrec_bgp_neighbor_set_status(ovs_bgp_neighbor_ptr, &smap);
 
-    /* update statistics */
-    if (update_stats_too) {
+    /* update statistics, state changes also carry the pending ones */
+    if (update_stats_too || peer->ovsdb_stats_dirty) {
     bgp_daemon_ovsdb_neighbor_statistics_update(false,
         ovs_bgp_neighbor_ptr, peer);
     VLOG_DBG("updated stats also\n");
@@ -2159,6 +2314,108 @@ void bgp_daemon_ovsdb_neighbor_update (struct peer *peer,
     ovsdb_idl_txn_destroy(db_txn);
 }
 
+/*
+ * Publish the statistics of all the peers which changed since the last
+ * export in a single transaction.
+ */
+static void
+bgp_nbr_stats_export (void)
+{
+    const struct ovsrec_bgp_neighbor *ovs_bgp_neighbor_ptr;
+    struct ovsdb_idl_txn *db_txn = NULL;
+    enum ovsdb_idl_txn_status status;
+    struct listnode *node, *nnode;
+    struct listnode *pnode, *pnnode;
+    struct bgp *bgp;
+    struct peer *peer;
+    int n_peers = 0;
+
+    for (ALL_LIST_ELEMENTS (bm->bgp, node, nnode, bgp)) {
+        for (ALL_LIST_ELEMENTS (bgp->peer, pnode, pnnode, peer)) {
+            if (!peer->ovsdb_stats_dirty) {
+                continue;
+            }
+
+            ovs_bgp_neighbor_ptr = get_bgp_neighbor_db_row(peer);
+            if (NULL == ovs_bgp_neighbor_ptr) {
+                peer->ovsdb_stats_dirty = 0;
+                continue;
+            }
+
+            if (NULL == db_txn) {
+                bgp_txn_batch_flush();
+                db_txn = ovsdb_idl_txn_create(idl);
+                if (NULL == db_txn) {
+                    VLOG_ERR("%%ovsdb_idl_txn_create failed in "
+                             "bgp_nbr_stats_export\n");
+                    return;
+                }
+            }
+
+            bgp_daemon_ovsdb_neighbor_statistics_update(false,
+                ovs_bgp_neighbor_ptr, peer);
+            n_peers++;
+        }
+    }
+
+    if (NULL == db_txn) {
+        return;
+    }
+
+    status = ovsdb_idl_txn_commit(db_txn);
+    ovsdb_idl_txn_destroy(db_txn);
+    bgp_nbr_stats_exports++;
+    bgp_nbr_stats_peers_exported += n_peers;
+    VLOG_DBG("%s OVSDB statistics of %d neighbours, transaction status is %s",
+             __FUNCTION__, n_peers, ovsdb_idl_txn_status_to_string(status));
+}
+
+static int
+bgp_nbr_stats_export_timer (struct thread *thread)
+{
+    bgp_nbr_stats_thread = NULL;
+    bgp_nbr_stats_export();
+    return 0;
+}
+
+/*
+ * Mark the statistics of a peer as changed. They are published with the
+ * other changed ones when the export interval expires, or with the next
+ * state change of the peer, whichever comes first.
+ */
+void
+bgp_daemon_ovsdb_neighbor_statistics_changed (struct peer *peer)
+{
+    if ((bgp_nbr_stats_interval_msec == 0) || !bm || !bm->master) {
+        bgp_daemon_ovsdb_neighbor_statistics_update(true, NULL, peer);
+        return;
+    }
+
+    peer->ovsdb_stats_dirty = 1;
+    if (!bgp_nbr_stats_thread) {
+        bgp_nbr_stats_thread =
+            thread_add_timer_msec(bm->master, bgp_nbr_stats_export_timer,
+                                  NULL, bgp_nbr_stats_interval_msec);
+    }
+}
+
+/*
+ * Set the interval of the neighbor statistics export. The statistics
+ * pending under the old interval are published first.
+ */
+void
+bgp_nbr_stats_set_interval (int interval_msec)
+{
+    if (interval_msec < 0) {
+        return;
+    }
+
+    THREAD_OFF(bgp_nbr_stats_thread);
+    bgp_nbr_stats_export();
+
+    bgp_nbr_stats_interval_msec = interval_msec;
+}
+
 static int
 fetch_key_value (char **key, const int64_t *value,
     size_t n_elem, char *your_key)
@@ -2817,6 +3074,7 @@ bgp_nbr_read_ovsdb_apply_changes (struct ovsdb_idl *idl, bool bfd_session_change
             if (!confirm_txn) {
                 VLOG_DBG("Check here for clear counters for neighbor %s\n"
                          ,ovs_bgp->key_bgp_neighbors[j]);
+                bgp_txn_batch_flush();
                 confirm_txn = ovsdb_idl_txn_create(idl);
                 bgp_check_neighbor_clear_soft_in(idl, ovs_nbr,
                                                  ovs_bgp->key_bgp_neighbors[j]);
@@ -3019,6 +3277,7 @@ bgp_create_bfd_session_in_ovsdb(char *remote, char *local, as_t asn)
     /*
      * TODO: bgp_txn_finish() needs be added here after rel/dill merge
      */
+    bgp_txn_batch_flush();
     ovs_txn = ovsdb_idl_txn_create(idl);
 
     ovs_bfd_session = find_matching_bfd_session_in_ovsdb(idl, remote);
@@ -3066,6 +3325,7 @@ bgp_delete_bfd_session_in_ovsdb(char *remote, as_t asn)
     /*
      * TODO: bgp_txn_finish() needs be added here after rel/dill merge
      */
+    bgp_txn_batch_flush();
     ovs_txn = ovsdb_idl_txn_create(idl);
 
     ovs_bfd_session = find_matching_bfd_session_in_ovsdb(idl, remote);
@@ -3092,6 +3352,9 @@ bgp_reconfigure (struct ovsdb_idl *idl)
         return;
     }
 
+    /* Update the nexthop rows used to publish routes */
+    bgp_ovsdb_nexthop_hmap_apply_changes(idl);
+
     /*
      * Apply prefix list, community filter and route map changes
      */
@@ -3110,6 +3373,9 @@ bgp_reconfigure (struct ovsdb_idl *idl)
 
     /* update the seq. number */
     idl_seqno = new_idl_seqno;
+
+    /* All the tracked row changes have been consumed by this run */
+    ovsdb_idl_track_clear(idl);
 }
 
 /* Wrapper function that checks for idl updates and reconfigures the daemon
@@ -3117,6 +3383,9 @@ bgp_reconfigure (struct ovsdb_idl *idl)
 static void
 bgp_ovs_run ()
 {
+    /* The IDL cannot be run with a transaction batch still open */
+    bgp_txn_batch_flush();
+
     ovsdb_idl_run(idl);
     unixctl_server_run(appctl);
 
@@ -54,4 +54,12 @@ void bgp_ovsdb_init_poll_loop (struct bgp_master *bm);
 boolean  get_global_ecmp_status(void);
 extern void bgp_daemon_ovsdb_neighbor_update (struct peer *peer, bool update_stats_too);
 
+/* Interval at which the changed neighbor statistics are published, 0
+ * publishes them as they change.
+ */
+#define BGP_NBR_STATS_INTERVAL_MSEC_DEFAULT     1000
+
+extern void bgp_daemon_ovsdb_neighbor_statistics_changed (struct peer *peer);
+extern void bgp_nbr_stats_set_interval (int interval_msec);
+
 #endif /* BGP_OVSDB_IF_H */
@@ -71,6 +71,36 @@ extern const char *bgp_origin_str[];
 extern const char *bgp_origin_long_str[];
 static struct hmap global_hmap = HMAP_INITIALIZER(&global_hmap);
 
+/*
+ * Nexthop and BGP_Nexthop rows by IP address, also indexed by row UUID
+ * since the IP address of a deleted row can no longer be read. The maps
+ * are built from the IDL on first use and then updated from the tracked
+ * row changes, which cover the rows inserted, modified and deleted by
+ * other daemons, our own committed transactions and IDL reconnects. The
+ * rows inserted by the open transaction batch are added as they are
+ * created.
+ */
+struct nexthop_hmap_element {
+    struct hmap_node node;          /* In by_ip */
+    struct hmap_node uuid_node;     /* In by_uuid */
+    struct uuid uuid;
+    char ip_address[INET6_ADDRSTRLEN];
+};
+
+struct nexthop_hmap {
+    struct hmap by_ip;
+    struct hmap by_uuid;
+};
+
+#define NEXTHOP_HMAP_INITIALIZER(MAP) \
+    { HMAP_INITIALIZER(&(MAP)->by_ip), HMAP_INITIALIZER(&(MAP)->by_uuid) }
+
+static struct nexthop_hmap nexthop_hmap =
+    NEXTHOP_HMAP_INITIALIZER(&nexthop_hmap);
+static struct nexthop_hmap local_nexthop_hmap =
+    NEXTHOP_HMAP_INITIALIZER(&local_nexthop_hmap);
+static bool nexthop_hmap_valid = false;
+
 VLOG_DEFINE_THIS_MODULE(bgp_ovsdb_route);
 
 /* Structure definition for path attributes data (psd) column in the
@@ -104,10 +134,25 @@ char *txn_bgp_request_str[]={
     "TXN_BGP_UPD_ATTR"
 };
 
+/*
+ * A batch is a single OVSDB transaction shared by the RIB publishing
+ * requests of many prefixes. Requests are added to the open batch until
+ * it holds bgp_txn_batch_size requests or the flush timer expires, and
+ * the batch is then committed as one multi-row transaction.
+ */
+struct bgp_ovsdb_txn_batch {
+    struct ovsdb_idl_txn *txn;
+    unsigned int id;          /* Batch sequence number used in logs */
+    int refcnt;               /* Number of txn records in the batch */
+    int n_requests;           /* Number of prefix requests in the batch */
+    bool committed;           /* Commit has been issued for the batch */
+    enum ovsdb_idl_txn_status fail_status; /* Injected failure, if any */
+};
+
 struct bgp_ovsdb_txn {
     struct hmap_node hmap_node;
     int    request;
-    struct ovsdb_idl_txn *txn;
+    struct bgp_ovsdb_txn_batch *batch;
     as_t   as_no;
     afi_t  afi;
     safi_t safi;
@@ -115,6 +160,7 @@ struct bgp_ovsdb_txn {
     struct bgp_info *bgp_info;
     unsigned int info_attr_hash;
     time_t update_time;
+    int    retries;           /* Times the request was already retried */
 };
 
 void bgp_txn_init(void);
@@ -130,6 +176,31 @@ policy_rt_map_apply_changes (struct route_map *map,
 
 static bool bgp_review(struct bgp_ovsdb_txn *txn, enum txn_op_type op, bgp_table_type_t table_type);
 static uint32_t get_lookup_key(char *prefix, char *table_name);
+static struct ovsdb_idl_txn *bgp_txn_batch_get(void);
+static int bgp_txn_batch_end(char *msg, char *pr);
+
+/* Batch currently collecting RIB publishing requests */
+static struct bgp_ovsdb_txn_batch *bgp_txn_open_batch = NULL;
+static unsigned int bgp_txn_batch_seq = 0;
+static struct thread *bgp_txn_batch_flush_thread = NULL;
+
+/* Batching parameters, configurable through ovs-appctl */
+static int bgp_txn_batch_size = BGP_RIB_TXN_BATCH_SIZE_DEFAULT;
+static int bgp_txn_batch_flush_msec = BGP_RIB_TXN_BATCH_FLUSH_MSEC_DEFAULT;
+
+/* Batching statistics */
+static unsigned long bgp_txn_batch_commits = 0;
+static unsigned long bgp_txn_batch_requests = 0;
+static unsigned long bgp_txn_batch_failed_requests = 0;
+static unsigned long bgp_txn_batch_retried_requests = 0;
+static unsigned long bgp_txn_batch_dropped_requests = 0;
+
+/* Retry count given to the requests published by a failure recovery */
+static int bgp_txn_retries = 0;
+
+/* Failure injection, configurable through ovs-appctl */
+static int bgp_txn_fail_batches = 0;
+static enum ovsdb_idl_txn_status bgp_txn_fail_status = TXN_ERROR;
 
 static int
 txn_command_result(enum ovsdb_idl_txn_status status, char *msg, char *pr)
@@ -156,11 +227,11 @@ txn_command_result(enum ovsdb_idl_txn_status status, char *msg, char *pr)
         if (txn_rec == NULL) {                                          \
             VLOG_ERR("%s: %s\n",                                        \
                      __FUNCTION__, "Failed to insert txn to hash");     \
-            ovsdb_idl_txn_destroy(txn);                                 \
             return -1;                                                  \
         }                                                               \
         txn_rec->request = req;                                         \
-        txn_rec->txn = txn;                                             \
+        txn_rec->batch = bgp_txn_open_batch;                            \
+        txn_rec->batch->refcnt++;                                       \
         memcpy (&txn_rec->prefix, p, sizeof (*p));                      \
         txn_rec->bgp_info = info;                                       \
         if (info? info->attr : 0)  {                                    \
@@ -170,14 +241,15 @@ txn_command_result(enum ovsdb_idl_txn_status status, char *msg, char *pr)
         txn_rec->afi = family2afi(p->family);                           \
         txn_rec->safi = safi;                                           \
         txn_rec->update_time = time (NULL);                             \
+        txn_rec->retries = bgp_txn_retries;                             \
         bgp_txn_insert(&txn_rec->hmap_node);                            \
         prefix2str(p, p_str, sizeof(p_str));                            \
     } while (0)
 
+/* Get the open batch transaction and add a recovery node to it */
 #define START_DB_TXN(txn, msg, req, p, info, asn, safi)                 \
     do {                                                                \
-        enum ovsdb_idl_txn_status status;                               \
-        txn = ovsdb_idl_txn_create(idl);                                \
+        txn = bgp_txn_batch_get();                                      \
         if (txn == NULL) {                                              \
             VLOG_ERR("%s: %s\n",                                        \
                      __FUNCTION__, msg);                                \
@@ -186,11 +258,10 @@ txn_command_result(enum ovsdb_idl_txn_status status, char *msg, char *pr)
         HASH_DB_TXN(txn, req, p, info, asn, safi);                      \
     } while (0)
 
+/* Account the request in the open batch, committing it once full */
 #define END_DB_TXN(txn, msg, pr)                          \
     do {                                                  \
-        enum ovsdb_idl_txn_status status;                 \
-        status = ovsdb_idl_txn_commit(txn);               \
-        return txn_command_result(status, msg, pr);       \
+        return bgp_txn_batch_end(msg, pr);                \
     } while (0)
 
 
@@ -388,42 +459,231 @@ bgp_ovsdb_set_rib_path_attributes(struct smap *smap,
     return 0;
 }
 
+static struct nexthop_hmap_element *
+nexthop_hmap_find(struct nexthop_hmap *map, const char *ip)
+{
+    struct nexthop_hmap_element *hmap_entry;
+
+    HMAP_FOR_EACH_WITH_HASH(hmap_entry, node, hash_string(ip, 0),
+                            &map->by_ip) {
+        if (!strcmp(hmap_entry->ip_address, ip)) {
+            return hmap_entry;
+        }
+    }
+    return NULL;
+}
+
+static struct nexthop_hmap_element *
+nexthop_hmap_find_uuid(struct nexthop_hmap *map, const struct uuid *uuid)
+{
+    struct nexthop_hmap_element *hmap_entry;
+
+    HMAP_FOR_EACH_WITH_HASH(hmap_entry, uuid_node, uuid_hash(uuid),
+                            &map->by_uuid) {
+        if (uuid_equals(&hmap_entry->uuid, uuid)) {
+            return hmap_entry;
+        }
+    }
+    return NULL;
+}
+
+static void
+nexthop_hmap_add(struct nexthop_hmap *map, const char *ip,
+                 const struct uuid *uuid)
+{
+    struct nexthop_hmap_element *hmap_entry;
+
+    /* Keep the first row of an IP address, as the table scan did */
+    if (nexthop_hmap_find(map, ip)) {
+        return;
+    }
+
+    hmap_entry = xzalloc(sizeof *hmap_entry);
+    hmap_entry->uuid = *uuid;
+    strncpy(hmap_entry->ip_address, ip, sizeof(hmap_entry->ip_address) - 1);
+    hmap_insert(&map->by_ip, &hmap_entry->node, hash_string(ip, 0));
+    hmap_insert(&map->by_uuid, &hmap_entry->uuid_node, uuid_hash(uuid));
+}
+
+static void
+nexthop_hmap_remove(struct nexthop_hmap *map,
+                    struct nexthop_hmap_element *hmap_entry)
+{
+    hmap_remove(&map->by_ip, &hmap_entry->node);
+    hmap_remove(&map->by_uuid, &hmap_entry->uuid_node);
+    free(hmap_entry);
+}
+
+static void
+nexthop_hmap_clear(struct nexthop_hmap *map)
+{
+    struct nexthop_hmap_element *hmap_entry, *next;
+
+    HMAP_FOR_EACH_SAFE(hmap_entry, next, node, &map->by_ip) {
+        nexthop_hmap_remove(map, hmap_entry);
+    }
+}
+
+/*
+ * Check that the row of a Nexthop or BGP_Nexthop entry still exists
+ * with the IP address of the entry. The row of a temporary UUID is gone
+ * once its transaction is committed or aborted.
+ */
+static bool
+nexthop_hmap_entry_valid(struct nexthop_hmap_element *hmap_entry)
+{
+    const struct ovsrec_nexthop *row;
+
+    row = ovsrec_nexthop_get_for_uuid(idl, &hmap_entry->uuid);
+    return row && row->ip_address &&
+           !strcmp(row->ip_address, hmap_entry->ip_address);
+}
+
+static bool
+local_nexthop_hmap_entry_valid(struct nexthop_hmap_element *hmap_entry)
+{
+    const struct ovsrec_bgp_nexthop *row;
+
+    row = ovsrec_bgp_nexthop_get_for_uuid(idl, &hmap_entry->uuid);
+    return row && row->ip_address &&
+           !strcmp(row->ip_address, hmap_entry->ip_address);
+}
+
+/*
+ * Apply a tracked change of a row to a nexthop map, ip being NULL for a
+ * deleted row. An inserted or modified row replaces the entry of its IP
+ * address if the row of that entry is gone, such as the temporary row of
+ * a committed insert.
+ */
+static void
+nexthop_hmap_track_row(struct nexthop_hmap *map, const struct uuid *uuid,
+                       const char *ip,
+                       bool (*entry_valid)(struct nexthop_hmap_element *))
+{
+    struct nexthop_hmap_element *hmap_entry;
+
+    hmap_entry = nexthop_hmap_find_uuid(map, uuid);
+    if (hmap_entry && (!ip || strcmp(hmap_entry->ip_address, ip))) {
+        nexthop_hmap_remove(map, hmap_entry);
+    }
+
+    if (!ip) {
+        return;
+    }
+
+    hmap_entry = nexthop_hmap_find(map, ip);
+    if (hmap_entry && !uuid_equals(&hmap_entry->uuid, uuid) &&
+        !entry_valid(hmap_entry)) {
+        nexthop_hmap_remove(map, hmap_entry);
+    }
+    nexthop_hmap_add(map, ip, uuid);
+}
+
+/*
+ * Build the nexthop maps from the IDL on first use.
+ */
+static void
+bgp_ovsdb_nexthop_hmap_sync(void)
+{
+    const struct ovsrec_nexthop *row;
+    const struct ovsrec_bgp_nexthop *local_row;
+
+    if (nexthop_hmap_valid) {
+        return;
+    }
+
+    nexthop_hmap_clear(&nexthop_hmap);
+    nexthop_hmap_clear(&local_nexthop_hmap);
+
+    OVSREC_NEXTHOP_FOR_EACH(row, idl) {
+        if (row->ip_address) {
+            nexthop_hmap_add(&nexthop_hmap, row->ip_address,
+                             &row->header_.uuid);
+        }
+    }
+    OVSREC_BGP_NEXTHOP_FOR_EACH(local_row, idl) {
+        if (local_row->ip_address) {
+            nexthop_hmap_add(&local_nexthop_hmap, local_row->ip_address,
+                             &local_row->header_.uuid);
+        }
+    }
+
+    nexthop_hmap_valid = true;
+}
+
+/*
+ * Update the nexthop maps with the Nexthop and BGP_Nexthop rows
+ * inserted, modified or deleted since the tracked changes were last
+ * cleared. Maps not built yet are left to be built on first use.
+ */
+void
+bgp_ovsdb_nexthop_hmap_apply_changes(struct ovsdb_idl *idl)
+{
+    const struct ovsrec_nexthop *row;
+    const struct ovsrec_bgp_nexthop *local_row;
+
+    if (!nexthop_hmap_valid) {
+        return;
+    }
+
+    OVSREC_NEXTHOP_FOR_EACH_TRACKED(row, idl) {
+        nexthop_hmap_track_row(&nexthop_hmap, &row->header_.uuid,
+                               ovsrec_nexthop_is_deleted(row) ?
+                               NULL : row->ip_address,
+                               nexthop_hmap_entry_valid);
+    }
+    OVSREC_BGP_NEXTHOP_FOR_EACH_TRACKED(local_row, idl) {
+        nexthop_hmap_track_row(&local_nexthop_hmap, &local_row->header_.uuid,
+                               ovsrec_bgp_nexthop_is_deleted(local_row) ?
+                               NULL : local_row->ip_address,
+                               local_nexthop_hmap_entry_valid);
+    }
+}
+
 static const struct ovsrec_nexthop*
 bgp_ovsdb_lookup_nexthop(char *ip)
 {
-    const struct ovsrec_nexthop *row = NULL;
+    struct nexthop_hmap_element *hmap_entry;
+    const struct ovsrec_nexthop *row;
     if (!ip)
         assert(0);
 
-    OVSREC_NEXTHOP_FOR_EACH(row, idl) {
-        if (row->ip_address)
-        {
-            if (strcmp(ip, row->ip_address) == 0) {
-                /* Match */
-                return row;
-            }
-        }
+    bgp_ovsdb_nexthop_hmap_sync();
+    hmap_entry = nexthop_hmap_find(&nexthop_hmap, ip);
+    if (!hmap_entry) {
+        return NULL;
     }
-    return NULL;
+
+    row = ovsrec_nexthop_get_for_uuid(idl, &hmap_entry->uuid);
+    if (!row || !row->ip_address || strcmp(ip, row->ip_address)) {
+        /* The row was deleted by an aborted transaction */
+        nexthop_hmap_remove(&nexthop_hmap, hmap_entry);
+        return NULL;
+    }
+    return row;
 }
 
 static const struct ovsrec_bgp_nexthop*
 bgp_ovsdb_lookup_local_nexthop(char *ip)
 {
-    const struct ovsrec_bgp_nexthop *row = NULL;
+    struct nexthop_hmap_element *hmap_entry;
+    const struct ovsrec_bgp_nexthop *row;
     if (!ip)
         assert(0);
 
-    OVSREC_BGP_NEXTHOP_FOR_EACH(row, idl) {
-        if (row->ip_address)
-        {
-            if (strcmp(ip, row->ip_address) == 0) {
-                /* Match */
-                return row;
-            }
-        }
+    bgp_ovsdb_nexthop_hmap_sync();
+    hmap_entry = nexthop_hmap_find(&local_nexthop_hmap, ip);
+    if (!hmap_entry) {
+        return NULL;
     }
-    return NULL;
+
+    row = ovsrec_bgp_nexthop_get_for_uuid(idl, &hmap_entry->uuid);
+    if (!row || !row->ip_address || strcmp(ip, row->ip_address)) {
+        /* The row was deleted by an aborted transaction */
+        nexthop_hmap_remove(&local_nexthop_hmap, hmap_entry);
+        return NULL;
+    }
+    return row;
 }
 
 /*
@@ -478,13 +738,14 @@ bgp_ovsdb_set_rib_nexthop(struct ovsdb_idl_txn *txn,
     if (!pnexthop) {
         pnexthop = ovsrec_nexthop_insert(txn);
         ovsrec_nexthop_set_ip_address(pnexthop, nexthop_buf);
+        nexthop_hmap_add(&nexthop_hmap, nexthop_buf,
+                         &pnexthop->header_.uuid);
         VLOG_DBG("Setting nexthop IP address %s\n", nexthop_buf);
         ovsrec_nexthop_set_type(pnexthop, safi_str);
     }
     selected = 1;
     ovsrec_nexthop_set_selected(pnexthop, &selected, 1);
     nexthop_list[0] = (struct ovsrec_nexthop*) pnexthop;
-    nexthop_list[0]->ip_address = xstrdup(nexthop_buf);
 
     int ii = 1;
     if(get_global_ecmp_status())
@@ -518,6 +779,8 @@ bgp_ovsdb_set_rib_nexthop(struct ovsdb_idl_txn *txn,
             if (!pnexthop) {
                 pnexthop = ovsrec_nexthop_insert(txn);
                 ovsrec_nexthop_set_ip_address(pnexthop, nexthop_buf);
+                nexthop_hmap_add(&nexthop_hmap, nexthop_buf,
+                                 &pnexthop->header_.uuid);
                 VLOG_DBG("Setting nexthop IP address %s, count %d\n",
                          nexthop_buf, ii);
                 ovsrec_nexthop_set_type(pnexthop, safi_str);
@@ -525,13 +788,10 @@ bgp_ovsdb_set_rib_nexthop(struct ovsdb_idl_txn *txn,
             selected = 1;
             ovsrec_nexthop_set_selected(pnexthop, &selected, 1);
             nexthop_list[ii] = (struct ovsrec_nexthop*) pnexthop;
-            nexthop_list[ii]->ip_address = xstrdup(nexthop_buf);
             ii++;
         }
     }
     ovsrec_route_set_nexthops(rib, nexthop_list, nexthop_num);
-    for (ii = 0; ii < nexthop_num; ii++)
-        free(nexthop_list[ii]->ip_address);
     free(nexthop_list);
     return 0;
 }
@@ -592,11 +852,12 @@ bgp_ovsdb_set_local_rib_nexthop(struct ovsdb_idl_txn *txn,
     if (!pnexthop) {
         pnexthop = ovsrec_bgp_nexthop_insert(txn);
         ovsrec_bgp_nexthop_set_ip_address(pnexthop, nexthop_buf);
+        nexthop_hmap_add(&local_nexthop_hmap, nexthop_buf,
+                         &pnexthop->header_.uuid);
         VLOG_DBG("Setting local nexthop IP address %s\n", nexthop_buf);
         ovsrec_bgp_nexthop_set_type(pnexthop, safi_str);
     }
     nexthop_list[0] = (struct ovsrec_bgp_nexthop *) pnexthop;
-    nexthop_list[0]->ip_address = xstrdup(nexthop_buf);
     int ii = 1;
     /* Set multipath nexthops */
     for(mpinfo = bgp_info_mpath_first (info); mpinfo;
@@ -627,17 +888,16 @@ bgp_ovsdb_set_local_rib_nexthop(struct ovsdb_idl_txn *txn,
             if (!pnexthop) {
                 pnexthop = ovsrec_bgp_nexthop_insert(txn);
                 ovsrec_bgp_nexthop_set_ip_address(pnexthop, nexthop_buf);
+                nexthop_hmap_add(&local_nexthop_hmap, nexthop_buf,
+                                 &pnexthop->header_.uuid);
                 VLOG_DBG("Setting local nexthop IP address %s, count %d\n",
                          nexthop_buf, ii);
                 ovsrec_bgp_nexthop_set_type(pnexthop, safi_str);
             }
             nexthop_list[ii] = (struct ovsrec_bgp_nexthop *) pnexthop;
-            nexthop_list[ii]->ip_address = xstrdup(nexthop_buf);
             ii++;
         }
     ovsrec_bgp_route_set_bgp_nexthops(rib, nexthop_list, nexthop_num);
-    for (ii = 0; ii < nexthop_num; ii++)
-        free(nexthop_list[ii]->ip_address);
     free(nexthop_list);
     return 0;
 }
@@ -1167,6 +1427,198 @@ bgp_txn_remove(struct hmap_node *txn_node) {
     hmap_remove(&bgp_ovsdb_txn_hmap, txn_node);
 }
 
+/*
+ * Return the commit status of a batch, or the failure injected into it.
+ */
+static enum ovsdb_idl_txn_status
+bgp_txn_batch_status(struct bgp_ovsdb_txn_batch *batch)
+{
+    enum ovsdb_idl_txn_status status;
+
+    status = ovsdb_idl_txn_commit(batch->txn);
+    if (batch->fail_status != TXN_UNCOMMITTED) {
+        return batch->fail_status;
+    }
+    return status;
+}
+
+/*
+ * Release a batch once its transaction is committed and no transaction
+ * record refers to it anymore.
+ */
+static void
+bgp_txn_batch_unref(struct bgp_ovsdb_txn_batch *batch)
+{
+    batch->refcnt--;
+    if ((batch->refcnt <= 0) && batch->committed) {
+        ovsdb_idl_txn_destroy(batch->txn);
+        free(batch);
+    }
+}
+
+/*
+ * Timer callback committing the open batch so that a partially filled
+ * batch is not held back longer than the flush interval.
+ */
+static int
+bgp_txn_batch_flush_timer(struct thread *thread)
+{
+    bgp_txn_batch_flush_thread = NULL;
+    bgp_txn_batch_flush();
+    return 0;
+}
+
+/*
+ * Return the transaction of the open batch, creating a new batch if
+ * there is none.
+ */
+static struct ovsdb_idl_txn *
+bgp_txn_batch_get(void)
+{
+    struct ovsdb_idl_txn *txn;
+
+    if (bgp_txn_open_batch) {
+        return bgp_txn_open_batch->txn;
+    }
+
+    txn = ovsdb_idl_txn_create(idl);
+    if (txn == NULL) {
+        return NULL;
+    }
+
+    bgp_txn_open_batch = xzalloc(sizeof (*bgp_txn_open_batch));
+    bgp_txn_open_batch->txn = txn;
+    bgp_txn_open_batch->id = ++bgp_txn_batch_seq;
+
+    if ((bgp_txn_batch_size > 1) && bm && bm->master &&
+        !bgp_txn_batch_flush_thread) {
+        bgp_txn_batch_flush_thread =
+            thread_add_timer_msec(bm->master, bgp_txn_batch_flush_timer,
+                                  NULL, bgp_txn_batch_flush_msec);
+    }
+
+    return txn;
+}
+
+/*
+ * Account one prefix request in the open batch. The batch is committed
+ * once it holds bgp_txn_batch_size requests.
+ */
+static int
+bgp_txn_batch_end(char *msg, char *pr)
+{
+    enum ovsdb_idl_txn_status status;
+
+    bgp_txn_open_batch->n_requests++;
+    bgp_txn_batch_requests++;
+
+    if (bgp_txn_open_batch->n_requests < bgp_txn_batch_size) {
+        VLOG_DBG("%s %s queued in txn batch %u\n",
+                 msg, pr, bgp_txn_open_batch->id);
+        return 0;
+    }
+
+    status = bgp_txn_batch_flush();
+    return txn_command_result(status, msg, pr);
+}
+
+/*
+ * Commit the open batch, if any. This must be called before any other
+ * transaction is created on the IDL and before the IDL is run, since
+ * the IDL allows only one open transaction at a time.
+ */
+enum ovsdb_idl_txn_status
+bgp_txn_batch_flush(void)
+{
+    struct bgp_ovsdb_txn_batch *batch = bgp_txn_open_batch;
+    enum ovsdb_idl_txn_status status;
+
+    if (batch == NULL) {
+        return TXN_UNCHANGED;
+    }
+
+    bgp_txn_open_batch = NULL;
+    THREAD_OFF(bgp_txn_batch_flush_thread);
+
+    /* Drop the batch and report it as failed if asked to */
+    if (bgp_txn_fail_batches > 0) {
+        bgp_txn_fail_batches--;
+        batch->fail_status = bgp_txn_fail_status;
+        ovsdb_idl_txn_abort(batch->txn);
+    }
+
+    status = bgp_txn_batch_status(batch);
+    batch->committed = true;
+    bgp_txn_batch_commits++;
+
+    VLOG_DBG("Committed txn batch %u with %d route requests, status %s\n",
+             batch->id, batch->n_requests,
+             ovsdb_idl_txn_status_to_string(status));
+
+    /* Release a batch which ended up with no requests */
+    if (batch->refcnt <= 0) {
+        ovsdb_idl_txn_destroy(batch->txn);
+        free(batch);
+    }
+
+    return status;
+}
+
+/*
+ * Set the maximum number of route requests per batch and the interval
+ * after which a partially filled batch is committed. A batch size of 1
+ * publishes every prefix in its own transaction.
+ */
+void
+bgp_txn_batch_set_params(int batch_size, int flush_msec)
+{
+    if (batch_size < 1 || flush_msec < 0) {
+        return;
+    }
+
+    /* Commit pending requests under the old parameters */
+    bgp_txn_batch_flush();
+
+    bgp_txn_batch_size = batch_size;
+    bgp_txn_batch_flush_msec = flush_msec;
+}
+
+/*
+ * Make the next n_batches batch commits fail with the given status. The
+ * transactions of these batches are aborted, so nothing is written.
+ */
+void
+bgp_txn_batch_fail(int n_batches, enum ovsdb_idl_txn_status status)
+{
+    if (n_batches < 0) {
+        return;
+    }
+
+    bgp_txn_fail_batches = n_batches;
+    bgp_txn_fail_status = status;
+}
+
+/*
+ * Dump the batching parameters and statistics.
+ */
+void
+bgp_txn_batch_dump(struct ds *ds)
+{
+    ds_put_format(ds, "RIB transaction batching:\n");
+    ds_put_format(ds, "  Batch size: %d\n", bgp_txn_batch_size);
+    ds_put_format(ds, "  Flush interval: %d msec\n", bgp_txn_batch_flush_msec);
+    ds_put_format(ds, "  Batches committed: %lu\n", bgp_txn_batch_commits);
+    ds_put_format(ds, "  Route requests: %lu\n", bgp_txn_batch_requests);
+    ds_put_format(ds, "  Failed route requests: %lu\n",
+                  bgp_txn_batch_failed_requests);
+    ds_put_format(ds, "  Retried route requests: %lu\n",
+                  bgp_txn_batch_retried_requests);
+    ds_put_format(ds, "  Dropped route requests: %lu\n",
+                  bgp_txn_batch_dropped_requests);
+    ds_put_format(ds, "  Pending route requests: %zu\n",
+                  hmap_count(&bgp_ovsdb_txn_hmap));
+}
+
 /*
  * Check if an OVSDB route exists for a given BGP route transaction
  * in local RIB table.
@@ -1241,7 +1693,7 @@ bgp_info_found(struct bgp *bgp, struct bgp_ovsdb_txn *txn)
 static void
 bgp_txn_free(struct bgp_ovsdb_txn *txn)
 {
-    ovsdb_idl_txn_destroy(txn->txn);
+    bgp_txn_batch_unref(txn->batch);
     bgp_txn_remove (&txn->hmap_node);
     free(txn);
 }
@@ -1255,8 +1707,75 @@ bgp_txn_log(struct bgp_ovsdb_txn *txn, int status)
     char prefix_str[PREFIX_MAXLEN];
 
     prefix2str(&txn->prefix, prefix_str, sizeof(prefix_str));
-    VLOG_DBG("Active Transaction for route %s at time %lld status=%d",
-              prefix_str, txn->update_time, status);
+    VLOG_DBG("Active Transaction for route %s in batch %u at time %lld "
+             "status=%d", prefix_str, txn->batch->id, txn->update_time,
+             status);
+}
+
+/*
+ * Attribute the failure of a batch transaction to one of its prefix
+ * requests.
+ */
+static void
+bgp_txn_log_failure(struct bgp_ovsdb_txn *txn, int status)
+{
+    char prefix_str[PREFIX_MAXLEN];
+
+    bgp_txn_batch_failed_requests++;
+    prefix2str(&txn->prefix, prefix_str, sizeof(prefix_str));
+    VLOG_ERR("Route request %s failed in batch %u as=%d prefix=%s "
+             "status=%s", txn_bgp_request_str[txn->request],
+             txn->batch->id, txn->as_no, prefix_str,
+             ovsdb_idl_txn_status_to_string(status));
+}
+
+/*
+ * Reset the global hash map entry of the row written by a failed
+ * request to the state of the row before the request: the entry of a
+ * row that failed to be inserted is removed, and the entry of an
+ * existing row is back in sync. Return the operation and table of the
+ * entry and whether it needed a review, or false if there is no entry
+ * in flight for the request.
+ */
+static bool
+bgp_txn_reset_prefix(struct bgp_ovsdb_txn *txn, enum txn_op_type *op_type,
+                     bgp_table_type_t *table_type, int *needs_review)
+{
+    char prefix_str[PREFIX_MAXLEN];
+    struct lookup_hmap_element *hmap_entry;
+    uint32_t lookup_hash;
+
+    prefix2str(&txn->prefix, prefix_str, sizeof(prefix_str));
+    if ((txn->request == TXN_BGP_UPD_ANNOUNCE) ||
+        (txn->request == TXN_BGP_UPD_WITHDRAW)) {
+        *table_type = ROUTE;
+        lookup_hash = get_lookup_key(prefix_str, ROUTE_TABLE);
+    } else {
+        *table_type = BGP_ROUTE;
+        lookup_hash = get_lookup_key(prefix_str, BGP_ROUTE_TABLE);
+    }
+    *needs_review = 0;
+
+    HMAP_FOR_EACH_IN_BUCKET (hmap_entry, node, lookup_hash, &global_hmap) {
+        if (!strcmp(hmap_entry->prefix, prefix_str) &&
+            (hmap_entry->table_type == *table_type)) {
+            if (hmap_entry->state != IN_FLIGHT) {
+                return false;
+            }
+
+            *op_type = hmap_entry->op_type;
+            *needs_review = hmap_entry->needs_review;
+            if (hmap_entry->op_type == INSERT) {
+                hmap_remove(&global_hmap, &(hmap_entry->node));
+                free(hmap_entry);
+            } else {
+                hmap_entry->state = DB_SYNC;
+                hmap_entry->needs_review = 0;
+            }
+            return true;
+        }
+    }
+    return false;
 }
 
 /*
@@ -1306,68 +1825,67 @@ bgp_txn_complete_processing(void)
     bgp_table_type_t table_type;
     int needs_review;
     enum txn_op_type op_type;
+    struct bgp_ovsdb_txn *next_txn;
+    bool found;
+
+    HMAP_FOR_EACH_SAFE (txn, next_txn, hmap_node, &bgp_ovsdb_txn_hmap) {
+        /* Requests of the open batch have not been committed yet */
+        if (!txn->batch->committed) {
+            continue;
+        }
 
-    HMAP_FOR_EACH (txn, hmap_node, &bgp_ovsdb_txn_hmap) {
         /* Get commit status for transaction */
-        status = ovsdb_idl_txn_commit(txn->txn);
+        status = bgp_txn_batch_status(txn->batch);
         prefix2str(&txn->prefix, prefix_str, sizeof(prefix_str));
 
         /* log transaction */
         bgp_txn_log(txn, status);
 
         /* Clean up an free txn on success */
-        if ((status == TXN_SUCCESS) || (status == TXN_UNCHANGED) ||
-            (status == TXN_ABORTED) || (status == TXN_ERROR)) {
-            if (status != TXN_SUCCESS) {
-                bgp_txn_log(txn, status);
+        if ((status == TXN_SUCCESS) || (status == TXN_UNCHANGED)) {
+            /* Identify table type and compute hash key based on request */
+            if ((txn->request == TXN_BGP_ADD) || (txn->request ==
+                       TXN_BGP_DEL) || (txn->request == TXN_BGP_UPD_ATTR)){
+                table_type = BGP_ROUTE;
+                lookup_hash = get_lookup_key(prefix_str, BGP_ROUTE_TABLE);
+            }
+            else if (txn->request == TXN_BGP_UPD_ANNOUNCE ||
+                         txn->request == TXN_BGP_UPD_WITHDRAW){
+                table_type = ROUTE;
+                lookup_hash = get_lookup_key(prefix_str, ROUTE_TABLE);
             }
 
-            if((status == TXN_SUCCESS) || (status == TXN_UNCHANGED))
-            {
-                /* Identify table type and compute hash key based on request */
-                if ((txn->request == TXN_BGP_ADD) || (txn->request ==
-                           TXN_BGP_DEL) || (txn->request == TXN_BGP_UPD_ATTR)){
-                    table_type = BGP_ROUTE;
-                    lookup_hash = get_lookup_key(prefix_str, BGP_ROUTE_TABLE);
-                }
-                else if (txn->request == TXN_BGP_UPD_ANNOUNCE ||
-                             txn->request == TXN_BGP_UPD_WITHDRAW){
-                    table_type = ROUTE;
-                    lookup_hash = get_lookup_key(prefix_str, ROUTE_TABLE);
-                }
-
-                /* Find node in global hash map, and update real UUID */
-                HMAP_FOR_EACH_IN_BUCKET (hmap_entry, node, lookup_hash,
-                                                        &global_hmap) {
-                    if (!strcmp(hmap_entry->prefix, prefix_str) &&
-                                        (table_type == hmap_entry->table_type)){
+            /* Find node in global hash map, and update real UUID */
+            HMAP_FOR_EACH_IN_BUCKET (hmap_entry, node, lookup_hash,
+                                                    &global_hmap) {
+                if (!strcmp(hmap_entry->prefix, prefix_str) &&
+                                    (table_type == hmap_entry->table_type)){
 
-                        table_type = hmap_entry->table_type;
-                        needs_review = hmap_entry->needs_review;
-                        op_type = hmap_entry->op_type;
+                    table_type = hmap_entry->table_type;
+                    needs_review = hmap_entry->needs_review;
+                    op_type = hmap_entry->op_type;
 
-                        /* If last operation was Delete, remove node from map*/
-                        if (hmap_entry->op_type == DELETE) {
-                            hmap_remove(&global_hmap, &(hmap_entry->node));
-                            free(hmap_entry);
-                        }
-                        /* If last operation was Insert/Update, hash
-                           node is updated */
-                        else {
-                            hmap_entry->state = DB_SYNC;
-                            hmap_entry->needs_review = 0;
-                            const struct uuid *db_uuid =
-                                ovsdb_idl_txn_get_insert_uuid(txn->txn,
-                                                             &(hmap_entry->uuid));
-                            if(db_uuid != NULL) {
-                                hmap_entry->uuid = *(db_uuid);
-                            }
+                    /* If last operation was Delete, remove node from map*/
+                    if (hmap_entry->op_type == DELETE) {
+                        hmap_remove(&global_hmap, &(hmap_entry->node));
+                        free(hmap_entry);
+                    }
+                    /* If last operation was Insert/Update, hash
+                       node is updated */
+                    else {
+                        hmap_entry->state = DB_SYNC;
+                        hmap_entry->needs_review = 0;
+                        const struct uuid *db_uuid =
+                            ovsdb_idl_txn_get_insert_uuid(txn->batch->txn,
+                                                         &(hmap_entry->uuid));
+                        if(db_uuid != NULL) {
+                            hmap_entry->uuid = *(db_uuid);
                         }
-                        if(needs_review == 1)
-                            bgp_review(txn, op_type, table_type);
-
-                        break;
                     }
+                    if(needs_review == 1)
+                        bgp_review(txn, op_type, table_type);
+
+                    break;
                 }
             }
             bgp_txn_free(txn);
@@ -1382,8 +1900,22 @@ bgp_txn_complete_processing(void)
         }
 
         /*
-         * Handle all error cases
+         * Handle all error cases. Nothing of the batch was written, so
+         * the prefix is reset to its state before the request and the
+         * request is published again.
          */
+        bgp_txn_log_failure(txn, status);
+        found = bgp_txn_reset_prefix(txn, &op_type, &table_type,
+                                     &needs_review);
+
+        if (txn->retries >= BGP_RIB_TXN_MAX_RETRIES) {
+            bgp_txn_batch_dropped_requests++;
+            VLOG_ERR("Route request %s dropped after %d retries as=%d "
+                     "prefix=%s", txn_bgp_request_str[txn->request],
+                     txn->retries, txn->as_no, prefix_str);
+            bgp_txn_free(txn);
+            continue;
+        }
 
         /* Get bgp pointer correspending to as_no */
         bgp = bgp_lookup(txn->as_no, NULL);
@@ -1393,17 +1925,25 @@ bgp_txn_complete_processing(void)
                      txn->as_no, prefix_str);
             continue;
         }
-        /* Search bgp route info linked list for txn->bgp_info */
-        if (!bgp_info_found(bgp, txn)) {
-            bgp_txn_free(txn);
-            VLOG_ERR("Route transaction bgp_info mismatch as=%d prefix=%s",
-                     txn->as_no, prefix_str);
-            continue;
-        }
 
-        /* In case the transaction is inconsistent with OVSDB,
-           don't add/update */
+        /* Requests published below inherit the retry count */
+        bgp_txn_retries = txn->retries + 1;
+        bgp_txn_batch_retried_requests++;
 
+        /* Search bgp route info linked list for txn->bgp_info. If the
+           prefix changed since the request, publish its current state,
+           knowing that the row is absent after a failed insert. In case
+           the transaction is inconsistent with OVSDB, don't add/update */
+        if (needs_review || !bgp_info_found(bgp, txn)) {
+            if (found) {
+                bgp_review(txn, (op_type == INSERT) ? DELETE : UPDATE,
+                           table_type);
+            } else {
+                VLOG_ERR("Route transaction bgp_info mismatch as=%d "
+                         "prefix=%s", txn->as_no, prefix_str);
+            }
+            bgp_txn_free(txn);
+        } else
         if ((txn->request == TXN_BGP_ADD) &&
             !bgp_txn_local_route_found(txn)) {
             /* add route in OVSDB route table */
@@ -1411,8 +1951,7 @@ bgp_txn_complete_processing(void)
                                           txn->bgp_info, bgp, txn->safi);
             bgp_txn_free(txn);
         } else
-        if ((txn->request == TXN_BGP_UPD_ANNOUNCE) &&
-            bgp_txn_route_found(txn)) {
+        if (txn->request == TXN_BGP_UPD_ANNOUNCE) {
             /* announce route in OVSDB route table */
             bgp_ovsdb_announce_rib_entry(&txn->prefix,
                                          txn->bgp_info, bgp, txn->safi);
@@ -1446,6 +1985,7 @@ bgp_txn_complete_processing(void)
                      txn->as_no, prefix_str);
             bgp_txn_free(txn);
         }
+        bgp_txn_retries = 0;
     }
 }
 
@@ -1906,6 +2446,9 @@ policy_rt_map_apply_changes (struct route_map *map,
         return CMD_SUCCESS;
     }
 
+    /* Recompile the matches of the changed route map on its next apply */
+    route_map_compiled_flush(map);
+
     if (argc1 == RT_MAP_DESCRIPTION) {
         if (index->description)
             XFREE (MTYPE_TMP, index->description);
@@ -39,6 +39,20 @@
 #define PREFIX_MAXLEN            50
 #define MAX_KEY_LEN              60
 
+/*
+ * Default maximum number of route requests published in one OVSDB
+ * transaction, and default interval after which a partially filled
+ * transaction batch is committed.
+ */
+#define BGP_RIB_TXN_BATCH_SIZE_DEFAULT          500
+#define BGP_RIB_TXN_BATCH_FLUSH_MSEC_DEFAULT    100
+
+/*
+ * Number of times a route request is published again after its
+ * transaction batch failed, before the request is given up.
+ */
+#define BGP_RIB_TXN_MAX_RETRIES                 3
+
 struct bgp_info;
 struct prefix;
 struct bgp;
@@ -187,6 +201,21 @@ bgp_ovsdb_republish_route(const struct ovsrec_bgp_router *bgp_first, int asn);
 extern void
 bgp_txn_complete_processing(void);
 
+extern void
+bgp_ovsdb_nexthop_hmap_apply_changes(struct ovsdb_idl *idl);
+
+extern enum ovsdb_idl_txn_status
+bgp_txn_batch_flush(void);
+
+extern void
+bgp_txn_batch_set_params(int batch_size, int flush_msec);
+
+extern void
+bgp_txn_batch_dump(struct ds *ds);
+
+extern void
+bgp_txn_batch_fail(int n_batches, enum ovsdb_idl_txn_status status);
+
 extern int policy_prefix_list_read_ovsdb_apply_changes(struct ovsdb_idl *idl);
 extern int policy_community_filter_read_ovsdb_apply_changes(struct ovsdb_idl *idl);
 extern int policy_rt_map_read_ovsdb_apply_changes (struct ovsdb_idl *idl);
@@ -47,6 +47,7 @@ Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
 #include "bgpd/bgp_network.h"
 #include "bgpd/bgp_mplsvpn.h"
 #include "bgpd/bgp_advertise.h"
+#include "bgpd/bgp_updgrp.h"
 #include "bgpd/bgp_vty.h"
 
 int stream_put_prefix (struct stream *, struct prefix *);
@@ -200,11 +201,12 @@ bgp_update_packet (struct peer *peer, afi_t afi, safi_t safi)
 	   */
 	  mpattr_pos = stream_get_endp(s);
 
-	  /* 5: Encode all the attributes, except MP_REACH_NLRI attr. */
-	  total_attr_len = bgp_packet_attribute (NULL, peer, s,
-	                                         adv->baa->attr,
-	                                         NULL, afi, safi,
-	                                         from, NULL, NULL);
+	  /* 5: Encode all the attributes, except MP_REACH_NLRI attr.  The
+	   * encoding is shared with the peers of the update group.
+	   */
+	  total_attr_len = bgp_updgrp_packet_attribute (peer, s,
+	                                                adv->baa->attr,
+	                                                afi, safi, from);
 	}
 
       if (afi == AFI_IP && safi == SAFI_UNICAST)
@@ -766,7 +768,7 @@ bgp_write (struct thread *thread)
 	}
 
 #ifdef ENABLE_OVSDB
-        bgp_daemon_ovsdb_neighbor_statistics_update(true, NULL, peer);
+        bgp_daemon_ovsdb_neighbor_statistics_changed(peer);
 #endif // ENABLE_OVSDB
 
       /* OK we send packet so delete it. */
@@ -1941,7 +1943,7 @@ bgp_update_receive (struct peer *peer, bgp_size_t size)
   bgp_timer_set (peer);
 
 #ifdef ENABLE_OVSDB
-  bgp_daemon_ovsdb_neighbor_statistics_update(true, NULL, peer);
+  bgp_daemon_ovsdb_neighbor_statistics_changed(peer);
 #endif // ENABLE_OVSDB
 
   return 0;
@@ -2019,7 +2021,7 @@ bgp_notify_receive (struct peer *peer, bgp_size_t size)
     UNSET_FLAG (peer->sflags, PEER_STATUS_CAPABILITY_OPEN);
 
 #ifdef ENABLE_OVSDB
-  bgp_daemon_ovsdb_neighbor_statistics_update(true, NULL, peer);
+  bgp_daemon_ovsdb_neighbor_statistics_changed(peer);
 #endif // ENABLE_OVSDB
 
   BGP_EVENT_ADD (peer, Receive_NOTIFICATION_message);
@@ -2630,7 +2632,7 @@ bgp_read (struct thread *thread)
     }
 
 #ifdef ENABLE_OVSDB
-    bgp_daemon_ovsdb_neighbor_statistics_update(true, NULL, peer);
+    bgp_daemon_ovsdb_neighbor_statistics_changed(peer);
 #endif // ENABLE_OVSDB
 
   /* Clear input buffer. */
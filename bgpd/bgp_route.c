@@ -56,6 +56,7 @@ Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
 #include "bgpd/bgp_zebra.h"
 #include "bgpd/bgp_vty.h"
 #include "bgpd/bgp_mpath.h"
+#include "bgpd/bgp_updgrp.h"
 #include "bgpd/bgp_ovsdb_route.h"
 #include "openvswitch/vlog.h"
 /* Extern from bgp_dump.c */
@@ -801,23 +802,14 @@ bgp_import_modifier (struct peer *rsclient, struct peer *peer,
   return RMAP_PERMIT;
 }
 
+/* Checks of bgp_announce_check which depend on the peer itself rather
+   than on its update group. */
 static int
-bgp_announce_check (struct bgp_info *ri, struct peer *peer, struct prefix *p,
-		    struct attr *attr, afi_t afi, safi_t safi)
+bgp_announce_check_peer (struct bgp_info *ri, struct peer *peer,
+                         struct prefix *p, struct attr *riattr,
+                         afi_t afi, safi_t safi)
 {
-  int ret;
   char buf[SU_ADDRSTRLEN];
-  struct bgp_filter *filter;
-  struct peer *from;
-  struct bgp *bgp;
-  int transparent;
-  int reflect;
-  struct attr *riattr;
-
-  from = ri->peer;
-  filter = &peer->filter[afi][safi];
-  bgp = peer->bgp;
-  riattr = bgp_info_mpath_count (ri) ? bgp_info_mpath_attr (ri) : ri->attr;
 
   if (DISABLE_BGP_ANNOUNCE)
     return 0;
@@ -827,14 +819,9 @@ bgp_announce_check (struct bgp_info *ri, struct peer *peer, struct prefix *p,
     return 0;
 
   /* Do not send back route to sender. */
-  if (from == peer)
+  if (ri->peer == peer)
     return 0;
 
-  /* Aggregate-address suppress check. */
-  if (ri->extra && ri->extra->suppress)
-    if (! UNSUPPRESS_MAP_NAME (filter))
-      return 0;
-
   /* Default route check.  */
   if (CHECK_FLAG (peer->af_sflags[afi][safi], PEER_STATUS_DEFAULT_ORIGINATE))
     {
@@ -846,17 +833,6 @@ bgp_announce_check (struct bgp_info *ri, struct peer *peer, struct prefix *p,
 #endif /* HAVE_IPV6 */
     }
 
-  /* Transparency check. */
-  if (CHECK_FLAG (peer->af_flags[afi][safi], PEER_FLAG_RSERVER_CLIENT)
-      && CHECK_FLAG (from->af_flags[afi][safi], PEER_FLAG_RSERVER_CLIENT))
-    transparent = 1;
-  else
-    transparent = 0;
-
-  /* If community is not disabled check the no-export and local. */
-  if (! transparent && bgp_community_filter (peer, riattr))
-    return 0;
-
   /* If the attribute has originator-id and it is same as remote
      peer's id. */
   if (riattr->flag & ATTR_FLAG_BIT (BGP_ATTR_ORIGINATOR_ID))
@@ -883,6 +859,45 @@ bgp_announce_check (struct bgp_info *ri, struct peer *peer, struct prefix *p,
           return 0;
       }
 
+  return 1;
+}
+
+/* Checks and attribute changes of bgp_announce_check which are the same
+   for all the members of the update group of the peer. */
+static int
+bgp_announce_check_group (struct bgp_info *ri, struct peer *peer,
+                          struct prefix *p, struct attr *attr,
+                          afi_t afi, safi_t safi)
+{
+  char buf[SU_ADDRSTRLEN];
+  struct bgp_filter *filter;
+  struct peer *from;
+  struct bgp *bgp;
+  int transparent;
+  int reflect;
+  struct attr *riattr;
+
+  from = ri->peer;
+  filter = &peer->filter[afi][safi];
+  bgp = peer->bgp;
+  riattr = bgp_info_mpath_count (ri) ? bgp_info_mpath_attr (ri) : ri->attr;
+
+  /* Aggregate-address suppress check. */
+  if (ri->extra && ri->extra->suppress)
+    if (! UNSUPPRESS_MAP_NAME (filter))
+      return 0;
+
+  /* Transparency check. */
+  if (CHECK_FLAG (peer->af_flags[afi][safi], PEER_FLAG_RSERVER_CLIENT)
+      && CHECK_FLAG (from->af_flags[afi][safi], PEER_FLAG_RSERVER_CLIENT))
+    transparent = 1;
+  else
+    transparent = 0;
+
+  /* If community is not disabled check the no-export and local. */
+  if (! transparent && bgp_community_filter (peer, riattr))
+    return 0;
+
   /* Output filter check. */
   if (bgp_output_filter (peer, p, riattr, afi, safi) == FILTER_DENY)
     {
@@ -1072,6 +1087,23 @@ bgp_announce_check (struct bgp_info *ri, struct peer *peer, struct prefix *p,
       && aspath_private_as_check (attr->aspath))
     attr->aspath = aspath_empty_get ();
 
+  return 1;
+}
+
+/* Outbound route-map or unsuppress-map of bgp_announce_check, applied
+   to each peer as they may match or set the address of the peer. */
+static int
+bgp_announce_check_rmap (struct bgp_info *ri, struct peer *peer,
+                         struct prefix *p, struct attr *attr,
+                         afi_t afi, safi_t safi)
+{
+  int ret;
+  struct bgp_filter *filter;
+  struct peer *from;
+
+  from = ri->peer;
+  filter = &peer->filter[afi][safi];
+
   /* Route map & unsuppress-map apply. */
   if (ROUTE_MAP_OUT_NAME (filter)
       || (ri->extra && ri->extra->suppress) )
@@ -1112,6 +1144,78 @@ bgp_announce_check (struct bgp_info *ri, struct peer *peer, struct prefix *p,
   return 1;
 }
 
+static int
+bgp_announce_check (struct bgp_info *ri, struct peer *peer, struct prefix *p,
+		    struct attr *attr, afi_t afi, safi_t safi)
+{
+  struct attr *riattr;
+
+  riattr = bgp_info_mpath_count (ri) ? bgp_info_mpath_attr (ri) : ri->attr;
+
+  if (! bgp_announce_check_peer (ri, peer, p, riattr, afi, safi))
+    return 0;
+
+  if (! bgp_announce_check_group (ri, peer, p, attr, afi, safi))
+    return 0;
+
+  return bgp_announce_check_rmap (ri, peer, p, attr, afi, safi);
+}
+
+/* bgp_announce_check of the route processing pass of bgp_process_main,
+   which shares the checks and attributes of the update group of the peer
+   with the other members. */
+static int
+bgp_announce_check_updgrp (struct bgp_info *ri, struct peer *peer,
+                           struct prefix *p, struct attr *attr,
+                           afi_t afi, safi_t safi)
+{
+  struct update_group *group;
+  struct attr *riattr;
+  unsigned long pass;
+
+  riattr = bgp_info_mpath_count (ri) ? bgp_info_mpath_attr (ri) : ri->attr;
+
+  if (! bgp_announce_check_peer (ri, peer, p, riattr, afi, safi))
+    return 0;
+
+  group = bgp_updgrp_get (peer, afi, safi);
+  if (! group)
+    return (bgp_announce_check_group (ri, peer, p, attr, afi, safi)
+            && bgp_announce_check_rmap (ri, peer, p, attr, afi, safi));
+
+  pass = bgp_updgrp_pass_current ();
+  if (group->pass != pass || group->ri != ri)
+    {
+      group->pass = pass;
+      group->ri = ri;
+      if (group->aspath)
+        aspath_unintern (&group->aspath);
+
+      group->announce = bgp_announce_check_group (ri, peer, p, &group->attr,
+                                                  afi, safi);
+
+      /* The AS path made by the checks, such as the one without the
+         private ASes, is interned for the members to share it. */
+      if (group->announce
+          && group->attr.aspath && ! group->attr.aspath->refcnt)
+        {
+          group->aspath = aspath_intern (group->attr.aspath);
+          group->attr.aspath = group->aspath;
+        }
+
+      group->policy_computed++;
+    }
+  else
+    group->policy_reused++;
+
+  if (! group->announce)
+    return 0;
+
+  bgp_attr_dup (attr, &group->attr);
+
+  return bgp_announce_check_rmap (ri, peer, p, attr, afi, safi);
+}
+
 static int
 bgp_announce_check_rsclient (struct bgp_info *ri, struct peer *rsclient,
         struct prefix *p, struct attr *attr, afi_t afi, safi_t safi)
@@ -1478,7 +1582,8 @@ bgp_process_announce_selected (struct peer *peer, struct bgp_info *selected,
       case BGP_TABLE_MAIN:
       /* Announcement to peer->conf.  If the route is filtered,
          withdraw it. */
-        if (selected && bgp_announce_check (selected, peer, p, &attr, afi, safi))
+        if (selected
+            && bgp_announce_check_updgrp (selected, peer, p, &attr, afi, safi))
           bgp_adj_out_set (rn, peer, p, &attr, afi, safi, selected);
         else
           bgp_adj_out_unset (rn, peer, p, afi, safi);
@@ -1614,7 +1719,9 @@ bgp_process_main (struct work_queue *wq, void *data)
       UNSET_FLAG (new_select->flags, BGP_INFO_MULTIPATH_CHG);
     }
 
-  /* Check each BGP peer. */
+  /* Check each BGP peer, sharing the outbound policy of the new route
+     between the peers of an update group. */
+  bgp_updgrp_pass_next ();
   for (ALL_LIST_ELEMENTS (bgp->peer, node, nnode, peer))
     {
       bgp_process_announce_selected (peer, new_select, rn, afi, safi);
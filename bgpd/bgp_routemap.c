@@ -219,15 +219,16 @@ struct route_map_rule_cmd route_match_peer_cmd =
 /* Match function should return 1 if match is success else return
    zero. */
 static route_map_result_t
-route_match_ip_address (void *rule, struct prefix *prefix, 
-			route_map_object_t type, void *object)
+route_match_ip_address_resolved (void *resolved, void *rule,
+				 struct prefix *prefix,
+				 route_map_object_t type, void *object)
 {
   struct access_list *alist;
   /* struct prefix_ipv4 match; */
 
   if (type == RMAP_BGP)
     {
-      alist = access_list_lookup (AFI_IP, (char *) rule);
+      alist = resolved;
       if (alist == NULL)
 	return RMAP_NOMATCH;
     
@@ -237,6 +238,23 @@ route_match_ip_address (void *rule, struct prefix *prefix,
   return RMAP_NOMATCH;
 }
 
+/* Look up the list once for compiled route maps. */
+static void *
+route_match_ip_address_resolve (void *rule)
+{
+  return access_list_lookup (AFI_IP, (char *) rule);
+}
+
+static route_map_result_t
+route_match_ip_address (void *rule, struct prefix *prefix,
+			route_map_object_t type, void *object)
+{
+  void *resolved = route_match_ip_address_resolve (rule);
+
+  return route_match_ip_address_resolved (resolved, rule, prefix, type,
+					  object);
+}
+
 /* Route map `ip address' match statement.  `arg' should be
    access-list name. */
 static void *
@@ -258,15 +276,19 @@ struct route_map_rule_cmd route_match_ip_address_cmd =
   "ip address",
   route_match_ip_address,
   route_match_ip_address_compile,
-  route_match_ip_address_free
+  route_match_ip_address_free,
+  route_match_ip_address_resolve,
+  route_match_ip_address_resolved,
+  RMAP_COST_LIST
 };
 
 /* `match ip next-hop IP_ADDRESS' */
 
 /* Match function return 1 if match is success else return zero. */
 static route_map_result_t
-route_match_ip_next_hop (void *rule, struct prefix *prefix, 
-			 route_map_object_t type, void *object)
+route_match_ip_next_hop_resolved (void *resolved, void *rule,
+				  struct prefix *prefix,
+				  route_map_object_t type, void *object)
 {
   struct access_list *alist;
   struct bgp_info *bgp_info;
@@ -279,7 +301,7 @@ route_match_ip_next_hop (void *rule, struct prefix *prefix,
       p.prefix = bgp_info->attr->nexthop;
       p.prefixlen = IPV4_MAX_BITLEN;
 
-      alist = access_list_lookup (AFI_IP, (char *) rule);
+      alist = resolved;
       if (alist == NULL)
 	return RMAP_NOMATCH;
 
@@ -289,6 +311,23 @@ route_match_ip_next_hop (void *rule, struct prefix *prefix,
   return RMAP_NOMATCH;
 }
 
+/* Look up the list once for compiled route maps. */
+static void *
+route_match_ip_next_hop_resolve (void *rule)
+{
+  return access_list_lookup (AFI_IP, (char *) rule);
+}
+
+static route_map_result_t
+route_match_ip_next_hop (void *rule, struct prefix *prefix,
+			 route_map_object_t type, void *object)
+{
+  void *resolved = route_match_ip_next_hop_resolve (rule);
+
+  return route_match_ip_next_hop_resolved (resolved, rule, prefix, type,
+					   object);
+}
+
 /* Route map `ip next-hop' match statement. `arg' is
    access-list name. */
 static void *
@@ -310,15 +349,19 @@ struct route_map_rule_cmd route_match_ip_next_hop_cmd =
   "ip next-hop",
   route_match_ip_next_hop,
   route_match_ip_next_hop_compile,
-  route_match_ip_next_hop_free
+  route_match_ip_next_hop_free,
+  route_match_ip_next_hop_resolve,
+  route_match_ip_next_hop_resolved,
+  RMAP_COST_LIST
 };
 
 /* `match ip route-source ACCESS-LIST' */
 
 /* Match function return 1 if match is success else return zero. */
 static route_map_result_t
-route_match_ip_route_source (void *rule, struct prefix *prefix, 
-			     route_map_object_t type, void *object)
+route_match_ip_route_source_resolved (void *resolved, void *rule,
+				      struct prefix *prefix,
+				      route_map_object_t type, void *object)
 {
   struct access_list *alist;
   struct bgp_info *bgp_info;
@@ -337,7 +380,7 @@ route_match_ip_route_source (void *rule, struct prefix *prefix,
       p.prefix = peer->su.sin.sin_addr;
       p.prefixlen = IPV4_MAX_BITLEN;
 
-      alist = access_list_lookup (AFI_IP, (char *) rule);
+      alist = resolved;
       if (alist == NULL)
 	return RMAP_NOMATCH;
 
@@ -347,6 +390,23 @@ route_match_ip_route_source (void *rule, struct prefix *prefix,
   return RMAP_NOMATCH;
 }
 
+/* Look up the list once for compiled route maps. */
+static void *
+route_match_ip_route_source_resolve (void *rule)
+{
+  return access_list_lookup (AFI_IP, (char *) rule);
+}
+
+static route_map_result_t
+route_match_ip_route_source (void *rule, struct prefix *prefix,
+			     route_map_object_t type, void *object)
+{
+  void *resolved = route_match_ip_route_source_resolve (rule);
+
+  return route_match_ip_route_source_resolved (resolved, rule, prefix, type,
+					       object);
+}
+
 /* Route map `ip route-source' match statement. `arg' is
    access-list name. */
 static void *
@@ -368,20 +428,25 @@ struct route_map_rule_cmd route_match_ip_route_source_cmd =
   "ip route-source",
   route_match_ip_route_source,
   route_match_ip_route_source_compile,
-  route_match_ip_route_source_free
+  route_match_ip_route_source_free,
+  route_match_ip_route_source_resolve,
+  route_match_ip_route_source_resolved,
+  RMAP_COST_LIST
 };
 
 /* `match ip address prefix-list PREFIX_LIST' */
 
 static route_map_result_t
-route_match_ip_address_prefix_list (void *rule, struct prefix *prefix, 
-				    route_map_object_t type, void *object)
+route_match_ip_address_prefix_list_resolved (void *resolved, void *rule,
+					     struct prefix *prefix,
+					     route_map_object_t type,
+					     void *object)
 {
   struct prefix_list *plist;
 
   if (type == RMAP_BGP)
     {
-      plist = prefix_list_lookup (AFI_IP, (char *) rule);
+      plist = resolved;
       if (plist == NULL)
 	return RMAP_NOMATCH;
     
@@ -391,6 +456,23 @@ route_match_ip_address_prefix_list (void *rule, struct prefix *prefix,
   return RMAP_NOMATCH;
 }
 
+/* Look up the list once for compiled route maps. */
+static void *
+route_match_ip_address_prefix_list_resolve (void *rule)
+{
+  return prefix_list_lookup (AFI_IP, (char *) rule);
+}
+
+static route_map_result_t
+route_match_ip_address_prefix_list (void *rule, struct prefix *prefix,
+				    route_map_object_t type, void *object)
+{
+  void *resolved = route_match_ip_address_prefix_list_resolve (rule);
+
+  return route_match_ip_address_prefix_list_resolved (resolved, rule, prefix,
+						      type, object);
+}
+
 static void *
 route_match_ip_address_prefix_list_compile (const char *arg)
 {
@@ -408,14 +490,19 @@ struct route_map_rule_cmd route_match_ip_address_prefix_list_cmd =
   "ip address prefix-list",
   route_match_ip_address_prefix_list,
   route_match_ip_address_prefix_list_compile,
-  route_match_ip_address_prefix_list_free
+  route_match_ip_address_prefix_list_free,
+  route_match_ip_address_prefix_list_resolve,
+  route_match_ip_address_prefix_list_resolved,
+  RMAP_COST_LIST
 };
 
 /* `match ip next-hop prefix-list PREFIX_LIST' */
 
 static route_map_result_t
-route_match_ip_next_hop_prefix_list (void *rule, struct prefix *prefix,
-                                    route_map_object_t type, void *object)
+route_match_ip_next_hop_prefix_list_resolved (void *resolved, void *rule,
+					      struct prefix *prefix,
+					      route_map_object_t type,
+					      void *object)
 {
   struct prefix_list *plist;
   struct bgp_info *bgp_info;
@@ -428,7 +515,7 @@ route_match_ip_next_hop_prefix_list (void *rule, struct prefix *prefix,
       p.prefix = bgp_info->attr->nexthop;
       p.prefixlen = IPV4_MAX_BITLEN;
 
-      plist = prefix_list_lookup (AFI_IP, (char *) rule);
+      plist = resolved;
       if (plist == NULL)
         return RMAP_NOMATCH;
 
@@ -438,6 +525,23 @@ route_match_ip_next_hop_prefix_list (void *rule, struct prefix *prefix,
   return RMAP_NOMATCH;
 }
 
+/* Look up the list once for compiled route maps. */
+static void *
+route_match_ip_next_hop_prefix_list_resolve (void *rule)
+{
+  return prefix_list_lookup (AFI_IP, (char *) rule);
+}
+
+static route_map_result_t
+route_match_ip_next_hop_prefix_list (void *rule, struct prefix *prefix,
+				     route_map_object_t type, void *object)
+{
+  void *resolved = route_match_ip_next_hop_prefix_list_resolve (rule);
+
+  return route_match_ip_next_hop_prefix_list_resolved (resolved, rule, prefix,
+						       type, object);
+}
+
 static void *
 route_match_ip_next_hop_prefix_list_compile (const char *arg)
 {
@@ -455,14 +559,19 @@ struct route_map_rule_cmd route_match_ip_next_hop_prefix_list_cmd =
   "ip next-hop prefix-list",
   route_match_ip_next_hop_prefix_list,
   route_match_ip_next_hop_prefix_list_compile,
-  route_match_ip_next_hop_prefix_list_free
+  route_match_ip_next_hop_prefix_list_free,
+  route_match_ip_next_hop_prefix_list_resolve,
+  route_match_ip_next_hop_prefix_list_resolved,
+  RMAP_COST_LIST
 };
 
 /* `match ip route-source prefix-list PREFIX_LIST' */
 
 static route_map_result_t
-route_match_ip_route_source_prefix_list (void *rule, struct prefix *prefix,
-					 route_map_object_t type, void *object)
+route_match_ip_route_source_prefix_list_resolved (void *resolved, void *rule,
+						  struct prefix *prefix,
+						  route_map_object_t type,
+						  void *object)
 {
   struct prefix_list *plist;
   struct bgp_info *bgp_info;
@@ -481,7 +590,7 @@ route_match_ip_route_source_prefix_list (void *rule, struct prefix *prefix,
       p.prefix = peer->su.sin.sin_addr;
       p.prefixlen = IPV4_MAX_BITLEN;
 
-      plist = prefix_list_lookup (AFI_IP, (char *) rule);
+      plist = resolved;
       if (plist == NULL)
         return RMAP_NOMATCH;
 
@@ -491,6 +600,24 @@ route_match_ip_route_source_prefix_list (void *rule, struct prefix *prefix,
   return RMAP_NOMATCH;
 }
 
+/* Look up the list once for compiled route maps. */
+static void *
+route_match_ip_route_source_prefix_list_resolve (void *rule)
+{
+  return prefix_list_lookup (AFI_IP, (char *) rule);
+}
+
+static route_map_result_t
+route_match_ip_route_source_prefix_list (void *rule, struct prefix *prefix,
+					 route_map_object_t type, void *object)
+{
+  void *resolved = route_match_ip_route_source_prefix_list_resolve (rule);
+
+  return route_match_ip_route_source_prefix_list_resolved (resolved, rule,
+							   prefix, type,
+							   object);
+}
+
 static void *
 route_match_ip_route_source_prefix_list_compile (const char *arg)
 {
@@ -508,7 +635,10 @@ struct route_map_rule_cmd route_match_ip_route_source_prefix_list_cmd =
   "ip route-source prefix-list",
   route_match_ip_route_source_prefix_list,
   route_match_ip_route_source_prefix_list_compile,
-  route_match_ip_route_source_prefix_list_free
+  route_match_ip_route_source_prefix_list_free,
+  route_match_ip_route_source_prefix_list_resolve,
+  route_match_ip_route_source_prefix_list_resolved,
+  RMAP_COST_LIST
 };
 
 /* `match metric METRIC' */
@@ -580,8 +710,8 @@ struct route_map_rule_cmd route_match_metric_cmd =
 
 /* Match function for as-path match.  I assume given object is */
 static route_map_result_t
-route_match_aspath (void *rule, struct prefix *prefix, 
-		    route_map_object_t type, void *object)
+route_match_aspath_resolved (void *resolved, void *rule, struct prefix *prefix,
+			     route_map_object_t type, void *object)
 {
   
   struct as_list *as_list;
@@ -589,7 +719,7 @@ route_match_aspath (void *rule, struct prefix *prefix,
 
   if (type == RMAP_BGP)
     {
-      as_list = as_list_lookup ((char *) rule);
+      as_list = resolved;
       if (as_list == NULL)
 	return RMAP_NOMATCH;
     
@@ -601,6 +731,22 @@ route_match_aspath (void *rule, struct prefix *prefix,
   return RMAP_NOMATCH;
 }
 
+/* Look up the list once for compiled route maps. */
+static void *
+route_match_aspath_resolve (void *rule)
+{
+  return as_list_lookup ((char *) rule);
+}
+
+static route_map_result_t
+route_match_aspath (void *rule, struct prefix *prefix,
+		    route_map_object_t type, void *object)
+{
+  void *resolved = route_match_aspath_resolve (rule);
+
+  return route_match_aspath_resolved (resolved, rule, prefix, type, object);
+}
+
 /* Compile function for as-path match. */
 static void *
 route_match_aspath_compile (const char *arg)
@@ -621,7 +767,10 @@ struct route_map_rule_cmd route_match_aspath_cmd =
   "as-path",
   route_match_aspath,
   route_match_aspath_compile,
-  route_match_aspath_free
+  route_match_aspath_free,
+  route_match_aspath_resolve,
+  route_match_aspath_resolved,
+  RMAP_COST_REGEX
 };
 
 /* `match community COMMUNIY' */
@@ -633,8 +782,9 @@ struct rmap_community
 
 /* Match function for community match. */
 static route_map_result_t
-route_match_community (void *rule, struct prefix *prefix, 
-		       route_map_object_t type, void *object)
+route_match_community_resolved (void *resolved, void *rule,
+				struct prefix *prefix, route_map_object_t type,
+				void *object)
 {
   struct community_list *list;
   struct bgp_info *bgp_info;
@@ -645,7 +795,7 @@ route_match_community (void *rule, struct prefix *prefix,
       bgp_info = object;
       rcom = rule;
 
-      list = community_list_lookup (bgp_clist, rcom->name, COMMUNITY_LIST_MASTER);
+      list = resolved;
       if (! list)
 	return RMAP_NOMATCH;
 
@@ -663,6 +813,24 @@ route_match_community (void *rule, struct prefix *prefix,
   return RMAP_NOMATCH;
 }
 
+/* Look up the list once for compiled route maps. */
+static void *
+route_match_community_resolve (void *rule)
+{
+  struct rmap_community *rcom = rule;
+
+  return community_list_lookup (bgp_clist, rcom->name, COMMUNITY_LIST_MASTER);
+}
+
+static route_map_result_t
+route_match_community (void *rule, struct prefix *prefix,
+		       route_map_object_t type, void *object)
+{
+  void *resolved = route_match_community_resolve (rule);
+
+  return route_match_community_resolved (resolved, rule, prefix, type, object);
+}
+
 /* Compile function for community match. */
 static void *
 route_match_community_compile (const char *arg)
@@ -705,13 +873,17 @@ struct route_map_rule_cmd route_match_community_cmd =
   "community",
   route_match_community,
   route_match_community_compile,
-  route_match_community_free
+  route_match_community_free,
+  route_match_community_resolve,
+  route_match_community_resolved,
+  RMAP_COST_LIST
 };
 
 /* Match function for extcommunity match. */
 static route_map_result_t
-route_match_ecommunity (void *rule, struct prefix *prefix, 
-			route_map_object_t type, void *object)
+route_match_ecommunity_resolved (void *resolved, void *rule,
+				 struct prefix *prefix,
+				 route_map_object_t type, void *object)
 {
   struct community_list *list;
   struct bgp_info *bgp_info;
@@ -723,8 +895,7 @@ route_match_ecommunity (void *rule, struct prefix *prefix,
       if (!bgp_info->attr->extra)
         return RMAP_NOMATCH;
       
-      list = community_list_lookup (bgp_clist, (char *) rule,
-				    EXTCOMMUNITY_LIST_MASTER);
+      list = resolved;
       if (! list)
 	return RMAP_NOMATCH;
 
@@ -734,6 +905,24 @@ route_match_ecommunity (void *rule, struct prefix *prefix,
   return RMAP_NOMATCH;
 }
 
+/* Look up the list once for compiled route maps. */
+static void *
+route_match_ecommunity_resolve (void *rule)
+{
+  return community_list_lookup (bgp_clist, (char *) rule,
+				EXTCOMMUNITY_LIST_MASTER);
+}
+
+static route_map_result_t
+route_match_ecommunity (void *rule, struct prefix *prefix,
+			route_map_object_t type, void *object)
+{
+  void *resolved = route_match_ecommunity_resolve (rule);
+
+  return route_match_ecommunity_resolved (resolved, rule, prefix, type,
+					  object);
+}
+
 /* Compile function for extcommunity match. */
 static void *
 route_match_ecommunity_compile (const char *arg)
@@ -754,7 +943,10 @@ struct route_map_rule_cmd route_match_ecommunity_cmd =
   "extcommunity",
   route_match_ecommunity,
   route_match_ecommunity_compile,
-  route_match_ecommunity_free
+  route_match_ecommunity_free,
+  route_match_ecommunity_resolve,
+  route_match_ecommunity_resolved,
+  RMAP_COST_LIST
 };
 
 /* `match nlri` and `set nlri` are replaced by `address-family ipv4`
@@ -1784,14 +1976,15 @@ struct route_map_rule_cmd route_set_aggregator_as_cmd =
 /* `match ipv6 address IP_ACCESS_LIST' */
 
 static route_map_result_t
-route_match_ipv6_address (void *rule, struct prefix *prefix, 
-			  route_map_object_t type, void *object)
+route_match_ipv6_address_resolved (void *resolved, void *rule,
+				   struct prefix *prefix,
+				   route_map_object_t type, void *object)
 {
   struct access_list *alist;
 
   if (type == RMAP_BGP)
     {
-      alist = access_list_lookup (AFI_IP6, (char *) rule);
+      alist = resolved;
       if (alist == NULL)
 	return RMAP_NOMATCH;
     
@@ -1801,6 +1994,23 @@ route_match_ipv6_address (void *rule, struct prefix *prefix,
   return RMAP_NOMATCH;
 }
 
+/* Look up the list once for compiled route maps. */
+static void *
+route_match_ipv6_address_resolve (void *rule)
+{
+  return access_list_lookup (AFI_IP6, (char *) rule);
+}
+
+static route_map_result_t
+route_match_ipv6_address (void *rule, struct prefix *prefix,
+			  route_map_object_t type, void *object)
+{
+  void *resolved = route_match_ipv6_address_resolve (rule);
+
+  return route_match_ipv6_address_resolved (resolved, rule, prefix, type,
+					    object);
+}
+
 static void *
 route_match_ipv6_address_compile (const char *arg)
 {
@@ -1819,7 +2029,10 @@ struct route_map_rule_cmd route_match_ipv6_address_cmd =
   "ipv6 address",
   route_match_ipv6_address,
   route_match_ipv6_address_compile,
-  route_match_ipv6_address_free
+  route_match_ipv6_address_free,
+  route_match_ipv6_address_resolve,
+  route_match_ipv6_address_resolved,
+  RMAP_COST_LIST
 };
 
 /* `match ipv6 next-hop IP_ADDRESS' */
@@ -1886,14 +2099,16 @@ struct route_map_rule_cmd route_match_ipv6_next_hop_cmd =
 /* `match ipv6 address prefix-list PREFIX_LIST' */
 
 static route_map_result_t
-route_match_ipv6_address_prefix_list (void *rule, struct prefix *prefix, 
-			      route_map_object_t type, void *object)
+route_match_ipv6_address_prefix_list_resolved (void *resolved, void *rule,
+					       struct prefix *prefix,
+					       route_map_object_t type,
+					       void *object)
 {
   struct prefix_list *plist;
 
   if (type == RMAP_BGP)
     {
-      plist = prefix_list_lookup (AFI_IP6, (char *) rule);
+      plist = resolved;
       if (plist == NULL)
 	return RMAP_NOMATCH;
     
@@ -1903,6 +2118,23 @@ route_match_ipv6_address_prefix_list (void *rule, struct prefix *prefix,
   return RMAP_NOMATCH;
 }
 
+/* Look up the list once for compiled route maps. */
+static void *
+route_match_ipv6_address_prefix_list_resolve (void *rule)
+{
+  return prefix_list_lookup (AFI_IP6, (char *) rule);
+}
+
+static route_map_result_t
+route_match_ipv6_address_prefix_list (void *rule, struct prefix *prefix,
+				      route_map_object_t type, void *object)
+{
+  void *resolved = route_match_ipv6_address_prefix_list_resolve (rule);
+
+  return route_match_ipv6_address_prefix_list_resolved (resolved, rule, prefix,
+							type, object);
+}
+
 static void *
 route_match_ipv6_address_prefix_list_compile (const char *arg)
 {
@@ -1920,7 +2152,10 @@ struct route_map_rule_cmd route_match_ipv6_address_prefix_list_cmd =
   "ipv6 address prefix-list",
   route_match_ipv6_address_prefix_list,
   route_match_ipv6_address_prefix_list_compile,
-  route_match_ipv6_address_prefix_list_free
+  route_match_ipv6_address_prefix_list_free,
+  route_match_ipv6_address_prefix_list_resolve,
+  route_match_ipv6_address_prefix_list_resolved,
+  RMAP_COST_LIST
 };
 
 /* `set ipv6 nexthop global IP_ADDRESS' */
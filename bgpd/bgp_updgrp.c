@@ -0,0 +1,401 @@
+/* BGP update groups
+ * (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+ *
+ * This file is part of Quagga
+ *
+ * Quagga is free software; you can redistribute it and/or modify it
+ * under the terms of the GNU General Public License as published by the
+ * Free Software Foundation; either version 2, or (at your option) any
+ * later version.
+ *
+ * Quagga is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+ * General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with Quagga; see the file COPYING.  If not, write to the Free
+ * Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
+ * 02111-1307, USA.
+ */
+
+/* Peers of an address family are grouped by the configuration that
+   determines what is sent to them, so that the outbound policy of a
+   route and the encoding of its attributes are computed once for all
+   the members of a group.  The key of a peer is checked each time its
+   group is looked up: a peer whose configuration changed moves to the
+   group of its new key, which splits and merges the groups. */
+
+#include <zebra.h>
+
+#include "command.h"
+#include "prefix.h"
+#include "linklist.h"
+#include "memory.h"
+#include "hash.h"
+#include "jhash.h"
+#include "stream.h"
+
+#include "bgpd/bgpd.h"
+#include "bgpd/bgp_table.h"
+#include "bgpd/bgp_route.h"
+#include "bgpd/bgp_attr.h"
+#include "bgpd/bgp_aspath.h"
+#include "bgpd/bgp_filter.h"
+#include "bgpd/bgp_updgrp.h"
+
+/* Update groups of all the BGP instances. */
+static struct hash *updgrp_hash;
+
+/* Identifier of the next group. */
+static unsigned int updgrp_id;
+
+/* Route processing pass of bgp_process_main. */
+static unsigned long updgrp_pass;
+
+static int
+updgrp_name_same (const char *name1, const char *name2)
+{
+  if (name1 == NULL || name2 == NULL)
+    return name1 == name2;
+  return strcmp (name1, name2) == 0;
+}
+
+static char *
+updgrp_name_dup (const char *name)
+{
+  return name ? XSTRDUP (MTYPE_BGP_UPDGRP, name) : NULL;
+}
+
+static void
+updgrp_name_free (char *name)
+{
+  if (name)
+    XFREE (MTYPE_BGP_UPDGRP, name);
+}
+
+/* Fill the key of a peer.  The names point to the peer configuration. */
+static void
+updgrp_key_set (struct update_group_key *key, struct peer *peer,
+                afi_t afi, safi_t safi)
+{
+  struct bgp_filter *filter = &peer->filter[afi][safi];
+
+  memset (key, 0, sizeof (struct update_group_key));
+  key->bgp = peer->bgp;
+  key->afi = afi;
+  key->safi = safi;
+
+  key->sort = peer->sort;
+  key->as = peer->as;
+  key->local_as = peer->local_as;
+  key->change_local_as = peer->change_local_as;
+  key->flags = peer->flags & (PEER_FLAG_LOCAL_AS_NO_PREPEND
+                              | PEER_FLAG_LOCAL_AS_REPLACE_AS);
+  key->af_flags = peer->af_flags[afi][safi];
+  key->cap = peer->cap & PEER_CAP_AS4_RCV;
+
+  key->shared_network = peer->shared_network;
+  key->nexthop_v4 = peer->nexthop.v4;
+#ifdef HAVE_IPV6
+  key->nexthop_v6_global = peer->nexthop.v6_global;
+  key->nexthop_v6_local = peer->nexthop.v6_local;
+#endif /* HAVE_IPV6 */
+
+  key->dlist = DISTRIBUTE_OUT_NAME (filter);
+  key->plist = PREFIX_LIST_OUT_NAME (filter);
+  key->aslist = FILTER_LIST_OUT_NAME (filter);
+  key->usmap = UNSUPPRESS_MAP_NAME (filter);
+
+  /* The peers of the same nexthop share its subnet, unless they are
+     multihop EBGP peers. */
+  if (peer->sort == BGP_PEER_EBGP && peer->ttl > 1)
+    key->host = peer->host;
+}
+
+static unsigned int
+updgrp_hash_key (void *arg)
+{
+  const struct update_group_key *key = arg;
+  unsigned int hash;
+
+  hash = jhash_3words ((u_int32_t) (unsigned long) key->bgp,
+                       key->afi << 8 | key->safi,
+                       key->nexthop_v4.s_addr, 0);
+  hash = jhash_3words (key->as, key->local_as, key->af_flags, hash);
+  hash = jhash_3words (key->sort, key->change_local_as,
+                       key->flags | key->cap << 16, hash);
+#ifdef HAVE_IPV6
+  hash = jhash (&key->nexthop_v6_global, sizeof (struct in6_addr), hash);
+#endif /* HAVE_IPV6 */
+  if (key->plist)
+    hash ^= string_hash_make (key->plist);
+  if (key->host)
+    hash ^= string_hash_make (key->host);
+
+  return hash;
+}
+
+static int
+updgrp_hash_cmp (const void *arg1, const void *arg2)
+{
+  const struct update_group_key *key1 = arg1;
+  const struct update_group_key *key2 = arg2;
+
+  return (key1->bgp == key2->bgp
+          && key1->afi == key2->afi
+          && key1->safi == key2->safi
+          && key1->sort == key2->sort
+          && key1->as == key2->as
+          && key1->local_as == key2->local_as
+          && key1->change_local_as == key2->change_local_as
+          && key1->flags == key2->flags
+          && key1->af_flags == key2->af_flags
+          && key1->cap == key2->cap
+          && key1->shared_network == key2->shared_network
+          && IPV4_ADDR_SAME (&key1->nexthop_v4, &key2->nexthop_v4)
+#ifdef HAVE_IPV6
+          && IPV6_ADDR_SAME (&key1->nexthop_v6_global,
+                             &key2->nexthop_v6_global)
+          && IPV6_ADDR_SAME (&key1->nexthop_v6_local,
+                             &key2->nexthop_v6_local)
+#endif /* HAVE_IPV6 */
+          && updgrp_name_same (key1->dlist, key2->dlist)
+          && updgrp_name_same (key1->plist, key2->plist)
+          && updgrp_name_same (key1->aslist, key2->aslist)
+          && updgrp_name_same (key1->usmap, key2->usmap)
+          && updgrp_name_same (key1->host, key2->host));
+}
+
+static void *
+updgrp_hash_alloc (void *arg)
+{
+  struct update_group_key *key = arg;
+  struct update_group *group;
+
+  group = XCALLOC (MTYPE_BGP_UPDGRP, sizeof (struct update_group));
+  group->key = *key;
+  group->key.dlist = updgrp_name_dup (key->dlist);
+  group->key.plist = updgrp_name_dup (key->plist);
+  group->key.aslist = updgrp_name_dup (key->aslist);
+  group->key.usmap = updgrp_name_dup (key->usmap);
+  group->key.host = updgrp_name_dup (key->host);
+  group->id = ++updgrp_id;
+  group->peer = list_new ();
+  group->attr.extra = &group->extra;
+
+  return group;
+}
+
+static void
+updgrp_encoding_flush (struct update_group_encoding *enc)
+{
+  if (enc->attr)
+    bgp_attr_unintern (&enc->attr);
+  if (enc->data)
+    XFREE (MTYPE_BGP_UPDGRP_ENCODING, enc->data);
+  memset (enc, 0, sizeof (struct update_group_encoding));
+}
+
+static void
+updgrp_free (struct update_group *group)
+{
+  int i;
+
+  for (i = 0; i < BGP_UPDGRP_ENCODING_SLOTS; i++)
+    updgrp_encoding_flush (&group->encoding[i]);
+  if (group->aspath)
+    aspath_unintern (&group->aspath);
+
+  updgrp_name_free (group->key.dlist);
+  updgrp_name_free (group->key.plist);
+  updgrp_name_free (group->key.aslist);
+  updgrp_name_free (group->key.usmap);
+  updgrp_name_free (group->key.host);
+  list_delete (group->peer);
+  XFREE (MTYPE_BGP_UPDGRP, group);
+}
+
+static void
+updgrp_leave (struct update_group *group, struct peer *peer,
+              afi_t afi, safi_t safi)
+{
+  listnode_delete (group->peer, peer);
+  peer->updgrp[afi][safi] = NULL;
+
+  if (list_isempty (group->peer))
+    {
+      hash_release (updgrp_hash, group);
+      updgrp_free (group);
+    }
+}
+
+/* Update group of a peer in an address family, after moving the peer
+   to the group of its current configuration.  A peer being deleted has
+   no group. */
+struct update_group *
+bgp_updgrp_get (struct peer *peer, afi_t afi, safi_t safi)
+{
+  struct update_group_key key;
+  struct update_group *group;
+
+  if (peer->status == Deleted)
+    return NULL;
+
+  updgrp_key_set (&key, peer, afi, safi);
+
+  group = peer->updgrp[afi][safi];
+  if (group)
+    {
+      if (updgrp_hash_cmp (&group->key, &key))
+        return group;
+      updgrp_leave (group, peer, afi, safi);
+    }
+
+  group = hash_get (updgrp_hash, &key, updgrp_hash_alloc);
+  listnode_add (group->peer, peer);
+  peer->updgrp[afi][safi] = group;
+
+  return group;
+}
+
+/* Remove a peer from its update groups. */
+void
+bgp_updgrp_peer_leave (struct peer *peer)
+{
+  afi_t afi;
+  safi_t safi;
+
+  for (afi = AFI_IP; afi < AFI_MAX; afi++)
+    for (safi = SAFI_UNICAST; safi < SAFI_MAX; safi++)
+      if (peer->updgrp[afi][safi])
+        updgrp_leave (peer->updgrp[afi][safi], peer, afi, safi);
+}
+
+/* Start a route processing pass, invalidating the outbound policy
+   remembered by the groups. */
+unsigned long
+bgp_updgrp_pass_next (void)
+{
+  return ++updgrp_pass;
+}
+
+unsigned long
+bgp_updgrp_pass_current (void)
+{
+  return updgrp_pass;
+}
+
+/* Encode the attributes of an UPDATE to a peer, reusing the encoding
+   of the same interned attributes for its update group.  The encoding
+   depends on the peer through the group key only, and on the peer the
+   route is from through its sort and router-id. */
+bgp_size_t
+bgp_updgrp_packet_attribute (struct peer *peer, struct stream *s,
+                             struct attr *attr, afi_t afi, safi_t safi,
+                             struct peer *from)
+{
+  struct update_group *group;
+  struct update_group_encoding *enc;
+  struct bgp *bgp;
+  struct in_addr cluster_id;
+  as_t confed_id;
+  size_t start;
+  bgp_size_t length;
+
+  group = bgp_updgrp_get (peer, afi, safi);
+  bgp = bgp_get_default ();
+  if (! group || ! bgp || ! attr->refcnt)
+    return bgp_packet_attribute (NULL, peer, s, attr, NULL, afi, safi,
+                                 from, NULL, NULL);
+
+  if (bgp->config & BGP_CONFIG_CLUSTER_ID)
+    cluster_id = bgp->cluster_id;
+  else
+    cluster_id = bgp->router_id;
+  confed_id = CHECK_FLAG (bgp->config, BGP_CONFIG_CONFEDERATION)
+              ? bgp->confed_id : 0;
+
+  enc = &group->encoding[jhash_1word ((u_int32_t) (unsigned long) attr, 0)
+                         % BGP_UPDGRP_ENCODING_SLOTS];
+
+  if (enc->attr == attr
+      && enc->from == (from != NULL)
+      && (! from
+          || (enc->from_sort == from->sort
+              && IPV4_ADDR_SAME (&enc->from_remote_id, &from->remote_id)))
+      && IPV4_ADDR_SAME (&enc->cluster_id, &cluster_id)
+      && enc->confed_id == confed_id)
+    {
+      stream_put (s, enc->data, enc->length);
+      group->encoding_reused++;
+      return enc->length;
+    }
+
+  start = stream_get_endp (s);
+  length = bgp_packet_attribute (NULL, peer, s, attr, NULL, afi, safi,
+                                 from, NULL, NULL);
+  group->encoding_computed++;
+
+  if (enc->attr != attr)
+    {
+      if (enc->attr)
+        bgp_attr_unintern (&enc->attr);
+      enc->attr = bgp_attr_intern (attr);
+    }
+  enc->from = (from != NULL);
+  if (from)
+    {
+      enc->from_sort = from->sort;
+      enc->from_remote_id = from->remote_id;
+    }
+  enc->cluster_id = cluster_id;
+  enc->confed_id = confed_id;
+
+  if (enc->size < length)
+    {
+      enc->data = XREALLOC (MTYPE_BGP_UPDGRP_ENCODING, enc->data, length);
+      enc->size = length;
+    }
+  memcpy (enc->data, STREAM_DATA (s) + start, length);
+  enc->length = length;
+
+  return length;
+}
+
+unsigned long
+bgp_updgrp_count (void)
+{
+  return updgrp_hash->count;
+}
+
+struct updgrp_iterate_arg
+{
+  void (*func) (struct update_group *, void *);
+  void *arg;
+};
+
+static void
+updgrp_iterate_backet (struct hash_backet *backet, void *arg)
+{
+  struct updgrp_iterate_arg *iter = arg;
+
+  (*iter->func) (backet->data, iter->arg);
+}
+
+/* Call func for each update group. */
+void
+bgp_updgrp_iterate (void (*func) (struct update_group *, void *), void *arg)
+{
+  struct updgrp_iterate_arg iter;
+
+  iter.func = func;
+  iter.arg = arg;
+  hash_iterate (updgrp_hash, updgrp_iterate_backet, &iter);
+}
+
+void
+bgp_updgrp_init (void)
+{
+  updgrp_hash = hash_create (updgrp_hash_key, updgrp_hash_cmp);
+}
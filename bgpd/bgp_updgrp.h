@@ -0,0 +1,123 @@
+/* BGP update groups
+ * (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+ *
+ * This file is part of Quagga
+ *
+ * Quagga is free software; you can redistribute it and/or modify it
+ * under the terms of the GNU General Public License as published by the
+ * Free Software Foundation; either version 2, or (at your option) any
+ * later version.
+ *
+ * Quagga is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+ * General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with Quagga; see the file COPYING.  If not, write to the Free
+ * Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
+ * 02111-1307, USA.
+ */
+
+#ifndef _QUAGGA_BGP_UPDGRP_H
+#define _QUAGGA_BGP_UPDGRP_H
+
+/* Number of attribute encodings remembered by an update group. */
+#define BGP_UPDGRP_ENCODING_SLOTS 64
+
+/* Outbound configuration of a peer in an address family.  Peers with
+   the same key are sent the same attributes for the same routes, so
+   they share an update group. */
+struct update_group_key
+{
+  struct bgp *bgp;
+  afi_t afi;
+  safi_t safi;
+
+  bgp_peer_sort_t sort;
+  as_t as;
+  as_t local_as;
+  as_t change_local_as;
+  u_int32_t flags;
+  u_int32_t af_flags;
+  u_int16_t cap;
+
+  /* Nexthop of the announcements. */
+  int shared_network;
+  struct in_addr nexthop_v4;
+#ifdef HAVE_IPV6
+  struct in6_addr nexthop_v6_global;
+  struct in6_addr nexthop_v6_local;
+#endif /* HAVE_IPV6 */
+
+  /* Outbound filter names.  The outbound route-map is applied to each
+     member, as it may match or set the address of the peer. */
+  char *dlist;
+  char *plist;
+  char *aslist;
+  char *usmap;
+
+  /* Address of a multihop EBGP peer, whose nexthop checks depend on
+     the address. */
+  char *host;
+};
+
+/* Attributes encoded once for the members of an update group. */
+struct update_group_encoding
+{
+  /* Interned attribute, locked by the encoding. */
+  struct attr *attr;
+
+  /* What else the encoding depends on. */
+  u_char from;
+  bgp_peer_sort_t from_sort;
+  struct in_addr from_remote_id;
+  struct in_addr cluster_id;
+  as_t confed_id;
+
+  u_char *data;
+  bgp_size_t length;
+  bgp_size_t size;
+};
+
+struct update_group
+{
+  struct update_group_key key;
+
+  /* Identifier shown by the update group dump. */
+  unsigned int id;
+
+  /* Member peers. */
+  struct list *peer;
+
+  /* Outbound policy of the route announced in bgp_process_main.  The
+     announcement and attributes are valid while pass is current. */
+  unsigned long pass;
+  struct bgp_info *ri;
+  int announce;
+  struct attr attr;
+  struct attr_extra extra;
+  struct aspath *aspath;
+
+  struct update_group_encoding encoding[BGP_UPDGRP_ENCODING_SLOTS];
+
+  /* Statistics. */
+  unsigned long policy_computed;
+  unsigned long policy_reused;
+  unsigned long encoding_computed;
+  unsigned long encoding_reused;
+};
+
+extern void bgp_updgrp_init (void);
+extern struct update_group *bgp_updgrp_get (struct peer *, afi_t, safi_t);
+extern void bgp_updgrp_peer_leave (struct peer *);
+extern unsigned long bgp_updgrp_pass_next (void);
+extern unsigned long bgp_updgrp_pass_current (void);
+extern bgp_size_t bgp_updgrp_packet_attribute (struct peer *, struct stream *,
+                                               struct attr *, afi_t, safi_t,
+                                               struct peer *);
+extern unsigned long bgp_updgrp_count (void);
+extern void bgp_updgrp_iterate (void (*) (struct update_group *, void *),
+                                void *);
+
+#endif /* _QUAGGA_BGP_UPDGRP_H */
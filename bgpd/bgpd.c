@@ -60,6 +60,7 @@ Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
 #include "bgpd/bgp_network.h"
 #include "bgpd/bgp_vty.h"
 #include "bgpd/bgp_mpath.h"
+#include "bgpd/bgp_updgrp.h"
 #ifdef HAVE_SNMP
 #include "bgpd/bgp_snmp.h"
 #endif /* HAVE_SNMP */
@@ -1272,6 +1273,9 @@ peer_delete (struct peer *peer)
   bgp_stop (peer);
   bgp_fsm_change_status (peer, Deleted);
 
+  /* Leave the update groups. */
+  bgp_updgrp_peer_leave (peer);
+
   /* Password configuration */
   if (peer->password)
     {
@@ -5523,6 +5527,7 @@ bgp_init (void)
   bgp_debug_init ();
   bgp_dump_init ();
   bgp_route_init ();
+  bgp_updgrp_init ();
   bgp_route_map_init ();
   bgp_address_init ();
   bgp_scan_init ();
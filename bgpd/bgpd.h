@@ -28,6 +28,10 @@
 #include "sockunion.h"
 /* For struct stream_fifo */
 #include "stream.h"
+#ifdef ENABLE_OVSDB
+/* For struct uuid */
+#include "uuid.h"
+#endif
 
 /* Typedef BGP specific types.  */
 typedef u_int32_t as_t;
@@ -359,6 +363,12 @@ struct peer
 #ifdef ENABLE_OVSDB
   /* BFD section */
   int bfd_status;	/* status of BFD session */
+
+  /* UUID of the BGP_Neighbor row of the peer, zero until looked up. */
+  struct uuid ovsdb_uuid;
+
+  /* Statistics changed since they were last published. */
+  u_char ovsdb_stats_dirty;
 #endif
 
   /* Peer address family configuration. */
@@ -537,6 +547,9 @@ struct peer
   /* Filter structure. */
   struct bgp_filter filter[AFI_MAX][SAFI_MAX];
 
+  /* Update groups of the peer, see bgp_updgrp.c. */
+  struct update_group *updgrp[AFI_MAX][SAFI_MAX];
+
   /* ORF Prefix-list */
   struct prefix_list *orf_plist[AFI_MAX][SAFI_MAX];
 
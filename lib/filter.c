@@ -28,6 +28,7 @@
 #include "sockunion.h"
 #include "buffer.h"
 #include "log.h"
+#include "routemap.h"
 
 struct filter_cisco
 {
@@ -233,6 +234,9 @@ access_list_delete (struct access_list *access)
   struct access_list_list *list;
   struct access_master *master;
 
+  /* Compiled route maps hold the access-lists they resolved. */
+  route_map_compiled_flush_all ();
+
   for (filter = access->head; filter; filter = next)
     {
       next = filter->next;
@@ -281,6 +285,9 @@ access_list_insert (afi_t afi, const char *name)
   if (master == NULL)
     return NULL;
 
+  /* Compiled route maps hold the access-lists they resolved. */
+  route_map_compiled_flush_all ();
+
   /* Allocate new access_list and copy given name. */
   access = access_list_new ();
   access->name = XSTRDUP (MTYPE_ACCESS_LIST_STR, name);
@@ -48,6 +48,7 @@ struct memory_list memory_list_lib[] =
   { MTYPE_PREFIX_LIST,		"Prefix List"			},
   { MTYPE_PREFIX_LIST_ENTRY,	"Prefix List Entry"		},
   { MTYPE_PREFIX_LIST_STR,	"Prefix List Str"		},
+  { MTYPE_PREFIX_LIST_TRIE,	"Prefix List Trie"		},
   { MTYPE_ROUTE_MAP,		"Route map"			},
   { MTYPE_ROUTE_MAP_NAME,	"Route map name"		},
   { MTYPE_ROUTE_MAP_INDEX,	"Route map index"		},
@@ -115,10 +116,13 @@ struct memory_list memory_list_bgp[] =
   { MTYPE_BGP_ADJ_IN,		"BGP adj in"			},
   { MTYPE_BGP_ADJ_OUT,		"BGP adj out"			},
   { MTYPE_BGP_MPATH_INFO,	"BGP multipath info"		},
+  { MTYPE_BGP_UPDGRP,		"BGP update group"		},
+  { MTYPE_BGP_UPDGRP_ENCODING,	"BGP update group encoding"	},
   { 0, NULL },
   { MTYPE_AS_LIST,		"BGP AS list"			},
   { MTYPE_AS_FILTER,		"BGP AS filter"			},
   { MTYPE_AS_FILTER_STR,	"BGP AS filter str"		},
+  { MTYPE_AS_LIST_CACHE,	"BGP AS list cache"		},
   { 0, NULL },
   { MTYPE_COMMUNITY,		"community"			},
   { MTYPE_COMMUNITY_VAL,	"community val"			},
@@ -28,6 +28,8 @@
 #include "sockunion.h"
 #include "buffer.h"
 #include "stream.h"
+#include "hash.h"
+#include "routemap.h"
 #include "log.h"
 
 #ifndef ENABLE_OVSDB
@@ -47,6 +49,10 @@ struct prefix_list_entry
   unsigned long refcnt;
   unsigned long hitcnt;
 
+  /* Compiled applies which stopped at this entry, not yet counted in the
+     refcnt of this entry and the ones before it. */
+  unsigned long stopcnt;
+
   struct prefix_list_entry *next;
   struct prefix_list_entry *prev;
 };
@@ -78,9 +84,15 @@ struct prefix_master
 
   /* Hook function which is executed when prefix_list is deleted. */
   void (*delete_hook) (struct prefix_list *);
+
+  /* Number and string prefix_lists indexed by name. */
+  struct hash *hash;
 };
 #endif
 
+/* Prefix-lists with fewer entries are applied without being compiled. */
+#define PREFIX_LIST_TRIE_MIN_ENTRIES 8
+
 /* Static structure of IPv4 prefix_list's master. */
 static struct prefix_master prefix_master_ipv4 =
 {
@@ -131,29 +143,39 @@ prefix_master_get (afi_t afi)
   return NULL;
 }
 
+static unsigned int
+prefix_list_hash_key_make (void *p)
+{
+  const struct prefix_list *plist = p;
+
+  return string_hash_make (plist->name);
+}
+
+static int
+prefix_list_hash_cmp (const void *p1, const void *p2)
+{
+  const struct prefix_list *plist1 = p1;
+  const struct prefix_list *plist2 = p2;
+
+  return strcmp (plist1->name, plist2->name) == 0;
+}
+
 /* Lookup prefix_list from list of prefix_list by name. */
 struct prefix_list *
 prefix_list_lookup (afi_t afi, const char *name)
 {
-  struct prefix_list *plist;
+  struct prefix_list tmp_plist;
   struct prefix_master *master;
 
   if (name == NULL)
     return NULL;
 
   master = prefix_master_get (afi);
-  if (master == NULL)
+  if (master == NULL || master->hash == NULL)
     return NULL;
 
-  for (plist = master->num.head; plist; plist = plist->next)
-    if (strcmp (plist->name, name) == 0)
-      return plist;
-
-  for (plist = master->str.head; plist; plist = plist->next)
-    if (strcmp (plist->name, name) == 0)
-      return plist;
-
-  return NULL;
+  tmp_plist.name = (char *) name;
+  return hash_lookup (master->hash, &tmp_plist);
 }
 
 static struct prefix_list *
@@ -190,6 +212,184 @@ prefix_list_entry_free (struct prefix_list_entry *pentry)
   XFREE (MTYPE_PREFIX_LIST_ENTRY, pentry);
 }
 
+/* Binary trie on the prefix bits of the entries of a prefix_list. Each
+   node holds the entries whose prefix ends at it, in sequence order, so
+   that applying the prefix_list walks at most one node per bit of the
+   prefix instead of every entry. */
+struct prefix_list_trie_node
+{
+  struct prefix_list_trie_node *link[2];
+
+  struct prefix_list_entry **entries;
+  int count;
+};
+
+struct prefix_list_trie
+{
+  struct prefix_list_trie_node *root4;
+  struct prefix_list_trie_node *root6;
+
+  /* Compiled applies which matched no entry, not yet counted in the
+     refcnt of the entries. */
+  unsigned long misses;
+};
+
+/* Check the prefix length of p against the ge and le of an entry whose
+   prefix contains p. */
+static int
+prefix_list_entry_len_match (struct prefix_list_entry *pentry,
+			     struct prefix *p)
+{
+  /* In case of le nor ge is specified, exact match is performed. */
+  if (! pentry->le && ! pentry->ge)
+    {
+      if (pentry->prefix.prefixlen != p->prefixlen)
+	return 0;
+    }
+  else
+    {
+      if (pentry->le)
+	if (p->prefixlen > pentry->le)
+	  return 0;
+
+      if (pentry->ge)
+	if (p->prefixlen < pentry->ge)
+	  return 0;
+    }
+  return 1;
+}
+
+static void
+prefix_list_trie_insert (struct prefix_list_trie_node **root,
+			 struct prefix_list_entry *pentry)
+{
+  struct prefix_list_trie_node **node;
+  int bit;
+
+  node = root;
+  for (bit = 0; ; bit++)
+    {
+      if (*node == NULL)
+	*node = XCALLOC (MTYPE_PREFIX_LIST_TRIE,
+			 sizeof (struct prefix_list_trie_node));
+
+      if (bit == pentry->prefix.prefixlen)
+	break;
+
+      node = &(*node)->link[prefix_bit (&pentry->prefix.u.prefix, bit)];
+    }
+
+  (*node)->entries = XREALLOC (MTYPE_PREFIX_LIST_TRIE, (*node)->entries,
+			       ((*node)->count + 1) *
+			       sizeof (struct prefix_list_entry *));
+  (*node)->entries[(*node)->count++] = pentry;
+}
+
+static void
+prefix_list_trie_node_free (struct prefix_list_trie_node *node)
+{
+  if (node == NULL)
+    return;
+
+  prefix_list_trie_node_free (node->link[0]);
+  prefix_list_trie_node_free (node->link[1]);
+
+  if (node->entries)
+    XFREE (MTYPE_PREFIX_LIST_TRIE, node->entries);
+  XFREE (MTYPE_PREFIX_LIST_TRIE, node);
+}
+
+static void
+prefix_list_trie_build (struct prefix_list *plist)
+{
+  struct prefix_list_entry *pentry;
+
+  plist->trie = XCALLOC (MTYPE_PREFIX_LIST_TRIE,
+			 sizeof (struct prefix_list_trie));
+
+  /* The entries are sorted by sequence number, so each node gets its
+     entries in sequence order. */
+  for (pentry = plist->head; pentry; pentry = pentry->next)
+    {
+      if (pentry->prefix.family == AF_INET)
+	prefix_list_trie_insert (&plist->trie->root4, pentry);
+      else if (pentry->prefix.family == AF_INET6)
+	prefix_list_trie_insert (&plist->trie->root6, pentry);
+    }
+}
+
+/* Return the entry with the lowest sequence number matching p, as the
+   sequential evaluation of the entries does. */
+static struct prefix_list_entry *
+prefix_list_trie_match (struct prefix_list_trie_node *node, struct prefix *p)
+{
+  struct prefix_list_entry *best = NULL;
+  struct prefix_list_entry *pentry;
+  int bit;
+  int i;
+
+  for (bit = 0; node; bit++)
+    {
+      for (i = 0; i < node->count; i++)
+	{
+	  pentry = node->entries[i];
+	  if (best && pentry->seq > best->seq)
+	    break;
+
+	  if (prefix_list_entry_len_match (pentry, p))
+	    {
+	      best = pentry;
+	      break;
+	    }
+	}
+
+      if (bit == p->prefixlen)
+	break;
+
+      node = node->link[prefix_bit (&p->u.prefix, bit)];
+    }
+
+  return best;
+}
+
+/* Add the compiled applies to the refcnt of the entries. An apply which
+   stopped at an entry referenced that entry and all the ones before it,
+   and an apply which matched nothing referenced every entry. */
+static void
+prefix_list_refcnt_sync (struct prefix_list *plist)
+{
+  struct prefix_list_entry *pentry;
+  unsigned long refs;
+
+  if (plist->trie == NULL)
+    return;
+
+  refs = plist->trie->misses;
+  for (pentry = plist->tail; pentry; pentry = pentry->prev)
+    {
+      refs += pentry->stopcnt;
+      pentry->stopcnt = 0;
+      pentry->refcnt += refs;
+    }
+
+  plist->trie->misses = 0;
+}
+
+/* Drop the compiled form of a prefix_list whose entries are changing. */
+static void
+prefix_list_trie_free (struct prefix_list *plist)
+{
+  if (plist->trie == NULL)
+    return;
+
+  prefix_list_refcnt_sync (plist);
+
+  prefix_list_trie_node_free (plist->trie->root4);
+  prefix_list_trie_node_free (plist->trie->root6);
+  XFREE (MTYPE_PREFIX_LIST_TRIE, plist->trie);
+  plist->trie = NULL;
+}
+
 /* Insert new prefix list to list of prefix_list.  Each prefix_list
    is sorted by the name. */
 static struct prefix_list *
@@ -206,11 +406,19 @@ prefix_list_insert (afi_t afi, const char *name)
   if (master == NULL)
     return NULL;
 
+  /* Compiled route maps hold the prefix-lists they resolved. */
+  route_map_compiled_flush_all ();
+
   /* Allocate new prefix_list and copy given name. */
   plist = prefix_list_new ();
   plist->name = XSTRDUP (MTYPE_PREFIX_LIST_STR, name);
   plist->master = master;
 
+  if (master->hash == NULL)
+    master->hash = hash_create (prefix_list_hash_key_make,
+                                prefix_list_hash_cmp);
+  hash_get (master->hash, plist, hash_alloc_intern);
+
   /* If name is made by all digit character.  We treat it as
      number. */
   for (number = 0, i = 0; i < strlen (name); i++)
@@ -311,6 +519,11 @@ prefix_list_delete (struct prefix_list *plist)
   struct prefix_list_entry *pentry;
   struct prefix_list_entry *next;
 
+  /* Compiled route maps hold the prefix-lists they resolved. */
+  route_map_compiled_flush_all ();
+
+  prefix_list_trie_free (plist);
+
   /* If prefix-list contain prefix_list_entry free all of it. */
   for (pentry = plist->head; pentry; pentry = next)
     {
@@ -336,6 +549,8 @@ prefix_list_delete (struct prefix_list *plist)
   else
     list->head = plist->next;
 
+  hash_release (master->hash, plist);
+
   if (plist->desc)
     XFREE (MTYPE_TMP, plist->desc);
 
@@ -463,6 +678,9 @@ prefix_list_entry_delete (struct prefix_list *plist,
 {
   if (plist == NULL || pentry == NULL)
     return;
+
+  prefix_list_trie_free (plist);
+
   if (pentry->prev)
     pentry->prev->next = pentry->next;
   else
@@ -499,6 +717,8 @@ prefix_list_entry_add (struct prefix_list *plist,
   struct prefix_list_entry *replace;
   struct prefix_list_entry *point;
 
+  prefix_list_trie_free (plist);
+
   /* Automatic asignment of seq no. */
   if (pentry->seq == -1)
     pentry->seq = prefix_new_seq_get (plist);
@@ -571,27 +791,12 @@ prefix_list_entry_match (struct prefix_list_entry *pentry, struct prefix *p)
   if (! ret)
     return 0;
 
-  /* In case of le nor ge is specified, exact match is performed. */
-  if (! pentry->le && ! pentry->ge)
-    {
-      if (pentry->prefix.prefixlen != p->prefixlen)
-	return 0;
-    }
-  else
-    {
-      if (pentry->le)
-	if (p->prefixlen > pentry->le)
-	  return 0;
-
-      if (pentry->ge)
-	if (p->prefixlen < pentry->ge)
-	  return 0;
-    }
-  return 1;
+  return prefix_list_entry_len_match (pentry, p);
 }
 
+/* Apply the entries of a prefix_list one by one until the first match. */
 enum prefix_list_type
-prefix_list_apply (struct prefix_list *plist, void *object)
+prefix_list_apply_linear (struct prefix_list *plist, void *object)
 {
   struct prefix_list_entry *pentry;
   struct prefix *p;
@@ -617,6 +822,41 @@ prefix_list_apply (struct prefix_list *plist, void *object)
   return PREFIX_DENY;
 }
 
+enum prefix_list_type
+prefix_list_apply (struct prefix_list *plist, void *object)
+{
+  struct prefix_list_entry *pentry;
+  struct prefix *p;
+
+  p = (struct prefix *) object;
+
+  if (plist == NULL)
+    return PREFIX_DENY;
+
+  /* Short prefix_lists are not worth compiling. */
+  if (plist->count < PREFIX_LIST_TRIE_MIN_ENTRIES
+      || (p->family != AF_INET && p->family != AF_INET6))
+    return prefix_list_apply_linear (plist, object);
+
+  if (plist->trie == NULL)
+    prefix_list_trie_build (plist);
+
+  if (p->family == AF_INET)
+    pentry = prefix_list_trie_match (plist->trie->root4, p);
+  else
+    pentry = prefix_list_trie_match (plist->trie->root6, p);
+
+  if (pentry == NULL)
+    {
+      plist->trie->misses++;
+      return PREFIX_DENY;
+    }
+
+  pentry->stopcnt++;
+  pentry->hitcnt++;
+  return pentry->type;
+}
+
 static void __attribute__ ((unused))
 prefix_list_print (struct prefix_list *plist)
 {
@@ -960,6 +1200,8 @@ vty_show_prefix_entry (struct vty *vty, afi_t afi, struct prefix_list *plist,
 {
   struct prefix_list_entry *pentry;
 
+  prefix_list_refcnt_sync (plist);
+
   /* Print the name of the protocol */
   if (zlog_default)
       vty_out (vty, "%s: ", zlog_proto_names[zlog_default->protocol]);
@@ -1095,6 +1337,8 @@ vty_show_prefix_list_prefix (struct vty *vty, afi_t afi, const char *name,
       return CMD_WARNING;
     }
 
+  prefix_list_refcnt_sync (plist);
+
   for (pentry = plist->head; pentry; pentry = pentry->next)
     {
       match = 0;
@@ -52,6 +52,10 @@ struct prefix_list
   struct prefix_list_entry *head;
   struct prefix_list_entry *tail;
 
+  /* Compiled form of the entries, built by the first apply after a
+     change. */
+  struct prefix_list_trie *trie;
+
   struct prefix_list *next;
   struct prefix_list *prev;
 };
@@ -72,6 +76,8 @@ extern void prefix_list_delete_hook (void (*func) (struct prefix_list *));
 
 extern struct prefix_list *prefix_list_lookup (afi_t, const char *);
 extern enum prefix_list_type prefix_list_apply (struct prefix_list *, void *);
+extern enum prefix_list_type prefix_list_apply_linear (struct prefix_list *,
+                                                       void *);
 
 extern struct stream * prefix_bgp_orf_entry (struct stream *,
                                              struct prefix_list *,
@@ -97,6 +103,10 @@ struct prefix_list_entry
   unsigned long refcnt;
   unsigned long hitcnt;
 
+  /* Compiled applies which stopped at this entry, not yet counted in the
+     refcnt of this entry and the ones before it. */
+  unsigned long stopcnt;
+
   struct prefix_list_entry *next;
   struct prefix_list_entry *prev;
 };
@@ -128,6 +138,9 @@ struct prefix_master
 
   /* Hook function which is executed when prefix_list is deleted. */
   void (*delete_hook) (struct prefix_list *);
+
+  /* Number and string prefix_lists indexed by name. */
+  struct hash *hash;
 };
 
 extern void prefix_list_entry_add(struct prefix_list *plist,
@@ -20,6 +20,7 @@ Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
 
 #include <zebra.h>
 
+#include "hash.h"
 #include "linklist.h"
 #include "memory.h"
 #include "vector.h"
@@ -62,6 +63,9 @@ struct route_map_list
   void (*add_hook) (const char *);
   void (*delete_hook) (const char *);
   void (*event_hook) (route_map_event_t, const char *);
+
+  /* Route maps indexed by name. */
+  struct hash *hash;
 };
 
 /* Master list of route map. */
@@ -74,6 +78,99 @@ static void
 route_map_rule_delete (struct route_map_rule_list *,
 		       struct route_map_rule *);
 
+/* Compiled match rule of a route map index. */
+struct route_map_compiled_match
+{
+  struct route_map_rule *rule;
+
+  /* List resolved by the rule's func_resolve. */
+  void *resolved;
+};
+
+/* Drop the compiled match rules of an index whose rules or referenced
+   lists are changing. */
+static void
+route_map_index_compiled_free (struct route_map_index *index)
+{
+  if (index->compiled_match)
+    XFREE (MTYPE_ROUTE_MAP_COMPILED, index->compiled_match);
+  index->compiled_match = NULL;
+  index->compiled_count = 0;
+}
+
+/* Sort the match rules of an index by cost, keeping the configured order
+   among rules of the same cost, and resolve the lists they reference. */
+static void
+route_map_index_compile (struct route_map_index *index)
+{
+  struct route_map_compiled_match *compiled;
+  struct route_map_compiled_match match;
+  struct route_map_rule *rule;
+  int count;
+  int i, j;
+
+  count = 0;
+  for (rule = index->match_list.head; rule; rule = rule->next)
+    count++;
+
+  compiled = XCALLOC (MTYPE_ROUTE_MAP_COMPILED,
+		      count * sizeof (struct route_map_compiled_match));
+
+  for (i = 0, rule = index->match_list.head; rule; rule = rule->next, i++)
+    {
+      match.rule = rule;
+      match.resolved = NULL;
+      if (rule->cmd->func_resolve)
+	match.resolved = (*rule->cmd->func_resolve) (rule->value);
+
+      for (j = i; j > 0 && compiled[j - 1].rule->cmd->cost > rule->cmd->cost;
+	   j--)
+	compiled[j] = compiled[j - 1];
+      compiled[j] = match;
+    }
+
+  index->compiled_match = compiled;
+  index->compiled_count = count;
+}
+
+/* Drop the compiled match rules of a route map. */
+void
+route_map_compiled_flush (struct route_map *map)
+{
+  struct route_map_index *index;
+
+  for (index = map->head; index; index = index->next)
+    route_map_index_compiled_free (index);
+}
+
+/* Drop the compiled match rules of every route map, as the lists they
+   reference were added or deleted. */
+void
+route_map_compiled_flush_all (void)
+{
+  struct route_map *map;
+
+  for (map = route_map_master.head; map; map = map->next)
+    route_map_compiled_flush (map);
+}
+
+static unsigned int
+route_map_hash_key_make (void *p)
+{
+  const struct route_map *map = p;
+
+  return string_hash_make (map->name);
+}
+
+static int
+route_map_hash_cmp (const void *p1, const void *p2)
+{
+  const struct route_map *map1 = p1;
+  const struct route_map *map2 = p2;
+
+  return strcmp (map1->name, map2->name) == 0;
+}
+
 /* New route map allocation. Please note route map's name must be
    specified. */
 static struct route_map *
@@ -104,6 +201,10 @@ route_map_add (const char *name)
     list->head = map;
   list->tail = map;
 
+  if (list->hash == NULL)
+    list->hash = hash_create (route_map_hash_key_make, route_map_hash_cmp);
+  hash_get (list->hash, map, hash_alloc_intern);
+
   /* Execute hook. */
   if (route_map_master.add_hook)
     (*route_map_master.add_hook) (name);
@@ -140,6 +241,8 @@ route_map_delete (struct route_map *map)
   else
     list->head = map->next;
 
+  hash_release (list->hash, map);
+
   XFREE (MTYPE_ROUTE_MAP, map);
 
   /* Execute deletion hook. */
@@ -155,12 +258,13 @@ route_map_delete (struct route_map *map)
 struct route_map *
 route_map_lookup_by_name (const char *name)
 {
-  struct route_map *map;
+  struct route_map tmp_map;
 
-  for (map = route_map_master.head; map; map = map->next)
-    if (strcmp (map->name, name) == 0)
-      return map;
-  return NULL;
+  if (route_map_master.hash == NULL)
+    return NULL;
+
+  tmp_map.name = (char *) name;
+  return hash_lookup (route_map_master.hash, &tmp_map);
 }
 
 /* Lookup route map.  If there isn't route map create one and return
@@ -308,6 +412,8 @@ route_map_index_delete (struct route_map_index *index, int notify)
 {
   struct route_map_rule *rule;
 
+  route_map_index_compiled_free (index);
+
   /* Free route match. */
   while ((rule = index->match_list.head) != NULL)
     route_map_rule_delete (&index->match_list, rule);
@@ -568,6 +674,8 @@ route_map_add_match (struct route_map_index *index, const char *match_name,
   else
     compile = NULL;
 
+  route_map_index_compiled_free (index);
+
   /* If argument is completely same ignore it. */
   for (rule = index->match_list.head; rule; rule = next)
     {
@@ -617,6 +725,7 @@ route_map_delete_match (struct route_map_index *index, const char *match_name,
     if (rule->cmd == cmd &&
 	(rulecmp (rule->rule_str, match_arg) == 0 || match_arg == NULL))
       {
+	route_map_index_compiled_free (index);
 	route_map_rule_delete (&index->match_list, rule);
 	/* Execute event hook. */
 	if (route_map_master.event_hook)
@@ -761,28 +870,39 @@ route_map_delete_set (struct route_map_index *index, const char *set_name,
 */
 
 static route_map_result_t
-route_map_apply_match (struct route_map_rule_list *match_list,
+route_map_apply_match (struct route_map_index *index,
                        struct prefix *prefix, route_map_object_t type,
                        void *object)
 {
   route_map_result_t ret = RMAP_NOMATCH;
-  struct route_map_rule *match;
+  struct route_map_compiled_match *match;
+  int i;
 
 
   /* Check all match rule and if there is no match rule, go to the
      set statement. */
-  if (!match_list->head)
+  if (!index->match_list.head)
     ret = RMAP_MATCH;
   else
     {
-      for (match = match_list->head; match; match = match->next)
+      if (index->compiled_match == NULL)
+        route_map_index_compile (index);
+
+      for (i = 0; i < index->compiled_count; i++)
         {
-          /* Try each match statement in turn, If any do not return
-             RMAP_MATCH, return, otherwise continue on to next match
-             statement. All match statements must match for end-result
-             to be a match. */
-          ret = (*match->cmd->func_apply) (match->value, prefix,
-                                           type, object);
+          /* Try each match statement in turn, cheapest first. If any do
+             not return RMAP_MATCH, return, otherwise continue on to next
+             match statement. All match statements must match for
+             end-result to be a match. */
+          match = &index->compiled_match[i];
+          if (match->rule->cmd->func_resolve)
+            ret = (*match->rule->cmd->func_apply_resolved) (match->resolved,
+                                                            match->rule->value,
+                                                            prefix, type,
+                                                            object);
+          else
+            ret = (*match->rule->cmd->func_apply) (match->rule->value,
+                                                   prefix, type, object);
           if (ret != RMAP_MATCH)
             return ret;
         }
@@ -815,7 +935,7 @@ route_map_apply (struct route_map *map, struct prefix *prefix,
   for (index = map->head; index; index = index->next)
     {
       /* Apply this index. */
-      ret = route_map_apply_match (&index->match_list, prefix, type, object);
+      ret = route_map_apply_match (index, prefix, type, object);
 
       /* Now we apply the matrix from above */
       if (ret == RMAP_NOMATCH)
@@ -87,8 +87,23 @@ struct route_map_rule_cmd
 
   /* Free allocated value by func_compile (). */
   void (*func_free)(void *);
+
+  /* Optional lookup of the list named by the compiled value. Compiled
+     route maps resolve it once and apply the rule with
+     func_apply_resolved instead of func_apply. */
+  void *(*func_resolve)(void *);
+  route_map_result_t (*func_apply_resolved)(void *, void *, struct prefix *,
+					    route_map_object_t, void *);
+
+  /* Relative cost of a match rule, cheaper ones are applied first. */
+  int cost;
 };
 
+/* Route map match rule costs. */
+#define RMAP_COST_CHEAP   0
+#define RMAP_COST_LIST    1
+#define RMAP_COST_REGEX   2
+
 /* Route map apply error. */
 enum
 {
@@ -131,6 +146,11 @@ struct route_map_index
   struct route_map_rule_list match_list;
   struct route_map_rule_list set_list;
 
+  /* Match rules sorted by cost with their lists resolved, built by the
+     first apply after a change. */
+  struct route_map_compiled_match *compiled_match;
+  int compiled_count;
+
   /* Make linked list. */
   struct route_map_index *next;
   struct route_map_index *prev;
@@ -194,6 +214,8 @@ extern route_map_result_t route_map_apply (struct route_map *map,
 extern void route_map_add_hook (void (*func) (const char *));
 extern void route_map_delete_hook (void (*func) (const char *));
 extern void route_map_event_hook (void (*func) (route_map_event_t, const char *));
+extern void route_map_compiled_flush (struct route_map *);
+extern void route_map_compiled_flush_all (void);
 
 #ifdef ENABLE_OVSDB
 /* Making route map list. */
@@ -205,6 +227,9 @@ struct route_map_list
   void (*add_hook) (const char *);
   void (*delete_hook) (const char *);
   void (*event_hook) (route_map_event_t, const char *);
+
+  /* Route maps indexed by name. */
+  struct hash *hash;
 };
 
 extern struct route_map_list route_map_master;
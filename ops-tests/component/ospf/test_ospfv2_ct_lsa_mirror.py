@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from time import sleep
+
+
+TOPOLOGY = """
+#
+#
+# +-------+
+# +  sw1  +
+# +-------+
+#
+#
+
+# Nodes
+[type=openswitch name="Switch 1"] sw1
+
+# Links
+sw1:if01
+"""
+
+LSA_MIRROR_SLEEP = 5
+
+
+def get_lsa_mirror(sw1, mode=""):
+    return sw1("ovs-appctl -t ops-ospfd ospf/lsa-mirror {}".format(mode),
+               shell='bash')
+
+
+def test_ospfv2_ct_lsa_mirror(topology, step):
+    '''
+    This test verifies that the LSA database mirroring to OVSDB can be
+    switched between the full, header and none modes and that the LSAs
+    are mirrored in batches
+    '''
+    sw1 = topology.get('sw1')
+
+    assert sw1 is not None
+
+    step('### Configuring OSPF on an interface of SW1 ###')
+    sw1("configure terminal")
+    sw1("interface {}".format(sw1.ports["if01"]))
+    sw1("ip address 10.10.10.1/24")
+    sw1("no shutdown")
+    sw1("exit")
+    sw1("router ospf")
+    sw1("router-id 1.1.1.1")
+    sw1("network 10.10.10.0/24 area 0")
+    sw1("exit")
+    sw1("exit")
+
+    sleep(LSA_MIRROR_SLEEP)
+
+    step('### Verifying the default LSA mirror mode ###')
+    output = get_lsa_mirror(sw1)
+    assert "LSA mirror mode: full" in output, \
+           "The LSA mirror mode is not full by default"
+    assert "LSA batches: 0," not in output, \
+           "The router LSA is not mirrored to OVSDB"
+
+    step('### Verifying the LSA mirror modes ###')
+    for mode in ["header", "none", "full"]:
+        output = get_lsa_mirror(sw1, mode)
+        assert "LSA mirror mode: {}".format(mode) in output, \
+               "Unable to set the LSA mirror mode to " + mode
+
+    output = get_lsa_mirror(sw1, "invalid")
+    assert "Expected full, header or none" in output, \
+           "An invalid LSA mirror mode is accepted"
+
+    step('### Verifying the LSA volatile field interval ###')
+    output = sw1("ovs-appctl -t ops-ospfd ospf/lsa-mirror-interval",
+                 shell='bash')
+    assert "LSA volatile field interval: 0 seconds" in output, \
+           "The LSA volatile fields are not published immediately by default"
+
+    output = sw1("ovs-appctl -t ops-ospfd ospf/lsa-mirror-interval 60",
+                 shell='bash')
+    assert "LSA volatile field interval: 60 seconds" in output, \
+           "Unable to set the LSA volatile field interval"
+
+    output = sw1("ovs-appctl -t ops-ospfd ospf/lsa-mirror-interval 3601",
+                 shell='bash')
+    assert "Expected an interval of 0-3600 seconds" in output, \
+           "An invalid LSA volatile field interval is accepted"
+
+    sw1("ovs-appctl -t ops-ospfd ospf/lsa-mirror-interval 0", shell='bash')
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import re
+from time import sleep, time
+
+
+TOPOLOGY = """
+#
+#            area 0           area 1
+# +-------+          +-------+
+# +  sw1  +----------+  sw2  +---------- 30.0.0.0/24, 20.0.x.0/24
+# +-------+          +-------+
+#
+
+# Nodes
+[type=openswitch name="Switch 1"] sw1
+[type=openswitch name="Switch 2"] sw2
+
+# Links
+sw1:if01 -- sw2:if01
+sw1:if02 -- sw2:if02
+"""
+
+# Number of area 1 subnets summarized by the ABR SW2 into area 0. They
+# are flapped while 30.0.0.0/24 keeps SW2 an ABR, so that SW1 only sees
+# summary-LSA changes.
+AREA1_SUBNET_COUNT = 50
+SUMMARY_FLAP_COUNT = 5
+ADJACENCY_SLEEP = 45
+CONVERGENCE_TIMEOUT = 60
+POLL_TIME = 1
+
+
+def get_area1_subnets():
+    return ["20.0.{}.0/24".format(index)
+            for index in range(1, AREA1_SUBNET_COUNT + 1)]
+
+
+def get_spf_runs(sw1):
+    output = sw1("ovs-appctl -t ops-ospfd ospf/spf-stats", shell='bash')
+    match = re.search(r"SPF runs: full (\d+), partial (\d+)", output)
+    assert match is not None, "Unable to read the SPF statistics"
+    return int(match.group(1)), int(match.group(2))
+
+
+def get_last_spf_duration(sw1):
+    output = sw1("ovs-appctl -t ops-ospfd ospf/spf-stats", shell='bash')
+    match = re.search(r"Last SPF duration: (\d+) usecs", output)
+    assert match is not None, "Unable to read the SPF duration"
+    return int(match.group(1))
+
+
+def wait_for_area1_routes(sw1, if_present):
+    start_time = time()
+
+    while time() - start_time < CONVERGENCE_TIMEOUT:
+        show_ip_route = sw1("show ip route")
+        routes_present = [prefix for prefix in get_area1_subnets()
+                          if prefix in show_ip_route]
+
+        if if_present and len(routes_present) == AREA1_SUBNET_COUNT:
+            return time() - start_time
+
+        if not if_present and len(routes_present) == 0:
+            return time() - start_time
+
+        sleep(POLL_TIME)
+
+    return None
+
+
+def configure_topology(sw1, sw2, step):
+    step('### Configuring SW1 in area 0 ###')
+    sw1("configure terminal")
+    sw1("interface {}".format(sw1.ports["if01"]))
+    sw1("ip address 10.10.10.1/24")
+    sw1("no shutdown")
+    sw1("exit")
+    sw1("router ospf")
+    sw1("router-id 1.1.1.1")
+    sw1("network 10.10.10.0/24 area 0")
+    sw1("exit")
+    sw1("exit")
+
+    step('### Configuring SW2 as ABR with {} subnets in area 1 ###'.format(
+         AREA1_SUBNET_COUNT))
+    sw2("configure terminal")
+    sw2("interface {}".format(sw2.ports["if01"]))
+    sw2("ip address 10.10.10.2/24")
+    sw2("no shutdown")
+    sw2("exit")
+    sw2("interface {}".format(sw2.ports["if02"]))
+    sw2("ip address 30.0.0.1/24")
+    for index in range(1, AREA1_SUBNET_COUNT + 1):
+        sw2("ip address 20.0.{}.1/24 secondary".format(index))
+    sw2("no shutdown")
+    sw2("exit")
+    sw2("router ospf")
+    sw2("router-id 2.2.2.2")
+    sw2("network 10.10.10.0/24 area 0")
+    sw2("network 30.0.0.0/24 area 1")
+    sw2("network 20.0.0.0/16 area 1")
+    sw2("exit")
+    sw2("exit")
+
+
+def flap_area1_network(sw2, enable):
+    sw2("configure terminal")
+    sw2("router ospf")
+    if enable:
+        sw2("network 20.0.0.0/16 area 1")
+    else:
+        sw2("no network 20.0.0.0/16 area 1")
+    sw2("exit")
+    sw2("exit")
+
+
+def test_ospfv2_ct_partial_spf(topology, step):
+    '''
+    This test verifies that summary-LSA changes only trigger partial SPF
+    runs, reusing the intra-area routes of the last full SPF, and reports
+    the time taken by them
+    '''
+    sw1 = topology.get('sw1')
+    sw2 = topology.get('sw2')
+
+    assert sw1 is not None
+    assert sw2 is not None
+
+    configure_topology(sw1, sw2, step)
+
+    sleep(ADJACENCY_SLEEP)
+
+    step('### Verifying the inter-area routes on SW1 ###')
+    assert wait_for_area1_routes(sw1, True) is not None, \
+        "The area 1 subnets are not learnt by SW1"
+
+    full_runs, partial_runs = get_spf_runs(sw1)
+    step("SPF runs before the summary flaps: full {}, "
+         "partial {}".format(full_runs, partial_runs))
+    assert full_runs > 0, "No full SPF was run on SW1"
+
+    step('### Flapping the area 1 subnets on the ABR SW2 ###')
+    durations = []
+    for flap in range(SUMMARY_FLAP_COUNT):
+        flap_area1_network(sw2, False)
+        assert wait_for_area1_routes(sw1, False) is not None, \
+            "The area 1 subnets are not withdrawn from SW1"
+
+        flap_area1_network(sw2, True)
+        assert wait_for_area1_routes(sw1, True) is not None, \
+            "The area 1 subnets are not relearnt by SW1"
+
+        durations.append(get_last_spf_duration(sw1))
+
+    new_full_runs, new_partial_runs = get_spf_runs(sw1)
+    step("SPF runs after the summary flaps: full {}, "
+         "partial {}".format(new_full_runs, new_partial_runs))
+    step("Partial SPF of {} summary-LSAs took {} usecs on "
+         "average".format(AREA1_SUBNET_COUNT,
+                          sum(durations) / len(durations)))
+
+    assert new_partial_runs > partial_runs, \
+        "The summary-LSA changes did not trigger a partial SPF on SW1"
+
+    step('### Verifying the SPF statistics of the area on SW1 ###')
+    output = sw1("ovs-vsctl list OSPF_Area", shell='bash')
+    for key in ["spf_last_duration", "spf_batched_events",
+                "spf_partial_runs", "spf_reason_summary_lsa"]:
+        assert key in output, "The SPF statistic " + key + " is not " \
+            "published to the OSPF area"
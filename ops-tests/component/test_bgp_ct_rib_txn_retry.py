@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+#
+# GNU Zebra is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2, or (at your option) any
+# later version.
+#
+# GNU Zebra is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GNU Zebra; see the file COPYING.  If not, write to the Free
+# Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
+# 02111-1307, USA.
+
+from helpers_routing import wait_for_route
+from re import match
+
+TOPOLOGY = """
+# +-------+
+# |       |     +-------+
+# |  hsw1  <----->  sw1  |
+# |       |     +-------+
+# +-------+
+
+# Nodes
+[type=openswitch name="Switch 1"] sw1
+[type=host name="Host 1"] hsw1
+
+# Links
+hsw1:if01 -- sw1:if01
+"""
+
+
+BGP_ASN = "1"
+BGP_ROUTER_ID = "9.0.0.1"
+BGP_NETWORKS = ["11.0.0.0", "12.0.0.0"]
+BGP_PL = "8"
+NEXT_HOP = "0.0.0.0"
+
+
+def get_rib_txn_stat(switch, name):
+    """
+    This function returns the RIB transaction batching statistic 'name'
+    reported by bgpd.
+    """
+    output = switch("ovs-appctl -t ops-bgpd bgpd/rib-txn-batch",
+                    shell="bash")
+    for line in output.splitlines():
+        stat = match(r"\s*{}: (\d+)".format(name), line)
+        if stat is not None:
+            return int(stat.group(1))
+    assert False, 'Missing "{}" in "bgpd/rib-txn-batch"'.format(name)
+
+
+def fail_rib_txn_batches(switch, batches, status):
+    output = switch("ovs-appctl -t ops-bgpd bgpd/rib-txn-fail {} {}".format(
+                    batches, status), shell="bash")
+    assert "Failing the next {} RIB txn batches".format(batches) in output
+
+
+def test_bgp_ct_rib_txn_retry(topology, step):
+    sw1 = topology.get("sw1")
+    assert sw1 is not None
+
+    step("1-Verifying bgp processes...")
+    pid = sw1("pgrep -f bgpd", shell='bash')
+    pid = pid.strip()
+    assert pid != "" and pid is not None
+
+    step("2-Applying BGP configurations")
+    sw1("configure terminal")
+    sw1("router bgp {}".format(BGP_ASN))
+    sw1("bgp router-id {}".format(BGP_ROUTER_ID))
+    retried = get_rib_txn_stat(sw1, "Retried route requests")
+
+    step("3-Adding networks with failing RIB transactions")
+    for network, status in zip(BGP_NETWORKS, ["error", "try-again"]):
+        fail_rib_txn_batches(sw1, 1, status)
+        sw1("network {}/{}".format(network, BGP_PL))
+        wait_for_route(sw1, NEXT_HOP, network)
+
+    assert get_rib_txn_stat(sw1, "Retried route requests") >= \
+        retried + len(BGP_NETWORKS), \
+        "The routes of the failed RIB transactions were not retried"
+
+    step("4-Removing networks with failing RIB transactions")
+    retried = get_rib_txn_stat(sw1, "Retried route requests")
+    for network in BGP_NETWORKS:
+        fail_rib_txn_batches(sw1, 1, "error")
+        sw1("no network {}/{}".format(network, BGP_PL))
+        wait_for_route(sw1, NEXT_HOP, network, exists=False)
+
+    assert get_rib_txn_stat(sw1, "Retried route requests") >= \
+        retried + len(BGP_NETWORKS), \
+        "The routes of the failed RIB transactions were not retried"
+    assert get_rib_txn_stat(sw1, "Dropped route requests") == 0, \
+        "Route requests were dropped after failed RIB transactions"
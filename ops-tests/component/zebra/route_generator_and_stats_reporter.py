@@ -17,7 +17,7 @@
 # Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
 # 02111-1307, USA.
 
-from time import sleep
+from time import sleep, time
 
 IPV4_MIN_OCTET_NUMBER = 1
 IPV4_MAX_OCTET_NUMBER = 200
@@ -144,6 +144,79 @@ def print_route_list_stats(route_list, time_elapsed, time_test_snapshot,
     return perf_stat_dict
 
 
+def get_show_ip_route_prefix_set(show_ip_route_output):
+    prefix_set = set()
+
+    if show_ip_route_output is None:
+        return prefix_set
+
+    # Every selected route starts with a line "<prefix>,  <n> unicast
+    # next-hops", followed by the indented next-hop lines
+    for line in show_ip_route_output.splitlines():
+        words = line.split()
+        if len(words) > 0 and '/' in words[0]:
+            prefix_set.add(words[0].rstrip(','))
+
+    return prefix_set
+
+
+def get_show_running_route_set(show_running_output, if_ipv4):
+    route_set = set()
+
+    if show_running_output is None:
+        return route_set
+
+    route_command = "ip" if if_ipv4 is True else "ipv6"
+
+    # The static routes are displayed as "ip route <prefix> <nexthop>"
+    # with an optional distance and vrf following the next-hop
+    for line in show_running_output.splitlines():
+        words = line.split()
+        if len(words) >= 4 and words[0] == route_command and \
+           words[1] == "route":
+            route_set.add((words[2], words[3]))
+
+    return route_set
+
+
+def get_kernel_ip_route_prefix_set(kernel_ip_route_output, if_ipv4):
+    prefix_set = set()
+
+    if kernel_ip_route_output is None:
+        return prefix_set
+
+    host_prefix_len = "/32" if if_ipv4 is True else "/128"
+
+    # The kernel displays the host routes without the prefix length, and
+    # the next-hops of a multipath route on indented lines
+    for line in kernel_ip_route_output.splitlines():
+        if not line or line[0].isspace():
+            continue
+
+        prefix = line.split()[0]
+        if prefix == "default":
+            continue
+
+        if '/' not in prefix:
+            prefix = prefix + host_prefix_len
+
+        prefix_set.add(prefix)
+
+    return prefix_set
+
+
+def update_static_route_list_with_route_status(route_list,
+                                               show_ip_route_prefix_set,
+                                               kernel_ip_route_prefix_set,
+                                               show_running_route_set):
+    for route in route_list:
+        route["show ip route"] = route['Prefix'] in show_ip_route_prefix_set
+        route["kernel ip route"] = \
+            route['Prefix'] in kernel_ip_route_prefix_set
+        route["running-config"] = \
+            (route['Prefix'], route['Nexthop']) in show_running_route_set
+
+
 def update_static_route_list_with_route_status_in_show_ip_route(
                                                     show_ip_route_output,
                                                     route_list):
@@ -155,12 +228,10 @@ def update_static_route_list_with_route_status_in_show_ip_route(
         print("The route list is None")
         return
 
-    for route in route_list:
-       route["show ip route"] = False
+    prefix_set = get_show_ip_route_prefix_set(show_ip_route_output)
 
-       if route['Prefix'] in show_ip_route_output:
-            #print("Found a match for " + route['Prefix'])
-            route["show ip route"] = True
+    for route in route_list:
+        route["show ip route"] = route['Prefix'] in prefix_set
 
 
 def update_static_route_list_with_route_status_in_show_running(
@@ -179,19 +250,11 @@ def update_static_route_list_with_route_status_in_show_running(
         print("Ipv4 flag is None" )
         return(None)
 
-    for route in route_list:
-       route["running-config"] = False
-
-       if if_ipv4 is True:
-            show_running_config_string = \
-                    "ip route %s %s" %(route['Prefix'], route['Nexthop'])
-       else:
-            show_running_config_string = \
-                    "ipv6 route %s %s" %(route['Prefix'], route['Nexthop'])
+    route_set = get_show_running_route_set(show_running_output, if_ipv4)
 
-       if show_running_config_string in show_running_output:
-            #print("Found a match for " + route['Prefix'])
-            route["running-config"] = True
+    for route in route_list:
+        route["running-config"] = \
+            (route['Prefix'], route['Nexthop']) in route_set
 
 
 def update_static_route_list_with_route_status_in_kernel_ip_route(
@@ -205,14 +268,15 @@ def update_static_route_list_with_route_status_in_kernel_ip_route(
         print("The route list is None")
         return
 
-    for route in route_list:
-       route["kernel ip route"] = False
+    if len(route_list) == 0:
+        return
 
-       [prefix, masklen] = route["Prefix"].split('/')
+    if_ipv4 = ':' not in route_list[0]['Prefix']
+    prefix_set = get_kernel_ip_route_prefix_set(kernel_ip_route_output,
+                                                if_ipv4)
 
-       if prefix in kernel_ip_route_output:
-            #print("Found a match for " + route['Prefix'])
-            route["kernel ip route"] = True
+    for route in route_list:
+        route["kernel ip route"] = route['Prefix'] in prefix_set
 
 
 def capture_output_samples_and_generate_perf_stats(
@@ -245,12 +309,13 @@ def capture_output_samples_and_generate_perf_stats(
     print("Capturing route output samples..")
 
     time_inc = 0
-    index = 0
-    show_ip_route_dump_list = []
-    kernel_ip_route_dump_list = []
-    show_running_dump_list = []
+    final_route_perf_stat_dict = None
 
+    # Every sample is reduced to the sets of prefixes found in the outputs
+    # as soon as it is captured, so that only one sample is held in memory
+    # and the route list is matched against the sample in O(routes)
     while time_inc <= total_time:
+        sample_start_time = time()
 
         if if_ipv4 is True:
             show_ip_route = switch("show ip route")
@@ -263,33 +328,11 @@ def capture_output_samples_and_generate_perf_stats(
 
         show_running = switch("show running-config")
 
-        show_ip_route_dump_list.append(show_ip_route)
-        kernel_ip_route_dump_list.append(kernel_ip_route)
-        show_running_dump_list.append(show_running)
-
-        sleep(sampling_time)
-        time_inc = time_inc + sampling_time
-
-    print("Finsih capturing output samples")
-
-    time_inc = 0
-    index = 0
-    final_route_perf_stat_dict = None
-    while time_inc <= total_time:
-
-        update_static_route_list_with_route_status_in_show_ip_route(
-                              show_ip_route_dump_list[index], route_list)
-        update_static_route_list_with_route_status_in_kernel_ip_route(
-                              kernel_ip_route_dump_list[index], route_list)
-
-        if if_ipv4 is True:
-            update_static_route_list_with_route_status_in_show_running(
-                                  show_running_dump_list[index], True,
-                                  route_list)
-        else:
-            update_static_route_list_with_route_status_in_show_running(
-                                  show_running_dump_list[index], False,
-                                  route_list)
+        update_static_route_list_with_route_status(
+                route_list,
+                get_show_ip_route_prefix_set(show_ip_route),
+                get_kernel_ip_route_prefix_set(kernel_ip_route, if_ipv4),
+                get_show_running_route_set(show_running, if_ipv4))
 
         route_perf_stat_dict = print_route_list_stats(route_list, time_inc,
                                                       time_test_snapshot,
@@ -298,14 +341,42 @@ def capture_output_samples_and_generate_perf_stats(
         if route_perf_stat_dict is not None:
             final_route_perf_stat_dict = route_perf_stat_dict
 
+        # Keep the sampling period, including the time spent on the sample
+        sleep(max(0, sampling_time - (time() - sample_start_time)))
         time_inc = time_inc + sampling_time
-        index = index + 1
+
+    print("Finsih capturing output samples")
 
     return final_route_perf_stat_dict
 
 
+def get_zebra_coverage_counter(switch, counter_name):
+    if switch is None:
+        print("Switch is None")
+        return(None)
+
+    if counter_name is None:
+        print("The counter name is None")
+        return(None)
+
+    coverage_output = switch("ovs-appctl -t ops-zebra coverage/show",
+                             shell='bash')
+
+    # Coverage counters which were never incremented are not displayed
+    for line in coverage_output.splitlines():
+        words = line.split()
+        if len(words) > 0 and words[0] == counter_name and "total:" in words:
+            return int(words[words.index("total:") + 1])
+
+    return 0
+
+
 __all__ = ["get_static_route_dict", "print_route_list_stats",
+           "get_show_ip_route_prefix_set", "get_show_running_route_set",
+           "get_kernel_ip_route_prefix_set",
+           "update_static_route_list_with_route_status",
            "update_static_route_list_with_route_status_in_show_ip_route",
            "update_static_route_list_with_route_status_in_kernel_ip_route",
            "update_static_route_list_with_route_status_in_show_running",
-           "capture_output_samples_and_generate_perf_stats"]
+           "capture_output_samples_and_generate_perf_stats",
+           "get_zebra_coverage_counter"]
@@ -66,6 +66,37 @@ def test_zebra_diag_dump(topology, step):
     assert '-------- Zebra memory dump: --------' in output, \
            'Missing memory dump in "zebra/dump memory" output'
 
+    step('### Testing output of "ovs-appctl -t ops-zebra zebra/dump txn" ###')
+    output = sw1("ovs-appctl -t ops-zebra zebra/dump txn", shell="bash")
+    assert '-------- Zebra OVSDB transaction dump: --------' in output, \
+           'Missing transaction dump in "zebra/dump txn" output'
+    assert 'Batch size target:' in output, \
+           'Missing batch size in "zebra/dump txn" output'
+    assert 'Commit latency:' in output, \
+           'Missing commit latency in "zebra/dump txn" output'
+    assert 'Selected writes collapsed:' in output, \
+           'Missing suppressed selected writes in "zebra/dump txn" output'
+
+    step('### Testing output of "ovs-appctl -t ops-zebra zebra/dump route-pipeline" ###')
+    output = sw1("ovs-appctl -t ops-zebra zebra/dump route-pipeline",
+                 shell="bash")
+    assert '-------- Zebra route pipeline dump: --------' in output, \
+           'Missing route pipeline dump in "zebra/dump route-pipeline" output'
+    assert 'Route pipeline mode: disabled' in output, \
+           'Route pipeline is not disabled by default'
+
+    step('### Testing "ovs-appctl -t ops-zebra zebra/route-pipeline" ###')
+    output = sw1("ovs-appctl -t ops-zebra zebra/route-pipeline enable",
+                 shell="bash")
+    assert 'Route pipeline mode: enabled' in output, \
+           'Route pipeline not enabled by "zebra/route-pipeline enable"'
+    assert 'Routes submitted:' in output, \
+           'Missing route statistics in "zebra/route-pipeline" output'
+    output = sw1("ovs-appctl -t ops-zebra zebra/route-pipeline disable",
+                 shell="bash")
+    assert 'Route pipeline mode: disabled' in output, \
+           'Route pipeline not disabled by "zebra/route-pipeline disable"'
+
     step('### Testing output of CLI command "diag-dump route-manager basic" ###')
     output = sw1('diag-dump route-manager basic')
     assert '-------- Zebra internal IPv4 routes dump: --------' in output, \
@@ -101,6 +132,10 @@ def test_zebra_diag_dump(topology, step):
            'Missing L3 port cache dump in "zebra/dump" output'
     assert '-------- Zebra memory dump: --------' in output, \
            'Missing memory dump in "zebra/dump" output'
+    assert '-------- Zebra OVSDB transaction dump: --------' in output, \
+           'Missing transaction dump in "zebra/dump" output'
+    assert '-------- Zebra route pipeline dump: --------' in output, \
+           'Missing route pipeline dump in "zebra/dump" output'
 
     step('### Testing invalid arguments to "ovs-appctl -t ops-zebra zebra/debug" ###')
     output = sw1("ovs-appctl -t ops-zebra zebra/debug unsupported", shell="bash")
@@ -0,0 +1,124 @@
+#!/usr/bin/python
+
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+#
+# GNU Zebra is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2, or (at your option) any
+# later version.
+#
+# GNU Zebra is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GNU Zebra; see the file COPYING.  If not, write to the Free
+# Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
+# 02111-1307, USA.
+
+from helpers_routing import (
+    ZEBRA_TEST_SLEEP_TIME,
+    verify_show_ip_route,
+    verify_show_rib
+)
+from route_generator_and_stats_reporter import get_zebra_coverage_counter
+from time import sleep
+
+TOPOLOGY = """
+# +-------+    +-------+
+# |       <---->       |
+# |  sw1  |    |  sw2  |
+# |       <---->       |
+# +-------+    +-------+
+
+# Nodes
+[type=openswitch name="Switch 1"] sw1
+[type=openswitch name="Switch 2"] sw2
+
+# Links
+sw1:if01 -- sw2:if01
+sw1:if02 -- sw2:if02
+"""
+
+
+ECMP_ROUTE = "123.0.0.0/24"
+FLAP_COUNT = 5
+
+
+def get_ecmp_route_dict(nexthops):
+    route_dict = dict()
+    route_dict['Route'] = ECMP_ROUTE
+    route_dict['NumberNexthops'] = str(len(nexthops))
+    for nexthop in nexthops:
+        route_dict[nexthop] = dict()
+        route_dict[nexthop]['Distance'] = '1'
+        route_dict[nexthop]['Metric'] = '0'
+        route_dict[nexthop]['RouteType'] = 'static'
+    return route_dict
+
+
+def configure_ecmp_route(sw1, step):
+    step("### Configuring an ECMP static route over two ports on SW1 ###")
+    sw1("configure terminal")
+
+    sw1("interface {}".format(sw1.ports["if01"]))
+    sw1("ip address 10.0.10.1/24")
+    sw1("no shutdown")
+    sw1("exit")
+
+    sw1("interface {}".format(sw1.ports["if02"]))
+    sw1("ip address 10.0.20.1/24")
+    sw1("no shutdown")
+    sw1("exit")
+
+    sw1("ip route {} {}".format(ECMP_ROUTE, sw1.ports["if01"]))
+    sw1("ip route {} {}".format(ECMP_ROUTE, sw1.ports["if02"]))
+
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+
+def flap_ecmp_member(sw1, last_state):
+    # The port state changes are issued back to back, so that zebra
+    # publishes the next selected flag while its earlier commits are still
+    # waiting for the OVSDB reply.
+    sw1("interface {}".format(sw1.ports["if02"]))
+    for i in range(FLAP_COUNT):
+        sw1("shutdown")
+        sw1("no shutdown")
+    sw1(last_state)
+    sw1("exit")
+
+
+def test_zebra_ct_ecmp_selected_flap(topology, step):
+    sw1 = topology.get("sw1")
+    sw2 = topology.get("sw2")
+
+    assert sw1 is not None
+    assert sw2 is not None
+
+    configure_ecmp_route(sw1, step)
+
+    both_nexthops = get_ecmp_route_dict([sw1.ports["if01"],
+                                         sw1.ports["if02"]])
+    verify_show_ip_route(sw1, ECMP_ROUTE, 'static', both_nexthops)
+
+    step("### Flapping an ECMP member and leaving it down ###")
+    commits_before = get_zebra_coverage_counter(sw1, "zebra_txn_commit")
+    flap_ecmp_member(sw1, "shutdown")
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+    assert get_zebra_coverage_counter(sw1, "zebra_txn_commit") > \
+        commits_before + 1, "The port flaps were not published in " \
+        "separate transactions"
+
+    verify_show_ip_route(sw1, ECMP_ROUTE, 'static',
+                         get_ecmp_route_dict([sw1.ports["if01"]]))
+    verify_show_rib(sw1, ECMP_ROUTE, 'static', both_nexthops)
+
+    step("### Flapping an ECMP member and leaving it up ###")
+    flap_ecmp_member(sw1, "no shutdown")
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+    verify_show_ip_route(sw1, ECMP_ROUTE, 'static', both_nexthops)
+    verify_show_rib(sw1, ECMP_ROUTE, 'static', both_nexthops)
@@ -19,7 +19,8 @@
 
 from route_generator_and_stats_reporter import (
     get_static_route_dict,
-    capture_output_samples_and_generate_perf_stats
+    capture_output_samples_and_generate_perf_stats,
+    get_zebra_coverage_counter
 )
 
 from time import sleep
@@ -52,6 +53,9 @@ TOTAL_TIME = 8
 SAMPLING_TIME = 2
 TRIGGER_SLEEP = 5
 SNAPSHOT_TIME = 2 * SAMPLING_TIME
+# Upper bound on the OVSDB route rows zebra may visit for a single
+# static route flap, independent of the number of routes configured
+SINGLE_ROUTE_FLAP_MAX_ROWS_VISITED = 4
 zebra_stop_command_string = "systemctl stop ops-zebra"
 zebra_start_command_string = "systemctl start ops-zebra"
 
@@ -120,6 +124,62 @@ def ConfigureIpv4StaticRoutes(sw1, sw2, ipv4_route_list, step):
            actual: " + str(perf_stats_dict['TotalShowRunning'])
 
 
+def SingleStaticRouteFlap(sw1, sw2, ipv4_route_list, step):
+    step('### Test zebra route processing cost on single static route flap ###')
+
+    route = ipv4_route_list[0]
+
+    rows_visited_before = get_zebra_coverage_counter(
+                                         sw1, "zebra_route_rows_visited")
+    delta_deletes_before = get_zebra_coverage_counter(
+                                         sw1, "zebra_route_delta_delete")
+
+    sw1("configure terminal")
+    sw1("no ip route {} {}".format(route['Prefix'], route['Nexthop']))
+    sw1("ip route {} {}".format(route['Prefix'], route['Nexthop']))
+    sw1("exit")
+
+    sleep(TRIGGER_SLEEP)
+
+    rows_visited_after = get_zebra_coverage_counter(
+                                         sw1, "zebra_route_rows_visited")
+
+    rows_visited = rows_visited_after - rows_visited_before
+
+    delta_deletes_after = get_zebra_coverage_counter(
+                                         sw1, "zebra_route_delta_delete")
+
+    assert delta_deletes_after > delta_deletes_before, "The route delete \
+           was not processed from the deleted next-hop rows"
+
+    step("Route rows visited for a single route flap with {} routes: "
+         "{}".format(MAX_IPV4_ROUTE, rows_visited))
+
+    assert rows_visited <= SINGLE_ROUTE_FLAP_MAX_ROWS_VISITED, "Zebra \
+           visited " + str(rows_visited) + " route rows for a single \
+           route flap, expected at most " + \
+           str(SINGLE_ROUTE_FLAP_MAX_ROWS_VISITED)
+
+    perf_stats_dict = capture_output_samples_and_generate_perf_stats(
+                                     sw1, ipv4_route_list,
+                                     "Single static route flap", True,
+                                     TOTAL_TIME, SAMPLING_TIME,
+                                     SNAPSHOT_TIME)
+
+    assert perf_stats_dict is not None, "No perf stat captured \
+           at "  + str(SNAPSHOT_TIME) + "seconds"
+
+    assert perf_stats_dict['TotalShowIpRoute'] == MAX_IPV4_ROUTE,  "The \
+           show ip route captured at " + str(SNAPSHOT_TIME) + " seconds \
+           are not same expected: " + str(MAX_IPV4_ROUTE) + " \
+           actual: " + str(perf_stats_dict['TotalShowIpRoute'])
+
+    assert perf_stats_dict['TotalKernelIpRoute'] == MAX_IPV4_ROUTE,  "The \
+           kernel ip route captured at " + str(SNAPSHOT_TIME) + " seconds \
+           are not same expected: " + str(MAX_IPV4_ROUTE) + " \
+           actual: " + str(perf_stats_dict['TotalKernelIpRoute'])
+
+
 def InterfaceDown(sw1, sw2, ipv4_route_list, step):
     step('### Test selection of static routes on interface shutdown ###')
 
@@ -329,6 +389,7 @@ def test_zebra_ct_ipv4_scale_tests(topology, step):
     assert sw2 is not None
 
     ConfigureIpv4StaticRoutes(sw1, sw2, ipv4_route_list, step)
+    SingleStaticRouteFlap(sw1, sw2, ipv4_route_list, step)
     InterfaceDown(sw1, sw2, ipv4_route_list, step)
     InterfaceUp(sw1, sw2, ipv4_route_list, step)
     InterfaceAddrChange(sw1, sw2, ipv4_route_list, step)
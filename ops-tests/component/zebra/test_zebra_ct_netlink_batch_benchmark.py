@@ -0,0 +1,176 @@
+#!/usr/bin/python
+
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+#
+# GNU Zebra is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2, or (at your option) any
+# later version.
+#
+# GNU Zebra is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GNU Zebra; see the file COPYING.  If not, write to the Free
+# Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
+# 02111-1307, USA.
+
+from route_generator_and_stats_reporter import (
+    get_static_route_dict,
+    get_kernel_ip_route_prefix_set
+)
+
+from time import sleep, time
+
+TOPOLOGY = """
+# +-------+    +-------+
+# |       |    |       |
+# |       <---->       |
+# |  sw1  |    |  sw2  |
+# |       |    |       |
+# |       |    |       |
+# +-------+    +-------+
+
+# Nodes
+[type=openswitch name="Switch 1"] sw1
+[type=openswitch name="Switch 2"] sw2
+
+# Links
+sw1:if01 -- sw2:if01
+"""
+
+
+# Number of static routes reprogrammed in the kernel on every uplink flap
+MAX_IPV4_ROUTE = 2000
+TRIGGER_SLEEP = 5
+CONVERGENCE_TIMEOUT = 120
+POLL_TIME = 0.5
+NETLINK_BATCH_MODES = ["disable", "enable"]
+zebra_stop_command_string = "systemctl stop ops-zebra"
+zebra_start_command_string = "systemctl start ops-zebra"
+
+
+def ConfigureUplinkAndRoutes(sw1, ipv4_route_list, step):
+    step("Configuring the uplink and {} static routes on SW1".format(
+                                                    len(ipv4_route_list)))
+
+    # Stop ops-zebra process on sw1
+    sw1(zebra_stop_command_string, shell='bash')
+
+    sw1("configure terminal")
+
+    sw1("interface {}".format(sw1.ports["if01"]))
+    sw1("ip address 10.1.1.1/24")
+    sw1("no shutdown")
+    sw1("exit")
+
+    for route in ipv4_route_list:
+        sw1("ip route {} {}".format(route['Prefix'], route['Nexthop']))
+
+    sw1("exit")
+
+    # Start ops-zebra process on sw1
+    sw1(zebra_start_command_string, shell='bash')
+
+    sleep(TRIGGER_SLEEP)
+
+
+def GetKernelRouteCount(sw1, ipv4_route_list):
+    kernel_ip_route = sw1("ip netns exec swns ip route", shell='bash')
+    kernel_prefixes = get_kernel_ip_route_prefix_set(kernel_ip_route, True)
+
+    return len([route for route in ipv4_route_list
+                if route['Prefix'] in kernel_prefixes])
+
+
+def WaitForKernelRoutes(sw1, ipv4_route_list, expected_count):
+    start_time = time()
+
+    while time() - start_time < CONVERGENCE_TIMEOUT:
+        if GetKernelRouteCount(sw1, ipv4_route_list) == expected_count:
+            return time() - start_time
+
+        sleep(POLL_TIME)
+
+    return None
+
+
+def MeasureKernelReprogramming(sw1, ipv4_route_list, mode, step):
+    step("### Measure kernel route reprogramming with netlink batch "
+         "mode {}d ###".format(mode))
+
+    output = sw1("ovs-appctl -t ops-zebra zebra/netlink-batch {}".format(
+                 mode), shell='bash')
+    assert "Netlink batch mode: {}d".format(mode) in output, \
+           "Unable to " + mode + " the netlink batch mode"
+
+    sw1("configure terminal")
+    sw1("interface {}".format(sw1.ports["if01"]))
+    sw1("shutdown")
+    sw1("exit")
+    sw1("exit")
+
+    assert WaitForKernelRoutes(sw1, ipv4_route_list, 0) is not None, \
+           "The static routes are still in the kernel after the " \
+           "uplink shutdown"
+
+    sw1("configure terminal")
+    sw1("interface {}".format(sw1.ports["if01"]))
+    sw1("no shutdown")
+    sw1("exit")
+    sw1("exit")
+
+    install_time = WaitForKernelRoutes(sw1, ipv4_route_list,
+                                       len(ipv4_route_list))
+
+    assert install_time is not None, "The static routes are not " \
+           "reprogrammed in the kernel after " + \
+           str(CONVERGENCE_TIMEOUT) + " seconds"
+
+    output = sw1("ovs-appctl -t ops-zebra zebra/netlink-batch",
+                 shell='bash')
+    step(output)
+
+    if mode == "enable":
+        assert "Route messages acknowledged: 0," not in output, \
+               "No route messages were acknowledged in batch mode"
+        assert "failed: 0," in output, \
+               "Route messages failed in batch mode"
+
+    step("Kernel reprogramming of {} routes with netlink batch mode "
+         "{}d took {:.2f} seconds".format(len(ipv4_route_list), mode,
+                                          install_time))
+
+    return install_time
+
+
+def test_zebra_ct_netlink_batch_benchmark(topology, step):
+    sw1 = topology.get("sw1")
+    sw2 = topology.get("sw2")
+
+    assert sw1 is not None
+    assert sw2 is not None
+
+    ipv4_route_list = get_static_route_dict(MAX_IPV4_ROUTE, True,
+                                            '10.1.1.2')
+
+    ConfigureUplinkAndRoutes(sw1, ipv4_route_list, step)
+
+    assert WaitForKernelRoutes(sw1, ipv4_route_list,
+                               len(ipv4_route_list)) is not None, \
+           "The static routes are not programmed in the kernel"
+
+    install_times = {}
+    for mode in NETLINK_BATCH_MODES:
+        install_times[mode] = MeasureKernelReprogramming(sw1,
+                                                         ipv4_route_list,
+                                                         mode, step)
+
+    sw1("ovs-appctl -t ops-zebra zebra/netlink-batch disable", shell='bash')
+
+    step("Kernel reprogramming of {} routes: per-route {:.2f} seconds, "
+         "batched {:.2f} seconds".format(MAX_IPV4_ROUTE,
+                                         install_times["disable"],
+                                         install_times["enable"]))
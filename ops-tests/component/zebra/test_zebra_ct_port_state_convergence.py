@@ -0,0 +1,186 @@
+#!/usr/bin/python
+
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+#
+# GNU Zebra is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2, or (at your option) any
+# later version.
+#
+# GNU Zebra is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GNU Zebra; see the file COPYING.  If not, write to the Free
+# Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
+# 02111-1307, USA.
+
+from route_generator_and_stats_reporter import (
+    get_static_route_dict,
+    get_zebra_coverage_counter
+)
+
+from time import sleep, time
+
+TOPOLOGY = """
+# +-------+    +-------+
+# |       |    |       |
+# |       <---->       |
+# |  sw1  |    |  sw2  |
+# |       |    |       |
+# |       |    |       |
+# +-------+    +-------+
+
+# Nodes
+[type=openswitch name="Switch 1"] sw1
+[type=openswitch name="Switch 2"] sw2
+
+# Links
+sw1:if01 -- sw2:if01
+sw1:if02 -- sw2:if02
+"""
+
+
+# Number of static routes on the first uplink for each measurement. The
+# static routes on the second uplink stay the same.
+IPV4_ROUTE_SCALE_LIST = [100, 1000]
+IPV4_FLAP_ROUTE_COUNT = 10
+TRIGGER_SLEEP = 5
+CONVERGENCE_TIMEOUT = 60
+POLL_TIME = 0.5
+zebra_stop_command_string = "systemctl stop ops-zebra"
+zebra_start_command_string = "systemctl start ops-zebra"
+
+
+def get_flap_route_list():
+    return ["172.16.{}.0/24".format(index)
+            for index in range(1, IPV4_FLAP_ROUTE_COUNT + 1)]
+
+
+def ConfigureUplinks(sw1, step):
+    step("Configuring the uplink interfaces on SW1")
+
+    sw1("configure terminal")
+
+    sw1("interface {}".format(sw1.ports["if01"]))
+    sw1("ip address 10.1.1.1/24")
+    sw1("no shutdown")
+    sw1("exit")
+
+    sw1("interface {}".format(sw1.ports["if02"]))
+    sw1("ip address 10.2.2.1/24")
+    sw1("no shutdown")
+    sw1("exit")
+
+    for prefix in get_flap_route_list():
+        sw1("ip route {} 10.2.2.2".format(prefix))
+
+    sw1("exit")
+
+    sleep(TRIGGER_SLEEP)
+
+
+def ConfigureScaleRoutes(sw1, ipv4_route_list, step):
+    step("Configuring {} static routes on the first uplink".format(
+                                                    len(ipv4_route_list)))
+
+    # Stop ops-zebra process on sw1
+    sw1(zebra_stop_command_string, shell='bash')
+
+    sw1("configure terminal")
+    for route in ipv4_route_list:
+        sw1("ip route {} {}".format(route['Prefix'], route['Nexthop']))
+    sw1("exit")
+
+    # Start ops-zebra process on sw1
+    sw1(zebra_start_command_string, shell='bash')
+
+    sleep(TRIGGER_SLEEP)
+
+
+def WaitForFlapRoutes(sw1, if_present):
+    start_time = time()
+
+    while time() - start_time < CONVERGENCE_TIMEOUT:
+        show_ip_route = sw1("show ip route")
+        routes_present = [prefix for prefix in get_flap_route_list()
+                          if prefix in show_ip_route]
+
+        if if_present and len(routes_present) == IPV4_FLAP_ROUTE_COUNT:
+            return time() - start_time
+
+        if not if_present and len(routes_present) == 0:
+            return time() - start_time
+
+        sleep(POLL_TIME)
+
+    return None
+
+
+def MeasureUplinkFlap(sw1, route_count, step):
+    step("### Measure convergence of an uplink shutdown with {} routes "
+         "on the other uplink ###".format(route_count))
+
+    nodes_visited_before = get_zebra_coverage_counter(
+                               sw1, "zebra_port_event_route_nodes_visited")
+
+    sw1("configure terminal")
+    sw1("interface {}".format(sw1.ports["if02"]))
+    sw1("shutdown")
+    sw1("exit")
+    sw1("exit")
+
+    convergence_time = WaitForFlapRoutes(sw1, False)
+
+    assert convergence_time is not None, "The static routes on the " \
+           "shutdown uplink are still selected after " + \
+           str(CONVERGENCE_TIMEOUT) + " seconds"
+
+    nodes_visited = get_zebra_coverage_counter(
+                        sw1, "zebra_port_event_route_nodes_visited") - \
+                    nodes_visited_before
+
+    step("Uplink shutdown with {} routes converged in {:.2f} seconds, "
+         "route nodes visited {}".format(route_count, convergence_time,
+                                         nodes_visited))
+
+    # Only the static routes resolving through the shutdown uplink
+    # should be revisited, irrespective of the routes on the other uplink
+    assert nodes_visited <= IPV4_FLAP_ROUTE_COUNT, "Zebra visited " + \
+           str(nodes_visited) + " route nodes for an uplink shutdown, " \
+           "expected at most " + str(IPV4_FLAP_ROUTE_COUNT)
+
+    sw1("configure terminal")
+    sw1("interface {}".format(sw1.ports["if02"]))
+    sw1("no shutdown")
+    sw1("exit")
+    sw1("exit")
+
+    assert WaitForFlapRoutes(sw1, True) is not None, "The static routes " \
+           "on the uplink are not selected after the uplink is up"
+
+    return convergence_time
+
+
+def test_zebra_ct_port_state_convergence(topology, step):
+    sw1 = topology.get("sw1")
+    sw2 = topology.get("sw2")
+
+    assert sw1 is not None
+    assert sw2 is not None
+
+    ConfigureUplinks(sw1, step)
+
+    convergence_times = {}
+    for route_count in IPV4_ROUTE_SCALE_LIST:
+        ipv4_route_list = get_static_route_dict(route_count, True,
+                                                '10.1.1.2')
+        ConfigureScaleRoutes(sw1, ipv4_route_list, step)
+        convergence_times[route_count] = MeasureUplinkFlap(sw1, route_count,
+                                                           step)
+
+    for route_count in IPV4_ROUTE_SCALE_LIST:
+        step("Routes: {} Uplink shutdown convergence: {:.2f} "
+             "seconds".format(route_count, convergence_times[route_count]))
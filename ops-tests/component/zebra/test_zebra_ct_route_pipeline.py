@@ -0,0 +1,266 @@
+#!/usr/bin/python
+
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+#
+# GNU Zebra is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2, or (at your option) any
+# later version.
+#
+# GNU Zebra is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GNU Zebra; see the file COPYING.  If not, write to the Free
+# Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
+# 02111-1307, USA.
+
+from helpers_routing import (
+    ZEBRA_TEST_SLEEP_TIME,
+    verify_show_ip_route,
+    verify_show_rib,
+    verify_route_in_show_kernel_route
+)
+from re import match
+from time import sleep
+
+TOPOLOGY = """
+# +-------+    +-------+
+# |  sw1  <---->  sw2  |
+# +-------+    +-------+
+
+# Nodes
+[type=openswitch name="Switch 1"] sw1
+[type=openswitch name="Switch 2"] sw2
+
+# Links
+sw1:if01 -- sw2:if01
+"""
+
+
+BGP_ROUTES = ["143.0.0.1/32", "153.0.0.0/24"]
+BGP_NEXTHOP = "10.0.10.2"
+BGP_MODIFIED_NEXTHOP = "10.0.10.3"
+
+
+def get_vrf_uuid(switch, vrf_name):
+    """
+    This function takes a switch and a vrf_name as inputs and returns
+    the uuid of the vrf.
+    """
+    output = switch('list vrf {}'.format(vrf_name), shell='vsctl')
+    vrf_uuid = None
+    for line in output.splitlines():
+        vrf_uuid = match("(.*)_uuid( +): (.*)", line)
+        if vrf_uuid is not None:
+            break
+    assert vrf_uuid is not None
+    return vrf_uuid.group(3).rstrip('\r')
+
+
+def get_route_selected(switch, route):
+    """
+    This function returns the selected column of the BGP route row for
+    the prefix 'route', or None if there is no such row.
+    """
+    output = switch('find Route prefix="{}" from=bgp'.format(route),
+                    shell='vsctl')
+    for line in output.splitlines():
+        selected = match("selected( +): (.*)", line)
+        if selected is not None:
+            return selected.group(2).rstrip('\r')
+    return None
+
+
+def get_route_pipeline_linked(switch):
+    """
+    This function returns the number of routes linked into the RIB by the
+    route pipeline.
+    """
+    output = switch("ovs-appctl -t ops-zebra zebra/dump route-pipeline",
+                    shell="bash")
+    for line in output.splitlines():
+        linked = match(r"Routes submitted: (.*), linked: (\d+)", line)
+        if linked is not None:
+            return int(linked.group(2))
+    assert False, 'Missing route statistics in "zebra/dump route-pipeline"'
+
+
+def add_bgp_route(switch, vrf_uuid, route):
+    bgp_route_cmd = "ovsdb-client transact \'[ \"OpenSwitch\",\
+         {\
+             \"op\" : \"insert\",\
+             \"table\" : \"Nexthop\",\
+             \"row\" : {\
+                 \"ip_address\" : \"%s\",\
+                 \"weight\" : 3,\
+                 \"selected\": true\
+             },\
+             \"uuid-name\" : \"nh01\"\
+         },\
+        {\
+            \"op\" : \"insert\",\
+            \"table\" : \"Route\",\
+            \"row\" : {\
+                     \"prefix\":\"%s\",\
+                     \"from\":\"bgp\",\
+                     \"vrf\":[\"uuid\",\"%s\"],\
+                     \"address_family\":\"ipv4\",\
+                     \"sub_address_family\":\"unicast\",\
+                     \"distance\":6,\
+                     \"nexthops\" : [\
+                     \"set\",\
+                     [\
+                         [\
+                             \"named-uuid\",\
+                             \"nh01\"\
+                         ]\
+                     ]]\
+                     }\
+        }\
+    ]\'" % (BGP_NEXTHOP, route, vrf_uuid)
+
+    switch(bgp_route_cmd, shell='bash')
+
+
+def modify_bgp_nexthops(switch):
+    # The next-hop rows are updated in place, so that zebra sees modified
+    # next-hop rows rather than a change in the nexthops column of the
+    # route rows.
+    bgp_nexthop_cmd = "ovsdb-client transact \'[ \"OpenSwitch\",\
+         {\
+             \"op\" : \"update\",\
+             \"table\" : \"Nexthop\",\
+             \"where\" : [[\"ip_address\", \"==\", \"%s\"]],\
+             \"row\" : {\
+                 \"ip_address\" : \"%s\"\
+             }\
+         }\
+    ]\'" % (BGP_NEXTHOP, BGP_MODIFIED_NEXTHOP)
+
+    switch(bgp_nexthop_cmd, shell='bash')
+
+
+def delete_bgp_route(switch, route):
+    bgp_route_cmd = "ovsdb-client transact \'[ \"OpenSwitch\",\
+         {\
+             \"op\" : \"delete\",\
+             \"table\" : \"Route\",\
+             \"where\" : [[\"prefix\", \"==\", \"%s\"],\
+                          [\"from\", \"==\", \"bgp\"]]\
+         }\
+    ]\'" % route
+
+    switch(bgp_route_cmd, shell='bash')
+
+
+def get_bgp_route_dict(route, nexthop):
+    route_dict = dict()
+    route_dict['Route'] = route
+    route_dict['NumberNexthops'] = '1'
+    route_dict[nexthop] = dict()
+    route_dict[nexthop]['Distance'] = '6'
+    route_dict[nexthop]['Metric'] = '0'
+    route_dict[nexthop]['RouteType'] = 'bgp'
+    return route_dict
+
+
+def get_kernel_route_dict(route, nexthop):
+    route_dict = dict()
+    route_dict['Route'] = route
+    route_dict['NumberNexthops'] = '1'
+    route_dict[nexthop] = dict()
+    route_dict[nexthop]['Distance'] = ''
+    route_dict[nexthop]['Metric'] = ''
+    route_dict[nexthop]['RouteType'] = 'zebra'
+    return route_dict
+
+
+def verify_bgp_route(switch, route, nexthop):
+    route_dict = get_bgp_route_dict(route, nexthop)
+    verify_show_ip_route(switch, route, 'bgp', route_dict)
+    verify_show_rib(switch, route, 'bgp', route_dict)
+    verify_route_in_show_kernel_route(switch, True,
+                                      get_kernel_route_dict(route, nexthop),
+                                      'zebra')
+    assert get_route_selected(switch, route) == 'true', \
+        "Route {} is not selected".format(route)
+
+
+def verify_bgp_route_deleted(switch, route):
+    route_dict = dict()
+    route_dict['Route'] = route
+    verify_show_ip_route(switch, route, 'bgp', route_dict)
+    verify_show_rib(switch, route, 'bgp', route_dict)
+    verify_route_in_show_kernel_route(switch, True, route_dict, 'zebra')
+    assert get_route_selected(switch, route) is None, \
+        "Route {} is still in OVSDB".format(route)
+
+
+def configure_interfaces(sw1, sw2, step):
+    step("### Configuring the interfaces on SW1 and SW2 ###")
+    sw1("configure terminal")
+    sw1("interface {}".format(sw1.ports["if01"]))
+    sw1("ip address 10.0.10.1/24")
+    sw1("no shutdown")
+    sw1("exit")
+
+    sw2("configure terminal")
+    sw2("interface {}".format(sw2.ports["if01"]))
+    sw2("ip address 10.0.10.2/24")
+    sw2("no shutdown")
+    sw2("exit")
+
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+
+def test_zebra_ct_route_pipeline(topology, step):
+    sw1 = topology.get("sw1")
+    sw2 = topology.get("sw2")
+
+    assert sw1 is not None
+    assert sw2 is not None
+
+    configure_interfaces(sw1, sw2, step)
+
+    step("### Enabling the route pipeline on SW1 ###")
+    output = sw1("ovs-appctl -t ops-zebra zebra/route-pipeline enable",
+                 shell="bash")
+    assert 'Route pipeline mode: enabled' in output, \
+        'Route pipeline not enabled by "zebra/route-pipeline enable"'
+    linked_before = get_route_pipeline_linked(sw1)
+
+    step("### Adding BGP routes through OVSDB on SW1 ###")
+    vrf_uuid = get_vrf_uuid(sw1, "vrf_default")
+    for route in BGP_ROUTES:
+        add_bgp_route(sw1, vrf_uuid, route)
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+    assert get_route_pipeline_linked(sw1) >= \
+        linked_before + len(BGP_ROUTES), \
+        "The BGP routes were not added through the route pipeline"
+    for route in BGP_ROUTES:
+        verify_bgp_route(sw1, route, BGP_NEXTHOP)
+
+    step("### Modifying the BGP route next-hops in place on SW1 ###")
+    modify_bgp_nexthops(sw1)
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+    for route in BGP_ROUTES:
+        verify_bgp_route(sw1, route, BGP_MODIFIED_NEXTHOP)
+
+    step("### Deleting the BGP routes through OVSDB on SW1 ###")
+    for route in BGP_ROUTES:
+        delete_bgp_route(sw1, route)
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+    for route in BGP_ROUTES:
+        verify_bgp_route_deleted(sw1, route)
+
+    step("### Disabling the route pipeline on SW1 ###")
+    output = sw1("ovs-appctl -t ops-zebra zebra/route-pipeline disable",
+                 shell="bash")
+    assert 'Route pipeline mode: disabled' in output, \
+        'Route pipeline not disabled by "zebra/route-pipeline disable"'
@@ -0,0 +1,236 @@
+#!/usr/bin/python
+
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+#
+# GNU Zebra is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2, or (at your option) any
+# later version.
+#
+# GNU Zebra is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GNU Zebra; see the file COPYING.  If not, write to the Free
+# Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
+# 02111-1307, USA.
+
+from helpers_routing import (
+    ZEBRA_TEST_SLEEP_TIME,
+    verify_show_ip_route,
+    verify_show_rib,
+    verify_route_in_show_kernel_route
+)
+from re import match
+from time import sleep
+
+TOPOLOGY = """
+# +-------+    +-------+
+# |  sw1  <---->  sw2  |
+# +-------+    +-------+
+
+# Nodes
+[type=openswitch name="Switch 1"] sw1
+[type=openswitch name="Switch 2"] sw2
+
+# Links
+sw1:if01 -- sw2:if01
+"""
+
+
+# Like bgpd, the BGP routes below share a single Nexthop row.
+BGP_ROUTE_1 = "143.0.0.1/32"
+BGP_ROUTE_2 = "153.0.0.0/24"
+BGP_NEXTHOP = "10.0.10.2"
+BGP_MODIFIED_NEXTHOP = "10.0.10.3"
+
+
+def get_uuid(switch, command):
+    """
+    This function returns the uuid of the first row listed by the
+    ovs-vsctl command.
+    """
+    output = switch(command, shell='vsctl')
+    row_uuid = None
+    for line in output.splitlines():
+        row_uuid = match("(.*)_uuid( +): (.*)", line)
+        if row_uuid is not None:
+            break
+    assert row_uuid is not None
+    return row_uuid.group(3).rstrip('\r')
+
+
+def get_route_selected(switch, route):
+    """
+    This function returns the selected column of the BGP route row for
+    the prefix 'route', or None if there is no such row.
+    """
+    output = switch('find Route prefix="{}" from=bgp'.format(route),
+                    shell='vsctl')
+    for line in output.splitlines():
+        selected = match("selected( +): (.*)", line)
+        if selected is not None:
+            return selected.group(2).rstrip('\r')
+    return None
+
+
+def add_bgp_route(switch, vrf_uuid, route, nexthop_uuid=None):
+    """
+    This function adds a BGP route with a new next-hop row, or with the
+    existing next-hop row 'nexthop_uuid'.
+    """
+    if nexthop_uuid is None:
+        nexthop_op = "{\
+             \"op\" : \"insert\",\
+             \"table\" : \"Nexthop\",\
+             \"row\" : {\
+                 \"ip_address\" : \"%s\",\
+                 \"weight\" : 3,\
+                 \"selected\": true\
+             },\
+             \"uuid-name\" : \"nh01\"\
+         }," % BGP_NEXTHOP
+        nexthop_ref = "[\"named-uuid\", \"nh01\"]"
+    else:
+        nexthop_op = ""
+        nexthop_ref = "[\"uuid\", \"%s\"]" % nexthop_uuid
+
+    bgp_route_cmd = "ovsdb-client transact \'[ \"OpenSwitch\",\
+         %s\
+        {\
+            \"op\" : \"insert\",\
+            \"table\" : \"Route\",\
+            \"row\" : {\
+                     \"prefix\":\"%s\",\
+                     \"from\":\"bgp\",\
+                     \"vrf\":[\"uuid\",\"%s\"],\
+                     \"address_family\":\"ipv4\",\
+                     \"sub_address_family\":\"unicast\",\
+                     \"distance\":6,\
+                     \"nexthops\" : [\"set\", [%s]]\
+                     }\
+        }\
+    ]\'" % (nexthop_op, route, vrf_uuid, nexthop_ref)
+
+    switch(bgp_route_cmd, shell='bash')
+
+
+def modify_bgp_nexthop(switch, nexthop_uuid):
+    bgp_nexthop_cmd = "ovsdb-client transact \'[ \"OpenSwitch\",\
+         {\
+             \"op\" : \"update\",\
+             \"table\" : \"Nexthop\",\
+             \"where\" : [[\"_uuid\", \"==\", [\"uuid\", \"%s\"]]],\
+             \"row\" : {\
+                 \"ip_address\" : \"%s\"\
+             }\
+         }\
+    ]\'" % (nexthop_uuid, BGP_MODIFIED_NEXTHOP)
+
+    switch(bgp_nexthop_cmd, shell='bash')
+
+
+def delete_bgp_route(switch, route):
+    bgp_route_cmd = "ovsdb-client transact \'[ \"OpenSwitch\",\
+         {\
+             \"op\" : \"delete\",\
+             \"table\" : \"Route\",\
+             \"where\" : [[\"prefix\", \"==\", \"%s\"],\
+                          [\"from\", \"==\", \"bgp\"]]\
+         }\
+    ]\'" % route
+
+    switch(bgp_route_cmd, shell='bash')
+
+
+def get_route_dict(route, nexthop, route_type, distance, metric):
+    route_dict = dict()
+    route_dict['Route'] = route
+    route_dict['NumberNexthops'] = '1'
+    route_dict[nexthop] = dict()
+    route_dict[nexthop]['Distance'] = distance
+    route_dict[nexthop]['Metric'] = metric
+    route_dict[nexthop]['RouteType'] = route_type
+    return route_dict
+
+
+def verify_bgp_route(switch, route, nexthop):
+    route_dict = get_route_dict(route, nexthop, 'bgp', '6', '0')
+    verify_show_ip_route(switch, route, 'bgp', route_dict)
+    verify_show_rib(switch, route, 'bgp', route_dict)
+    verify_route_in_show_kernel_route(switch, True,
+                                      get_route_dict(route, nexthop,
+                                                     'zebra', '', ''),
+                                      'zebra')
+    assert get_route_selected(switch, route) == 'true', \
+        "Route {} is not selected".format(route)
+
+
+def verify_bgp_route_deleted(switch, route):
+    route_dict = dict()
+    route_dict['Route'] = route
+    verify_show_ip_route(switch, route, 'bgp', route_dict)
+    verify_show_rib(switch, route, 'bgp', route_dict)
+    verify_route_in_show_kernel_route(switch, True, route_dict, 'zebra')
+
+
+def configure_interfaces(sw1, sw2, step):
+    step("### Configuring the interfaces on SW1 and SW2 ###")
+    sw1("configure terminal")
+    sw1("interface {}".format(sw1.ports["if01"]))
+    sw1("ip address 10.0.10.1/24")
+    sw1("no shutdown")
+    sw1("exit")
+
+    sw2("configure terminal")
+    sw2("interface {}".format(sw2.ports["if01"]))
+    sw2("ip address 10.0.10.2/24")
+    sw2("no shutdown")
+    sw2("exit")
+
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+
+def test_zebra_ct_shared_nexthop(topology, step):
+    sw1 = topology.get("sw1")
+    sw2 = topology.get("sw2")
+
+    assert sw1 is not None
+    assert sw2 is not None
+
+    configure_interfaces(sw1, sw2, step)
+
+    step("### Adding two BGP routes sharing one next-hop row on SW1 ###")
+    vrf_uuid = get_uuid(sw1, "list vrf vrf_default")
+    add_bgp_route(sw1, vrf_uuid, BGP_ROUTE_1)
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+    nexthop_uuid = get_uuid(sw1, 'find Nexthop ip_address="{}"'.format(
+                                 BGP_NEXTHOP))
+    add_bgp_route(sw1, vrf_uuid, BGP_ROUTE_2, nexthop_uuid)
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+    verify_bgp_route(sw1, BGP_ROUTE_1, BGP_NEXTHOP)
+    verify_bgp_route(sw1, BGP_ROUTE_2, BGP_NEXTHOP)
+
+    step("### Modifying the shared next-hop row in place on SW1 ###")
+    modify_bgp_nexthop(sw1, nexthop_uuid)
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+    verify_bgp_route(sw1, BGP_ROUTE_1, BGP_MODIFIED_NEXTHOP)
+    verify_bgp_route(sw1, BGP_ROUTE_2, BGP_MODIFIED_NEXTHOP)
+
+    step("### Deleting one of the routes sharing the next-hop row ###")
+    delete_bgp_route(sw1, BGP_ROUTE_1)
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+    verify_bgp_route_deleted(sw1, BGP_ROUTE_1)
+    verify_bgp_route(sw1, BGP_ROUTE_2, BGP_MODIFIED_NEXTHOP)
+
+    step("### Deleting the last route of the next-hop row ###")
+    delete_bgp_route(sw1, BGP_ROUTE_2)
+    sleep(ZEBRA_TEST_SLEEP_TIME)
+
+    verify_bgp_route_deleted(sw1, BGP_ROUTE_2)
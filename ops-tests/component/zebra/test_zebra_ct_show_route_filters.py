@@ -0,0 +1,128 @@
+#!/usr/bin/python
+
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+#
+# GNU Zebra is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2, or (at your option) any
+# later version.
+#
+# GNU Zebra is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GNU Zebra; see the file COPYING.  If not, write to the Free
+# Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
+# 02111-1307, USA.
+
+import re
+from time import sleep
+
+TOPOLOGY = """
+# +-------+
+# |  sw1  |
+# +-------+
+
+# Nodes
+[type=openswitch name="Switch 1"] sw1
+
+# Links
+sw1:if01
+"""
+
+
+ROUTE_SLEEP = 5
+PAGE_SIZE = 5
+STATIC_ROUTES = ["10.1.{}.0/24".format(index) for index in range(1, 13)] + \
+    ["10.1.128.0/17", "10.2.0.0/16", "192.168.1.0/24"]
+
+
+def get_displayed_prefixes(output):
+    return re.findall(r"^\*?(\d+\.\d+\.\d+\.\d+/\d+),", output, re.MULTILINE)
+
+
+def get_next_page_start(output):
+    match = re.search(r"page-size \d+ start (\S+) --", output)
+    return match.group(1) if match else None
+
+
+def test_zebra_ct_show_route_filters(topology, step):
+    sw1 = topology.get("sw1")
+
+    assert sw1 is not None
+
+    step("### Configuring a connected and {} static routes on SW1 ###".format(
+         len(STATIC_ROUTES)))
+    sw1("configure terminal")
+    sw1("interface {}".format(sw1.ports["if01"]))
+    sw1("ip address 10.0.0.1/24")
+    sw1("no shutdown")
+    sw1("exit")
+    for prefix in STATIC_ROUTES:
+        sw1("ip route {} 10.0.0.2".format(prefix))
+    sw1("exit")
+
+    sleep(ROUTE_SLEEP)
+
+    step("### Verifying show ip route longer-prefixes ###")
+    prefixes = get_displayed_prefixes(
+        sw1("show ip route 10.1.0.0/16 longer-prefixes"))
+    expected = [prefix for prefix in STATIC_ROUTES
+                if prefix.startswith("10.1.")]
+    assert sorted(prefixes) == sorted(expected), \
+        "show ip route longer-prefixes shows " + str(prefixes)
+
+    prefixes = get_displayed_prefixes(
+        sw1("show ip route 10.1.128.0/17 longer-prefixes"))
+    assert prefixes == ["10.1.128.0/17"], \
+        "show ip route longer-prefixes of a /17 shows " + str(prefixes)
+
+    output = sw1("show ip route 172.16.0.0/16 longer-prefixes")
+    assert "No ipv4 routes configured" in output, \
+        "show ip route longer-prefixes shows routes of other prefixes"
+
+    step("### Verifying show ip route protocol ###")
+    prefixes = get_displayed_prefixes(sw1("show ip route protocol static"))
+    assert sorted(prefixes) == sorted(STATIC_ROUTES), \
+        "show ip route protocol static shows " + str(prefixes)
+
+    prefixes = get_displayed_prefixes(sw1("show ip route protocol connected"))
+    assert prefixes == ["10.0.0.0/24"], \
+        "show ip route protocol connected shows " + str(prefixes)
+
+    step("### Verifying show ip route summary ###")
+    output = sw1("show ip route summary")
+    assert re.search(r"static\s+{}".format(len(STATIC_ROUTES)), output), \
+        "The static routes are not counted by show ip route summary"
+    assert re.search(r"connected\s+1", output), \
+        "The connected route is not counted by show ip route summary"
+    assert re.search(r"Total\s+{}".format(len(STATIC_ROUTES) + 1), output), \
+        "The routes are not totaled by show ip route summary"
+    assert get_displayed_prefixes(output) == [], \
+        "show ip route summary renders the routes"
+
+    output = sw1("show rib summary")
+    assert re.search(r"static\s+{}".format(len(STATIC_ROUTES)), output), \
+        "The static routes are not counted by show rib summary"
+
+    step("### Verifying show ip route paging ###")
+    all_prefixes = get_displayed_prefixes(sw1("show ip route"))
+    paged_prefixes = []
+    output = sw1("show ip route page-size {}".format(PAGE_SIZE))
+
+    while True:
+        page = get_displayed_prefixes(output)
+        assert len(page) <= PAGE_SIZE, \
+            "A page of routes has {} routes".format(len(page))
+        paged_prefixes.extend(page)
+
+        start = get_next_page_start(output)
+        if start is None:
+            break
+        output = sw1("show ip route page-size {} start {}".format(PAGE_SIZE,
+                                                                  start))
+
+    assert paged_prefixes == all_prefixes, \
+        "The pages of routes do not match show ip route"
@@ -0,0 +1,117 @@
+#!/usr/bin/python
+
+# (c) Copyright 2016 Hewlett Packard Enterprise Development LP
+#
+# GNU Zebra is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation; either version 2, or (at your option) any
+# later version.
+#
+# GNU Zebra is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with GNU Zebra; see the file COPYING.  If not, write to the Free
+# Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
+# 02111-1307, USA.
+
+from route_generator_and_stats_reporter import (
+    get_static_route_dict,
+    get_show_running_route_set
+)
+
+from time import time
+
+TOPOLOGY = """
+# +-------+
+# |  sw1  |
+# +-------+
+
+# Nodes
+[type=openswitch name="Switch 1"] sw1
+
+# Links
+sw1:if01
+"""
+
+
+MAX_IPV4_ROUTE = 2000
+ROUTE_FILE_CHUNK = 100
+ROUTE_FILE = "/tmp/static_routes.cfg"
+INVALID_ROUTE_FILE = "/tmp/invalid_static_routes.cfg"
+
+
+def WriteRouteFile(sw1, filename, lines):
+    sw1("rm -f {}".format(filename), shell='bash')
+
+    for index in range(0, len(lines), ROUTE_FILE_CHUNK):
+        chunk = " ".join("'{}'".format(line) for line in
+                         lines[index:index + ROUTE_FILE_CHUNK])
+        sw1("printf '%s\\n' {} >> {}".format(chunk, filename), shell='bash')
+
+
+def test_zebra_ct_static_routes_load(topology, step):
+    sw1 = topology.get("sw1")
+
+    assert sw1 is not None
+
+    step("### Configuring the nexthop interface on SW1 ###")
+    sw1("configure terminal")
+    sw1("interface {}".format(sw1.ports["if01"]))
+    sw1("ip address 10.1.1.1/24")
+    sw1("no shutdown")
+    sw1("exit")
+    sw1("exit")
+
+    ipv4_route_list = get_static_route_dict(MAX_IPV4_ROUTE, True,
+                                            '10.1.1.2')
+    route_lines = ["ip route {} {}".format(route['Prefix'],
+                                           route['Nexthop'])
+                   for route in ipv4_route_list]
+
+    step("### Loading {} static routes from a file ###".format(
+         len(route_lines)))
+    WriteRouteFile(sw1, ROUTE_FILE, route_lines)
+
+    start_time = time()
+    sw1("configure terminal")
+    output = sw1("static-routes load {}".format(ROUTE_FILE))
+    sw1("exit")
+    load_time = time() - start_time
+
+    assert "{} static routes configured".format(len(route_lines)) in \
+        output, "The static routes of the file are not configured"
+
+    route_set = get_show_running_route_set(sw1("show running-config"), True)
+    missing_routes = [route for route in ipv4_route_list
+                      if (route['Prefix'], route['Nexthop']) not in
+                      route_set]
+    assert len(missing_routes) == 0, str(len(missing_routes)) + \
+        " static routes of the file are not in the running config"
+
+    step("Loading {} static routes took {:.2f} seconds".format(
+         len(route_lines), load_time))
+
+    step("### Loading the same file again is a no-op ###")
+    sw1("configure terminal")
+    output = sw1("static-routes load {}".format(ROUTE_FILE))
+    sw1("exit")
+    assert "Nexthop already exists" in output, \
+        "Duplicate static routes are not detected"
+
+    step("### Loading a file with an invalid route configures nothing ###")
+    WriteRouteFile(sw1, INVALID_ROUTE_FILE,
+                   ["ip route 192.168.1.0/24 10.1.1.2",
+                    "ip route 192.168.2.0/24"])
+
+    sw1("configure terminal")
+    output = sw1("static-routes load {}".format(INVALID_ROUTE_FILE))
+    sw1("exit")
+    assert "Invalid static route at line 2" in output, \
+        "The invalid static route line is not reported"
+
+    route_set = get_show_running_route_set(sw1("show running-config"), True)
+    assert ("192.168.1.0/24", "10.1.1.2") not in route_set, \
+        "The static routes of an invalid file are partly configured"
@@ -3028,6 +3028,10 @@ ospf_lsa_maxage_walker_remover (struct ospf *ospf, struct ospf_lsa *lsa)
           case OSPF_AS_NSSA_LSA:
 	    ospf_ase_incremental_update (ospf, lsa);
             break;
+          case OSPF_SUMMARY_LSA:
+          case OSPF_ASBR_SUMMARY_LSA:
+	    ospf_spf_calculate_schedule (ospf, SPF_FLAG_SUMMARY_LSA_MAXAGE);
+            break;
           default:
 	    ospf_spf_calculate_schedule (ospf, SPF_FLAG_MAXAGE);
             break;
@@ -49,6 +49,8 @@
 #include "openswitch-idl.h"
 #include "vswitch-idl.h"
 #include "coverage.h"
+#include "dynamic-string.h"
+#include "ovs/hash.h"
 
 /* Quagga ospfd headers */
 #include "ospfd/ospfd.h"
@@ -67,6 +69,11 @@
 #define NEXTHOP_STR_SIZE 64
 
 COVERAGE_DEFINE(ospf_ovsdb_cnt);
+COVERAGE_DEFINE(ospf_route_publish);
+COVERAGE_DEFINE(ospf_route_row_insert);
+COVERAGE_DEFINE(ospf_route_row_update);
+COVERAGE_DEFINE(ospf_route_row_delete);
+COVERAGE_DEFINE(ospf_route_row_unchanged);
 VLOG_DEFINE_THIS_MODULE(ospf_ovsdb_if);
 
 extern int
@@ -191,6 +198,13 @@ enum OSPF_INTERVALS_KEY_SORTED {
   OVS_OSPF_INTERVAL_SORTED_MAX
 };
 static int ospf_ovspoll_enqueue (ospf_ovsdb_t *ospf_ovs_g);
+static void ospf_unixctl_lsa_mirror (struct unixctl_conn *conn, int argc,
+                                     const char *argv[], void *aux);
+static void ospf_unixctl_lsa_mirror_interval (struct unixctl_conn *conn,
+                                              int argc, const char *argv[],
+                                              void *aux);
+static void ospf_unixctl_spf_stats (struct unixctl_conn *conn, int argc,
+                                    const char *argv[], void *aux);
 static int ospf_ovs_read_cb (struct thread *thread);
 
 static void
@@ -512,6 +526,12 @@ ovsdb_init (const char *db_path)
                                             2, 5, ospf_unixctl_no_debug, NULL);
     unixctl_command_register("ospf/show-debug", "ospfv2", 1, 1,
                                               ospfd_unixctl_show_debug_info, NULL);
+    unixctl_command_register("ospf/lsa-mirror", "[full|header|none]", 0, 1,
+                                              ospf_unixctl_lsa_mirror, NULL);
+    unixctl_command_register("ospf/lsa-mirror-interval", "[seconds]", 0, 1,
+                                     ospf_unixctl_lsa_mirror_interval, NULL);
+    unixctl_command_register("ospf/spf-stats", "", 0, 0,
+                                              ospf_unixctl_spf_stats, NULL);
 }
 
 static void
@@ -1206,300 +1226,875 @@ ovsdb_ospf_vl_update (const struct ospf_interface* voi)
     ovsdb_idl_txn_destroy(vl_txn);
 }
 
-void
-ovsdb_ospf_add_lsa  (struct ospf_lsa* lsa)
+/*
+ * LSA database mirroring to the OSPF_LSA table.
+ *
+ * LSA installs and removals are queued as deltas keyed by the LSA identity,
+ * so that the refreshes of an LSA are merged into one delta, and are
+ * written to OVSDB in bounded batches from a timer. The area LSA columns
+ * are rebuilt once per batch instead of once per LSA.
+ *
+ * With a volatile field interval, LSA refreshes which only change the age,
+ * checksum and sequence number of a mirrored LSA are deferred and published
+ * at most once per interval. LSA installs and removals are still written
+ * with the next batch.
+ */
+#define OSPF_LSA_MIRROR_FLUSH_MSEC      100
+#define OSPF_LSA_MIRROR_BATCH_MAX       512
+#define OSPF_LSA_MIRROR_VOLATILE_INTERVAL_MAX       3600
+#define OSPF_LSA_MIRROR_VOLATILE_INTERVAL_MAX_STR   "3600"
+
+enum ospf_lsa_mirror_mode
 {
-    struct ovsrec_ospf_router* ospf_router_row = NULL;
-    struct ovsrec_ospf_area* area_row = NULL;
-    struct ovsdb_idl_txn* area_txn = NULL;
-    struct ovsrec_ospf_lsa* new_lsas = NULL;
-    struct ovsrec_ospf_lsa** router_lsas = NULL;
-    struct ovsrec_ospf_lsa** network_lsas = NULL;
-    enum ovsdb_idl_txn_status status;
-    struct smap chksum_smap;
-    char buf [64] = {0};
-    int64_t lsa_area_id = 0;
-    int64_t lsa_id = 0;
-    int64_t lsa_age = 0;
-    int64_t lsa_adv_router = 0;
-    int64_t lsa_chksum = 0;
-    int64_t lsa_seqnum = 0;
-    int ospf_instance = 0;
-    int i = 0;
+    OSPF_LSA_MIRROR_FULL,       /* LSA rows and area LSA checksum sums */
+    OSPF_LSA_MIRROR_HEADER,     /* LSA rows only */
+    OSPF_LSA_MIRROR_NONE,       /* Nothing */
+    OSPF_LSA_MIRROR_MODE_MAX
+};
 
-    memset (&chksum_smap,0,sizeof(chksum_smap));
-    if (NULL == lsa->data)
+static const char *ospf_lsa_mirror_mode_str[OSPF_LSA_MIRROR_MODE_MAX] =
+{
+    "full",
+    "header",
+    "none"
+};
+
+struct ospf_lsa_mirror_key
+{
+    int instance;
+    u_int32_t area_id;
+    u_int32_t ls_id;
+    u_int32_t adv_router;
+    u_char type;
+};
+
+struct ospf_lsa_mirror_entry
+{
+    struct hmap_node node;
+    struct ospf_lsa_mirror_key key;
+    bool present;               /* LSA install if true, removal otherwise */
+    bool any_seqnum;            /* Removal of any instance of the LSA */
+    u_int32_t ls_seqnum;
+    u_int16_t ls_age;
+    u_int16_t checksum;
+    bool has_lsdb_checksum;
+    unsigned int lsdb_checksum;
+    unsigned long long gen;
+};
+
+/* Per area state of the OSPF_LSA rows while a batch is written */
+struct ospf_lsa_mirror_area
+{
+    struct hmap_node node;
+    const struct ovsrec_ospf_area *area_row;
+    struct hmap rows;           /* ospf_lsa_mirror_row by LSA identity */
+    bool changed[OSPF_MAX_LSA];
+    bool has_lsdb_checksum[OSPF_MAX_LSA];
+    unsigned int lsdb_checksum[OSPF_MAX_LSA];
+    unsigned long long lsdb_checksum_gen[OSPF_MAX_LSA];
+};
+
+struct ospf_lsa_mirror_row
+{
+    struct hmap_node node;
+    struct ovsrec_ospf_lsa *row;
+    u_char type;
+};
+
+struct ospf_lsa_mirror_stats
+{
+    unsigned long long queued;
+    unsigned long long merged;
+    unsigned long long batches;
+    unsigned long long inserted;
+    unsigned long long updated;
+    unsigned long long deleted;
+    unsigned long long deferred;
+    unsigned int max_pending;
+};
+
+static enum ospf_lsa_mirror_mode ospf_lsa_mirror_mode = OSPF_LSA_MIRROR_FULL;
+static struct hmap ospf_lsa_mirror_pending =
+    HMAP_INITIALIZER(&ospf_lsa_mirror_pending);
+static struct thread *ospf_lsa_mirror_thread = NULL;
+static unsigned long long ospf_lsa_mirror_gen = 0;
+static struct ospf_lsa_mirror_stats ospf_lsa_mirror_stats;
+
+/* Volatile LSA field updates, published every volatile interval seconds */
+static unsigned int ospf_lsa_mirror_volatile_interval = 0;
+static struct hmap ospf_lsa_mirror_deferred =
+    HMAP_INITIALIZER(&ospf_lsa_mirror_deferred);
+static struct thread *ospf_lsa_mirror_volatile_thread = NULL;
+
+static int ospf_lsa_mirror_flush_cb (struct thread *thread);
+static int ospf_lsa_mirror_volatile_cb (struct thread *thread);
+
+static uint32_t
+ospf_lsa_mirror_hash (int instance, u_int32_t area_id, u_char type,
+                      u_int32_t ls_id, u_int32_t adv_router)
+{
+    uint32_t hash;
+
+    hash = hash_int (instance, 0);
+    hash = hash_int (area_id, hash);
+    hash = hash_int (type, hash);
+    hash = hash_int (ls_id, hash);
+    return hash_int (adv_router, hash);
+}
+
+static bool
+ospf_lsa_mirror_key_equal (const struct ospf_lsa_mirror_key *a,
+                           const struct ospf_lsa_mirror_key *b)
+{
+    return (a->instance == b->instance && a->area_id == b->area_id &&
+            a->type == b->type && a->ls_id == b->ls_id &&
+            a->adv_router == b->adv_router);
+}
+
+static struct ospf_lsa_mirror_entry *
+ospf_lsa_mirror_entry_find (const struct hmap *queue,
+                            const struct ospf_lsa_mirror_key *key)
+{
+    struct ospf_lsa_mirror_entry *entry;
+    uint32_t hash;
+
+    hash = ospf_lsa_mirror_hash (key->instance, key->area_id, key->type,
+                                 key->ls_id, key->adv_router);
+    HMAP_FOR_EACH_WITH_HASH (entry, node, hash, queue)
     {
-        VLOG_DBG ("No LSA data to add");
+        if (ospf_lsa_mirror_key_equal (&entry->key, key))
+            return entry;
+    }
+
+    return NULL;
+}
+
+static void
+ospf_lsa_mirror_volatile_schedule (void)
+{
+    if (ospf_lsa_mirror_volatile_thread || !glob_ospf_ovs.master ||
+        hmap_is_empty (&ospf_lsa_mirror_deferred))
         return;
+
+    if (ospf_lsa_mirror_volatile_interval)
+        ospf_lsa_mirror_volatile_thread =
+            thread_add_timer (glob_ospf_ovs.master, ospf_lsa_mirror_volatile_cb,
+                              NULL, ospf_lsa_mirror_volatile_interval);
+    else
+        ospf_lsa_mirror_volatile_thread =
+            thread_add_timer_msec (glob_ospf_ovs.master,
+                                   ospf_lsa_mirror_volatile_cb, NULL,
+                                   OSPF_LSA_MIRROR_FLUSH_MSEC);
+}
+
+static void
+ospf_lsa_mirror_schedule (void)
+{
+    /* The pending deltas are scheduled once the poll loop is integrated */
+    if (ospf_lsa_mirror_thread || !glob_ospf_ovs.master ||
+        hmap_is_empty (&ospf_lsa_mirror_pending))
+        return;
+
+    ospf_lsa_mirror_thread =
+        thread_add_timer_msec (glob_ospf_ovs.master, ospf_lsa_mirror_flush_cb,
+                               NULL, OSPF_LSA_MIRROR_FLUSH_MSEC);
+}
+
+/*
+ * Queue the install or the removal of the LSA. A pending delta of the same
+ * LSA is replaced, except by the removal of an older instance of the LSA.
+ */
+static void
+ospf_lsa_mirror_enqueue (struct ospf_lsa *lsa, bool present)
+{
+    struct ospf_lsa_mirror_entry *entry;
+    struct ospf_lsa_mirror_key key;
+
+    if (OSPF_LSA_MIRROR_NONE == ospf_lsa_mirror_mode)
+        return;
+
+    if (lsa->data->type != OSPF_ROUTER_LSA &&
+        lsa->data->type != OSPF_NETWORK_LSA)
+        return;
+
+    memset (&key, 0, sizeof (key));
+    key.instance = lsa->area->ospf->ospf_inst;
+    key.area_id = lsa->area->area_id.s_addr;
+    key.type = lsa->data->type;
+    key.ls_id = lsa->data->id.s_addr;
+    key.adv_router = lsa->data->adv_router.s_addr;
+
+    entry = ospf_lsa_mirror_entry_find (&ospf_lsa_mirror_pending, &key);
+
+    ospf_lsa_mirror_stats.queued++;
+
+    if (entry)
+    {
+        ospf_lsa_mirror_stats.merged++;
+
+        if (!present)
+        {
+            /* The removal of the instance replaced by the pending one */
+            if (entry->present && entry->ls_seqnum != lsa->data->ls_seqnum)
+                return;
+
+            entry->any_seqnum = (entry->present || entry->any_seqnum ||
+                                 entry->ls_seqnum != lsa->data->ls_seqnum);
+        }
     }
-    if (NULL == lsa->area)
+    else
     {
-        VLOG_DBG ("No area may be AS_EXTERNAL LSA, Not dealing now");
-        return;
+        entry = xzalloc (sizeof *entry);
+        entry->key = key;
+        hmap_insert (&ospf_lsa_mirror_pending, &entry->node,
+                     ospf_lsa_mirror_hash (key.instance, key.area_id, key.type,
+                                           key.ls_id, key.adv_router));
+
+        if (hmap_count (&ospf_lsa_mirror_pending) >
+            ospf_lsa_mirror_stats.max_pending)
+            ospf_lsa_mirror_stats.max_pending =
+                hmap_count (&ospf_lsa_mirror_pending);
+    }
+
+    entry->present = present;
+    if (present)
+        entry->any_seqnum = false;
+    entry->ls_seqnum = lsa->data->ls_seqnum;
+    entry->ls_age = lsa->data->ls_age;
+    entry->checksum = lsa->data->checksum;
+    entry->has_lsdb_checksum = (present && NULL != lsa->lsdb);
+    if (entry->has_lsdb_checksum)
+        entry->lsdb_checksum = lsa->lsdb->type[key.type].checksum;
+    entry->gen = ++ospf_lsa_mirror_gen;
+
+    ospf_lsa_mirror_schedule ();
+}
+
+static struct ospf_lsa_mirror_row *
+ospf_lsa_mirror_row_find (struct ospf_lsa_mirror_area *mirror_area,
+                          u_char type, u_int32_t ls_id, u_int32_t adv_router)
+{
+    struct ospf_lsa_mirror_row *mirror_row;
+    uint32_t hash;
+
+    hash = ospf_lsa_mirror_hash (0, 0, type, ls_id, adv_router);
+    HMAP_FOR_EACH_WITH_HASH (mirror_row, node, hash, &mirror_area->rows)
+    {
+        if (mirror_row->type == type &&
+            (u_int32_t) mirror_row->row->ls_id == ls_id &&
+            (u_int32_t) mirror_row->row->adv_router == adv_router)
+            return mirror_row;
+    }
+
+    return NULL;
+}
+
+static void
+ospf_lsa_mirror_row_add (struct ospf_lsa_mirror_area *mirror_area,
+                         struct ovsrec_ospf_lsa *row, u_char type)
+{
+    struct ospf_lsa_mirror_row *mirror_row;
+
+    mirror_row = xmalloc (sizeof *mirror_row);
+    mirror_row->row = row;
+    mirror_row->type = type;
+    hmap_insert (&mirror_area->rows, &mirror_row->node,
+                 ospf_lsa_mirror_hash (0, 0, type, (u_int32_t) row->ls_id,
+                                       (u_int32_t) row->adv_router));
+}
+
+static void
+ospf_lsa_mirror_area_index (struct ospf_lsa_mirror_area *mirror_area,
+                            struct ovsrec_ospf_lsa **lsas, size_t n_lsas,
+                            u_char type)
+{
+    size_t i;
+
+    for (i = 0; i < n_lsas; i++)
+    {
+        /* Only one instance of an LSA is kept in the area */
+        if (ospf_lsa_mirror_row_find (mirror_area, type,
+                                      (u_int32_t) lsas[i]->ls_id,
+                                      (u_int32_t) lsas[i]->adv_router))
+        {
+            ovsrec_ospf_lsa_delete (lsas[i]);
+            mirror_area->changed[type] = true;
+            ospf_lsa_mirror_stats.deleted++;
+            continue;
+        }
+        ospf_lsa_mirror_row_add (mirror_area, lsas[i], type);
     }
+}
 
-    ospf_instance = lsa->area->ospf->ospf_inst;
+static struct ospf_lsa_mirror_area *
+ospf_lsa_mirror_area_get (struct hmap *areas,
+                          const struct ovsrec_ospf_area *area_row)
+{
+    struct ospf_lsa_mirror_area *mirror_area;
+    uint32_t hash = hash_pointer (area_row, 0);
 
-    area_txn = ovsdb_idl_txn_create(idl);
-    if (!area_txn)
+    HMAP_FOR_EACH_WITH_HASH (mirror_area, node, hash, areas)
     {
-        VLOG_DBG ("Transaction create failed");
+        if (mirror_area->area_row == area_row)
+            return mirror_area;
+    }
+
+    mirror_area = xzalloc (sizeof *mirror_area);
+    mirror_area->area_row = area_row;
+    hmap_init (&mirror_area->rows);
+    ospf_lsa_mirror_area_index (mirror_area, area_row->router_lsas,
+                                area_row->n_router_lsas, OSPF_ROUTER_LSA);
+    ospf_lsa_mirror_area_index (mirror_area, area_row->network_lsas,
+                                area_row->n_network_lsas, OSPF_NETWORK_LSA);
+    hmap_insert (areas, &mirror_area->node, hash);
+
+    return mirror_area;
+}
+
+/*
+ * Defer the volatile field update of the entry to the next volatile
+ * interval, replacing an older deferred update of the same LSA.
+ */
+static void
+ospf_lsa_mirror_defer (const struct ospf_lsa_mirror_entry *entry)
+{
+    struct ospf_lsa_mirror_entry *deferred;
+    struct hmap_node node;
+
+    deferred = ospf_lsa_mirror_entry_find (&ospf_lsa_mirror_deferred,
+                                           &entry->key);
+    if (!deferred)
+    {
+        deferred = xzalloc (sizeof *deferred);
+        hmap_insert (&ospf_lsa_mirror_deferred, &deferred->node,
+                     ospf_lsa_mirror_hash (entry->key.instance,
+                                           entry->key.area_id,
+                                           entry->key.type, entry->key.ls_id,
+                                           entry->key.adv_router));
+    }
+    else if (deferred->gen > entry->gen)
+        return;
+
+    node = deferred->node;
+    *deferred = *entry;
+    deferred->node = node;
+
+    ospf_lsa_mirror_stats.deferred++;
+    ospf_lsa_mirror_volatile_schedule ();
+}
+
+static void
+ospf_lsa_mirror_apply (struct ovsdb_idl_txn *txn,
+                       struct ospf_lsa_mirror_area *mirror_area,
+                       const struct ospf_lsa_mirror_entry *entry,
+                       bool volatile_pass)
+{
+    struct ospf_lsa_mirror_row *mirror_row;
+    struct ospf_lsa_mirror_entry *deferred;
+    struct ovsrec_ospf_lsa *row;
+    u_char type = entry->key.type;
+    int64_t lsa_area_id = entry->key.area_id;
+    int64_t lsa_chksum = entry->checksum;
+    int64_t ls_seqnum;
+    bool updated = false;
+
+    mirror_row = ospf_lsa_mirror_row_find (mirror_area, type, entry->key.ls_id,
+                                           entry->key.adv_router);
+    deferred = volatile_pass ? NULL :
+        ospf_lsa_mirror_entry_find (&ospf_lsa_mirror_deferred, &entry->key);
+
+    if (!entry->present)
+    {
+        if (!mirror_row)
+            return;
+
+        /* The sequence number of a deferred update is not written yet */
+        ls_seqnum = deferred ? deferred->ls_seqnum : mirror_row->row->ls_seq_num;
+        if (entry->any_seqnum || ls_seqnum == entry->ls_seqnum)
+        {
+            ovsrec_ospf_lsa_delete (mirror_row->row);
+            hmap_remove (&mirror_area->rows, &mirror_row->node);
+            free (mirror_row);
+            mirror_area->changed[type] = true;
+            ospf_lsa_mirror_stats.deleted++;
+
+            if (deferred)
+            {
+                hmap_remove (&ospf_lsa_mirror_deferred, &deferred->node);
+                free (deferred);
+            }
+        }
         return;
     }
-    ospf_router_row =
-        ovsdb_ospf_get_router_by_instance_num (ospf_instance);
-    if (!ospf_router_row)
+
+    if (!mirror_row)
     {
-       VLOG_DBG ("No OSPF router found");
-       ovsdb_idl_txn_abort(area_txn);
-       return;
+        /* The LSA was removed since its update was deferred */
+        if (volatile_pass)
+            return;
+
+        row = ovsrec_ospf_lsa_insert (txn);
+        if (!row)
+        {
+            VLOG_DBG ("LSA insert failed");
+            return;
+        }
+        ovsrec_ospf_lsa_set_area_id (row, &lsa_area_id, 1);
+        ovsrec_ospf_lsa_set_lsa_type (row, lsa_str[type].lsa_type_str);
+        ovsrec_ospf_lsa_set_ls_id (row, entry->key.ls_id);
+        ovsrec_ospf_lsa_set_prefix (row, "0.0.0.0");
+        ovsrec_ospf_lsa_set_adv_router (row, entry->key.adv_router);
+        ovsrec_ospf_lsa_set_ls_birth_time (row, entry->ls_age);
+        ovsrec_ospf_lsa_set_chksum (row, &lsa_chksum, 1);
+        ovsrec_ospf_lsa_set_ls_seq_num (row, entry->ls_seqnum);
+        ospf_lsa_mirror_row_add (mirror_area, row, type);
+        mirror_area->changed[type] = true;
+        ospf_lsa_mirror_stats.inserted++;
     }
-    /* OPS_TODO : AS_EXTERNAL LSA check */
-    area_row = ovsrec_ospf_area_get_area_by_id(ospf_router_row,
-                             lsa->area->area_id);
-    if (!area_row)
+    else
     {
-       VLOG_DBG ("No associated OSPF area : %d exist",lsa->area->area_id.s_addr);
-       ovsdb_idl_txn_abort(area_txn);
-       return;
+        row = mirror_row->row;
+
+        if (!volatile_pass && ospf_lsa_mirror_volatile_interval &&
+            (row->ls_birth_time != entry->ls_age ||
+             !row->n_chksum || row->chksum[0] != lsa_chksum ||
+             row->ls_seq_num != entry->ls_seqnum))
+        {
+            ospf_lsa_mirror_defer (entry);
+            return;
+        }
+
+        if (row->ls_birth_time != entry->ls_age)
+        {
+            ovsrec_ospf_lsa_set_ls_birth_time (row, entry->ls_age);
+            updated = true;
+        }
+        if (!row->n_chksum || row->chksum[0] != lsa_chksum)
+        {
+            ovsrec_ospf_lsa_set_chksum (row, &lsa_chksum, 1);
+            updated = true;
+        }
+        if (row->ls_seq_num != entry->ls_seqnum)
+        {
+            ovsrec_ospf_lsa_set_ls_seq_num (row, entry->ls_seqnum);
+            updated = true;
+        }
+        if (updated)
+            ospf_lsa_mirror_stats.updated++;
     }
-    new_lsas = ovsrec_ospf_lsa_insert(area_txn);
-    if (!new_lsas)
+
+    if (OSPF_LSA_MIRROR_FULL == ospf_lsa_mirror_mode &&
+        entry->has_lsdb_checksum &&
+        entry->gen > mirror_area->lsdb_checksum_gen[type])
     {
-       VLOG_DBG ("LSA insert failed");
-       ovsdb_idl_txn_abort(area_txn);
-       return;
+        mirror_area->has_lsdb_checksum[type] = true;
+        mirror_area->lsdb_checksum[type] = entry->lsdb_checksum;
+        mirror_area->lsdb_checksum_gen[type] = entry->gen;
     }
-    switch (lsa->data->type)
+}
+
+static void
+ospf_lsa_mirror_area_set_lsas (struct ospf_lsa_mirror_area *mirror_area,
+                               u_char type)
+{
+    struct ospf_lsa_mirror_row *mirror_row;
+    struct ovsrec_ospf_lsa **lsas;
+    size_t n_lsas = 0;
+
+    lsas = xmalloc (sizeof *lsas * (hmap_count (&mirror_area->rows) + 1));
+    HMAP_FOR_EACH (mirror_row, node, &mirror_area->rows)
     {
-        case OSPF_ROUTER_LSA:
-            router_lsas = xmalloc(sizeof * area_row->router_lsas *
-                                         (area_row->n_router_lsas + 1));
-            for (i = 0; i < area_row->n_router_lsas; i++) {
-                   router_lsas[i] = area_row->router_lsas[i];
-            }
-            router_lsas[area_row->n_router_lsas] = new_lsas;
+        if (mirror_row->type == type)
+            lsas[n_lsas++] = mirror_row->row;
+    }
 
-            ovsrec_ospf_area_set_router_lsas (area_row,router_lsas,
-                                   area_row->n_router_lsas + 1);
+    if (OSPF_ROUTER_LSA == type)
+        ovsrec_ospf_area_set_router_lsas (mirror_area->area_row, lsas, n_lsas);
+    else
+        ovsrec_ospf_area_set_network_lsas (mirror_area->area_row, lsas, n_lsas);
 
-            if (NULL != lsa->lsdb)
-            {
-                snprintf (buf,sizeof(buf),"%u",lsa->lsdb->type[OSPF_ROUTER_LSA].checksum);
-                smap_clone(&chksum_smap,&(area_row->status));
-                smap_replace(&chksum_smap,"router_lsas_sum_cksum",buf);
-                ovsrec_ospf_area_set_status(area_row,&chksum_smap);
-                smap_destroy(&chksum_smap);
-            }
+    free (lsas);
+}
 
-            lsa_area_id = lsa->area->area_id.s_addr;
-            ovsrec_ospf_lsa_set_area_id (new_lsas,
-                                            &lsa_area_id,1);
+static void
+ospf_lsa_mirror_area_set_checksum (struct ospf_lsa_mirror_area *mirror_area,
+                                   u_char type)
+{
+    const char *key = (OSPF_ROUTER_LSA == type) ? "router_lsas_sum_cksum" :
+                                                  "network_lsas_sum_cksum";
+    const char *old;
+    struct smap chksum_smap;
+    char buf [64] = {0};
 
-            ovsrec_ospf_lsa_set_lsa_type (new_lsas,
-                                            lsa_str[lsa->data->type].lsa_type_str);
-            lsa_id = lsa->data->id.s_addr;
-            ovsrec_ospf_lsa_set_ls_id (new_lsas,lsa_id);
+    snprintf (buf, sizeof (buf), "%u", mirror_area->lsdb_checksum[type]);
+    old = smap_get (&mirror_area->area_row->status, key);
+    if (old && !strcmp (old, buf))
+        return;
 
-            lsa_age = lsa->data->ls_age;
-            ovsrec_ospf_lsa_set_ls_birth_time(new_lsas, lsa_age);
+    smap_clone (&chksum_smap, &mirror_area->area_row->status);
+    smap_replace (&chksum_smap, key, buf);
+    ovsrec_ospf_area_set_status (mirror_area->area_row, &chksum_smap);
+    smap_destroy (&chksum_smap);
+}
 
-            ovsrec_ospf_lsa_set_prefix (new_lsas, "0.0.0.0");
+static void
+ospf_lsa_mirror_area_finish (struct ospf_lsa_mirror_area *mirror_area)
+{
+    struct ospf_lsa_mirror_row *mirror_row, *next;
+    u_char type;
 
-            lsa_adv_router = lsa->data->adv_router.s_addr;
-            ovsrec_ospf_lsa_set_adv_router (new_lsas,lsa_adv_router);
+    for (type = OSPF_ROUTER_LSA; type <= OSPF_NETWORK_LSA; type++)
+    {
+        if (mirror_area->changed[type])
+            ospf_lsa_mirror_area_set_lsas (mirror_area, type);
+        if (mirror_area->has_lsdb_checksum[type])
+            ospf_lsa_mirror_area_set_checksum (mirror_area, type);
+    }
 
-            lsa_chksum = lsa->data->checksum;
-            ovsrec_ospf_lsa_set_chksum (new_lsas,&lsa_chksum,1);
-            lsa_seqnum = lsa->data->ls_seqnum;
-            ovsrec_ospf_lsa_set_ls_seq_num (new_lsas,lsa_seqnum);
+    HMAP_FOR_EACH_SAFE (mirror_row, next, node, &mirror_area->rows)
+    {
+        hmap_remove (&mirror_area->rows, &mirror_row->node);
+        free (mirror_row);
+    }
+    hmap_destroy (&mirror_area->rows);
+}
 
-            free(router_lsas);
-            break;
-        case OSPF_NETWORK_LSA:
-                network_lsas = xmalloc(sizeof * area_row->network_lsas *
-                                         (area_row->n_network_lsas + 1));
-            for (i = 0; i < area_row->n_network_lsas; i++) {
-                   network_lsas[i] = area_row->network_lsas[i];
-            }
-            network_lsas[area_row->n_network_lsas] = new_lsas;
+/* Write one batch of the queued LSA deltas in a single transaction */
+static void
+ospf_lsa_mirror_flush (struct hmap *queue, bool volatile_pass)
+{
+    struct ospf_lsa_mirror_entry *entry, *next;
+    struct ospf_lsa_mirror_area *mirror_area, *next_area;
+    struct ovsrec_ospf_router *ospf_router_row = NULL;
+    const struct ovsrec_ospf_area *area_row = NULL;
+    struct ovsdb_idl_txn *area_txn = NULL;
+    enum ovsdb_idl_txn_status status;
+    struct hmap areas = HMAP_INITIALIZER (&areas);
+    struct in_addr area_id;
+    int instance = -1;
+    int count = 0;
 
-            ovsrec_ospf_area_set_network_lsas (area_row,network_lsas,
-                                   area_row->n_network_lsas + 1);
+    if (hmap_is_empty (queue))
+        return;
 
-            if (NULL != lsa->lsdb)
-            {
-                snprintf (buf,sizeof(buf),"%u",lsa->lsdb->type[OSPF_NETWORK_LSA].checksum);
-                smap_clone(&chksum_smap,&(area_row->status));
-                smap_replace(&chksum_smap,"network_lsas_sum_cksum",buf);
-                ovsrec_ospf_area_set_status(area_row,&chksum_smap);
-                smap_destroy(&chksum_smap);
-            }
-            lsa_area_id = lsa->area->area_id.s_addr;
-            ovsrec_ospf_lsa_set_area_id (new_lsas,
-                                            &lsa_area_id,1);
-
-            ovsrec_ospf_lsa_set_lsa_type (new_lsas,
-                                            lsa_str[lsa->data->type].lsa_type_str);
-            lsa_id = lsa->data->id.s_addr;
-            ovsrec_ospf_lsa_set_ls_id (new_lsas,lsa_id);
-            lsa_age = lsa->data->ls_age;
-            ovsrec_ospf_lsa_set_ls_birth_time (new_lsas, lsa_age);
-            ovsrec_ospf_lsa_set_prefix (new_lsas, "0.0.0.0");  //change to prefix as its type 3
-            lsa_adv_router = lsa->data->adv_router.s_addr;
-            ovsrec_ospf_lsa_set_adv_router (new_lsas,lsa_adv_router);
-            lsa_chksum = lsa->data->checksum;
-            ovsrec_ospf_lsa_set_chksum (new_lsas,&lsa_chksum,1);
-            lsa_seqnum = lsa->data->ls_seqnum;
-            ovsrec_ospf_lsa_set_ls_seq_num (new_lsas,lsa_seqnum);
-            free(router_lsas);
+    area_txn = ovsdb_idl_txn_create (idl);
+    if (!area_txn)
+    {
+        VLOG_DBG ("Transaction create failed");
+        return;
+    }
+
+    HMAP_FOR_EACH_SAFE (entry, next, node, queue)
+    {
+        if (count++ >= OSPF_LSA_MIRROR_BATCH_MAX)
             break;
+
+        hmap_remove (queue, &entry->node);
+
+        if (entry->key.instance != instance)
+        {
+            instance = entry->key.instance;
+            ospf_router_row = ovsdb_ospf_get_router_by_instance_num (instance);
+        }
+        area_id.s_addr = entry->key.area_id;
+        if (!ospf_router_row ||
+            !(area_row = ovsrec_ospf_area_get_area_by_id (ospf_router_row,
+                                                          area_id)))
+        {
+            VLOG_DBG ("No associated OSPF area : %d exist", area_id.s_addr);
+            free (entry);
+            continue;
+        }
+
+        ospf_lsa_mirror_apply (area_txn,
+                               ospf_lsa_mirror_area_get (&areas, area_row),
+                               entry, volatile_pass);
+        free (entry);
     }
 
-    status = ovsdb_idl_txn_commit_block(area_txn);
+    HMAP_FOR_EACH_SAFE (mirror_area, next_area, node, &areas)
+    {
+        ospf_lsa_mirror_area_finish (mirror_area);
+        hmap_remove (&areas, &mirror_area->node);
+        free (mirror_area);
+    }
+    hmap_destroy (&areas);
+
+    status = ovsdb_idl_txn_commit_block (area_txn);
     if (TXN_SUCCESS != status &&
         TXN_UNCHANGED != status)
-        VLOG_DBG ("LSA transaction commit failed:%d",status);
+        VLOG_DBG ("LSA transaction commit failed:%d", status);
 
-    ovsdb_idl_txn_destroy(area_txn);
+    ovsdb_idl_txn_destroy (area_txn);
+    ospf_lsa_mirror_stats.batches++;
 }
 
-//void
-//ovsdb_ospf_remove_lsa  (struct in_addr lsa_id, unsigned char lsa_type, struct ospf_lsa* lsa)
-void
-ovsdb_ospf_remove_lsa  (struct ospf_lsa* lsa)
+static int
+ospf_lsa_mirror_flush_cb (struct thread *thread OVS_UNUSED)
 {
-    struct ovsrec_ospf_router* ospf_router_row = NULL;
-    struct ovsrec_ospf_area* area_row = NULL;
-    struct ovsdb_idl_txn* area_txn = NULL;
-    struct ovsrec_ospf_lsa* old_lsas = NULL;
-    struct ovsrec_ospf_lsa** router_lsas = NULL;
-    struct ovsrec_ospf_lsa** network_lsas = NULL;
+    ospf_lsa_mirror_thread = NULL;
+
+    ospf_lsa_mirror_flush (&ospf_lsa_mirror_pending, false);
+    ospf_lsa_mirror_schedule ();
+    return 0;
+}
+
+static int
+ospf_lsa_mirror_volatile_cb (struct thread *thread OVS_UNUSED)
+{
+    ospf_lsa_mirror_volatile_thread = NULL;
+
+    /* The LSA installs and removals are written before the updates */
+    while (!hmap_is_empty (&ospf_lsa_mirror_pending))
+        ospf_lsa_mirror_flush (&ospf_lsa_mirror_pending, false);
+    while (!hmap_is_empty (&ospf_lsa_mirror_deferred))
+        ospf_lsa_mirror_flush (&ospf_lsa_mirror_deferred, true);
+    return 0;
+}
+
+static void
+ospf_lsa_mirror_queue_clear (struct hmap *queue)
+{
+    struct ospf_lsa_mirror_entry *entry, *next;
+
+    HMAP_FOR_EACH_SAFE (entry, next, node, queue)
+    {
+        hmap_remove (queue, &entry->node);
+        free (entry);
+    }
+}
+
+static void
+ospf_lsa_mirror_clear (void)
+{
+    ospf_lsa_mirror_queue_clear (&ospf_lsa_mirror_pending);
+    ospf_lsa_mirror_queue_clear (&ospf_lsa_mirror_deferred);
+    THREAD_OFF (ospf_lsa_mirror_thread);
+    THREAD_OFF (ospf_lsa_mirror_volatile_thread);
+}
+
+/* Remove all the mirrored LSAs of all the areas from OVSDB */
+static void
+ospf_lsa_mirror_remove_all (void)
+{
+    const struct ovsrec_ospf_area *area_row = NULL;
+    struct ovsdb_idl_txn *area_txn = NULL;
     enum ovsdb_idl_txn_status status;
-    int ospf_instance = 0;
-    int i = 0, j = 0;
+    size_t i;
 
-    if (NULL == lsa->data)
+    area_txn = ovsdb_idl_txn_create (idl);
+    if (!area_txn)
     {
-        VLOG_DBG ("No LSA data to delete");
+        VLOG_DBG ("Transaction create failed");
         return;
     }
-    if (NULL == lsa->area)
+
+    OVSREC_OSPF_AREA_FOR_EACH (area_row, idl)
     {
-        VLOG_DBG ("No area may be AS_EXTERNAL LSA");
-        return;
+        for (i = 0; i < area_row->n_router_lsas; i++)
+            ovsrec_ospf_lsa_delete (area_row->router_lsas[i]);
+        for (i = 0; i < area_row->n_network_lsas; i++)
+            ovsrec_ospf_lsa_delete (area_row->network_lsas[i]);
+        if (area_row->n_router_lsas)
+            ovsrec_ospf_area_set_router_lsas (area_row, NULL, 0);
+        if (area_row->n_network_lsas)
+            ovsrec_ospf_area_set_network_lsas (area_row, NULL, 0);
     }
-    ospf_instance = lsa->area->ospf->ospf_inst;
 
-    area_txn = ovsdb_idl_txn_create(idl);
-    if (!area_txn)
+    status = ovsdb_idl_txn_commit_block (area_txn);
+    if (TXN_SUCCESS != status &&
+        TXN_UNCHANGED != status)
+        VLOG_DBG ("LSA delete transaction commit failed:%d", status);
+
+    ovsdb_idl_txn_destroy (area_txn);
+}
+
+/* Queue the router and network LSAs of all the areas to be mirrored */
+static void
+ospf_lsa_mirror_resync (void)
+{
+    struct ospf *ospf;
+    struct ospf_area *area;
+    struct listnode *node;
+    struct route_node *rn;
+    struct ospf_lsa *lsa;
+
+    if (!(ospf = ospf_lookup ()))
+        return;
+
+    for (ALL_LIST_ELEMENTS_RO (ospf->areas, node, area))
     {
-        VLOG_DBG ("Transaction create failed");
+        LSDB_LOOP (ROUTER_LSDB (area), rn, lsa)
+            ospf_lsa_mirror_enqueue (lsa, true);
+        LSDB_LOOP (NETWORK_LSDB (area), rn, lsa)
+            ospf_lsa_mirror_enqueue (lsa, true);
+    }
+}
+
+static void
+ospf_lsa_mirror_set_mode (enum ospf_lsa_mirror_mode mode)
+{
+    enum ospf_lsa_mirror_mode old_mode = ospf_lsa_mirror_mode;
+
+    if (mode == old_mode)
         return;
+
+    ospf_lsa_mirror_mode = mode;
+
+    if (OSPF_LSA_MIRROR_NONE == mode)
+    {
+        ospf_lsa_mirror_clear ();
+        ospf_lsa_mirror_remove_all ();
     }
-    ospf_router_row =
-        ovsdb_ospf_get_router_by_instance_num (ospf_instance);
-    if (!ospf_router_row)
+    else if (OSPF_LSA_MIRROR_NONE == old_mode)
     {
-       VLOG_DBG ("No OSPF router found");
-       ovsdb_idl_txn_abort(area_txn);
-       return;
+        ospf_lsa_mirror_resync ();
     }
-    /* OPS_TODO : AS_EXTERNAL LSA check */
-    area_row = ovsrec_ospf_area_get_area_by_id(ospf_router_row,
-                             lsa->area->area_id);
-    if (!area_row)
+}
+
+static void
+ospf_lsa_mirror_set_volatile_interval (unsigned int interval)
+{
+    ospf_lsa_mirror_volatile_interval = interval;
+
+    /* Publish the deferred updates with the new interval */
+    THREAD_OFF (ospf_lsa_mirror_volatile_thread);
+    ospf_lsa_mirror_volatile_schedule ();
+}
+
+static void
+ospf_lsa_mirror_show (struct ds *ds)
+{
+    ds_put_format (ds, "LSA mirror mode: %s\n",
+                   ospf_lsa_mirror_mode_str[ospf_lsa_mirror_mode]);
+    ds_put_format (ds, "LSA deltas queued: %llu, merged: %llu, "
+                   "pending: %u, max pending: %u\n",
+                   ospf_lsa_mirror_stats.queued, ospf_lsa_mirror_stats.merged,
+                   (unsigned int) hmap_count (&ospf_lsa_mirror_pending),
+                   ospf_lsa_mirror_stats.max_pending);
+    ds_put_format (ds, "LSA batches: %llu, rows inserted: %llu, "
+                   "updated: %llu, deleted: %llu\n",
+                   ospf_lsa_mirror_stats.batches,
+                   ospf_lsa_mirror_stats.inserted,
+                   ospf_lsa_mirror_stats.updated,
+                   ospf_lsa_mirror_stats.deleted);
+    ds_put_format (ds, "LSA volatile field interval: %u seconds, "
+                   "updates deferred: %llu, deferred: %u\n",
+                   ospf_lsa_mirror_volatile_interval,
+                   ospf_lsa_mirror_stats.deferred,
+                   (unsigned int) hmap_count (&ospf_lsa_mirror_deferred));
+}
+
+/* ovs-appctl ospf/lsa-mirror [full|header|none] */
+static void
+ospf_unixctl_lsa_mirror (struct unixctl_conn *conn, int argc,
+                         const char *argv[], void *aux OVS_UNUSED)
+{
+    struct ds ds = DS_EMPTY_INITIALIZER;
+    int mode;
+
+    if (argc > 1)
     {
-       VLOG_DBG ("No associated OSPF area : %d exist",lsa->area->area_id.s_addr);
-       ovsdb_idl_txn_abort(area_txn);
-       return;
+        for (mode = 0; mode < OSPF_LSA_MIRROR_MODE_MAX; mode++)
+        {
+            if (!strcmp (argv[1], ospf_lsa_mirror_mode_str[mode]))
+                break;
+        }
+        if (mode == OSPF_LSA_MIRROR_MODE_MAX)
+        {
+            unixctl_command_reply_error (conn,
+                                         "Expected full, header or none");
+            return;
+        }
+        ospf_lsa_mirror_set_mode (mode);
     }
-    switch (lsa->data->type)
+
+    ospf_lsa_mirror_show (&ds);
+    unixctl_command_reply (conn, ds_cstr (&ds));
+    ds_destroy (&ds);
+}
+
+/* ovs-appctl ospf/lsa-mirror-interval [seconds] */
+static void
+ospf_unixctl_lsa_mirror_interval (struct unixctl_conn *conn, int argc,
+                                  const char *argv[], void *aux OVS_UNUSED)
+{
+    struct ds ds = DS_EMPTY_INITIALIZER;
+    unsigned int interval;
+
+    if (argc > 1)
     {
-        case OSPF_ROUTER_LSA:
-            if (0 >= area_row->n_router_lsas)
-            {
-               ovsdb_idl_txn_abort(area_txn);
-               return;
-            }
-            router_lsas = xmalloc(sizeof * area_row->router_lsas *
-                                         (area_row->n_router_lsas - 1));
-
-            for (i = 0,j = 0; (i < area_row->n_router_lsas) && (j < area_row->n_router_lsas - 1); i++) {
-                if ((area_row->router_lsas[i]->ls_id == lsa->data->id.s_addr) &&
-                    (area_row->router_lsas[i]->ls_seq_num == lsa->data->ls_seqnum) &&
-                    (area_row->router_lsas[i]->adv_router == lsa->data->adv_router.s_addr)) {
-                   old_lsas = area_row->router_lsas[i];
-                }
-                else
-                {
-                   router_lsas[j] = area_row->router_lsas[i];
-                   j++;
-                }
-            }
-            if (!old_lsas)
-            {
+        if (!str_to_uint (argv[1], 10, &interval) ||
+            interval > OSPF_LSA_MIRROR_VOLATILE_INTERVAL_MAX)
+        {
+            unixctl_command_reply_error (conn, "Expected an interval of 0-"
+                                         OSPF_LSA_MIRROR_VOLATILE_INTERVAL_MAX_STR
+                                         " seconds");
+            return;
+        }
+        ospf_lsa_mirror_set_volatile_interval (interval);
+    }
 
-                ovsdb_idl_txn_abort(area_txn);
-                free(router_lsas);
-                return;
-            }
+    ospf_lsa_mirror_show (&ds);
+    unixctl_command_reply (conn, ds_cstr (&ds));
+    ds_destroy (&ds);
+}
 
-            ovsrec_ospf_area_set_router_lsas (area_row,router_lsas,
-                                   area_row->n_router_lsas - 1);
+static void
+ospf_unixctl_spf_stats (struct unixctl_conn *conn, int argc OVS_UNUSED,
+                        const char *argv[] OVS_UNUSED, void *aux OVS_UNUSED)
+{
+    struct ds ds = DS_EMPTY_INITIALIZER;
+    struct ospf *ospf;
 
+    ospf = ospf_lookup ();
+    if (!ospf)
+    {
+        unixctl_command_reply_error (conn, "NO OSPF instance present");
+        return;
+    }
 
-            ovsrec_ospf_lsa_delete (old_lsas);
-            // TODO: Update the checksum sum
-            free(router_lsas);
-            break;
-        case OSPF_NETWORK_LSA:
-            if (0 >= area_row->n_network_lsas)
-            {
-               ovsdb_idl_txn_abort(area_txn);
-               return;
-            }
-            network_lsas = xmalloc(sizeof * area_row->network_lsas *
-                                         (area_row->n_network_lsas - 1));
-
-            for (i = 0,j = 0; (i < area_row->n_network_lsas) & (j < area_row->n_network_lsas - 1); i++) {
-                if ((area_row->network_lsas[i]->ls_id == lsa->data->id.s_addr) &&
-                    (area_row->network_lsas[i]->ls_seq_num == lsa->data->ls_seqnum) &&
-                    (area_row->network_lsas[i]->adv_router == lsa->data->adv_router.s_addr)) {
-                    old_lsas = area_row->network_lsas[i];
-                }
-                else
-                {
-                   network_lsas[j] = area_row->network_lsas[i];
-                   j++;
-                }
-            }
+    ds_put_format (&ds, "SPF runs: full %lu, partial %lu\n",
+                   ospf->spf_full_runs, ospf->spf_partial_runs);
+    ds_put_format (&ds, "Last SPF duration: %ld usecs\n",
+                   (long) (ospf->ts_spf_duration.tv_sec * 1000000 +
+                           ospf->ts_spf_duration.tv_usec));
+    unixctl_command_reply (conn, ds_cstr (&ds));
+    ds_destroy (&ds);
+}
 
-            if (!old_lsas)
-            {
-                VLOG_DBG ("No lsa");
-                ovsdb_idl_txn_abort(area_txn);
-                free(network_lsas);
-                return;
-            }
+void
+ovsdb_ospf_add_lsa  (struct ospf_lsa* lsa)
+{
+    if (NULL == lsa->data)
+    {
+        VLOG_DBG ("No LSA data to add");
+        return;
+    }
+    if (NULL == lsa->area)
+    {
+        VLOG_DBG ("No area may be AS_EXTERNAL LSA, Not dealing now");
+        return;
+    }
 
-            ovsrec_ospf_area_set_network_lsas (area_row,network_lsas,
-                                   area_row->n_network_lsas - 1);
+    ospf_lsa_mirror_enqueue (lsa, true);
+}
 
-            ovsrec_ospf_lsa_delete (old_lsas);
-            // TODO: Update the checksum sum
-            free(network_lsas);
-            break;
+void
+ovsdb_ospf_remove_lsa  (struct ospf_lsa* lsa)
+{
+    if (NULL == lsa->data)
+    {
+        VLOG_DBG ("No LSA data to delete");
+        return;
+    }
+    if (NULL == lsa->area)
+    {
+        VLOG_DBG ("No area may be AS_EXTERNAL LSA");
+        return;
     }
 
-    status = ovsdb_idl_txn_commit_block(area_txn);
-    if (TXN_SUCCESS != status &&
-        TXN_UNCHANGED != status)
-        VLOG_DBG ("LSA delete transaction commit failed:%d",status);
-
-    ovsdb_idl_txn_destroy(area_txn);
-    return;
+    ospf_lsa_mirror_enqueue (lsa, false);
 }
 
 void
@@ -2686,9 +3281,31 @@ ovsdb_ospf_add_area_to_router (int ospf_intance,struct in_addr area_id)
     return;
 }
 
+/* Replace the value of a statistics key, appending the key if missing. */
+static void
+ospf_area_statistics_replace (char **keys, int64_t *values, size_t *n,
+                              char *key, int64_t value)
+{
+    size_t i;
+
+    for (i = 0; i < *n; i++)
+    {
+        if (0 == strcmp (keys[i], key))
+        {
+            values[i] = value;
+            return;
+        }
+    }
+
+    keys[*n] = key;
+    values[*n] = value;
+    (*n)++;
+}
+
 void
 ovsdb_ospf_set_spf_statistics (int instance, struct in_addr area_id,
-                              long spf_ts, int spf_count)
+                              long spf_ts, int spf_count,
+                              const struct ospf_spf_stats *spf_stats)
 {
     struct ovsrec_ospf_area* ovs_area = NULL;
     struct ovsrec_ospf_router* ovs_ospf = NULL;
@@ -2697,6 +3314,11 @@ ovsdb_ospf_set_spf_statistics (int instance, struct in_addr area_id,
     struct smap spf_smap;
     struct ovsdb_idl_txn* spf_txn = NULL;
     enum ovsdb_idl_txn_status status;
+    char **keys;
+    char *reason_keys[SPF_FLAG_MAX] = {NULL};
+    int64_t *values;
+    size_t n_stats;
+    const char *name;
     int i = 0;
 
     ovs_ospf = ovsdb_ospf_get_router_by_instance_num (instance);
@@ -2735,17 +3357,62 @@ ovsdb_ospf_set_spf_statistics (int instance, struct in_addr area_id,
 
     ovsrec_ospf_area_set_status(ovs_area,&spf_smap);
 
+    /* Room for the existing keys, the SPF run keys and one per reason */
+    keys = xmalloc (sizeof *keys * (ovs_area->n_statistics +
+                                    OSPF_AREA_SPF_STATS_KEYS + SPF_FLAG_MAX));
+    values = xmalloc (sizeof *values * (ovs_area->n_statistics +
+                                        OSPF_AREA_SPF_STATS_KEYS +
+                                        SPF_FLAG_MAX));
+    n_stats = ovs_area->n_statistics;
     for (i = 0 ; i < ovs_area->n_statistics ; i++)
     {
-        if (0 == strcmp (ovs_area->key_statistics[i],
-                      OSPF_KEY_AREA_STATS_SPF_EXEC)) {
-            ovs_area->value_statistics[i] = (int64_t)spf_count;
-            break;
+        keys[i] = ovs_area->key_statistics[i];
+        values[i] = ovs_area->value_statistics[i];
+    }
+
+    ospf_area_statistics_replace (keys, values, &n_stats,
+                                  OSPF_KEY_AREA_STATS_SPF_EXEC, spf_count);
+
+    if (spf_stats)
+    {
+        ospf_area_statistics_replace (keys, values, &n_stats,
+                                      OSPF_KEY_AREA_STATS_SPF_LAST_DURATION,
+                                      spf_stats->last_duration);
+        ospf_area_statistics_replace (keys, values, &n_stats,
+                                      OSPF_KEY_AREA_STATS_SPF_MAX_DURATION,
+                                      spf_stats->max_duration);
+        ospf_area_statistics_replace (keys, values, &n_stats,
+                                      OSPF_KEY_AREA_STATS_SPF_BATCHED_EVENTS,
+                                      spf_stats->batched_events);
+        ospf_area_statistics_replace (keys, values, &n_stats,
+                                      OSPF_KEY_AREA_STATS_SPF_MAX_BATCHED,
+                                      spf_stats->max_batched_events);
+        ospf_area_statistics_replace (keys, values, &n_stats,
+                                      OSPF_KEY_AREA_STATS_SPF_PENDING_EVENTS,
+                                      spf_stats->pending_events);
+        ospf_area_statistics_replace (keys, values, &n_stats,
+                                      OSPF_KEY_AREA_STATS_SPF_FULL_RUNS,
+                                      spf_stats->full_runs);
+        ospf_area_statistics_replace (keys, values, &n_stats,
+                                      OSPF_KEY_AREA_STATS_SPF_PARTIAL_RUNS,
+                                      spf_stats->partial_runs);
+
+        for (i = 0 ; i < SPF_FLAG_MAX ; i++)
+        {
+            name = ospf_spf_reason_name (i);
+            if (!name)
+                continue;
+
+            reason_keys[i] = xasprintf ("%s%s",
+                                        OSPF_KEY_AREA_STATS_SPF_REASON_PREFIX,
+                                        name);
+            ospf_area_statistics_replace (keys, values, &n_stats,
+                                          reason_keys[i],
+                                          spf_stats->reason_counts[i]);
         }
     }
 
-    ovsrec_ospf_area_set_statistics(ovs_area,ovs_area->key_statistics,
-                        ovs_area->value_statistics,ovs_area->n_statistics);
+    ovsrec_ospf_area_set_statistics(ovs_area,keys,values,n_stats);
 
     status = ovsdb_idl_txn_commit_block (spf_txn);
     if (TXN_SUCCESS != status &&
@@ -2754,6 +3421,10 @@ ovsdb_ospf_set_spf_statistics (int instance, struct in_addr area_id,
 
     ovsdb_idl_txn_destroy (spf_txn);
 
+    for (i = 0 ; i < SPF_FLAG_MAX ; i++)
+        free (reason_keys[i]);
+    free (keys);
+    free (values);
     smap_destroy (&spf_smap);
 }
 
@@ -5353,6 +6024,243 @@ ospf_apply_vlink_changes (struct ovsdb_idl *idl)
  * Update the ospf rib routes in the OSPF_Route table of the OVSDB database *
  */
 
+/*
+ * The OSPF_Route columns are published incrementally after every SPF run.
+ * The rows already referenced by a route column are indexed by prefix and
+ * reused for the new routes, so only the added, removed and changed routes
+ * are written to the OVSDB database.
+ */
+struct ospf_route_column {
+  struct shash rows;                   /* Unmatched existing rows by prefix */
+  struct ovsrec_ospf_route **routes;   /* New contents of the route column */
+  size_t n_routes;
+  bool changed;
+};
+
+struct ospf_route_publish_stats {
+  unsigned int inserted;
+  unsigned int updated;
+  unsigned int deleted;
+  unsigned int unchanged;
+};
+
+static void
+ospf_route_column_init (struct ospf_route_column *col,
+                        struct ovsrec_ospf_route **routes, size_t n_routes,
+                        size_t max_routes)
+{
+  size_t i;
+
+  shash_init (&col->rows);
+  for (i = 0; i < n_routes; i++) {
+    if (routes[i]->prefix) {
+      shash_add (&col->rows, routes[i]->prefix, routes[i]);
+    }
+  }
+
+  col->routes = xcalloc (max_routes, sizeof (struct ovsrec_ospf_route *));
+  col->n_routes = 0;
+  col->changed = false;
+}
+
+/*
+ * Get the OSPF_Route row of the prefix for the new route column, reusing
+ * the existing row of the prefix if there is one.
+ */
+static struct ovsrec_ospf_route *
+ospf_route_column_get_row (struct ospf_route_column *col,
+                           struct ovsdb_idl_txn *txn, const char *prefix_str,
+                           bool *is_new)
+{
+  struct ovsrec_ospf_route *ospf_route_row;
+
+  ospf_route_row = shash_find_and_delete (&col->rows, prefix_str);
+  *is_new = (ospf_route_row == NULL);
+
+  if (*is_new) {
+    if (!(ospf_route_row = ovsrec_ospf_route_insert (txn))) {
+      VLOG_ERR ("Insert in OSPF_Route table Failed.");
+      return NULL;
+    }
+    ovsrec_ospf_route_set_prefix (ospf_route_row, prefix_str);
+    col->changed = true;
+  }
+
+  col->routes[col->n_routes++] = ospf_route_row;
+
+  return ospf_route_row;
+}
+
+/*
+ * The existing rows which are not part of the new route column are removed
+ * from it. Returns true if the route column has to be written.
+ */
+static bool
+ospf_route_column_finish (struct ospf_route_column *col,
+                          struct ospf_route_publish_stats *stats)
+{
+  if (!shash_is_empty (&col->rows)) {
+    stats->deleted += shash_count (&col->rows);
+    col->changed = true;
+  }
+
+  return col->changed;
+}
+
+static void
+ospf_route_column_destroy (struct ospf_route_column *col)
+{
+  shash_destroy (&col->rows);
+  free (col->routes);
+  col->routes = NULL;
+}
+
+/*
+ * Build the path strings of the OSPF_Route row of the route.
+ * Returns the number of path strings.
+ */
+static size_t
+ospf_route_paths_to_strings (const struct ospf_route *or, char ***pathstrs)
+{
+  struct listnode *pnode, *pnnode;
+  struct ospf_path *path;
+  size_t k = 0;
+
+  *pathstrs = NULL;
+  if (!or->paths || !or->paths->count) {
+    return 0;
+  }
+
+  *pathstrs = xcalloc (or->paths->count, sizeof (char *));
+  for (ALL_LIST_ELEMENTS (or->paths, pnode, pnnode, path)) {
+    if (if_lookup_by_index(path->ifindex)) {
+      (*pathstrs)[k] = xcalloc (1, MAX_PATH_STRING_LEN * sizeof (char));
+      if (path->nexthop.s_addr == 0) {
+        snprintf ((*pathstrs)[k++], MAX_PATH_STRING_LEN, "directly attached to %s", ifindex2ifname (path->ifindex));
+      }
+      else {
+        snprintf ((*pathstrs)[k++], MAX_PATH_STRING_LEN, "via %s, %s", inet_ntoa (path->nexthop), ifindex2ifname (path->ifindex));
+      }
+    }
+  }
+
+  return k;
+}
+
+static void
+ospf_route_paths_free (char **pathstrs, size_t n_paths)
+{
+  size_t l;
+
+  for (l = 0; l < n_paths; l++) {
+    free (pathstrs[l]);
+  }
+  free (pathstrs);
+}
+
+/* The paths column is a set, so the order of the paths is not compared */
+static bool
+ospf_route_paths_equal (const struct ovsrec_ospf_route *ospf_route_row,
+                        char **pathstrs, size_t n_paths)
+{
+  size_t k, l;
+
+  if (ospf_route_row->n_paths != n_paths) {
+    return false;
+  }
+
+  for (k = 0; k < n_paths; k++) {
+    for (l = 0; l < ospf_route_row->n_paths; l++) {
+      if (!strcmp (ospf_route_row->paths[l], pathstrs[k])) {
+        break;
+      }
+    }
+    if (l == ospf_route_row->n_paths) {
+      return false;
+    }
+  }
+
+  return true;
+}
+
+/*
+ * Write the columns of the OSPF_Route row which differ from the route.
+ * Consumes the route info and the path strings.
+ */
+static void
+ospf_route_row_update (const struct ovsrec_ospf_route *ospf_route_row,
+                       bool is_new, const char *path_type,
+                       struct smap *route_info, char **pathstrs,
+                       size_t n_paths, struct ospf_route_publish_stats *stats)
+{
+  bool updated = false;
+
+  if (!ospf_route_row->path_type || strcmp (ospf_route_row->path_type, path_type)) {
+    ovsrec_ospf_route_set_path_type (ospf_route_row, path_type);
+    updated = true;
+  }
+
+  if (!smap_equal (&ospf_route_row->route_info, route_info)) {
+    ovsrec_ospf_route_set_route_info (ospf_route_row, route_info);
+    updated = true;
+  }
+  smap_destroy (route_info);
+
+  if (!ospf_route_paths_equal (ospf_route_row, pathstrs, n_paths)) {
+    ovsrec_ospf_route_set_paths (ospf_route_row, pathstrs, n_paths);
+    updated = true;
+  }
+  ospf_route_paths_free (pathstrs, n_paths);
+
+  if (is_new) {
+    stats->inserted++;
+  }
+  else if (updated) {
+    stats->updated++;
+  }
+  else {
+    stats->unchanged++;
+  }
+}
+
+static void
+ospf_route_publish_stats_log (const char *route_type,
+                              const struct ospf_route_publish_stats *stats)
+{
+  COVERAGE_INC (ospf_route_publish);
+  COVERAGE_ADD (ospf_route_row_insert, stats->inserted);
+  COVERAGE_ADD (ospf_route_row_update, stats->updated);
+  COVERAGE_ADD (ospf_route_row_delete, stats->deleted);
+  COVERAGE_ADD (ospf_route_row_unchanged, stats->unchanged);
+
+  VLOG_DBG ("OSPF %s routes published: %u inserted, %u updated, %u deleted, %u unchanged",
+            route_type, stats->inserted, stats->updated, stats->deleted,
+            stats->unchanged);
+}
+
+/*
+ * Get the per area ospf routing table of the area from the area route table
+ */
+static struct route_table *
+ospf_area_route_table_lookup (struct route_table *oart, int64_t area_id)
+{
+  struct route_table *per_area_rt_table = NULL;
+  struct route_node *rn;
+  struct prefix p_area;
+
+  memset (&p_area, 0, sizeof (p_area));
+  p_area.family = AF_INET;
+  p_area.prefixlen = IPV4_MAX_BITLEN;
+  p_area.u.prefix4.s_addr = (in_addr_t) area_id;
+
+  if ((rn = route_node_lookup (oart, &p_area))) {
+    per_area_rt_table = (struct route_table *) rn->info;
+    route_unlock_node (rn);
+  }
+
+  return per_area_rt_table;
+}
+
 /*
  * Update the ospf network routes in the OSPF_Route table of the OVSDB database *
  */
@@ -5362,20 +6270,20 @@ ovsdb_ospf_update_network_routes (const struct ospf *ospf, const struct route_ta
   struct ovsrec_ospf_router *ospf_router_row = NULL;
   struct ovsrec_ospf_area *ospf_area_row = NULL;
   struct ovsrec_ospf_route *ospf_route_row = NULL;
-  struct ovsrec_ospf_route **intra_area_rts = NULL, **inter_area_rts = NULL;
+  struct ospf_route_column intra_col, inter_col, *col;
+  struct ospf_route_publish_stats stats;
   struct ovsdb_idl_txn* ort_txn = NULL;
   enum   ovsdb_idl_txn_status txn_status;
   struct route_node *rn, *rn1;
   struct ospf_route *or;
   struct route_table *ospf_area_route_table = NULL, *per_area_rt_table = NULL;
-  struct in_addr area_id;
   struct smap route_info;
   char   cost[9] = {0};
   char   prefix_str[19] = {0};
-  struct listnode *pnode, *pnnode;
-  struct ospf_path *path;
   char   **pathstrs = NULL;
-  int    i = 0, j = 0, k = 0, l = 0;
+  size_t n_paths;
+  bool   is_new;
+  int    i = 0;
 
   if (NULL == ospf || NULL == rt) {
     VLOG_DBG ("No ospf instance or no routes to add");
@@ -5399,16 +6307,7 @@ ovsdb_ospf_update_network_routes (const struct ospf *ospf, const struct route_ta
     return;
   }
 
-  /* Delete all the network routes of all the areas in the ospf router instance */
-  for (i = 0 ; i < ospf_router_row->n_areas ; i++) {
-    ospf_area_row = ospf_router_row->value_areas[i];
-
-    ovsrec_ospf_area_set_intra_area_ospf_routes (ospf_area_row, NULL, 0);
-
-    ovsrec_ospf_area_set_inter_area_ospf_routes (ospf_area_row, NULL, 0);
-  }
-
-  /* Add ospf routes to OVSDB OSPF_Route table */
+  memset (&stats, 0, sizeof (stats));
 
   /* Generating the per area ospf routing table */
   ospf_area_route_table = route_table_init ();
@@ -5418,110 +6317,73 @@ ovsdb_ospf_update_network_routes (const struct ospf *ospf, const struct route_ta
     }
   }
 
-  /* Updating the OVSDB databse from the per area ospf routing table */
-  for (rn = route_top (ospf_area_route_table); rn; rn = route_next (rn)) {
-    if ((per_area_rt_table = (struct route_table *)(rn->info))) {
-      area_id = rn->p.u.prefix4;
-      if (ospf_area_row = ovsrec_ospf_area_get_area_by_id (ospf_router_row, area_id)) {
-        i = j = 0;
-        if (!(intra_area_rts = xcalloc (per_area_rt_table->count, sizeof (struct ovsrec_ospf_route *)))) {
-          VLOG_ERR ("Memory allocation Failure");
-          ovsdb_idl_txn_abort(ort_txn);
-          route_unlock_node (rn);
-          return;
-        }
-        if (!(inter_area_rts = xcalloc (per_area_rt_table->count, sizeof (struct ovsrec_ospf_route *)))) {
-          VLOG_ERR ("Memory allocation Failure");
-          free (intra_area_rts);
-          ovsdb_idl_txn_abort(ort_txn);
-          route_unlock_node (rn);
-          return;
+  /* Updating the OVSDB databse from the per area ospf routing table.
+   * The network routes of the areas without routes are removed. */
+  for (i = 0 ; i < ospf_router_row->n_areas ; i++) {
+    ospf_area_row = ospf_router_row->value_areas[i];
+    per_area_rt_table = ospf_area_route_table_lookup (ospf_area_route_table,
+                                                      ospf_router_row->key_areas[i]);
+
+    ospf_route_column_init (&intra_col, ospf_area_row->intra_area_ospf_routes,
+                            ospf_area_row->n_intra_area_ospf_routes,
+                            per_area_rt_table ? per_area_rt_table->count : 0);
+    ospf_route_column_init (&inter_col, ospf_area_row->inter_area_ospf_routes,
+                            ospf_area_row->n_inter_area_ospf_routes,
+                            per_area_rt_table ? per_area_rt_table->count : 0);
+
+    if (per_area_rt_table) {
+      for (rn1 = route_top (per_area_rt_table); rn1; rn1 = route_next (rn1)) {
+        if (!(or = (struct ospf_route *)(rn1->info))) {
+          continue;
         }
-        for (rn1 = route_top (per_area_rt_table); rn1; rn1 = route_next (rn1))
-          if ((or = (struct ospf_route *)(rn1->info))) {
-            memset(prefix_str, 0, sizeof(prefix_str));
 
-            if (!(ospf_route_row = ovsrec_ospf_route_insert (ort_txn))) {
-              VLOG_ERR ("insert in OSPF_Route Failed.");
-              continue;
-            }
+        if (or->path_type == OSPF_PATH_INTRA_AREA) {
+          col = &intra_col;
+        }
+        else if (or->path_type == OSPF_PATH_INTER_AREA) {
+          col = &inter_col;
+        }
+        else {
+          continue;
+        }
 
-            if (or->path_type == OSPF_PATH_INTRA_AREA) {
-              intra_area_rts[i++] = ospf_route_row;
-              ovsrec_ospf_route_set_path_type (ospf_route_row, OSPF_PATH_TYPE_STRING_INTRA_AREA);
-            }
-            else if (or->path_type == OSPF_PATH_INTER_AREA) {
-              inter_area_rts[j++] = ospf_route_row;
-              ovsrec_ospf_route_set_path_type (ospf_route_row, OSPF_PATH_TYPE_STRING_INTER_AREA);
-            }
-            else {
-              continue;
-            }
+        memset(prefix_str, 0, sizeof(prefix_str));
+        snprintf (prefix_str, sizeof(prefix_str), "%s/%d", inet_ntoa (rn1->p.u.prefix4), rn1->p.prefixlen);
 
-            snprintf (prefix_str, sizeof(prefix_str), "%s/%d", inet_ntoa (rn1->p.u.prefix4), rn1->p.prefixlen);
-            ovsrec_ospf_route_set_prefix (ospf_route_row, prefix_str);
-
-            if (!(or->path_type == OSPF_PATH_INTER_AREA && or->type == OSPF_DESTINATION_DISCARD)) {
-              memset(cost, 0, sizeof(cost));
-              smap_clone (&route_info, &(ospf_route_row->route_info));
-              smap_replace (&route_info, OSPF_KEY_ROUTE_AREA_ID, inet_ntoa (or->u.std.area_id));
-              snprintf (cost, sizeof(cost), "%d", or->cost);
-              smap_replace (&route_info, OSPF_KEY_ROUTE_COST, cost);
-              ovsrec_ospf_route_set_route_info (ospf_route_row, &route_info);
-              smap_destroy (&route_info);
-            }
+        if (!(ospf_route_row = ospf_route_column_get_row (col, ort_txn, prefix_str, &is_new))) {
+          continue;
+        }
 
-            if (or->type == OSPF_DESTINATION_NETWORK) {
-              k = 0;
-
-              if (or->paths) {
-                if (!(pathstrs = xcalloc (or->paths->count, sizeof (char *)))) {
-                  VLOG_ERR ("Memory allocation Failure");
-                  free (intra_area_rts);
-                  free (inter_area_rts);
-                  ovsdb_idl_txn_abort(ort_txn);
-                  route_unlock_node (rn1);
-                  route_unlock_node (rn);
-                  return;
-                }
+        smap_init (&route_info);
+        if (!(or->path_type == OSPF_PATH_INTER_AREA && or->type == OSPF_DESTINATION_DISCARD)) {
+          memset(cost, 0, sizeof(cost));
+          smap_replace (&route_info, OSPF_KEY_ROUTE_AREA_ID, inet_ntoa (or->u.std.area_id));
+          snprintf (cost, sizeof(cost), "%d", or->cost);
+          smap_replace (&route_info, OSPF_KEY_ROUTE_COST, cost);
+        }
 
-                for (ALL_LIST_ELEMENTS (or->paths, pnode, pnnode, path))
-                  if (if_lookup_by_index(path->ifindex)) {
-                    if (!(pathstrs[k] = xcalloc (1, MAX_PATH_STRING_LEN * sizeof (char )))) {
-                      VLOG_ERR ("Memory allocation Failure");
-                      free (intra_area_rts);
-                      free (inter_area_rts);
-                      for (l = 0; l < k; l++) {
-                        free(pathstrs[l]);
-                      }
-                      free (pathstrs);
-                      ovsdb_idl_txn_abort(ort_txn);
-                      route_unlock_node (rn1);
-                      route_unlock_node (rn);
-                      return;
-                    }
-                    if (path->nexthop.s_addr == 0) {
-                      snprintf (pathstrs[k++], MAX_PATH_STRING_LEN, "directly attached to %s", ifindex2ifname (path->ifindex));
-                    }
-                    else {
-                      snprintf (pathstrs[k++], MAX_PATH_STRING_LEN, "via %s, %s", inet_ntoa (path->nexthop), ifindex2ifname (path->ifindex));
-                    }
-                  }
+        n_paths = 0;
+        pathstrs = NULL;
+        if (or->type == OSPF_DESTINATION_NETWORK) {
+          n_paths = ospf_route_paths_to_strings (or, &pathstrs);
+        }
 
-                ovsrec_ospf_route_set_paths (ospf_route_row, pathstrs, k);
-                for (l = 0; l < k; l++) {
-                  free(pathstrs[l]);
-                }
-                free (pathstrs);
-              }
-            }
-          }
-         ovsrec_ospf_area_set_intra_area_ospf_routes (ospf_area_row, intra_area_rts, i);
-         free (intra_area_rts);
-         ovsrec_ospf_area_set_inter_area_ospf_routes (ospf_area_row, inter_area_rts, j);
-         free (inter_area_rts);
+        ospf_route_row_update (ospf_route_row, is_new,
+                               (or->path_type == OSPF_PATH_INTRA_AREA) ?
+                               OSPF_PATH_TYPE_STRING_INTRA_AREA :
+                               OSPF_PATH_TYPE_STRING_INTER_AREA,
+                               &route_info, pathstrs, n_paths, &stats);
       }
     }
+
+    if (ospf_route_column_finish (&intra_col, &stats)) {
+      ovsrec_ospf_area_set_intra_area_ospf_routes (ospf_area_row, intra_col.routes, intra_col.n_routes);
+    }
+    if (ospf_route_column_finish (&inter_col, &stats)) {
+      ovsrec_ospf_area_set_inter_area_ospf_routes (ospf_area_row, inter_col.routes, inter_col.n_routes);
+    }
+    ospf_route_column_destroy (&intra_col);
+    ospf_route_column_destroy (&inter_col);
   }
 
   ospf_area_route_table_free (ospf_area_route_table);
@@ -5533,6 +6395,8 @@ ovsdb_ospf_update_network_routes (const struct ospf *ospf, const struct route_ta
 
   ovsdb_idl_txn_destroy(ort_txn);
 
+  ospf_route_publish_stats_log ("network", &stats);
+
   return;
 }
 
@@ -5545,21 +6409,21 @@ ovsdb_ospf_update_router_routes (const struct ospf *ospf, const struct route_tab
   struct ovsrec_ospf_router *ospf_router_row = NULL;
   struct ovsrec_ospf_area *ospf_area_row = NULL;
   struct ovsrec_ospf_route *ospf_route_row = NULL;
-  struct ovsrec_ospf_route **router_rts = NULL;
+  struct ospf_route_column router_col;
+  struct ospf_route_publish_stats stats;
   struct ovsdb_idl_txn* ort_txn = NULL;
   enum   ovsdb_idl_txn_status txn_status;
   struct route_node *rn, *rn1;
   struct listnode *node;
   struct ospf_route *or;
   struct route_table *ospf_area_route_table = NULL, *per_area_rt_table = NULL;
-  struct in_addr area_id;
-  struct listnode *pnode, *pnnode;
-  struct ospf_path *path;
   struct smap route_info;
   char   prefix_str[19] = {0};
   char   cost[9] = {0};
   char   **pathstrs = NULL;
-  int    i = 0, j = 0, k = 0, l = 0;
+  size_t n_paths;
+  bool   is_new;
+  int    i = 0;
 
   if (NULL == ospf || NULL == rt) {
     VLOG_DBG ("No ospf instance or no routes to add");
@@ -5583,14 +6447,7 @@ ovsdb_ospf_update_router_routes (const struct ospf *ospf, const struct route_tab
     return;
   }
 
-  /* Delete all the network routes of all the areas in the ospf router instance */
-  for (i = 0 ; i < ospf_router_row->n_areas ; i++) {
-    ospf_area_row = ospf_router_row->value_areas[i];
-
-    ovsrec_ospf_area_set_router_ospf_routes (ospf_area_row, NULL, 0);
-  }
-
-  /* Add ospf routes to OVSDB OSPF_Route table */
+  memset (&stats, 0, sizeof (stats));
 
   /* Generating the per area ospf routing table */
   ospf_area_route_table = route_table_init ();
@@ -5599,90 +6456,50 @@ ovsdb_ospf_update_router_routes (const struct ospf *ospf, const struct route_tab
       for (ALL_LIST_ELEMENTS_RO ((struct list *)rn->info, node, or))
         ospf_route_add_to_area_route_table (ospf_area_route_table, &(rn->p), or);
 
-  /* Updating the OVSDB databse from the per area ospf routing table */
-  for (rn = route_top (ospf_area_route_table); rn; rn = route_next (rn)) {
-    if ((per_area_rt_table = (struct route_table *)(rn->info))) {
-      area_id = rn->p.u.prefix4;
-      if (ospf_area_row = ovsrec_ospf_area_get_area_by_id (ospf_router_row, area_id)) {
-        i = j = 0;
-        if (!(router_rts = xcalloc (per_area_rt_table->count, sizeof (struct ovsrec_ospf_route *)))) {
-          VLOG_ERR ("Memory allocation Failure");
-          ovsdb_idl_txn_abort(ort_txn);
-          route_unlock_node (rn);
-          return;
-        }
-        for (rn1 = route_top (per_area_rt_table); rn1; rn1 = route_next (rn1)) {
-          if ((or = (struct ospf_route *)(rn1->info))) {
-            memset(prefix_str, 0, sizeof(prefix_str));
-            memset(cost, 0, sizeof(cost));
-            k = 0;
-
-            if (!(ospf_route_row = ovsrec_ospf_route_insert (ort_txn))) {
-              VLOG_ERR ("insert in OSPF_Route Failed.");
-              continue;
-            }
+  /* Updating the OVSDB databse from the per area ospf routing table.
+   * The router routes of the areas without routes are removed. */
+  for (i = 0 ; i < ospf_router_row->n_areas ; i++) {
+    ospf_area_row = ospf_router_row->value_areas[i];
+    per_area_rt_table = ospf_area_route_table_lookup (ospf_area_route_table,
+                                                      ospf_router_row->key_areas[i]);
 
-            router_rts[i++] = ospf_route_row;
-
-            snprintf (prefix_str, sizeof(prefix_str), "%s", inet_ntoa (rn1->p.u.prefix4));
-            ovsrec_ospf_route_set_prefix (ospf_route_row, prefix_str);
-
-            ovsrec_ospf_route_set_path_type (ospf_route_row, ospf_route_path_type_string (or->path_type));
-
-            smap_clone (&route_info, &(ospf_route_row->route_info));
-            smap_replace (&route_info, OSPF_KEY_ROUTE_AREA_ID, inet_ntoa (or->u.std.area_id));
-            snprintf (cost, sizeof (cost), "%d", or->cost);
-            smap_replace (&route_info, OSPF_KEY_ROUTE_COST, cost);
-            smap_replace (&route_info, OSPF_KEY_ROUTE_TYPE_ABR, boolean2string(or->u.std.flags & ROUTER_LSA_BORDER));
-            smap_replace (&route_info, OSPF_KEY_ROUTE_TYPE_ASBR, boolean2string(or->u.std.flags & or->u.std.flags & ROUTER_LSA_EXTERNAL));
-            ovsrec_ospf_route_set_route_info (ospf_route_row, &route_info);
-            smap_destroy (&route_info);
-
-            if (or->paths) {
-              if (!(pathstrs = xcalloc (or->paths->count, sizeof (char *)))) {
-                VLOG_ERR ("Memory allocation Failure");
-                free (router_rts);
-                ovsdb_idl_txn_abort(ort_txn);
-                route_unlock_node (rn1);
-                route_unlock_node (rn);
-                return;
-              }
+    ospf_route_column_init (&router_col, ospf_area_row->router_ospf_routes,
+                            ospf_area_row->n_router_ospf_routes,
+                            per_area_rt_table ? per_area_rt_table->count : 0);
 
-              for (ALL_LIST_ELEMENTS (or->paths, pnode, pnnode, path)) {
-                if (if_lookup_by_index(path->ifindex)) {
-                  if (!(pathstrs[k] = xcalloc (1, MAX_PATH_STRING_LEN * sizeof (char )))) {
-                    VLOG_ERR ("Memory allocation Failure");
-                    free (router_rts);
-                    for (l = 0; l < k; l++) {
-                      free(pathstrs[l]);
-                    }
-                    free (pathstrs);
-                    ovsdb_idl_txn_abort(ort_txn);
-                    route_unlock_node (rn1);
-                    route_unlock_node (rn);
-                    return;
-                  }
-                  if (path->nexthop.s_addr == 0) {
-                    snprintf (pathstrs[k++], MAX_PATH_STRING_LEN, "directly attached to %s", ifindex2ifname (path->ifindex));
-                  }
-                  else {
-                    snprintf (pathstrs[k++], MAX_PATH_STRING_LEN, "via %s, %s", inet_ntoa (path->nexthop), ifindex2ifname (path->ifindex));
-                  }
-                }
-              }
+    if (per_area_rt_table) {
+      for (rn1 = route_top (per_area_rt_table); rn1; rn1 = route_next (rn1)) {
+        if (!(or = (struct ospf_route *)(rn1->info))) {
+          continue;
+        }
 
-              ovsrec_ospf_route_set_paths (ospf_route_row, pathstrs, k);
-              for (l = 0; l < k; l++) {
-                free(pathstrs[l]);
-              }
-              free (pathstrs);
-            }
-          }
+        memset(prefix_str, 0, sizeof(prefix_str));
+        snprintf (prefix_str, sizeof(prefix_str), "%s", inet_ntoa (rn1->p.u.prefix4));
+
+        if (!(ospf_route_row = ospf_route_column_get_row (&router_col, ort_txn, prefix_str, &is_new))) {
+          continue;
         }
-        ovsrec_ospf_area_set_router_ospf_routes (ospf_area_row, router_rts, i);
-        free (router_rts);
+
+        memset(cost, 0, sizeof(cost));
+        smap_init (&route_info);
+        smap_replace (&route_info, OSPF_KEY_ROUTE_AREA_ID, inet_ntoa (or->u.std.area_id));
+        snprintf (cost, sizeof (cost), "%d", or->cost);
+        smap_replace (&route_info, OSPF_KEY_ROUTE_COST, cost);
+        smap_replace (&route_info, OSPF_KEY_ROUTE_TYPE_ABR, boolean2string(or->u.std.flags & ROUTER_LSA_BORDER));
+        smap_replace (&route_info, OSPF_KEY_ROUTE_TYPE_ASBR, boolean2string(or->u.std.flags & or->u.std.flags & ROUTER_LSA_EXTERNAL));
+
+        n_paths = ospf_route_paths_to_strings (or, &pathstrs);
+
+        ospf_route_row_update (ospf_route_row, is_new,
+                               ospf_route_path_type_string (or->path_type),
+                               &route_info, pathstrs, n_paths, &stats);
       }
     }
+
+    if (ospf_route_column_finish (&router_col, &stats)) {
+      ovsrec_ospf_area_set_router_ospf_routes (ospf_area_row, router_col.routes, router_col.n_routes);
+    }
+    ospf_route_column_destroy (&router_col);
   }
 
   ospf_area_route_table_free (ospf_area_route_table);
@@ -5694,6 +6511,8 @@ ovsdb_ospf_update_router_routes (const struct ospf *ospf, const struct route_tab
 
   ovsdb_idl_txn_destroy(ort_txn);
 
+  ospf_route_publish_stats_log ("router", &stats);
+
   return;
 }
 
@@ -5705,18 +6524,18 @@ ovsdb_ospf_update_ext_routes (const struct ospf *ospf, const struct route_table
 {
   struct ovsrec_ospf_router *ospf_router_row = NULL;
   struct ovsrec_ospf_route *ospf_route_row = NULL;
-  struct ovsrec_ospf_route **ext_rts = NULL;
+  struct ospf_route_column ext_col;
+  struct ospf_route_publish_stats stats;
   struct ovsdb_idl_txn* ort_txn = NULL;
   enum   ovsdb_idl_txn_status txn_status;
   struct route_node *rn;
   struct ospf_route *or;
   char   prefix_str[19] = {0};
-  struct listnode *pnode, *pnnode;
-  struct ospf_path *path;
   struct smap route_info;
   char   buf[20] = {0};
   char   **pathstrs = NULL;
-  int    i = 0, k = 0, l = 0;
+  size_t n_paths;
+  bool   is_new;
 
   if (NULL == ospf || NULL == rt) {
       VLOG_DBG ("No ospf instance or no routes to add");
@@ -5735,35 +6554,24 @@ ovsdb_ospf_update_ext_routes (const struct ospf *ospf, const struct route_table
       return;
   }
 
-  /* Delete all the network routes of all the areas in the ospf router instance */
-  ovsrec_ospf_router_set_ext_ospf_routes (ospf_router_row, NULL, 0);
+  memset (&stats, 0, sizeof (stats));
 
-  /* Add ospf routes to OVSDB OSPF_Route table */
-  if (!(ext_rts = xcalloc (rt->count, sizeof (struct ovsrec_ospf_route *)))) {
-    VLOG_ERR ("Memory allocation Failure");
-    ovsdb_idl_txn_abort(ort_txn);
-    return;
-  }
+  /* Only the added, removed and changed external routes are written */
+  ospf_route_column_init (&ext_col, ospf_router_row->ext_ospf_routes,
+                          ospf_router_row->n_ext_ospf_routes, rt->count);
 
   for (rn = route_top (rt); rn; rn = route_next (rn)) {
     if ((or = (struct ospf_route *)(rn->info))) {
       memset(prefix_str, 0, sizeof(prefix_str));
       memset(buf, 0, sizeof(buf));
-      k = 0;
-
-      if (!(ospf_route_row = ovsrec_ospf_route_insert (ort_txn))) {
-        VLOG_ERR ("Insert in OSPF_Route table Failed.");
-        continue;
-      }
-
-      ext_rts[i++] = ospf_route_row;
 
       snprintf (prefix_str, sizeof(prefix_str), "%s/%d", inet_ntoa (rn->p.u.prefix4), rn->p.prefixlen);
-      ovsrec_ospf_route_set_prefix (ospf_route_row, prefix_str);
 
-      ovsrec_ospf_route_set_path_type (ospf_route_row, ospf_route_path_type_string (or->path_type));
+      if (!(ospf_route_row = ospf_route_column_get_row (&ext_col, ort_txn, prefix_str, &is_new))) {
+        continue;
+      }
 
-      smap_clone (&route_info, &(ospf_route_row->route_info));
+      smap_init (&route_info);
       smap_replace (&route_info, OSPF_KEY_ROUTE_AREA_ID, inet_ntoa (or->u.std.area_id));
       snprintf (buf, 11, "%u", or->cost);
       smap_replace (&route_info, OSPF_KEY_ROUTE_COST, buf);
@@ -5776,49 +6584,19 @@ ovsdb_ospf_update_ext_routes (const struct ospf *ospf, const struct route_table
         snprintf (buf, sizeof (buf), "%u", or->u.ext.type2_cost);
         smap_replace (&route_info, OSPF_KEY_ROUTE_TYPE2_COST, buf);
       }
-      ovsrec_ospf_route_set_route_info (ospf_route_row, &route_info);
-      smap_destroy (&route_info);
-
-      if (or->paths) {
-        if (!(pathstrs = xcalloc (or->paths->count, sizeof (char *)))) {
-          VLOG_ERR ("Memory allocation Failure");
-          free (ext_rts);
-          ovsdb_idl_txn_abort(ort_txn);
-          route_unlock_node (rn);
-          return;
-        }
-        for (ALL_LIST_ELEMENTS (or->paths, pnode, pnnode, path)) {
-          if (if_lookup_by_index(path->ifindex)) {
-            if (!(pathstrs[k] = xcalloc (1, MAX_PATH_STRING_LEN * sizeof (char )))) {
-              VLOG_ERR ("Memory allocation Failure");
-              free (ext_rts);
-              for (l = 0; l < k; l++)
-                free(pathstrs[l]);
-              free (pathstrs);
-              ovsdb_idl_txn_abort(ort_txn);
-              route_unlock_node (rn);
-              return;
-            }
-            if (path->nexthop.s_addr == 0) {
-              snprintf (pathstrs[k++], MAX_PATH_STRING_LEN, "directly attached to %s", ifindex2ifname (path->ifindex));
-            }
-            else {
-              snprintf (pathstrs[k++], MAX_PATH_STRING_LEN, "via %s, %s", inet_ntoa (path->nexthop), ifindex2ifname (path->ifindex));
-            }
-          }
-        }
 
-        ovsrec_ospf_route_set_paths (ospf_route_row, pathstrs, k);
-        for (l = 0; l < k; l++) {
-          free(pathstrs[l]);
-        }
-        free (pathstrs);
-      }
+      n_paths = ospf_route_paths_to_strings (or, &pathstrs);
+
+      ospf_route_row_update (ospf_route_row, is_new,
+                             ospf_route_path_type_string (or->path_type),
+                             &route_info, pathstrs, n_paths, &stats);
     }
   }
 
-  ovsrec_ospf_router_set_ext_ospf_routes (ospf_router_row, ext_rts, i);
-  free (ext_rts);
+  if (ospf_route_column_finish (&ext_col, &stats)) {
+    ovsrec_ospf_router_set_ext_ospf_routes (ospf_router_row, ext_col.routes, ext_col.n_routes);
+  }
+  ospf_route_column_destroy (&ext_col);
 
   txn_status = ovsdb_idl_txn_commit_block(ort_txn);
   if (TXN_SUCCESS != txn_status && TXN_UNCHANGED != txn_status) {
@@ -5827,6 +6605,8 @@ ovsdb_ospf_update_ext_routes (const struct ospf *ospf, const struct route_table
 
   ovsdb_idl_txn_destroy(ort_txn);
 
+  ospf_route_publish_stats_log ("external", &stats);
+
   return;
 }
 
@@ -6126,6 +6906,7 @@ void ospf_ovsdb_init_poll_loop (struct ospf_master *ospfm)
     ospf_ovs_run();
     ospf_ovs_wait();
     ospf_ovspoll_enqueue(&glob_ospf_ovs);
+    ospf_lsa_mirror_schedule();
 }
 
 static void
@@ -6139,6 +6920,7 @@ ovsdb_exit(void)
  */
 void ospf_ovsdb_exit(void)
 {
+    ospf_lsa_mirror_clear();
     ovsdb_exit();
 }
 
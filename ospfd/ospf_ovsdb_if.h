@@ -42,6 +42,17 @@
 #define OSPF_KEY_AREA_STATS_ABR_COUNT            "abr_count"
 #define OSPF_KEY_AREA_STATS_ASBR_COUNT            "asbr_count"
 
+#define OSPF_KEY_AREA_STATS_SPF_LAST_DURATION    "spf_last_duration"
+#define OSPF_KEY_AREA_STATS_SPF_MAX_DURATION     "spf_max_duration"
+#define OSPF_KEY_AREA_STATS_SPF_BATCHED_EVENTS   "spf_batched_events"
+#define OSPF_KEY_AREA_STATS_SPF_MAX_BATCHED      "spf_max_batched_events"
+#define OSPF_KEY_AREA_STATS_SPF_PENDING_EVENTS   "spf_pending_events"
+#define OSPF_KEY_AREA_STATS_SPF_FULL_RUNS        "spf_full_runs"
+#define OSPF_KEY_AREA_STATS_SPF_PARTIAL_RUNS     "spf_partial_runs"
+#define OSPF_KEY_AREA_STATS_SPF_REASON_PREFIX    "spf_reason_"
+/* Number of SPF run keys written with the SPF execution count */
+#define OSPF_AREA_SPF_STATS_KEYS                 8
+
 #define OSPF_MIN_INTERVAL                   1
 #define OSPF_MIN__RETRANSMIT_INTERVAL       1
 #define OSPF_MAX_INTERVAL                   65535
@@ -228,4 +239,10 @@ if_set_value_from_ovsdb (struct ovsdb_idl *, const struct ovsrec_port *, struct
 extern void
 ovsdb_ospf_vl_update (const struct ospf_interface*);
 
+struct ospf_spf_stats;
+extern void
+ovsdb_ospf_set_spf_statistics (int instance, struct in_addr area_id,
+                               long spf_ts, int spf_count,
+                               const struct ospf_spf_stats *spf_stats);
+
 #endif /* OSPF_OVSDB_IF_H */
@@ -64,6 +64,25 @@ ospf_route_free (struct ospf_route *or)
   XFREE (MTYPE_OSPF_ROUTE, or);
 }
 
+struct ospf_route *
+ospf_route_dup (struct ospf_route *or)
+{
+  struct ospf_route *new;
+
+  new = ospf_route_new ();
+  new->ctime = or->ctime;
+  new->mtime = or->mtime;
+  new->type = or->type;
+  new->id = or->id;
+  new->mask = or->mask;
+  new->path_type = or->path_type;
+  new->cost = or->cost;
+  new->u = or->u;
+  ospf_route_copy_nexthops (new, or->paths);
+
+  return new;
+}
+
 struct ospf_path *
 ospf_path_new ()
 {
@@ -126,6 +145,27 @@ ospf_route_table_free (struct route_table *rt)
    route_table_finish (rt);
 }
 
+/* Copy a route table, e.g. to keep the intra-area routes of the last
+   SPF calculation while the original is consumed by the route install. */
+struct route_table *
+ospf_route_table_dup (struct route_table *rt)
+{
+  struct route_table *new;
+  struct route_node *rn, *new_rn;
+  struct ospf_route *or;
+
+  new = route_table_init ();
+
+  for (rn = route_top (rt); rn; rn = route_next (rn))
+    if ((or = rn->info) != NULL)
+      {
+	new_rn = route_node_get (new, &rn->p);
+	new_rn->info = ospf_route_dup (or);
+      }
+
+  return new;
+}
+
 /* If a prefix exists in the new routing table, then return 1,
    otherwise return 0. Since the ZEBRA-RIB does an implicit
    withdraw, it is not necessary to send a delete, an add later
@@ -126,6 +126,8 @@ extern void ospf_path_free (struct ospf_path *);
 extern struct ospf_path *ospf_path_lookup (struct list *, struct ospf_path *);
 extern struct ospf_route *ospf_route_new (void);
 extern void ospf_route_free (struct ospf_route *);
+extern struct ospf_route *ospf_route_dup (struct ospf_route *);
+extern struct route_table *ospf_route_table_dup (struct route_table *);
 extern void ospf_route_delete (struct route_table *);
 extern void ospf_route_table_free (struct route_table *);
 
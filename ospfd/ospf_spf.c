@@ -46,11 +46,37 @@ Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
 #include "ospfd/ospf_ase.h"
 #include "ospfd/ospf_abr.h"
 #include "ospfd/ospf_dump.h"
+#ifdef ENABLE_OVSDB
+#include "ospf_ovsdb_if.h"
+#endif
 
 /* Variables to ensure a SPF scheduled log message is printed only once */
 
 static unsigned int spf_reason_flags = 0;
 
+static struct ospf_spf_stats spf_stats;
+
+static const char *spf_reason_names[SPF_FLAG_MAX] =
+{
+  [SPF_FLAG_ROUTER_LSA_INSTALL] = "router_lsa",
+  [SPF_FLAG_NETWORK_LSA_INSTALL] = "network_lsa",
+  [SPF_FLAG_SUMMARY_LSA_INSTALL] = "summary_lsa",
+  [SPF_FLAG_ASBR_SUMMARY_LSA_INSTALL] = "asbr_summary_lsa",
+  [SPF_FLAG_MAXAGE] = "maxage",
+  [SPF_FLAG_ABR_STATUS_CHANGE] = "abr_status",
+  [SPF_FLAG_ASBR_STATUS_CHANGE] = "asbr_status",
+  [SPF_FLAG_CONFIG_CHANGE] = "config",
+  [SPF_FLAG_SUMMARY_LSA_MAXAGE] = "summary_lsa_maxage",
+};
+
+const char *
+ospf_spf_reason_name (ospf_spf_reason_t reason)
+{
+  if (reason >= SPF_FLAG_MAX)
+    return NULL;
+  return spf_reason_names[reason];
+}
+
 static void
 ospf_clear_spf_reason_flags ()
 {
@@ -63,6 +89,20 @@ ospf_spf_set_reason (ospf_spf_reason_t reason)
   spf_reason_flags |= 1 << reason;
 }
 
+/* Reasons which leave the intra-area routes of the last full SPF valid.
+ * Summary-LSAs only feed the inter-area calculation (RFC2328 16.2, 16.3)
+ * so the Dijkstra of each area can be skipped for them.
+ */
+#define SPF_PARTIAL_REASONS ((1 << SPF_FLAG_SUMMARY_LSA_INSTALL) | \
+                             (1 << SPF_FLAG_ASBR_SUMMARY_LSA_INSTALL) | \
+                             (1 << SPF_FLAG_SUMMARY_LSA_MAXAGE))
+
+static int
+ospf_spf_reason_is_partial (void)
+{
+  return spf_reason_flags && !(spf_reason_flags & ~SPF_PARTIAL_REASONS);
+}
+
 static void
 ospf_get_spf_reason_str (char *buf)
 {
@@ -72,21 +112,26 @@ ospf_get_spf_reason_str (char *buf)
   buf[0] = '\0';
   if (spf_reason_flags)
     {
-      if (spf_reason_flags & SPF_FLAG_ROUTER_LSA_INSTALL)
+      if (spf_reason_flags & (1 << SPF_FLAG_ROUTER_LSA_INSTALL))
         strcat (buf, "R, ");
-      if (spf_reason_flags & SPF_FLAG_NETWORK_LSA_INSTALL)
+      if (spf_reason_flags & (1 << SPF_FLAG_NETWORK_LSA_INSTALL))
         strcat (buf, "N, ");
-      if (spf_reason_flags & SPF_FLAG_SUMMARY_LSA_INSTALL)
+      if (spf_reason_flags & (1 << SPF_FLAG_SUMMARY_LSA_INSTALL))
         strcat (buf, "S, ");
-      if (spf_reason_flags & SPF_FLAG_ASBR_SUMMARY_LSA_INSTALL)
+      if (spf_reason_flags & (1 << SPF_FLAG_ASBR_SUMMARY_LSA_INSTALL))
         strcat (buf, "AS, ");
-      if (spf_reason_flags & SPF_FLAG_ABR_STATUS_CHANGE)
+      if (spf_reason_flags & (1 << SPF_FLAG_ABR_STATUS_CHANGE))
         strcat (buf, "ABR, ");
-      if (spf_reason_flags & SPF_FLAG_ASBR_STATUS_CHANGE)
+      if (spf_reason_flags & (1 << SPF_FLAG_ASBR_STATUS_CHANGE))
         strcat (buf, "ASBR, ");
-      if (spf_reason_flags & SPF_FLAG_MAXAGE)
+      if (spf_reason_flags & (1 << SPF_FLAG_MAXAGE))
         strcat (buf, "M, ");
-      buf[strlen(buf)-2] = '\0'; /* skip the last ", " */
+      if (spf_reason_flags & (1 << SPF_FLAG_CONFIG_CHANGE))
+        strcat (buf, "C, ");
+      if (spf_reason_flags & (1 << SPF_FLAG_SUMMARY_LSA_MAXAGE))
+        strcat (buf, "SM, ");
+      if (buf[0] != '\0')
+        buf[strlen(buf)-2] = '\0'; /* skip the last ", " */
     }
 }
 
@@ -1120,6 +1165,47 @@ ospf_rtrs_free (struct route_table *rtrs)
   route_table_finish (rtrs);
 }
 
+struct route_table *
+ospf_rtrs_dup (struct route_table *rtrs)
+{
+  struct route_table *new;
+  struct route_node *rn, *new_rn;
+  struct list *or_list, *new_list;
+  struct ospf_route *or;
+  struct listnode *node;
+
+  new = route_table_init ();
+
+  for (rn = route_top (rtrs); rn; rn = route_next (rn))
+    if ((or_list = rn->info) != NULL)
+      {
+        new_list = list_new ();
+        for (ALL_LIST_ELEMENTS_RO (or_list, node, or))
+          listnode_add (new_list, ospf_route_dup (or));
+
+        new_rn = route_node_get (new, &rn->p);
+        new_rn->info = new_list;
+      }
+
+  return new;
+}
+
+/* Drop the intra-area routes kept for partial SPF calculations. */
+void
+ospf_spf_intra_free (struct ospf *ospf)
+{
+  if (ospf->spf_intra_table)
+    {
+      ospf_route_table_free (ospf->spf_intra_table);
+      ospf->spf_intra_table = NULL;
+    }
+  if (ospf->spf_intra_rtrs)
+    {
+      ospf_rtrs_free (ospf->spf_intra_rtrs);
+      ospf->spf_intra_rtrs = NULL;
+    }
+}
+
 #if 0
 static void
 ospf_rtrs_print (struct route_table *rtrs)
@@ -1289,13 +1375,6 @@ ospf_spf_calculate (struct ospf_area *area, struct route_table *new_table,
 
   quagga_gettime (QUAGGA_CLK_MONOTONIC, &area->ospf->ts_spf);
   area->ts_spf = area->ospf->ts_spf;
-#ifdef ENABLE_OVSDB
-  long spf_ts = 0;
-  int spf_count = area->spf_calculation;
-  spf_ts = (1000000 * area->ts_spf.tv_sec + area->ts_spf.tv_usec)/1000;
-  ovsdb_ospf_set_spf_statistics (area->ospf->ospf_inst,area->area_id,
-                          spf_ts,spf_count);
-#endif
 
   if (IS_DEBUG_OSPF_EVENT)
     zlog_debug ("ospf_spf_calculate: Stop. %ld vertices",
@@ -1307,6 +1386,33 @@ ospf_spf_calculate (struct ospf_area *area, struct route_table *new_table,
   list_delete_all_node (&vertex_list);
 }
 
+/* Account a finished SPF run and publish the statistics of each area. */
+static void
+ospf_spf_statistics_update (struct ospf *ospf, unsigned long duration)
+{
+  spf_stats.last_duration = duration;
+  if (duration > spf_stats.max_duration)
+    spf_stats.max_duration = duration;
+  spf_stats.full_runs = ospf->spf_full_runs;
+  spf_stats.partial_runs = ospf->spf_partial_runs;
+
+#ifdef ENABLE_OVSDB
+  {
+    struct ospf_area *area;
+    struct listnode *node;
+    long spf_ts;
+
+    for (ALL_LIST_ELEMENTS_RO (ospf->areas, node, area))
+      {
+        spf_ts = (1000000 * area->ts_spf.tv_sec + area->ts_spf.tv_usec)/1000;
+        ovsdb_ospf_set_spf_statistics (ospf->ospf_inst, area->area_id,
+                                       spf_ts, area->spf_calculation,
+                                       &spf_stats);
+      }
+  }
+#endif /* ENABLE_OVSDB */
+}
+
 /* Timer for SPF calculation. */
 static int
 ospf_spf_calculate_timer (struct thread *thread)
@@ -1317,47 +1423,79 @@ ospf_spf_calculate_timer (struct thread *thread)
   struct listnode *node, *nnode;
   struct timeval start_time, stop_time, spf_start_time;
   int areas_processed = 0;
+  int partial;
   unsigned long ia_time, prune_time, rt_time;
   unsigned long abr_time, total_spf_time, spf_time;
-  char rbuf[32];		/* reason_buf */
+  char rbuf[48];		/* reason_buf */
 
   if (IS_DEBUG_OSPF_EVENT)
     zlog_debug ("SPF: Timer (SPF calculation expire)");
 
   ospf->t_spf_calc = NULL;
 
+  /* All triggers since the timer was scheduled are handled by this run,
+   * later ones are left for the next.
+   */
+  spf_stats.batched_events = spf_stats.pending_events;
+  if (spf_stats.batched_events > spf_stats.max_batched_events)
+    spf_stats.max_batched_events = spf_stats.batched_events;
+  spf_stats.pending_events = 0;
+
   quagga_gettime (QUAGGA_CLK_MONOTONIC, &spf_start_time);
-  /* Allocate new table tree. */
-  new_table = route_table_init ();
-  new_rtrs = route_table_init ();
 
-  ospf_vl_unapprove (ospf);
+  /* Only summary-LSAs changed since the last full SPF: the shortest-path
+   * trees are the same, so start from a copy of their intra-area routes
+   * and redo the inter-area and later stages only.
+   */
+  partial = ospf_spf_reason_is_partial () &&
+            ospf->spf_intra_table && ospf->spf_intra_rtrs;
 
-  /* Calculate SPF for each area. */
-  for (ALL_LIST_ELEMENTS (ospf->areas, node, nnode, area))
+  if (partial)
     {
-      /* Do backbone last, so as to first discover intra-area paths
-       * for any back-bone virtual-links
-       */
-      if (ospf->backbone && ospf->backbone == area)
-        continue;
-
-      ospf_spf_calculate (area, new_table, new_rtrs);
-      areas_processed++;
+      new_table = ospf_route_table_dup (ospf->spf_intra_table);
+      new_rtrs = ospf_rtrs_dup (ospf->spf_intra_rtrs);
+      ospf->spf_partial_runs++;
     }
-
-  /* SPF for backbone, if required */
-  if (ospf->backbone)
+  else
     {
-      ospf_spf_calculate (ospf->backbone, new_table, new_rtrs);
-      areas_processed++;
+      /* Allocate new table tree. */
+      new_table = route_table_init ();
+      new_rtrs = route_table_init ();
+
+      ospf_vl_unapprove (ospf);
+
+      /* Calculate SPF for each area. */
+      for (ALL_LIST_ELEMENTS (ospf->areas, node, nnode, area))
+        {
+          /* Do backbone last, so as to first discover intra-area paths
+           * for any back-bone virtual-links
+           */
+          if (ospf->backbone && ospf->backbone == area)
+            continue;
+
+          ospf_spf_calculate (area, new_table, new_rtrs);
+          areas_processed++;
+        }
+
+      /* SPF for backbone, if required */
+      if (ospf->backbone)
+        {
+          ospf_spf_calculate (ospf->backbone, new_table, new_rtrs);
+          areas_processed++;
+        }
+
+      ospf_vl_shut_unapproved (ospf);
+
+      /* Keep the intra-area routes for later partial calculations. */
+      ospf_spf_intra_free (ospf);
+      ospf->spf_intra_table = ospf_route_table_dup (new_table);
+      ospf->spf_intra_rtrs = ospf_rtrs_dup (new_rtrs);
+      ospf->spf_full_runs++;
     }
 
   quagga_gettime (QUAGGA_CLK_MONOTONIC, &stop_time);
   spf_time = timeval_elapsed (stop_time, spf_start_time);
 
-  ospf_vl_shut_unapproved (ospf);
-
   start_time = stop_time;	/* saving a call */
 
   ospf_ia_routing (ospf, new_table, new_rtrs);
@@ -1414,11 +1552,19 @@ ospf_spf_calculate_timer (struct thread *thread)
   ospf->ts_spf_duration.tv_sec = total_spf_time/1000000;
   ospf->ts_spf_duration.tv_usec = total_spf_time % 1000000;
 
+  /* Partial runs skip ospf_spf_calculate(), stamp the run here so that the
+   * hold time and the statistics follow every run, partial or full.
+   */
+  ospf->ts_spf = stop_time;
+  for (ALL_LIST_ELEMENTS_RO (ospf->areas, node, area))
+    area->ts_spf = stop_time;
+
   ospf_get_spf_reason_str (rbuf);
 
   if (IS_DEBUG_OSPF_EVENT)
     {
-      zlog_info ("SPF Processing Time(usecs): %ld", total_spf_time);
+      zlog_info ("SPF Processing Time(usecs): %ld (%s)", total_spf_time,
+                 partial ? "partial" : "full");
       zlog_info ("\t    SPF Time: %ld", spf_time);
       zlog_info ("\t   InterArea: %ld", ia_time);
       zlog_info ("\t       Prune: %ld", prune_time);
@@ -1427,9 +1573,13 @@ ospf_spf_calculate_timer (struct thread *thread)
         zlog_info ("\t         ABR: %ld (%d areas)",
                    abr_time, areas_processed);
       zlog_info ("Reason(s) for SPF: %s", rbuf);
+      zlog_info ("SPF runs: %lu full, %lu partial",
+                 ospf->spf_full_runs, ospf->spf_partial_runs);
+      zlog_info ("SPF triggers batched: %lu", spf_stats.batched_events);
     }
 
   ospf_clear_spf_reason_flags ();
+  ospf_spf_statistics_update (ospf, total_spf_time);
 
   return 0;
 }
@@ -1451,7 +1601,13 @@ ospf_spf_calculate_schedule (struct ospf *ospf, ospf_spf_reason_t reason)
 
   ospf_spf_set_reason (reason);
 
-  /* SPF calculation timer is already scheduled. */
+  if (reason < SPF_FLAG_MAX)
+    spf_stats.reason_counts[reason]++;
+  spf_stats.pending_events++;
+
+  /* SPF calculation timer is already scheduled, the trigger is batched
+   * into the pending calculation.
+   */
   if (ospf->t_spf_calc)
     {
       if (IS_DEBUG_OSPF_EVENT)
@@ -1473,11 +1629,12 @@ ospf_spf_calculate_schedule (struct ospf *ospf, ospf_spf_reason_t reason)
   if (elapsed < ht)
     {
       /* Got an event within the hold time of last SPF. We need to
-       * increase the hold_multiplier, if it's not already at/past
-       * maximum value, and wasn't already increased..
+       * double the hold_multiplier, if it's not already at/past
+       * maximum value, so that the hold time backs off exponentially
+       * from spf_holdtime to spf_max_holdtime.
        */
       if (ht < ospf->spf_max_holdtime)
-        ospf->spf_hold_multiplier++;
+        ospf->spf_hold_multiplier *= 2;
 
       /* always honour the SPF initial delay */
       if ( (ht - elapsed) < ospf->spf_delay)
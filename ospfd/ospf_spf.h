@@ -69,10 +69,28 @@ typedef enum {
   SPF_FLAG_ABR_STATUS_CHANGE,
   SPF_FLAG_ASBR_STATUS_CHANGE,
   SPF_FLAG_CONFIG_CHANGE,
+  SPF_FLAG_SUMMARY_LSA_MAXAGE,
+  SPF_FLAG_MAX,
 } ospf_spf_reason_t;
 
+/* Statistics of the SPF scheduler, published with the area statistics. */
+struct ospf_spf_stats
+{
+  unsigned long last_duration;		/* usecs of the last SPF run. */
+  unsigned long max_duration;		/* usecs of the longest SPF run. */
+  unsigned long pending_events;		/* Triggers waiting for the timer. */
+  unsigned long batched_events;		/* Triggers handled by the last run. */
+  unsigned long max_batched_events;	/* Most triggers handled by a run. */
+  unsigned long full_runs;
+  unsigned long partial_runs;
+  unsigned long reason_counts[SPF_FLAG_MAX];	/* Triggers per reason. */
+};
+
 extern void ospf_spf_calculate_schedule (struct ospf *, ospf_spf_reason_t);
 extern void ospf_rtrs_free (struct route_table *);
+extern struct route_table *ospf_rtrs_dup (struct route_table *);
+extern void ospf_spf_intra_free (struct ospf *);
+extern const char *ospf_spf_reason_name (ospf_spf_reason_t);
 
 /* void ospf_spf_calculate_timer_add (); */
 #endif /* _QUAGGA_OSPF_SPF_H */
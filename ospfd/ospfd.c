@@ -571,6 +571,7 @@ ospf_finish_final (struct ospf *ospf)
     ospf_rtrs_free (ospf->old_rtrs);
   if (ospf->new_rtrs)
     ospf_rtrs_free (ospf->new_rtrs);
+  ospf_spf_intra_free (ospf);
   if (ospf->new_external_route)
     {
       ospf_route_delete (ospf->new_external_route);
@@ -193,6 +193,11 @@ struct ospf
   struct route_table *old_rtrs;         /* Old ABR/ASBR RT. */
   struct route_table *new_rtrs;         /* New ABR/ASBR RT. */
 
+  /* Intra-area routes of the last full SPF calculation, reused when
+     only summary-LSAs changed since. */
+  struct route_table *spf_intra_table;  /* Intra-area network RT. */
+  struct route_table *spf_intra_rtrs;   /* Intra-area ABR/ASBR RT. */
+
   struct route_table *new_external_route;   /* New External Route. */
   struct route_table *old_external_route;   /* Old External Route. */
 
@@ -202,6 +207,8 @@ struct ospf
   /* Time stamps */
   struct timeval ts_spf;		/* SPF calculation time stamp. */
   struct timeval ts_spf_duration;	/* Execution time of last SPF */
+  unsigned long spf_full_runs;		/* SPF runs with Dijkstra. */
+  unsigned long spf_partial_runs;	/* SPF runs reusing intra-area RT. */
 
   struct route_table *maxage_lsa;       /* List of MaxAge LSA for deletion. */
   int redistribute;                     /* Num of redistributed protocols. */
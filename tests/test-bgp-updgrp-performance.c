@@ -0,0 +1,226 @@
+/*
+ * Test program which compares the encoding of the attributes of UPDATE
+ * messages for each peer with their encoding once per update group, for
+ * the route-reflector clients of a BGP instance, and measures the time
+ * taken by both.
+ *
+ * Copyright (C) 2016 Hewlett Packard Enterprise Development LP
+ *
+ * This file is part of Quagga
+ *
+ * Quagga is free software; you can redistribute it and/or modify it
+ * under the terms of the GNU General Public License as published by the
+ * Free Software Foundation; either version 2, or (at your option) any
+ * later version.
+ *
+ * Quagga is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+ * General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with Quagga; see the file COPYING.  If not, write to the Free
+ * Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
+ * 02111-1307, USA.
+ */
+#include <zebra.h>
+
+#include "vty.h"
+#include "stream.h"
+#include "linklist.h"
+#include "privs.h"
+#include "memory.h"
+
+#include "bgpd/bgpd.h"
+#include "bgpd/bgp_attr.h"
+#include "bgpd/bgp_aspath.h"
+#include "bgpd/bgp_community.h"
+#include "bgpd/bgp_updgrp.h"
+
+#define UPDGRP_PEERS   300
+#define UPDGRP_ATTRS  2000
+
+/* need these to link in libbgp */
+struct zebra_privs_t *bgpd_privs = NULL;
+struct thread_master *master = NULL;
+
+static struct bgp *bgp;
+static as_t asn = 100;
+
+static struct peer *
+client_create (const char *host)
+{
+  struct peer *peer;
+
+  peer = peer_create_accept (bgp);
+  peer->host = strdup (host);
+  peer->as = asn;
+  peer->local_as = asn;
+  peer_sort (peer);
+  SET_FLAG (peer->cap, PEER_CAP_AS4_RCV);
+  SET_FLAG (peer->af_flags[AFI_IP][SAFI_UNICAST],
+            PEER_FLAG_REFLECTOR_CLIENT | PEER_FLAG_SEND_COMMUNITY);
+  inet_aton ("10.0.0.1", &peer->nexthop.v4);
+
+  return peer;
+}
+
+static struct attr *
+attr_create (int i)
+{
+  struct attr attr;
+  struct attr *new;
+  char aspath[64];
+  char community[64];
+
+  bgp_attr_default_set (&attr, BGP_ORIGIN_IGP);
+  aspath_unintern (&attr.aspath);
+  snprintf (aspath, sizeof (aspath), "%d %d", 65000 + i % 100, 64512 + i);
+  attr.aspath = aspath_str2aspath (aspath);
+  snprintf (community, sizeof (community), "%d:%d", asn, i % 50);
+  attr.community = community_str2com (community);
+  attr.flag |= ATTR_FLAG_BIT (BGP_ATTR_COMMUNITIES);
+  attr.med = i;
+  attr.flag |= ATTR_FLAG_BIT (BGP_ATTR_MULTI_EXIT_DISC);
+  attr.local_pref = 100;
+  attr.flag |= ATTR_FLAG_BIT (BGP_ATTR_LOCAL_PREF);
+  attr.nexthop.s_addr = htonl (0xc0a80000 | i);
+
+  new = bgp_attr_intern (&attr);
+  bgp_attr_extra_free (&attr);
+
+  return new;
+}
+
+/* Check that the update group encoding of an attribute to a peer is the
+   same as its own encoding. */
+static int
+encoding_check (struct stream *s1, struct stream *s2, struct peer *peer,
+                struct attr *attr, struct peer *from)
+{
+  bgp_size_t len1, len2;
+
+  stream_reset (s1);
+  stream_reset (s2);
+  len1 = bgp_packet_attribute (NULL, peer, s1, attr, NULL,
+                               AFI_IP, SAFI_UNICAST, from, NULL, NULL);
+  len2 = bgp_updgrp_packet_attribute (peer, s2, attr,
+                                      AFI_IP, SAFI_UNICAST, from);
+
+  return (len1 == len2
+          && memcmp (STREAM_DATA (s1), STREAM_DATA (s2), len1) == 0);
+}
+
+static unsigned long
+timeval_elapsed_usec (struct timeval *start, struct timeval *stop)
+{
+  return (stop->tv_sec - start->tv_sec) * 1000000
+         + stop->tv_usec - start->tv_usec;
+}
+
+int
+main (void)
+{
+  struct peer *from;
+  struct peer *peers[UPDGRP_PEERS];
+  struct attr *attrs[UPDGRP_ATTRS];
+  struct update_group *group;
+  struct stream *s1, *s2;
+  struct timeval tv_start, tv_stop;
+  unsigned long t_peer, t_updgrp;
+  unsigned long encodings;
+  char host[32];
+  int i, j;
+
+  master = thread_master_create ();
+  bgp_master_init ();
+  bgp_option_set (BGP_OPT_NO_LISTEN);
+  bgp_attr_init ();
+  bgp_updgrp_init ();
+
+  if (bgp_get (&bgp, &asn, NULL))
+    return 1;
+
+  from = client_create ("192.168.255.1");
+  inet_aton ("192.168.255.1", &from->remote_id);
+  for (i = 0; i < UPDGRP_PEERS; i++)
+    {
+      snprintf (host, sizeof (host), "10.0.%d.%d", i / 250, i % 250 + 2);
+      peers[i] = client_create (host);
+    }
+  for (i = 0; i < UPDGRP_ATTRS; i++)
+    attrs[i] = attr_create (i);
+
+  s1 = stream_new (BGP_MAX_PACKET_SIZE);
+  s2 = stream_new (BGP_MAX_PACKET_SIZE);
+
+  gettimeofday (&tv_start, NULL);
+  for (i = 0; i < UPDGRP_ATTRS; i++)
+    for (j = 0; j < UPDGRP_PEERS; j++)
+      {
+        stream_reset (s1);
+        bgp_packet_attribute (NULL, peers[j], s1, attrs[i], NULL,
+                              AFI_IP, SAFI_UNICAST, from, NULL, NULL);
+      }
+  gettimeofday (&tv_stop, NULL);
+  t_peer = timeval_elapsed_usec (&tv_start, &tv_stop);
+
+  gettimeofday (&tv_start, NULL);
+  for (i = 0; i < UPDGRP_ATTRS; i++)
+    for (j = 0; j < UPDGRP_PEERS; j++)
+      {
+        stream_reset (s2);
+        bgp_updgrp_packet_attribute (peers[j], s2, attrs[i],
+                                     AFI_IP, SAFI_UNICAST, from);
+      }
+  gettimeofday (&tv_stop, NULL);
+  t_updgrp = timeval_elapsed_usec (&tv_start, &tv_stop);
+
+  group = bgp_updgrp_get (peers[0], AFI_IP, SAFI_UNICAST);
+  if (bgp_updgrp_count () != 1 || listcount (group->peer) != UPDGRP_PEERS)
+    {
+      fprintf (stderr, "The clients are not in one update group\n");
+      return 1;
+    }
+  encodings = group->encoding_computed;
+
+  for (i = 0; i < UPDGRP_ATTRS; i++)
+    for (j = 0; j < UPDGRP_PEERS; j++)
+      if (! encoding_check (s1, s2, peers[j], attrs[i], from))
+        {
+          fprintf (stderr, "Attribute %d is not encoded the same way "
+                   "for peer %d\n", i, j);
+          return 1;
+        }
+
+  /* A client whose configuration changes is split from its group and
+     is merged back when the change is undone. */
+  UNSET_FLAG (peers[0]->af_flags[AFI_IP][SAFI_UNICAST],
+              PEER_FLAG_SEND_COMMUNITY);
+  if (bgp_updgrp_get (peers[0], AFI_IP, SAFI_UNICAST) == group
+      || bgp_updgrp_count () != 2
+      || ! encoding_check (s1, s2, peers[0], attrs[0], from))
+    {
+      fprintf (stderr, "The update group of a changed client is not split\n");
+      return 1;
+    }
+  SET_FLAG (peers[0]->af_flags[AFI_IP][SAFI_UNICAST],
+            PEER_FLAG_SEND_COMMUNITY);
+  if (bgp_updgrp_get (peers[0], AFI_IP, SAFI_UNICAST) != group
+      || bgp_updgrp_count () != 1)
+    {
+      fprintf (stderr, "The update group of a client is not merged back\n");
+      return 1;
+    }
+
+  printf ("Encoded %d attributes for %d clients: per peer %lu usecs, "
+          "per update group %lu usecs (%lu encodings)\n",
+          UPDGRP_ATTRS, UPDGRP_PEERS, t_peer, t_updgrp, encodings);
+
+  for (i = 0; i < UPDGRP_ATTRS; i++)
+    bgp_attr_unintern (&attrs[i]);
+  stream_free (s1);
+  stream_free (s2);
+
+  return 0;
+}
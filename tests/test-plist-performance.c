@@ -0,0 +1,150 @@
+/*
+ * Test program which compares the compiled and the sequential evaluation
+ * of a large prefix-list, and measures the time taken by both.
+ *
+ * Copyright (C) 2016 Hewlett Packard Enterprise Development LP
+ *
+ * This file is part of Quagga
+ *
+ * Quagga is free software; you can redistribute it and/or modify it
+ * under the terms of the GNU General Public License as published by the
+ * Free Software Foundation; either version 2, or (at your option) any
+ * later version.
+ *
+ * Quagga is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+ * General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with Quagga; see the file COPYING.  If not, write to the Free
+ * Software Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA
+ * 02111-1307, USA.
+ */
+#include <zebra.h>
+
+#include "prefix.h"
+#include "plist.h"
+#include "prng.h"
+
+#define PLIST_ENTRIES  20000
+#define PLIST_APPLIES 200000
+
+static void
+random_prefix (struct prng *prng, struct prefix *p, int minlen, int maxlen)
+{
+  memset (p, 0, sizeof (*p));
+  p->family = AF_INET;
+  p->prefixlen = minlen + prng_rand (prng) % (maxlen - minlen + 1);
+  /* Keep the prefixes in a few /8s so that the entries overlap */
+  p->u.prefix4.s_addr = htonl ((10 + prng_rand (prng) % 4) << 24
+                               | (prng_rand (prng) & 0xffffff));
+  apply_mask (p);
+}
+
+static void
+plist_add_entries (char *name, struct orf_prefix *orfps, int count)
+{
+  int i;
+
+  for (i = 0; i < count; i++)
+    prefix_bgp_orf_set (name, AFI_IP, &orfps[i], i % 3, 1);
+}
+
+static unsigned long
+timeval_elapsed_usec (struct timeval *start, struct timeval *stop)
+{
+  return (stop->tv_sec - start->tv_sec) * 1000000
+         + stop->tv_usec - start->tv_usec;
+}
+
+int main (int argc, char **argv)
+{
+  struct prng *prng;
+  struct orf_prefix *orfps;
+  struct prefix *prefixes;
+  enum prefix_list_type *results;
+  struct prefix_list *linear, *compiled;
+#ifdef ENABLE_OVSDB
+  struct prefix_list_entry *lentry, *centry;
+  struct orf_prefix last;
+#endif
+  struct timeval tv_start, tv_stop;
+  unsigned long t_linear, t_compiled;
+  int entries;
+  int i;
+
+  prng = prng_new (0);
+  orfps = calloc (PLIST_ENTRIES, sizeof (*orfps));
+  prefixes = calloc (PLIST_APPLIES, sizeof (*prefixes));
+  results = calloc (PLIST_APPLIES, sizeof (*results));
+
+  for (i = 0; i < PLIST_ENTRIES; i++)
+    {
+      orfps[i].seq = (i + 1) * 5;
+      random_prefix (prng, &orfps[i].p, 8, 24);
+      if (i % 2)
+        {
+          orfps[i].ge = orfps[i].p.prefixlen + 1;
+          orfps[i].le = orfps[i].ge + prng_rand (prng) % (32 - orfps[i].ge + 1);
+        }
+    }
+
+  for (i = 0; i < PLIST_APPLIES; i++)
+    random_prefix (prng, &prefixes[i], 8, 32);
+
+  plist_add_entries ("linear", orfps, PLIST_ENTRIES);
+  plist_add_entries ("compiled", orfps, PLIST_ENTRIES);
+  linear = prefix_list_lookup (AFI_ORF_PREFIX, "linear");
+  compiled = prefix_list_lookup (AFI_ORF_PREFIX, "compiled");
+  assert (linear && compiled && linear->count == compiled->count);
+  /* Random duplicates are not added */
+  entries = linear->count;
+
+  gettimeofday (&tv_start, NULL);
+  for (i = 0; i < PLIST_APPLIES; i++)
+    results[i] = prefix_list_apply_linear (linear, &prefixes[i]);
+  gettimeofday (&tv_stop, NULL);
+  t_linear = timeval_elapsed_usec (&tv_start, &tv_stop);
+
+  gettimeofday (&tv_start, NULL);
+  for (i = 0; i < PLIST_APPLIES; i++)
+    if (prefix_list_apply (compiled, &prefixes[i]) != results[i])
+      {
+        fprintf (stderr, "Prefix %d is not applied the same way\n", i);
+        return 1;
+      }
+  gettimeofday (&tv_stop, NULL);
+  t_compiled = timeval_elapsed_usec (&tv_start, &tv_stop);
+
+#ifdef ENABLE_OVSDB
+  /* The entries are only visible outside of plist.c with OVSDB. Changing
+   * the prefix-lists brings their reference counts up to date. */
+  memset (&last, 0, sizeof (last));
+  last.seq = (PLIST_ENTRIES + 1) * 5;
+  str2prefix ("192.168.0.0/16", &last.p);
+  plist_add_entries ("linear", &last, 1);
+  plist_add_entries ("compiled", &last, 1);
+
+  for (lentry = linear->head, centry = compiled->head; lentry && centry;
+       lentry = lentry->next, centry = centry->next)
+    if (lentry->hitcnt != centry->hitcnt || lentry->refcnt != centry->refcnt)
+      {
+        fprintf (stderr, "The counters of seq %d differ\n", lentry->seq);
+        return 1;
+      }
+#endif
+
+  printf ("Applied %d prefixes to %d entries: linear %lu usecs, "
+          "compiled %lu usecs\n", PLIST_APPLIES, entries,
+          t_linear, t_compiled);
+
+  prefix_bgp_orf_remove_all ("linear");
+  prefix_bgp_orf_remove_all ("compiled");
+  prng_free (prng);
+  free (orfps);
+  free (prefixes);
+  free (results);
+
+  return 0;
+}
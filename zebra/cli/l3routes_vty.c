@@ -29,6 +29,7 @@
  *
  ***************************************************************************/
 
+#include <ctype.h>
 #include <pwd.h>
 
 #include <readline/readline.h>
@@ -42,6 +43,7 @@
 #include "vswitch-idl.h"
 #include "openswitch-dflt.h"
 #include "ovsdb-idl.h"
+#include "shash.h"
 #include "openvswitch/vlog.h"
 #include "openswitch-idl.h"
 #include "prefix.h"
@@ -434,12 +436,86 @@ set_nexthop_entry (struct ovsdb_idl_txn *status_txn, char * nh_entry,
   return row_nh;
 }
 
+/* Key of a static route inserted in a transaction not yet committed */
+static void
+static_route_txn_key (char *buf, size_t len, const char *vrf_name,
+                      const char *prefix)
+{
+  snprintf (buf, len, "%s|%s", vrf_name ? vrf_name : DEFAULT_VRF_NAME,
+            prefix);
+}
+
+/* Find the static route of a prefix, in a VRF if vrf_name is given.
+ * The Route table index is sought to the address family, prefix and
+ * protocol instead of walking every route. Routes inserted earlier in
+ * the same transaction are not indexed yet, so they are looked up in
+ * txn_routes when given. */
+static const struct ovsrec_route *
+static_route_find (const char *vrf_name, const char *address_family,
+                   const char *prefix, struct shash *txn_routes)
+{
+  const struct ovsrec_route *row = NULL;
+  const struct ovsrec_route *found = NULL;
+  struct ovsrec_route *key = NULL;
+  const char *ovs_rt_vrf = NULL;
+  char txn_key[OVSDB_VRF_NAME_MAXLEN + MAX_ADDRESS_LEN + 2];
+
+  if (txn_routes)
+    {
+      static_route_txn_key (txn_key, sizeof(txn_key), vrf_name, prefix);
+      found = shash_find_data (txn_routes, txn_key);
+      if (found)
+        return found;
+    }
+
+  if (!is_route_cursor_initialized)
+    {
+      OVSREC_ROUTE_FOR_EACH (row, idl)
+        {
+          if (row->prefix == NULL || row->from == NULL ||
+              row->address_family == NULL)
+            continue;
+
+          if (!strcmp (row->prefix, prefix) &&
+              !strcmp (row->address_family, address_family) &&
+              !strcmp (row->from, OVSREC_ROUTE_FROM_STATIC))
+            {
+              ovs_rt_vrf = row->vrf ? row->vrf->name : DEFAULT_VRF_NAME;
+              if (vrf_name &&
+                  strncmp (ovs_rt_vrf, vrf_name, OVSDB_VRF_NAME_MAXLEN))
+                continue;
+              return row;
+            }
+        }
+      return NULL;
+    }
+
+  key = ovsrec_route_index_init_row (idl, &ovsrec_table_route);
+  ovsrec_route_index_set_address_family (key, address_family);
+  ovsrec_route_index_set_prefix (key, prefix);
+  ovsrec_route_index_set_from (key, OVSREC_ROUTE_FROM_STATIC);
+
+  OVSREC_ROUTE_FOR_EACH_EQUAL (row, &route_cursor, key)
+    {
+      ovs_rt_vrf = row->vrf ? row->vrf->name : DEFAULT_VRF_NAME;
+      if (vrf_name && strncmp (ovs_rt_vrf, vrf_name, OVSDB_VRF_NAME_MAXLEN))
+        continue;
+
+      found = row;
+      break;
+    }
+
+  ovsrec_route_index_destroy_row (key);
+
+  return found;
+}
+
+/* Add the nexthop of an ipv4 static route to a configuration transaction.
+ * The caller commits or aborts the transaction. */
 static int
-#ifdef VRF_ENABLE
-ip_route_common (struct vty *vty, char **argv, char *distance, char *vrf)
-#else
-ip_route_common (struct vty *vty, char **argv, char *distance)
-#endif
+ip_route_add (struct ovsdb_idl_txn *status_txn, const char *prefix_arg,
+              char *nh_arg, char *distance, char *vrf,
+              struct shash *txn_routes)
 {
   const struct ovsrec_route *row = NULL;
   struct ovsrec_nexthop *row_nh = NULL;
@@ -447,26 +523,12 @@ ip_route_common (struct vty *vty, char **argv, char *distance)
 
   struct prefix p;
   int ret, i;
-  enum ovsdb_idl_txn_status status;
-  struct ovsdb_idl_txn *status_txn = NULL;
   char prefix_str[MAX_ADDRESS_LEN];
-  char prefix_str_copy[MAX_ADDRESS_LEN];
-  char *prefix = NULL;
+  char txn_key[OVSDB_VRF_NAME_MAXLEN + MAX_ADDRESS_LEN + 2];
   bool prefix_match = false;
   bool nh_match = false;
   bool static_match = false;
-#ifdef VRF_ENABLE
   char *vrf_name = NULL;
-  char *ovs_rt_vrf = NULL;
-#endif
-  status_txn = cli_do_config_start ();
-
-  if (status_txn == NULL)
-    {
-      VLOG_ERR (OVSDB_TXN_CREATE_ERROR);
-      cli_do_config_abort (status_txn);
-      return CMD_OVSDB_FAILURE;
-    }
 
 #ifdef VRF_ENABLE
   if (!vrf)
@@ -475,11 +537,10 @@ ip_route_common (struct vty *vty, char **argv, char *distance)
     vrf_name = vrf;
 #endif
 
-  ret = str2prefix (argv[0], &p);
+  ret = str2prefix (prefix_arg, &p);
   if (ret <= 0)
     {
       vty_out (vty, "\n Malformed address format%s\n", VTY_NEWLINE);
-      cli_do_config_abort (status_txn);
       return CMD_WARNING;
     }
   /*
@@ -489,49 +550,29 @@ ip_route_common (struct vty *vty, char **argv, char *distance)
   memset (prefix_str, 0, sizeof(prefix_str));
   prefix2str ((const struct prefix*) &p, prefix_str, sizeof(prefix_str));
 
-  if (strcmp (prefix_str, argv[0]))
+  if (strcmp (prefix_str, prefix_arg))
     {
       vty_out (vty, "\nInvalid prefix. Valid prefix: %s\n", prefix_str);
-      cli_do_config_abort (status_txn);
       return CMD_OVSDB_FAILURE;
     }
 
   /* Validate if the prefix entered is a standard broadcast,
    * multicast or loopback address */
   if (ip4_routing_address_is_invalid (prefix_str, false))
-    {
-      cli_do_config_abort (status_txn);
-      return CMD_OVSDB_FAILURE;
-    }
+    return CMD_OVSDB_FAILURE;
 
-  OVSREC_ROUTE_FOR_EACH (row, idl)
+  row = static_route_find (vrf_name, OVSREC_ROUTE_ADDRESS_FAMILY_IPV4,
+                           prefix_str, txn_routes);
+  if (row != NULL)
     {
-      if (row->prefix != NULL)
+      if (row->n_nexthops > MAX_NEXTHOPS_PER_ROUTE - 1)
         {
-#ifdef VRF_ENABLE
-          if (row->vrf == NULL)
-            ovs_rt_vrf = DEFAULT_VRF_NAME;
-          else
-            ovs_rt_vrf = row->vrf->name;
-
-          if (strncmp(ovs_rt_vrf,vrf_name,OVSDB_VRF_NAME_MAXLEN))
-            continue;
-#endif
-          if (!strcmp (row->prefix, argv[0])
-              && !strcmp (row->from, OVSREC_ROUTE_FROM_STATIC))
-            {
-              if (row->n_nexthops > MAX_NEXTHOPS_PER_ROUTE - 1)
-                {
-                  vty_out (vty, "\nMaximum %d nexthops per route\n",
-                           MAX_NEXTHOPS_PER_ROUTE);
-                  cli_do_config_abort (status_txn);
-                  return CMD_OVSDB_FAILURE;
-                }
-              prefix_match = true;
-              static_match = true;
-              break;
-            }
+          vty_out (vty, "\nMaximum %d nexthops per route\n",
+                   MAX_NEXTHOPS_PER_ROUTE);
+          return CMD_OVSDB_FAILURE;
         }
+      prefix_match = true;
+      static_match = true;
     }
 
   if (row == NULL)
@@ -547,7 +588,6 @@ ip_route_common (struct vty *vty, char **argv, char *distance)
        {
          vty_out (vty, "\nVRF %s does not exist.%s\n", vrf_name,VTY_NEWLINE);
          VLOG_ERR (OVSDB_ROW_FETCH_ERROR);
-         cli_do_config_abort (status_txn);
          return CMD_OVSDB_FAILURE;
        }
 #else
@@ -555,7 +595,6 @@ ip_route_common (struct vty *vty, char **argv, char *distance)
       if (!row_vrf)
         {
           VLOG_ERR (OVSDB_ROW_FETCH_ERROR);
-          cli_do_config_abort (status_txn);
           return CMD_OVSDB_FAILURE;
         }
 #endif
@@ -573,15 +612,19 @@ ip_route_common (struct vty *vty, char **argv, char *distance)
 
       ovsrec_route_set_from (row, OVSREC_ROUTE_FROM_STATIC);
 
-      row_nh = set_nexthop_entry (status_txn, argv[1], prefix_match,
+      row_nh = set_nexthop_entry (status_txn, nh_arg, prefix_match,
                                   static_match, distance, row, "ipv4");
       if (row_nh == NULL)
-        {
-          cli_do_config_abort (status_txn);
-          return CMD_OVSDB_FAILURE;
-        }
+        return CMD_OVSDB_FAILURE;
+
       ovsrec_route_set_nexthops (row, &row_nh, row->n_nexthops + 1);
 
+      if (txn_routes)
+        {
+          static_route_txn_key (txn_key, sizeof(txn_key), vrf_name,
+                                prefix_str);
+          shash_add (txn_routes, txn_key, row);
+        }
     }
   else
     {
@@ -591,7 +634,7 @@ ip_route_common (struct vty *vty, char **argv, char *distance)
             {
               if (row->nexthops[i]->ip_address != NULL)
                 {
-                  if (!strcmp (row->nexthops[i]->ip_address, argv[1]))
+                  if (!strcmp (row->nexthops[i]->ip_address, nh_arg))
                     {
                       nh_match = true;
                       break;
@@ -600,7 +643,7 @@ ip_route_common (struct vty *vty, char **argv, char *distance)
               else if (row->nexthops[i]->ports != NULL &&
                        row->nexthops[i]->ports[0]->name != NULL)
                 {
-                  if (!strcmp (row->nexthops[i]->ports[0]->name, argv[1]))
+                  if (!strcmp (row->nexthops[i]->ports[0]->name, nh_arg))
                     {
                       nh_match = true;
                       break;
@@ -611,13 +654,10 @@ ip_route_common (struct vty *vty, char **argv, char *distance)
 
       if (!nh_match)
         {
-          row_nh = set_nexthop_entry (status_txn, argv[1], prefix_match,
+          row_nh = set_nexthop_entry (status_txn, nh_arg, prefix_match,
                                       static_match, distance, row, "ipv4");
           if (row_nh == NULL)
-            {
-              cli_do_config_abort (status_txn);
-              return CMD_OVSDB_FAILURE;
-            }
+            return CMD_OVSDB_FAILURE;
 
           struct ovsrec_nexthop **nexthops = NULL;
           nexthops = xmalloc (sizeof *row->nexthops * (row->n_nexthops + 1));
@@ -636,6 +676,40 @@ ip_route_common (struct vty *vty, char **argv, char *distance)
         }
     }
 
+  return CMD_SUCCESS;
+}
+
+static int
+#ifdef VRF_ENABLE
+ip_route_common (struct vty *vty, char **argv, char *distance, char *vrf)
+#else
+ip_route_common (struct vty *vty, char **argv, char *distance)
+#endif
+{
+  int ret;
+  enum ovsdb_idl_txn_status status;
+  struct ovsdb_idl_txn *status_txn = NULL;
+
+  status_txn = cli_do_config_start ();
+
+  if (status_txn == NULL)
+    {
+      VLOG_ERR (OVSDB_TXN_CREATE_ERROR);
+      cli_do_config_abort (status_txn);
+      return CMD_OVSDB_FAILURE;
+    }
+
+#ifdef VRF_ENABLE
+  ret = ip_route_add (status_txn, argv[0], argv[1], distance, vrf, NULL);
+#else
+  ret = ip_route_add (status_txn, argv[0], argv[1], distance, NULL, NULL);
+#endif
+  if (ret != CMD_SUCCESS)
+    {
+      cli_do_config_abort (status_txn);
+      return ret;
+    }
+
   status = cli_do_config_finish (status_txn);
 
   if (((status != TXN_SUCCESS) && (status != TXN_INCOMPLETE)
@@ -699,133 +773,401 @@ DEFUN (vtysh_ip_route_vrf,
 #endif
 
 
-#ifdef VRF_ENABLE
+/* Routes shown by the show ip/ipv6 route and show rib commands. The Route
+ * index is sorted by address family, prefix and protocol, so the cursor is
+ * sought to 'seek' and stops at the end of the address family or of the
+ * longer-prefixes range instead of walking every route. */
+struct route_show_filter
+{
+  const char *address_family;
+  const char *vrf_name;
+  const char *protocol;         /* Only the routes from this protocol */
+  bool rib;                     /* Show the routes not selected too */
+  bool has_longer;              /* Only the routes within 'longer' */
+  struct prefix longer;
+  char range_text[16];          /* Text of the ipv4 routes within 'longer' */
+  char seek[MAX_ADDRESS_LEN];   /* Prefix to seek the cursor to */
+  int page_size;                /* Routes per page, 0 for all the routes */
+};
+
+/* Position the route cursor on the first route of an address family at or
+ * after a prefix. The 'from' column of the key is left empty so that the
+ * routes of every protocol for that prefix sort after it. */
+static const struct ovsrec_route *
+route_index_seek (const char *address_family, const char *prefix)
+{
+  const struct ovsrec_route *row = NULL;
+  struct ovsrec_route *key = NULL;
+
+  key = ovsrec_route_index_init_row (idl, &ovsrec_table_route);
+  ovsrec_route_index_set_address_family (key, address_family);
+  ovsrec_route_index_set_prefix (key, prefix);
+  ovsrec_route_index_set_from (key, "");
+
+  row = ovsrec_route_index_forward_to (&route_cursor, key);
+
+  ovsrec_route_index_destroy_row (key);
+
+  return row;
+}
+
+static void
+route_show_filter_init (struct route_show_filter *filter,
+                        const char *address_family, const char *vrf_name,
+                        bool rib)
+{
+  memset (filter, 0, sizeof(*filter));
+  filter->address_family = address_family;
+  filter->vrf_name = vrf_name ? vrf_name : DEFAULT_VRF_NAME;
+  filter->rib = rib;
+
+  if (!strcmp ("ipv4", address_family))
+    snprintf (filter->seek, sizeof(filter->seek), "0.0.0.0/0");
+  else
+    snprintf (filter->seek, sizeof(filter->seek), "::/0");
+}
+
+/* Only show prefix_arg and its more specific routes.
+ * The ipv4 prefixes are sorted as strings in the Route index, so the routes
+ * of a prefix are only contiguous under the text of its whole leading
+ * octets, eg. "10.1." for 10.1.128.0/17. The ipv6 prefixes are sorted by
+ * their expanded address, so the routes of a prefix start at its address
+ * and end at the first route outside of it. */
 static int
-show_routes (struct vty *vty, char * ip_addr_family, char* vrf)
-#else
+route_show_filter_set_longer (struct vty *vty,
+                              struct route_show_filter *filter,
+                              const char *prefix_arg)
+{
+  char addr_str[INET6_ADDRSTRLEN];
+  u_char *octet;
+  int octets, i;
+
+  if (str2prefix (prefix_arg, &filter->longer) <= 0)
+    {
+      vty_out (vty, "\n Malformed address format%s\n", VTY_NEWLINE);
+      return CMD_WARNING;
+    }
+
+  apply_mask (&filter->longer);
+  filter->has_longer = true;
+
+  if (filter->longer.family == AF_INET)
+    {
+      octet = (u_char *) &filter->longer.u.prefix4;
+      octets = filter->longer.prefixlen / 8;
+      if (octets > 3)
+        octets = 3;
+
+      filter->range_text[0] = '\0';
+      for (i = 0; i < octets; i++)
+        snprintf (filter->range_text + strlen (filter->range_text),
+                  sizeof(filter->range_text) - strlen (filter->range_text),
+                  "%u.", octet[i]);
+
+      if (octets)
+        snprintf (filter->seek, sizeof(filter->seek), "%s/0",
+                  filter->range_text);
+    }
+  else
+    {
+      inet_ntop (AF_INET6, &filter->longer.u.prefix6, addr_str,
+                 sizeof(addr_str));
+      snprintf (filter->seek, sizeof(filter->seek), "%s/0", addr_str);
+    }
+
+  return CMD_SUCCESS;
+}
+
+/* Start showing the routes at prefix_arg instead of the first route. */
 static int
-show_routes (struct vty *vty, char * ip_addr_family)
-#endif
+route_show_filter_set_start (struct vty *vty,
+                             struct route_show_filter *filter,
+                             const char *prefix_arg)
 {
-  const struct ovsrec_route *row_route = NULL;
-  int flag = 0;
-  int disp_flag = 1;
-  char str[50];
-  int i, active_route_next_hops;
-  extern struct ovsdb_idl_index_cursor route_cursor;
-#ifdef VRF_ENABLE
-  char *vrf_name = vrf;
+  struct prefix p;
 
-  if (NULL == vrf_name)
-    vrf_name = DEFAULT_VRF_NAME;
-#endif
-  if (is_route_cursor_initialized)
+  if (str2prefix (prefix_arg, &p) <= 0)
+    {
+      vty_out (vty, "\n Malformed address format%s\n", VTY_NEWLINE);
+      return CMD_WARNING;
+    }
+
+  apply_mask (&p);
+  prefix2str (&p, filter->seek, sizeof(filter->seek));
+
+  return CMD_SUCCESS;
+}
+
+/* Check if the route cursor went past the routes of the longer-prefixes
+ * filter, after which no other route can match it. */
+static bool
+route_show_past_range (const struct route_show_filter *filter,
+                       const struct ovsrec_route *row)
+{
+  struct prefix p;
+
+  if (!filter->has_longer)
+    return false;
+
+  if (filter->longer.family == AF_INET)
+    return strncmp (row->prefix, filter->range_text,
+                    strlen (filter->range_text)) != 0;
+
+  if (str2prefix (row->prefix, &p) <= 0)
+    return false;
+
+  p.prefixlen = IPV6_MAX_BITLEN;
+  return !prefix_match (&filter->longer, &p);
+}
+
+/* Return the first route matching the filter from row onwards, or NULL
+ * once the cursor leaves the address family or the requested prefixes. */
+static const struct ovsrec_route *
+route_show_filter_rows (const struct route_show_filter *filter,
+                        const struct ovsrec_route *row)
+{
+  struct prefix p;
+
+  for (; row; row = ovsrec_route_index_next (&route_cursor))
     {
-      OVSREC_ROUTE_FOR_EACH_BYINDEX (row_route, &route_cursor)
+      if (strcmp (row->address_family, filter->address_family))
+        return NULL;
+
+      if (!(row->prefix))
+        continue;
+
+      if (route_show_past_range (filter, row))
+        return NULL;
+
+      if (filter->rib)
         {
-#ifdef VRF_ENABLE
-          if (strncmp(row_route->vrf->name, vrf_name,OVSDB_VRF_NAME_MAXLEN))
+          if (row->protocol_private != NULL && row->protocol_private[0] == true)
             continue;
+        }
+      else if (row->selected == NULL || row->selected[0] == false)
+        continue;
+
+#ifdef VRF_ENABLE
+      if (strncmp (row->vrf->name, filter->vrf_name, OVSDB_VRF_NAME_MAXLEN))
+        continue;
 #endif
 
-          if (strcmp (row_route->address_family, ip_addr_family))
-            continue;
+      if (filter->protocol &&
+          (row->from == NULL || strcmp (row->from, filter->protocol)))
+        continue;
 
-          if (row_route->selected == NULL || row_route->selected[0] == false)
-            continue;
+      if (filter->has_longer &&
+          (str2prefix (row->prefix, &p) <= 0 ||
+           !prefix_match (&filter->longer, &p)))
+        continue;
 
-          if (!(row_route->prefix))
-            continue;
+      return row;
+    }
 
-          if (disp_flag == 1)
+  return NULL;
+}
+
+static const struct ovsrec_route *
+route_show_first (const struct route_show_filter *filter)
+{
+  return route_show_filter_rows (filter,
+                                 route_index_seek (filter->address_family,
+                                                   filter->seek));
+}
+
+static const struct ovsrec_route *
+route_show_next (const struct route_show_filter *filter)
+{
+  return route_show_filter_rows (filter,
+                                 ovsrec_route_index_next (&route_cursor));
+}
+
+/* Check if a page of routes is full before row. The routes of a prefix
+ * are never split across pages, as the next page starts at a prefix. */
+static bool
+route_show_page_full (const struct route_show_filter *filter, int displayed,
+                      const char *last_prefix, const struct ovsrec_route *row)
+{
+  return filter->page_size && displayed >= filter->page_size &&
+         strcmp (row->prefix, last_prefix);
+}
+
+static void
+route_show_next_page (struct vty *vty, const struct route_show_filter *filter,
+                      const char *command, const struct ovsrec_route *row)
+{
+  vty_out (vty, "%s-- More entries, show the next page with: "
+           "%s page-size %d start %s --%s", VTY_NEWLINE, command,
+           filter->page_size, row->prefix, VTY_NEWLINE);
+}
+
+static void
+show_route_entry (struct vty *vty, const struct ovsrec_route *row_route)
+{
+  char str[50];
+  int i, active_route_next_hops;
+
+  memset (str, 0, sizeof(str));
+  snprintf (str, sizeof(str), "%s", row_route->prefix);
+  vty_out (vty, "%s", str);
+
+  if (row_route->n_nexthops)
+    {
+      active_route_next_hops = 0;
+      for (i = 0; i < row_route->n_nexthops; i++)
+        {
+          if (row_route->nexthops[i]->selected == NULL ||
+              row_route->nexthops[i]->selected[0] == true)
+            active_route_next_hops++;
+        }
+      vty_out (vty, ",  %d %s next-hops %s", active_route_next_hops,
+               row_route->sub_address_family, VTY_NEWLINE);
+    }
+
+  if (row_route->n_nexthops)
+    {
+      memset (str, 0, sizeof(str));
+
+      for (i = 0; i < row_route->n_nexthops; i++)
+        {
+          if (row_route->nexthops[i]->selected == NULL ||
+              row_route->nexthops[i]->selected[0] == true)
             {
-              flag = 1;
-              if (!strcmp ("ipv4", ip_addr_family))
+              if (row_route->nexthops[i]->ip_address)
                 {
-                  vty_out (vty,
-                           "\nDisplaying ipv4 routes selected for forwarding%s",
-                           VTY_NEWLINE);
+                  snprintf (str, sizeof(str), " %s",
+                            row_route->nexthops[i]->ip_address);
+                  vty_out (vty, "\tvia %s", str);
                 }
-              else if (!strcmp ("ipv6", ip_addr_family))
+              else if (row_route->nexthops[i]->ports != NULL
+                       && row_route->nexthops[i]->ports[0]->name)
                 {
-                  vty_out (vty,
-                           "\nDisplaying ipv6 routes selected for forwarding%s",
-                           VTY_NEWLINE);
+                  snprintf (str, sizeof(str), " %s",
+                            row_route->nexthops[i]->ports[0]->name);
+                  vty_out (vty, "\tvia %s", str);
                 }
-              vty_out (vty, "\n'[x/y]' denotes [distance/metric]%s\n",
-                       VTY_NEWLINE);
-              disp_flag = 0;
-            }
-
-          memset (str, 0, sizeof(str));
-          snprintf (str, sizeof(str), "%s", row_route->prefix);
-          vty_out (vty, "%s", str);
 
-          if (row_route->n_nexthops)
-            {
-              active_route_next_hops = 0;
-              for (i = 0; i < row_route->n_nexthops; i++)
-                {
-                  if (row_route->nexthops[i]->selected == NULL ||
-                      row_route->nexthops[i]->selected[0] == true)
-                    active_route_next_hops++;
-                }
-              vty_out (vty, ",  %d %s next-hops %s", active_route_next_hops,
-                       row_route->sub_address_family, VTY_NEWLINE);
-            }
+              vty_out (vty, ",  [%ld", *row_route->distance);
 
-          if (row_route->n_nexthops)
-            {
-              memset (str, 0, sizeof(str));
+              if (row_route->metric)
+                vty_out (vty, "/%ld]", *row_route->metric);
+              else
+                vty_out (vty, "/0]");
 
-              for (i = 0; i < row_route->n_nexthops; i++)
-                {
-                  if (row_route->nexthops[i]->selected == NULL ||
-                      row_route->nexthops[i]->selected[0] == true)
-                    {
-                      if (row_route->nexthops[i]->ip_address)
-                        {
-                          snprintf (str, sizeof(str), " %s",
-                                    row_route->nexthops[i]->ip_address);
-                          vty_out (vty, "\tvia %s", str);
-                        }
-                      else if (row_route->nexthops[i]->ports != NULL
-                               && row_route->nexthops[i]->ports[0]->name)
-                        {
-                          snprintf (str, sizeof(str), " %s",
-                                    row_route->nexthops[i]->ports[0]->name);
-                          vty_out (vty, "\tvia %s", str);
-                        }
+              vty_out (vty, ",  %s", row_route->from);
 
-                      vty_out (vty, ",  [%ld", *row_route->distance);
+              vty_out (vty, VTY_NEWLINE);
+            }
+        }
+    }
+}
 
-                      if (row_route->metric)
-                        vty_out (vty, "/%ld]", *row_route->metric);
-                      else
-                        vty_out (vty, "/0]");
+static int
+show_routes (struct vty *vty, const struct route_show_filter *filter)
+{
+  const struct ovsrec_route *row_route = NULL;
+  const char *last_prefix = NULL;
+  int displayed = 0;
 
-                      vty_out (vty, ",  %s", row_route->from);
+  if (!is_route_cursor_initialized)
+    return CMD_SUCCESS;
 
-                      vty_out (vty, VTY_NEWLINE);
-                    }
-                }
+  for (row_route = route_show_first (filter); row_route;
+       row_route = route_show_next (filter))
+    {
+      if (displayed == 0)
+        {
+          if (!strcmp ("ipv4", filter->address_family))
+            {
+              vty_out (vty,
+                       "\nDisplaying ipv4 routes selected for forwarding%s",
+                       VTY_NEWLINE);
             }
+          else if (!strcmp ("ipv6", filter->address_family))
+            {
+              vty_out (vty,
+                       "\nDisplaying ipv6 routes selected for forwarding%s",
+                       VTY_NEWLINE);
+            }
+          vty_out (vty, "\n'[x/y]' denotes [distance/metric]%s\n",
+                   VTY_NEWLINE);
         }
+      else if (route_show_page_full (filter, displayed, last_prefix,
+                                     row_route))
+        {
+          route_show_next_page (vty, filter,
+                                strcmp ("ipv4", filter->address_family) ?
+                                "show ipv6 route" : "show ip route",
+                                row_route);
+          break;
+        }
+
+      show_route_entry (vty, row_route);
+      last_prefix = row_route->prefix;
+      displayed++;
     }
-  else
-    return CMD_SUCCESS;
 
-  if (flag == 0)
+  if (displayed == 0)
     {
-      if (!strcmp ("ipv4", ip_addr_family))
+      if (!strcmp ("ipv4", filter->address_family))
         vty_out (vty, "\nNo ipv4 routes configured %s\n", VTY_NEWLINE);
-      else if (!strcmp ("ipv6", ip_addr_family))
+      else if (!strcmp ("ipv6", filter->address_family))
         vty_out (vty, "\nNo ipv6 routes configured %s\n", VTY_NEWLINE);
-      return CMD_SUCCESS;
     }
-  else
+
+  return CMD_SUCCESS;
+}
+
+/* Count the routes matching the filter per protocol, without rendering
+ * them. */
+static int
+show_routes_summary (struct vty *vty, const struct route_show_filter *filter)
+{
+  const struct ovsrec_route *row_route = NULL;
+  const char *from_protocols[ROUTE_SUMMARY_MAX_PROTOCOLS];
+  int counts[ROUTE_SUMMARY_MAX_PROTOCOLS];
+  int n_protocols = 0;
+  int total = 0;
+  int i;
+
+  if (!is_route_cursor_initialized)
     return CMD_SUCCESS;
+
+  for (row_route = route_show_first (filter); row_route;
+       row_route = route_show_next (filter))
+    {
+      if (row_route->from == NULL)
+        continue;
+
+      for (i = 0; i < n_protocols; i++)
+        {
+          if (!strcmp (from_protocols[i], row_route->from))
+            break;
+        }
+
+      if (i == n_protocols)
+        {
+          if (n_protocols == ROUTE_SUMMARY_MAX_PROTOCOLS)
+            continue;
+          from_protocols[n_protocols] = row_route->from;
+          counts[n_protocols++] = 0;
+        }
+
+      counts[i]++;
+      total++;
+    }
+
+  vty_out (vty, "\nSummary of %s %s%s\n", filter->address_family,
+           filter->rib ? "rib entries" : "routes selected for forwarding",
+           VTY_NEWLINE);
+  vty_out (vty, "%-20s%s%s", "Route source", "Routes", VTY_NEWLINE);
+  for (i = 0; i < n_protocols; i++)
+    vty_out (vty, "%-20s%d%s", from_protocols[i], counts[i], VTY_NEWLINE);
+  vty_out (vty, "%-20s%d%s", "Total", total, VTY_NEWLINE);
+
+  return CMD_SUCCESS;
 }
+
 #ifdef VRF_ENABLE
 DEFUN (vtysh_show_ip_route,
     vtysh_show_ip_route_cmd,
@@ -833,32 +1175,124 @@ DEFUN (vtysh_show_ip_route,
     SHOW_STR
     IP_STR
     ROUTE_STR
-    "VRF Information\n"
-    "VRF name\n")
+    "VRF Information\n"
+    "VRF name\n")
+{
+  struct route_show_filter filter;
+  int retval;
+
+  route_show_filter_init (&filter, "ipv4", argv[0], false);
+  retval = show_routes(vty, &filter);
+  vty_out(vty, VTY_NEWLINE);
+
+  return retval;
+}
+#else
+DEFUN (vtysh_show_ip_route,
+    vtysh_show_ip_route_cmd,
+    "show ip route",
+    SHOW_STR
+    IP_STR
+    ROUTE_STR)
+{
+  struct route_show_filter filter;
+  int retval;
+
+  route_show_filter_init (&filter, "ipv4", NULL, false);
+  retval = show_routes(vty, &filter);
+  vty_out(vty, VTY_NEWLINE);
+
+  return retval;
+}
+#endif
+
+DEFUN (vtysh_show_ip_route_longer_prefixes,
+    vtysh_show_ip_route_longer_prefixes_cmd,
+    "show ip route A.B.C.D/M longer-prefixes",
+    SHOW_STR
+    IP_STR
+    ROUTE_STR
+    "IP prefix <network>/<length>, e.g., 35.0.0.0/8\n"
+    "Show route matching the specified Network/Mask pair and its more "
+    "specific routes\n")
+{
+  struct route_show_filter filter;
+  int retval;
+
+  route_show_filter_init (&filter, "ipv4", NULL, false);
+  retval = route_show_filter_set_longer (vty, &filter, argv[0]);
+  if (retval == CMD_SUCCESS)
+    retval = show_routes(vty, &filter);
+  vty_out(vty, VTY_NEWLINE);
+
+  return retval;
+}
+
+DEFUN (vtysh_show_ip_route_protocol,
+    vtysh_show_ip_route_protocol_cmd,
+    "show ip route protocol (bgp|connected|ospf|static)",
+    SHOW_STR
+    IP_STR
+    ROUTE_STR
+    "Routes from a protocol\n"
+    "Border Gateway Protocol (BGP)\n"
+    "Connected routes\n"
+    "Open Shortest Path First (OSPF)\n"
+    "Static routes\n")
+{
+  struct route_show_filter filter;
+  int retval;
+
+  route_show_filter_init (&filter, "ipv4", NULL, false);
+  filter.protocol = argv[0];
+  retval = show_routes(vty, &filter);
+  vty_out(vty, VTY_NEWLINE);
+
+  return retval;
+}
+
+DEFUN (vtysh_show_ip_route_summary,
+    vtysh_show_ip_route_summary_cmd,
+    "show ip route summary",
+    SHOW_STR
+    IP_STR
+    ROUTE_STR
+    "Number of routes per protocol\n")
 {
+  struct route_show_filter filter;
   int retval;
 
-  retval = show_routes(vty, "ipv4", argv[0]);
+  route_show_filter_init (&filter, "ipv4", NULL, false);
+  retval = show_routes_summary(vty, &filter);
   vty_out(vty, VTY_NEWLINE);
 
   return retval;
 }
-#else
-DEFUN (vtysh_show_ip_route,
-    vtysh_show_ip_route_cmd,
-    "show ip route",
+
+DEFUN (vtysh_show_ip_route_page,
+    vtysh_show_ip_route_page_cmd,
+    "show ip route page-size <1-100000> {start A.B.C.D/M}",
     SHOW_STR
     IP_STR
-    ROUTE_STR)
+    ROUTE_STR
+    "Show a page of routes\n"
+    "Number of routes in the page\n"
+    "First prefix of the page\n"
+    "IP prefix <network>/<length>, e.g., 35.0.0.0/8\n")
 {
-  int retval;
-
-  retval = show_routes(vty, "ipv4");
+  struct route_show_filter filter;
+  int retval = CMD_SUCCESS;
+
+  route_show_filter_init (&filter, "ipv4", NULL, false);
+  filter.page_size = atoi (argv[0]);
+  if (argv[1])
+    retval = route_show_filter_set_start (vty, &filter, argv[1]);
+  if (retval == CMD_SUCCESS)
+    retval = show_routes(vty, &filter);
   vty_out(vty, VTY_NEWLINE);
 
   return retval;
 }
-#endif
 
 static int
 #ifdef VRF_ENABLE
@@ -869,17 +1303,13 @@ no_ip_route_common (struct vty *vty, char **argv, char *distance)
 {
   int ret;
   const struct ovsrec_route *row_route = NULL;
-  int flag = 0;
   struct prefix p;
   char prefix_str[MAX_ADDRESS_LEN];
   int found_flag = 0;
   char str[17];
   int distance_match = 0;
   int i, n;
-#ifdef VRF_ENABLE
   char *vrf_name = NULL;
-  char *ovs_rt_vrf = NULL;
-#endif
 
   enum ovsdb_idl_txn_status status;
   struct ovsdb_idl_txn *status_txn = NULL;
@@ -921,30 +1351,10 @@ no_ip_route_common (struct vty *vty, char **argv, char *distance)
     vrf_name = vrf;
 #endif
 
-  OVSREC_ROUTE_FOR_EACH (row_route, idl)
+  row_route = static_route_find (vrf_name, OVSREC_ROUTE_ADDRESS_FAMILY_IPV4,
+                                 prefix_str, NULL);
+  if (row_route != NULL)
     {
-#ifdef VRF_ENABLE
-     if (row_route->vrf == NULL)
-       ovs_rt_vrf = DEFAULT_VRF_NAME;
-     else
-       ovs_rt_vrf = row_route->vrf->name;
-
-     if (strncmp(ovs_rt_vrf,vrf_name,OVSDB_VRF_NAME_MAXLEN))
-       continue;
-#endif
-
-      if (row_route->address_family != NULL)
-        {
-          if (strcmp (row_route->address_family, "ipv4"))
-            continue;
-        }
-
-      if (row_route->from != NULL)
-        {
-          if (strcmp (row_route->from, OVSREC_ROUTE_FROM_STATIC))
-            continue;
-        }
-
       if (row_route->prefix != NULL)
         {
           /* Checking for presence of Prefix and Nexthop entries in a row */
@@ -1016,12 +1426,8 @@ no_ip_route_common (struct vty *vty, char **argv, char *distance)
                 }
             }
         }
-      flag = 1;
     }
 
-  if (flag == 0)
-    vty_out (vty, "\nNo ip routes configured %s\n", VTY_NEWLINE);
-
   if (found_flag == 0)
     vty_out (vty, "\nNo such ip route found %s\n", VTY_NEWLINE);
 
@@ -1091,8 +1497,11 @@ DEFUN (vtysh_no_ip_route_vrf,
 
 /* IPv6 CLIs*/
 
+/* Add the nexthop of an ipv6 static route to a configuration transaction.
+ * The caller commits or aborts the transaction. */
 static int
-ipv6_route_common (struct vty *vty, char **argv, char *distance)
+ipv6_route_add (struct ovsdb_idl_txn *status_txn, const char *prefix_arg,
+                char *nh_arg, char *distance, struct shash *txn_routes)
 {
   const struct ovsrec_route *row = NULL;
   const struct ovsrec_nexthop *row_nh = NULL;
@@ -1100,27 +1509,16 @@ ipv6_route_common (struct vty *vty, char **argv, char *distance)
 
   struct prefix p;
   int ret, i;
-  enum ovsdb_idl_txn_status status;
-  struct ovsdb_idl_txn *status_txn = NULL;
   char prefix_str[MAX_ADDRESS_LEN];
+  char txn_key[OVSDB_VRF_NAME_MAXLEN + MAX_ADDRESS_LEN + 2];
   bool prefix_match = false;
   bool nh_match = false;
   bool static_match = false;
 
-  status_txn = cli_do_config_start ();
-
-  if (status_txn == NULL)
-    {
-      VLOG_ERR (OVSDB_TXN_CREATE_ERROR);
-      cli_do_config_abort (status_txn);
-      return CMD_OVSDB_FAILURE;
-    }
-
-  ret = str2prefix (argv[0], &p);
+  ret = str2prefix (prefix_arg, &p);
   if (ret <= 0)
     {
       vty_out (vty, "\n Malformed address format%s\n", VTY_NEWLINE);
-      cli_do_config_abort (status_txn);
       return CMD_WARNING;
     }
   /*
@@ -1130,43 +1528,29 @@ ipv6_route_common (struct vty *vty, char **argv, char *distance)
   memset (prefix_str, 0, sizeof(prefix_str));
   prefix2str ((const struct prefix*) &p, prefix_str, sizeof(prefix_str));
 
-  if (strcmp (prefix_str, argv[0]))
+  if (strcmp (prefix_str, prefix_arg))
     {
       vty_out (vty, "\nInvalid prefix. Valid prefix: %s\n", prefix_str);
-      cli_do_config_abort (status_txn);
       return CMD_OVSDB_FAILURE;
     }
 
   /* Validate if the prefix entered is a standard multicast,
    * linklocal or loopback address */
   if (ip6_routing_address_is_invalid (prefix_str, false))
-    {
-      cli_do_config_abort (status_txn);
-      return CMD_OVSDB_FAILURE;
-    }
+    return CMD_OVSDB_FAILURE;
 
-  OVSREC_ROUTE_FOR_EACH (row, idl)
+  row = static_route_find (NULL, OVSREC_ROUTE_ADDRESS_FAMILY_IPV6,
+                           prefix_str, txn_routes);
+  if (row != NULL)
     {
-      if (row->prefix != NULL)
+      if (row->n_nexthops > MAX_NEXTHOPS_PER_ROUTE - 1)
         {
-          if (!strcmp (row->prefix, argv[0]) &&
-              !strcmp (row->from, OVSREC_ROUTE_FROM_STATIC))
-            {
-              if (row->n_nexthops != 0)
-                {
-                  if (row->n_nexthops > MAX_NEXTHOPS_PER_ROUTE - 1)
-                    {
-                      vty_out (vty, "\nMaximum %d nexthops per route\n",
-                               MAX_NEXTHOPS_PER_ROUTE);
-                      cli_do_config_abort (status_txn);
-                      return CMD_OVSDB_FAILURE;
-                    }
-                }
-              prefix_match = true;
-              static_match = true;
-              break;
-            }
+          vty_out (vty, "\nMaximum %d nexthops per route\n",
+                   MAX_NEXTHOPS_PER_ROUTE);
+          return CMD_OVSDB_FAILURE;
         }
+      prefix_match = true;
+      static_match = true;
     }
 
   if (row == NULL)
@@ -1175,7 +1559,6 @@ ipv6_route_common (struct vty *vty, char **argv, char *distance)
       if (!row_vrf)
         {
           VLOG_ERR (OVSDB_ROW_FETCH_ERROR);
-          cli_do_config_abort (status_txn);
           return CMD_OVSDB_FAILURE;
         }
 
@@ -1192,16 +1575,19 @@ ipv6_route_common (struct vty *vty, char **argv, char *distance)
 
       ovsrec_route_set_from (row, OVSREC_ROUTE_FROM_STATIC);
 
-      row_nh = set_nexthop_entry (status_txn, (char*) argv[1], prefix_match,
+      row_nh = set_nexthop_entry (status_txn, nh_arg, prefix_match,
                                   static_match, distance, row, "ipv6");
       if (row_nh == NULL)
-        {
-          cli_do_config_abort (status_txn);
-          return CMD_OVSDB_FAILURE;
-        }
+        return CMD_OVSDB_FAILURE;
 
       ovsrec_route_set_nexthops (row, (struct ovsrec_nexthop**) &row_nh,
                                  row->n_nexthops + 1);
+
+      if (txn_routes)
+        {
+          static_route_txn_key (txn_key, sizeof(txn_key), NULL, prefix_str);
+          shash_add (txn_routes, txn_key, row);
+        }
     }
   else
     {
@@ -1211,7 +1597,7 @@ ipv6_route_common (struct vty *vty, char **argv, char *distance)
             {
               if (row->nexthops[i]->ip_address != NULL)
                 {
-                  if (!strcmp (row->nexthops[i]->ip_address, argv[1]))
+                  if (!strcmp (row->nexthops[i]->ip_address, nh_arg))
                     {
                       nh_match = true;
                       break;
@@ -1220,7 +1606,7 @@ ipv6_route_common (struct vty *vty, char **argv, char *distance)
               else if (row->nexthops[i]->ports != NULL &&
                        row->nexthops[i]->ports[0]->name != NULL)
                 {
-                  if (!strcmp (row->nexthops[i]->ports[0]->name, argv[1]))
+                  if (!strcmp (row->nexthops[i]->ports[0]->name, nh_arg))
                     {
                       nh_match = true;
                       break;
@@ -1231,14 +1617,11 @@ ipv6_route_common (struct vty *vty, char **argv, char *distance)
 
       if (!nh_match)
         {
-          row_nh = set_nexthop_entry (status_txn, (char*) argv[1], prefix_match,
+          row_nh = set_nexthop_entry (status_txn, nh_arg, prefix_match,
                                       static_match, distance, row, "ipv6");
 
           if (row_nh == NULL)
-            {
-              cli_do_config_abort (status_txn);
-              return CMD_OVSDB_FAILURE;
-            }
+            return CMD_OVSDB_FAILURE;
 
           struct ovsrec_nexthop **nexthops = NULL;
           nexthops = xmalloc (sizeof *row->nexthops * (row->n_nexthops + 1));
@@ -1256,6 +1639,32 @@ ipv6_route_common (struct vty *vty, char **argv, char *distance)
         vty_out (vty, "\nNexthop already exists\n%s", VTY_NEWLINE);
     }
 
+  return CMD_SUCCESS;
+}
+
+static int
+ipv6_route_common (struct vty *vty, char **argv, char *distance)
+{
+  int ret;
+  enum ovsdb_idl_txn_status status;
+  struct ovsdb_idl_txn *status_txn = NULL;
+
+  status_txn = cli_do_config_start ();
+
+  if (status_txn == NULL)
+    {
+      VLOG_ERR (OVSDB_TXN_CREATE_ERROR);
+      cli_do_config_abort (status_txn);
+      return CMD_OVSDB_FAILURE;
+    }
+
+  ret = ipv6_route_add (status_txn, argv[0], argv[1], distance, NULL);
+  if (ret != CMD_SUCCESS)
+    {
+      cli_do_config_abort (status_txn);
+      return ret;
+    }
+
   status = cli_do_config_finish (status_txn);
 
   if (((status != TXN_SUCCESS) && (status != TXN_INCOMPLETE)
@@ -1301,12 +1710,99 @@ DEFUN (vtysh_show_ipv6_route,
     IPV6_STR
     ROUTE_STR)
 {
+  struct route_show_filter filter;
   int retval;
-#ifdef VRF_ENABLE
-  retval = show_routes(vty, "ipv6", NULL);
-#else
-  retval = show_routes(vty, "ipv6");
-#endif
+
+  route_show_filter_init (&filter, "ipv6", NULL, false);
+  retval = show_routes(vty, &filter);
+  vty_out(vty, VTY_NEWLINE);
+
+  return retval;
+}
+
+DEFUN (vtysh_show_ipv6_route_longer_prefixes,
+    vtysh_show_ipv6_route_longer_prefixes_cmd,
+    "show ipv6 route X:X::X:X/M longer-prefixes",
+    SHOW_STR
+    IPV6_STR
+    ROUTE_STR
+    "IPv6 prefix\n"
+    "Show route matching the specified Network/Mask pair and its more "
+    "specific routes\n")
+{
+  struct route_show_filter filter;
+  int retval;
+
+  route_show_filter_init (&filter, "ipv6", NULL, false);
+  retval = route_show_filter_set_longer (vty, &filter, argv[0]);
+  if (retval == CMD_SUCCESS)
+    retval = show_routes(vty, &filter);
+  vty_out(vty, VTY_NEWLINE);
+
+  return retval;
+}
+
+DEFUN (vtysh_show_ipv6_route_protocol,
+    vtysh_show_ipv6_route_protocol_cmd,
+    "show ipv6 route protocol (bgp|connected|ospf|static)",
+    SHOW_STR
+    IPV6_STR
+    ROUTE_STR
+    "Routes from a protocol\n"
+    "Border Gateway Protocol (BGP)\n"
+    "Connected routes\n"
+    "Open Shortest Path First (OSPF)\n"
+    "Static routes\n")
+{
+  struct route_show_filter filter;
+  int retval;
+
+  route_show_filter_init (&filter, "ipv6", NULL, false);
+  filter.protocol = argv[0];
+  retval = show_routes(vty, &filter);
+  vty_out(vty, VTY_NEWLINE);
+
+  return retval;
+}
+
+DEFUN (vtysh_show_ipv6_route_summary,
+    vtysh_show_ipv6_route_summary_cmd,
+    "show ipv6 route summary",
+    SHOW_STR
+    IPV6_STR
+    ROUTE_STR
+    "Number of routes per protocol\n")
+{
+  struct route_show_filter filter;
+  int retval;
+
+  route_show_filter_init (&filter, "ipv6", NULL, false);
+  retval = show_routes_summary(vty, &filter);
+  vty_out(vty, VTY_NEWLINE);
+
+  return retval;
+}
+
+DEFUN (vtysh_show_ipv6_route_page,
+    vtysh_show_ipv6_route_page_cmd,
+    "show ipv6 route page-size <1-100000> {start X:X::X:X/M}",
+    SHOW_STR
+    IPV6_STR
+    ROUTE_STR
+    "Show a page of routes\n"
+    "Number of routes in the page\n"
+    "First prefix of the page\n"
+    "IPv6 prefix\n")
+{
+  struct route_show_filter filter;
+  int retval = CMD_SUCCESS;
+
+  route_show_filter_init (&filter, "ipv6", NULL, false);
+  filter.page_size = atoi (argv[0]);
+  if (argv[1])
+    retval = route_show_filter_set_start (vty, &filter, argv[1]);
+  if (retval == CMD_SUCCESS)
+    retval = show_routes(vty, &filter);
   vty_out(vty, VTY_NEWLINE);
 
   return retval;
@@ -1317,7 +1813,6 @@ no_ipv6_route_common (struct vty *vty, char **argv, char *distance)
 {
   int ret;
   const struct ovsrec_route *row_route = NULL;
-  int flag = 0;
   struct prefix p;
   char prefix_str[MAX_ADDRESS_LEN];
   int found_flag = 0;
@@ -1358,20 +1853,10 @@ no_ipv6_route_common (struct vty *vty, char **argv, char *distance)
       return CMD_OVSDB_FAILURE;
     }
 
-  OVSREC_ROUTE_FOR_EACH (row_route, idl)
+  row_route = static_route_find (NULL, OVSREC_ROUTE_ADDRESS_FAMILY_IPV6,
+                                 prefix_str, NULL);
+  if (row_route != NULL)
     {
-      if (row_route->address_family != NULL)
-        {
-          if (strcmp (row_route->address_family, "ipv6"))
-            continue;
-        }
-
-      if (row_route->from != NULL)
-        {
-          if (strcmp (row_route->from, OVSREC_ROUTE_FROM_STATIC))
-            continue;
-        }
-
       if (row_route->prefix != NULL)
         {
           /* Checking for presence of Prefix and Nexthop entries in a row */
@@ -1447,12 +1932,8 @@ no_ipv6_route_common (struct vty *vty, char **argv, char *distance)
                 }
             }
         }
-      flag = 1;
     }
 
-  if (flag == 0)
-    vty_out (vty, "\nNo ipv6 routes configured %s\n", VTY_NEWLINE);
-
   if (found_flag == 0)
     vty_out (vty, "\nNo such ipv6 route found %s\n", VTY_NEWLINE);
 
@@ -1495,121 +1976,212 @@ DEFUN (vtysh_no_ipv6_route_distance,
   return no_ipv6_route_common(vty, (char **)argv, (char *)argv[2]);
 }
 
-#ifdef VRF_ENABLE
-static int
-show_rib (struct vty *vty, char * ip_addr_family, char *vrf)
-#else
+/* Configure the static routes of a file in a single transaction. Each
+ * line holds an "ip route" or "ipv6 route" command as in the running
+ * config, so that scripted provisioning of many routes does not commit
+ * once per route. Blank lines and lines starting with '!' or '#' are
+ * skipped. Any invalid line aborts the whole file. */
 static int
-show_rib (struct vty *vty, char * ip_addr_family)
-#endif
+static_routes_load (struct vty *vty, const char *filename)
 {
-  const struct ovsrec_route *row_route = NULL;
-  int flag = 0;
-  int disp_flag = 1;
-  char str[50];
-  int i;
-  extern struct ovsdb_idl_index_cursor route_cursor;
-#ifdef VRF_ENABLE
-  char *vrf_name = vrf;
+  FILE *fp;
+  char line[STATIC_ROUTE_LINE_MAX_LEN];
+  char *tokens[STATIC_ROUTE_LINE_MAX_TOKENS + 1];
+  char *distance, *vrf, *saveptr;
+  struct shash txn_routes;
+  enum ovsdb_idl_txn_status status;
+  struct ovsdb_idl_txn *status_txn = NULL;
+  int n_tokens, idx, line_num = 0, n_routes = 0;
+  int ret = CMD_SUCCESS;
 
-  if (NULL == vrf_name)
-    vrf_name = DEFAULT_VRF_NAME;
-#endif
-  if (is_route_cursor_initialized)
+  fp = fopen (filename, "r");
+  if (fp == NULL)
+    {
+      vty_out (vty, "\nUnable to open %s%s", filename, VTY_NEWLINE);
+      return CMD_WARNING;
+    }
+
+  status_txn = cli_do_config_start ();
+
+  if (status_txn == NULL)
+    {
+      VLOG_ERR (OVSDB_TXN_CREATE_ERROR);
+      cli_do_config_abort (status_txn);
+      fclose (fp);
+      return CMD_OVSDB_FAILURE;
+    }
+
+  shash_init (&txn_routes);
+
+  while (fgets (line, sizeof(line), fp) != NULL)
     {
-      OVSREC_ROUTE_FOR_EACH_BYINDEX (row_route, &route_cursor)
+      line_num++;
+
+      n_tokens = 0;
+      for (tokens[n_tokens] = strtok_r (line, " \t\r\n", &saveptr);
+           tokens[n_tokens] != NULL && n_tokens < STATIC_ROUTE_LINE_MAX_TOKENS;
+           tokens[n_tokens] = strtok_r (NULL, " \t\r\n", &saveptr))
+        n_tokens++;
+
+      if (n_tokens == 0 || tokens[0][0] == '!' || tokens[0][0] == '#')
+        continue;
+
+      ret = CMD_WARNING;
+      distance = NULL;
+      vrf = NULL;
+      idx = 4;
+
+      if (n_tokens >= 4 && !strcmp (tokens[1], "route"))
         {
-          if (row_route->protocol_private != NULL)
+          if (idx < n_tokens && isdigit ((unsigned char) tokens[idx][0]))
             {
-              if (row_route->protocol_private[0] == true)
-                continue;
+              distance = tokens[idx++];
+              if (atoi (distance) < 1 || atoi (distance) > 255)
+                idx = -1;
             }
 #ifdef VRF_ENABLE
-          if (strncmp(row_route->vrf->name, vrf_name,OVSDB_VRF_NAME_MAXLEN))
-            continue;
+          if (idx > 0 && idx + 1 < n_tokens && !strcmp (tokens[idx], "vrf"))
+            {
+              vrf = tokens[idx + 1];
+              idx += 2;
+            }
 #endif
+          if (idx == n_tokens && !strcmp (tokens[0], "ip"))
+            ret = ip_route_add (status_txn, tokens[2], tokens[3], distance,
+                                vrf, &txn_routes);
+          else if (idx == n_tokens && vrf == NULL &&
+                   !strcmp (tokens[0], "ipv6"))
+            ret = ipv6_route_add (status_txn, tokens[2], tokens[3], distance,
+                                  &txn_routes);
+        }
 
-          if (strcmp (row_route->address_family, ip_addr_family))
-            continue;
+      if (ret != CMD_SUCCESS)
+        {
+          vty_out (vty, "\nInvalid static route at line %d of %s, no routes "
+                   "configured%s", line_num, filename, VTY_NEWLINE);
+          break;
+        }
 
-          if (disp_flag == 1)
-            {
-              flag = 1;
-              if (!strcmp ("ipv4", ip_addr_family))
-                {
-                  vty_out (vty, "\nDisplaying ipv4 rib entries %s", VTY_NEWLINE);
-                }
-              else if (!strcmp ("ipv6", ip_addr_family))
-                {
-                  vty_out (
-                      vty,
-                      "\n\n-----------------------------------------------------%s\n",
-                      VTY_NEWLINE);
-                  vty_out (vty, "\nDisplaying ipv6 rib entries %s", VTY_NEWLINE);
-                }
-              vty_out (vty, "\n'*' denotes selected%s", VTY_NEWLINE);
-              vty_out (vty, "'[x/y]' denotes [distance/metric]%s\n", VTY_NEWLINE);
-              disp_flag = 0;
-            }
+      n_routes++;
+    }
+
+  fclose (fp);
+  shash_destroy (&txn_routes);
+
+  if (ret != CMD_SUCCESS)
+    {
+      cli_do_config_abort (status_txn);
+      return ret;
+    }
+
+  status = cli_do_config_finish (status_txn);
+
+  if (((status != TXN_SUCCESS) && (status != TXN_INCOMPLETE)
+      && (status != TXN_UNCHANGED)))
+    {
+      VLOG_ERR (OVSDB_TXN_COMMIT_ERROR);
+      return CMD_OVSDB_FAILURE;
+    }
+
+  vty_out (vty, "%d static routes configured%s", n_routes, VTY_NEWLINE);
+  return CMD_SUCCESS;
+}
+
+DEFUN (vtysh_static_routes_load,
+    vtysh_static_routes_load_cmd,
+    "static-routes load FILE",
+    "Configure static routes in bulk\n"
+    "Configure the ip and ipv6 routes listed in a file in one transaction\n"
+    "File with one \"ip route\" or \"ipv6 route\" command per line\n")
+{
+  return static_routes_load (vty, argv[0]);
+}
+
+static int
+show_rib (struct vty *vty, const struct route_show_filter *filter)
+{
+  const struct ovsrec_route *row_route = NULL;
+  int flag = 0;
+  char str[50];
+  int i;
+
+  if (!is_route_cursor_initialized)
+    return CMD_SUCCESS;
 
-          if (row_route->prefix)
+  for (row_route = route_show_first (filter); row_route;
+       row_route = route_show_next (filter))
+    {
+      if (flag == 0)
+        {
+          flag = 1;
+          if (!strcmp ("ipv4", filter->address_family))
             {
-              memset (str, 0, sizeof(str));
-              snprintf (str, sizeof(str), "%s", row_route->prefix);
-              if (row_route->selected != NULL && row_route->selected[0] == true)
-                vty_out (vty, "*%s", str);
-              else
-                vty_out (vty, "%s", str);
+              vty_out (vty, "\nDisplaying ipv4 rib entries %s", VTY_NEWLINE);
             }
-
-          if (row_route->n_nexthops)
+          else if (!strcmp ("ipv6", filter->address_family))
             {
-              vty_out (vty, ",  %zd %s next-hops %s", row_route->n_nexthops,
-                       row_route->sub_address_family, VTY_NEWLINE);
+              vty_out (
+                  vty,
+                  "\n\n-----------------------------------------------------%s\n",
+                  VTY_NEWLINE);
+              vty_out (vty, "\nDisplaying ipv6 rib entries %s", VTY_NEWLINE);
             }
+          vty_out (vty, "\n'*' denotes selected%s", VTY_NEWLINE);
+          vty_out (vty, "'[x/y]' denotes [distance/metric]%s\n", VTY_NEWLINE);
+        }
 
-          if (row_route->n_nexthops)
-            {
-              memset (str, 0, sizeof(str));
+      memset (str, 0, sizeof(str));
+      snprintf (str, sizeof(str), "%s", row_route->prefix);
+      if (row_route->selected != NULL && row_route->selected[0] == true)
+        vty_out (vty, "*%s", str);
+      else
+        vty_out (vty, "%s", str);
 
-              for (i = 0; i < row_route->n_nexthops; i++)
-                {
-                  if (row_route->nexthops[i]->ip_address)
-                    snprintf (str, sizeof(str), " %s",
-                              row_route->nexthops[i]->ip_address);
-                  else if (row_route->nexthops[i]->ports != NULL &&
-                           row_route->nexthops[i]->ports[0]->name)
-                    snprintf (str, sizeof(str), " %s",
-                              row_route->nexthops[i]->ports[0]->name);
-
-                  if (row_route->nexthops[i]->selected == NULL ||
-                      row_route->nexthops[i]->selected[0] == true)
-                    vty_out (vty, "\t*via %s", str);
-                  else
-                    vty_out (vty, "\tvia %s", str);
+      if (row_route->n_nexthops)
+        {
+          vty_out (vty, ",  %zd %s next-hops %s", row_route->n_nexthops,
+                   row_route->sub_address_family, VTY_NEWLINE);
+        }
 
-                  vty_out (vty, ",  [%ld", *row_route->distance);
+      if (row_route->n_nexthops)
+        {
+          memset (str, 0, sizeof(str));
 
-                  if (row_route->metric)
-                    vty_out (vty, "/%ld]", *row_route->metric);
-                  else
-                    vty_out (vty, "/0]");
+          for (i = 0; i < row_route->n_nexthops; i++)
+            {
+              if (row_route->nexthops[i]->ip_address)
+                snprintf (str, sizeof(str), " %s",
+                          row_route->nexthops[i]->ip_address);
+              else if (row_route->nexthops[i]->ports != NULL &&
+                       row_route->nexthops[i]->ports[0]->name)
+                snprintf (str, sizeof(str), " %s",
+                          row_route->nexthops[i]->ports[0]->name);
+
+              if (row_route->nexthops[i]->selected == NULL ||
+                  row_route->nexthops[i]->selected[0] == true)
+                vty_out (vty, "\t*via %s", str);
+              else
+                vty_out (vty, "\tvia %s", str);
 
-                  vty_out (vty, ",  %s", row_route->from);
+              vty_out (vty, ",  [%ld", *row_route->distance);
 
-                  vty_out (vty, VTY_NEWLINE);
-                }
+              if (row_route->metric)
+                vty_out (vty, "/%ld]", *row_route->metric);
+              else
+                vty_out (vty, "/0]");
+
+              vty_out (vty, ",  %s", row_route->from);
+
+              vty_out (vty, VTY_NEWLINE);
             }
         }
     }
-  else
-    return CMD_SUCCESS;
 
   if (flag == 0)
     {
-      if (!strcmp ("ipv4", ip_addr_family))
+      if (!strcmp ("ipv4", filter->address_family))
         vty_out (vty, "\nNo ipv4 rib entries %s", VTY_NEWLINE);
-      else if (!strcmp ("ipv6", ip_addr_family))
+      else if (!strcmp ("ipv6", filter->address_family))
         vty_out (vty, "\nNo ipv6 rib entries %s", VTY_NEWLINE);
       return CMD_SUCCESS;
     }
@@ -1627,10 +2199,13 @@ DEFUN (vtysh_show_rib,
     "VRF Information\n"
     "VRF name\n")
 {
+  struct route_show_filter filter;
   int retval;
 
-  retval = show_rib(vty, "ipv4", argv[0]);
-  retval = show_rib(vty, "ipv6", NULL);
+  route_show_filter_init (&filter, "ipv4", argv[0], true);
+  retval = show_rib(vty, &filter);
+  route_show_filter_init (&filter, "ipv6", NULL, true);
+  retval = show_rib(vty, &filter);
   vty_out(vty, VTY_NEWLINE);
 
   return retval;
@@ -1642,16 +2217,38 @@ DEFUN (vtysh_show_rib,
     SHOW_STR
     RIB_STR)
 {
+  struct route_show_filter filter;
   int retval;
 
-  retval = show_rib(vty, "ipv4");
-  retval = show_rib(vty, "ipv6");
+  route_show_filter_init (&filter, "ipv4", NULL, true);
+  retval = show_rib(vty, &filter);
+  route_show_filter_init (&filter, "ipv6", NULL, true);
+  retval = show_rib(vty, &filter);
   vty_out(vty, VTY_NEWLINE);
 
   return retval;
 }
 #endif
 
+DEFUN (vtysh_show_rib_summary,
+    vtysh_show_rib_summary_cmd,
+    "show rib summary",
+    SHOW_STR
+    RIB_STR
+    "Number of rib entries per protocol\n")
+{
+  struct route_show_filter filter;
+  int retval;
+
+  route_show_filter_init (&filter, "ipv4", NULL, true);
+  retval = show_routes_summary(vty, &filter);
+  route_show_filter_init (&filter, "ipv6", NULL, true);
+  retval = show_routes_summary(vty, &filter);
+  vty_out(vty, VTY_NEWLINE);
+
+  return retval;
+}
+
 /* This function expands the compressed IPv6 addresses and compares them.
    Eg: '1::1' is expanded to '0001:0000:0000:0000:0000:0000:0000:0001' */
 int ipv6_prefix_compare(const struct in6_addr * addr1,
@@ -1853,6 +2450,10 @@ cli_post_init (void)
   install_element (CONFIG_NODE, &vtysh_ip_route_vrf_cmd);
 #endif
   install_element (ENABLE_NODE, &vtysh_show_ip_route_cmd);
+  install_element (ENABLE_NODE, &vtysh_show_ip_route_longer_prefixes_cmd);
+  install_element (ENABLE_NODE, &vtysh_show_ip_route_protocol_cmd);
+  install_element (ENABLE_NODE, &vtysh_show_ip_route_summary_cmd);
+  install_element (ENABLE_NODE, &vtysh_show_ip_route_page_cmd);
   install_element (CONFIG_NODE, &vtysh_no_ip_route_cmd);
   install_element (CONFIG_NODE, &vtysh_no_ip_route_distance_cmd);
 #ifdef VRF_ENABLE
@@ -1861,9 +2462,15 @@ cli_post_init (void)
   install_element (CONFIG_NODE, &vtysh_ipv6_route_cmd);
   install_element (CONFIG_NODE, &vtysh_ipv6_route_distance_cmd);
   install_element (ENABLE_NODE, &vtysh_show_ipv6_route_cmd);
+  install_element (ENABLE_NODE, &vtysh_show_ipv6_route_longer_prefixes_cmd);
+  install_element (ENABLE_NODE, &vtysh_show_ipv6_route_protocol_cmd);
+  install_element (ENABLE_NODE, &vtysh_show_ipv6_route_summary_cmd);
+  install_element (ENABLE_NODE, &vtysh_show_ipv6_route_page_cmd);
   install_element (CONFIG_NODE, &vtysh_no_ipv6_route_cmd);
   install_element (CONFIG_NODE, &vtysh_no_ipv6_route_distance_cmd);
   install_element (ENABLE_NODE, &vtysh_show_rib_cmd);
+  install_element (ENABLE_NODE, &vtysh_show_rib_summary_cmd);
+  install_element (CONFIG_NODE, &vtysh_static_routes_load_cmd);
 
   retval = e_vtysh_error;
   retval = install_show_run_config_subcontext(e_vtysh_dependent_config,
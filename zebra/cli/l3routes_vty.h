@@ -35,6 +35,14 @@ cli_post_init (void);
 #define DEFAULT_DISTANCE  1
 #define MAX_ADDRESS_LEN   256
 
+/* A static route file line is at most "ipv6 route PREFIX NEXTHOP DISTANCE
+ * vrf NAME" */
+#define STATIC_ROUTE_LINE_MAX_LEN     1024
+#define STATIC_ROUTE_LINE_MAX_TOKENS  8
+
+/* Route sources counted by the route summary commands */
+#define ROUTE_SUMMARY_MAX_PROTOCOLS   8
+
 /* Loopback range lies from 127.0.0.0 - 127.255.255.255
  * Thus, not using the macro 'IS_LOOPBACK_IPV4(i)' defined in vtysh.h */
 #define  IS_LOOPBACK_IPV4_ADDRESS(ipv4_addr)  (((long)(ipv4_addr) & 0xff000000) == 0x7f000000)
@@ -40,6 +40,9 @@
 #include "zebra/irdp.h"
 #include "zebra/rtadv.h"
 #include "zebra/zebra_fpm.h"
+#ifdef HAVE_NETLINK
+#include "zebra/rt_netlink.h"
+#endif /* HAVE_NETLINK */
 
 #ifdef ENABLE_OVSDB
 #include "zebra/zebra_ovsdb_if.h"
@@ -88,6 +91,7 @@ struct option longopts[] =
   { "dryrun",      no_argument,       NULL, 'C'},
 #ifdef HAVE_NETLINK
   { "nl-bufsize",  required_argument, NULL, 's'},
+  { "nl-batch",    no_argument,       NULL, 'n'},
 #endif /* HAVE_NETLINK */
   { "user",        required_argument, NULL, 'u'},
   { "group",       required_argument, NULL, 'g'},
@@ -150,6 +154,7 @@ usage (char *progname, int status)
 	      "-g, --group	  Group to run as\n", progname);
 #ifdef HAVE_NETLINK
       printf ("-s, --nl-bufsize   Set netlink receive buffer size\n");
+      printf ("-n, --nl-batch     Batch the kernel route updates\n");
 #endif /* HAVE_NETLINK */
       printf ("-v, --version      Print program version\n"\
 	      "-h, --help         Display this help and exit\n"\
@@ -178,6 +183,9 @@ sigint (void)
 
   if (!retain_mode)
     rib_close ();
+#ifdef HAVE_NETLINK
+  netlink_batch_sync ();
+#endif /* HAVE_NETLINK */
 #ifdef HAVE_IRDP
   irdp_finish();
 #endif
@@ -248,7 +256,7 @@ main (int argc, char **argv)
       int opt;
 
 #ifdef HAVE_NETLINK
-      opt = getopt_long (argc, argv, "bdkf:i:z:hA:P:ru:g:vs:C", longopts, 0);
+      opt = getopt_long (argc, argv, "bdkf:i:z:hA:P:ru:g:vs:nC", longopts, 0);
 #else
       opt = getopt_long (argc, argv, "bdkf:i:z:hA:P:ru:g:vC", longopts, 0);
 #endif /* HAVE_NETLINK */
@@ -302,6 +310,9 @@ main (int argc, char **argv)
 	case 's':
 	  nl_rcvbufsize = atoi (optarg);
 	  break;
+	case 'n':
+	  netlink_batch_set_enabled (1);
+	  break;
 #endif /* HAVE_NETLINK */
 	case 'u':
 	  zserv_privs.user = optarg;
@@ -448,6 +459,10 @@ main (int argc, char **argv)
 #endif
     thread_call (&thread);
 
+#ifdef HAVE_NETLINK
+  netlink_batch_sync ();
+#endif /* HAVE_NETLINK */
+
 #ifdef ENABLE_OVSDB
   zebra_ovsdb_exit();
 #endif
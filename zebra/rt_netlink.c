@@ -235,6 +235,10 @@ netlink_request (int family, int type, struct nlsock *nl)
       return -1;
     }
 
+  /* The reply of the batched route messages must not be read as ours */
+  if (nl == &netlink_cmd)
+    netlink_batch_sync ();
+
   memset (&snl, 0, sizeof snl);
   snl.nl_family = AF_NETLINK;
 
@@ -1736,6 +1740,10 @@ netlink_talk (struct nlmsghdr *n, struct nlsock *nl)
   memset (&snl, 0, sizeof snl);
   snl.nl_family = AF_NETLINK;
 
+  /* The reply of the batched route messages must not be read as ours */
+  if (nl == &netlink_cmd)
+    netlink_batch_sync ();
+
   n->nlmsg_seq = ++nl->seq;
 
   /* Request an acknowledgement by setting NLM_F_ACK */
@@ -1769,6 +1777,591 @@ netlink_talk (struct nlmsghdr *n, struct nlsock *nl)
   return netlink_parse_info (netlink_talk_filter, nl);
 }
 
+/*
+ * Batched route programming. In the batch mode the route messages built
+ * by netlink_route_multipath() are not sent one at a time through
+ * netlink_talk(), which waits for the kernel acknowledgement of every
+ * message. They are packed into a batch buffer which is sent with a
+ * single sendmsg() when it is full or NL_BATCH_FLUSH_MSEC after the first
+ * message was queued. The acknowledgements are read from the command
+ * socket by a read thread, and correlated back to the route node through
+ * the sequence number and the prefix kept for every message which is not
+ * acknowledged yet. The rib of a message is not kept, since it may be
+ * freed before the acknowledgement arrives.
+ *
+ * If acknowledgements are lost, because the socket receive buffer
+ * overran or a reply was truncated, the result of the messages is
+ * unknown. Their prefixes are resynced: the route selected in the RIB is
+ * installed again, or the route is deleted from the kernel when nothing
+ * is selected any more.
+ */
+#define NL_BATCH_BUF_SIZE       (8 * NL_PKT_BUF_SIZE)
+#define NL_BATCH_MAX_MSGS       512
+#define NL_BATCH_MAX_INFLIGHT   (4 * NL_BATCH_MAX_MSGS)
+#define NL_BATCH_FLUSH_MSEC     10
+
+/* Result of a route message whose acknowledgement was lost */
+#define NL_BATCH_ERR_UNKNOWN    (-1)
+
+struct netlink_batch_msg
+{
+  u_int32_t seq;
+  int cmd;
+  u_char table;
+  struct prefix p;
+};
+
+struct netlink_batch_stats netlink_batch_stats;
+
+static char netlink_batch_buf[NL_BATCH_BUF_SIZE];
+static size_t netlink_batch_len = 0;
+
+/*
+ * Ring of the route messages not acknowledged yet. The oldest
+ * 'netlink_batch_count - netlink_batch_queued' messages have been sent
+ * to the kernel, the rest are still in the batch buffer.
+ */
+static struct netlink_batch_msg netlink_batch_msgs[NL_BATCH_MAX_INFLIGHT];
+static int netlink_batch_head = 0;
+static int netlink_batch_count = 0;
+static int netlink_batch_queued = 0;
+
+static struct thread *netlink_batch_flush_thread = NULL;
+static struct thread *netlink_batch_ack_thread = NULL;
+
+/* Prefixes whose route messages have an unknown result */
+static struct list *netlink_batch_resync_list = NULL;
+static struct thread *netlink_batch_resync_thread = NULL;
+
+static int
+netlink_batch_add (struct nlmsghdr *n, struct prefix *p);
+
+/*
+ * Return 1 if a route message for the prefix is still waiting for the
+ * kernel. Its result supersedes the result of older messages.
+ */
+static int
+netlink_batch_prefix_pending (struct prefix *p)
+{
+  int i;
+
+  for (i = 0; i < netlink_batch_count; i++)
+    if (prefix_same (&netlink_batch_msgs[(netlink_batch_head + i) %
+                                         NL_BATCH_MAX_INFLIGHT].p, p))
+      return 1;
+
+  return 0;
+}
+
+/*
+ * Find the route node of the prefix and its selected rib. The route node
+ * is returned locked, and '*selected' is set to NULL if no rib is
+ * selected.
+ */
+static struct route_node *
+netlink_batch_route_lookup (struct prefix *p, struct rib **selected)
+{
+  struct route_table *table;
+  struct route_node *rn;
+  struct rib *rib;
+
+  *selected = NULL;
+
+  table = vrf_table (p->family == AF_INET ? AFI_IP : AFI_IP6,
+                     SAFI_UNICAST, 0);
+  if (!table)
+    return NULL;
+
+  rn = route_node_lookup (table, p);
+  if (!rn)
+    return NULL;
+
+  RNODE_FOREACH_RIB (rn, rib)
+    if (CHECK_FLAG (rib->flags, ZEBRA_FLAG_SELECTED))
+      {
+        *selected = rib;
+        break;
+      }
+
+  return rn;
+}
+
+/* Clear the FIB flags of the rib, so that it is installed again. */
+static void
+netlink_batch_rib_unset_fib (struct rib *rib)
+{
+  struct nexthop *nexthop, *tnexthop;
+  int recursing;
+
+  for (ALL_NEXTHOPS_RO(rib->nexthop, nexthop, tnexthop, recursing))
+    UNSET_FLAG (nexthop->flags, NEXTHOP_FLAG_FIB);
+}
+
+/*
+ * The kernel failed to install the route. Unless a newer message for the
+ * prefix is in flight, clear the FIB flags of the rib selected for the
+ * prefix the same way rib_install_kernel() does for a synchronous
+ * failure.
+ */
+static void
+netlink_batch_route_failed (struct netlink_batch_msg *bmsg)
+{
+  struct route_node *rn;
+  struct rib *rib;
+
+  if (netlink_batch_prefix_pending (&bmsg->p))
+    return;
+
+  rn = netlink_batch_route_lookup (&bmsg->p, &rib);
+  if (!rn)
+    return;
+
+  if (rib)
+    netlink_batch_rib_unset_fib (rib);
+
+  route_unlock_node (rn);
+}
+
+/* Delete the route of the prefix installed by zebra from the kernel. */
+static void
+netlink_batch_route_delete (struct netlink_batch_msg *bmsg)
+{
+  struct
+  {
+    struct nlmsghdr n;
+    struct rtmsg r;
+    char buf[NL_PKT_BUF_SIZE];
+  } req;
+
+  memset (&req, 0, sizeof req - NL_PKT_BUF_SIZE);
+
+  req.n.nlmsg_len = NLMSG_LENGTH (sizeof (struct rtmsg));
+  req.n.nlmsg_flags = NLM_F_REQUEST;
+  req.n.nlmsg_type = RTM_DELROUTE;
+  req.r.rtm_family = bmsg->p.family;
+  req.r.rtm_table = bmsg->table;
+  req.r.rtm_dst_len = bmsg->p.prefixlen;
+  req.r.rtm_protocol = RTPROT_ZEBRA;
+  req.r.rtm_scope = RT_SCOPE_UNIVERSE;
+
+  addattr_l (&req.n, sizeof req, RTA_DST, &bmsg->p.u.prefix,
+             bmsg->p.family == AF_INET ? 4 : 16);
+
+  if (netlink_batch_stats.enabled)
+    netlink_batch_add (&req.n, &bmsg->p);
+  else
+    netlink_talk (&req.n, &netlink_cmd);
+}
+
+/*
+ * Program the prefixes whose route messages have an unknown result
+ * again. The route selected in the RIB is reinstalled by rib_process(),
+ * and the route is deleted from the kernel if nothing is selected.
+ */
+static int
+netlink_batch_resync (struct thread *thread)
+{
+  struct list *resync_list = netlink_batch_resync_list;
+  struct listnode *node, *nnode;
+  struct netlink_batch_msg *bmsg;
+  struct route_node *rn;
+  struct rib *rib;
+  char buf[INET6_ADDRSTRLEN + 5];
+
+  netlink_batch_resync_thread = NULL;
+  netlink_batch_resync_list = NULL;
+
+  for (ALL_LIST_ELEMENTS (resync_list, node, nnode, bmsg))
+    {
+      if (IS_ZEBRA_DEBUG_KERNEL)
+        {
+          prefix2str (&bmsg->p, buf, sizeof buf);
+          zlog_debug ("netlink_batch_resync: %s prefix %s",
+                      netlink_cmd.name, buf);
+        }
+
+      netlink_batch_stats.resyncs++;
+      rn = netlink_batch_route_lookup (&bmsg->p, &rib);
+      if (rib && rib->type != ZEBRA_ROUTE_KERNEL
+          && rib->type != ZEBRA_ROUTE_CONNECT)
+        {
+          netlink_batch_rib_unset_fib (rib);
+#ifdef ENABLE_OVSDB
+          rib_queue_add (&zebrad, rn);
+#endif
+        }
+      else
+        netlink_batch_route_delete (bmsg);
+
+      if (rn)
+        route_unlock_node (rn);
+
+      XFREE (MTYPE_TMP, bmsg);
+    }
+
+  list_delete (resync_list);
+
+  return 0;
+}
+
+/*
+ * The result of the route message is unknown. Unless a newer message for
+ * the prefix is in flight, schedule a resync of the prefix.
+ */
+static void
+netlink_batch_route_unknown (struct netlink_batch_msg *bmsg)
+{
+  struct listnode *node;
+  struct netlink_batch_msg *pending;
+
+  if (netlink_batch_prefix_pending (&bmsg->p))
+    return;
+
+  if (!netlink_batch_resync_list)
+    netlink_batch_resync_list = list_new ();
+
+  for (ALL_LIST_ELEMENTS_RO (netlink_batch_resync_list, node, pending))
+    if (prefix_same (&pending->p, &bmsg->p))
+      return;
+
+  pending = XMALLOC (MTYPE_TMP, sizeof (struct netlink_batch_msg));
+  *pending = *bmsg;
+  listnode_add (netlink_batch_resync_list, pending);
+
+  if (!netlink_batch_resync_thread)
+    netlink_batch_resync_thread =
+        thread_add_event (zebrad.master, netlink_batch_resync, NULL, 0);
+}
+
+/* Complete the oldest route message with the kernel result 'errnum'. */
+static void
+netlink_batch_complete (int errnum)
+{
+  struct netlink_batch_msg *bmsg = &netlink_batch_msgs[netlink_batch_head];
+  char buf[INET6_ADDRSTRLEN + 5];
+
+  netlink_batch_head = (netlink_batch_head + 1) % NL_BATCH_MAX_INFLIGHT;
+  netlink_batch_count--;
+
+  if (errnum == 0)
+    {
+      netlink_batch_stats.acks++;
+      return;
+    }
+
+  prefix2str (&bmsg->p, buf, sizeof buf);
+
+  if (errnum == NL_BATCH_ERR_UNKNOWN)
+    {
+      netlink_batch_stats.unknown++;
+      if (IS_ZEBRA_DEBUG_KERNEL)
+        zlog_debug ("%s: acknowledgement lost, type=%s(%u), seq=%u, "
+                    "prefix %s", netlink_cmd.name,
+                    lookup (nlmsg_str, bmsg->cmd), bmsg->cmd, bmsg->seq, buf);
+      netlink_batch_route_unknown (bmsg);
+      return;
+    }
+
+  /* Deal with errors that occur because of races in link handling */
+  if ((bmsg->cmd == RTM_DELROUTE && (errnum == ENODEV || errnum == ESRCH))
+      || (bmsg->cmd == RTM_NEWROUTE && errnum == EEXIST))
+    {
+      netlink_batch_stats.acks++;
+      if (IS_ZEBRA_DEBUG_KERNEL)
+        zlog_debug ("%s: error: %s type=%s(%u), seq=%u, prefix %s",
+                    netlink_cmd.name, safe_strerror (errnum),
+                    lookup (nlmsg_str, bmsg->cmd), bmsg->cmd, bmsg->seq, buf);
+      return;
+    }
+
+  netlink_batch_stats.errors++;
+  zlog_err ("%s error: %s, type=%s(%u), seq=%u, prefix %s",
+            netlink_cmd.name, safe_strerror (errnum),
+            lookup (nlmsg_str, bmsg->cmd), bmsg->cmd, bmsg->seq, buf);
+
+  if (bmsg->cmd == RTM_NEWROUTE)
+    netlink_batch_route_failed (bmsg);
+}
+
+/*
+ * Complete the route message acknowledged by 'err'. The kernel processes
+ * and acknowledges the messages of a batch in order, so the result of a
+ * message older than the acknowledged one, whose acknowledgement was not
+ * seen, is unknown.
+ */
+static void
+netlink_batch_ack (struct nlmsgerr *err)
+{
+  while (netlink_batch_count > netlink_batch_queued &&
+         (int32_t) (netlink_batch_msgs[netlink_batch_head].seq -
+                    err->msg.nlmsg_seq) < 0)
+    netlink_batch_complete (NL_BATCH_ERR_UNKNOWN);
+
+  if (netlink_batch_count > netlink_batch_queued &&
+      netlink_batch_msgs[netlink_batch_head].seq == err->msg.nlmsg_seq)
+    netlink_batch_complete (-err->error);
+}
+
+/*
+ * Read the acknowledgements of the route messages sent to the kernel. If
+ * 'wait' is set, block until all of them have been acknowledged.
+ */
+static void
+netlink_batch_read_acks (int wait)
+{
+  int status;
+  struct nlmsghdr *h;
+  char buf[NL_PKT_BUF_SIZE];
+  struct iovec iov = {
+    .iov_base = buf,
+    .iov_len = sizeof buf
+  };
+  struct sockaddr_nl snl;
+  struct msghdr msg = {
+    .msg_name = (void *) &snl,
+    .msg_namelen = sizeof snl,
+    .msg_iov = &iov,
+    .msg_iovlen = 1
+  };
+
+  while (netlink_batch_count > netlink_batch_queued)
+    {
+      status = recvmsg (netlink_cmd.sock, &msg, wait ? 0 : MSG_DONTWAIT);
+      if (status < 0)
+        {
+          if (errno == EINTR)
+            continue;
+          if (errno == EWOULDBLOCK || errno == EAGAIN)
+            break;
+
+          /*
+           * The acknowledgements were dropped by the kernel, so the
+           * result of the messages sent so far is unknown.
+           */
+          netlink_batch_stats.overruns++;
+          zlog (NULL, LOG_ERR, "%s recvmsg overrun: %s, %d route messages "
+                "not acknowledged", netlink_cmd.name, safe_strerror (errno),
+                netlink_batch_count - netlink_batch_queued);
+          while (netlink_batch_count > netlink_batch_queued)
+            netlink_batch_complete (NL_BATCH_ERR_UNKNOWN);
+          break;
+        }
+
+      if (status == 0)
+        {
+          zlog (NULL, LOG_ERR, "%s EOF", netlink_cmd.name);
+          break;
+        }
+
+      /*
+       * Only the header of the original message is needed from an error
+       * message, so a truncated error message is still usable. Any other
+       * truncated reply is dropped, and the acknowledgements it hid are
+       * found missing when the next one is read.
+       */
+      if (msg.msg_flags & MSG_TRUNC)
+        {
+          netlink_batch_stats.overruns++;
+          h = (struct nlmsghdr *) buf;
+          if ((unsigned int) status >= NLMSG_LENGTH (sizeof (struct nlmsgerr))
+              && h->nlmsg_type == NLMSG_ERROR)
+            netlink_batch_ack ((struct nlmsgerr *) NLMSG_DATA (h));
+          else
+            zlog (NULL, LOG_ERR, "%s recvmsg truncated reply, %d bytes",
+                  netlink_cmd.name, status);
+          continue;
+        }
+
+      for (h = (struct nlmsghdr *) buf; NLMSG_OK (h, (unsigned int) status);
+           h = NLMSG_NEXT (h, status))
+        {
+          if (h->nlmsg_type != NLMSG_ERROR)
+            {
+              netlink_talk_filter (&snl, h);
+              continue;
+            }
+
+          netlink_batch_ack ((struct nlmsgerr *) NLMSG_DATA (h));
+        }
+    }
+}
+
+static int
+netlink_batch_ack_read (struct thread *thread)
+{
+  netlink_batch_ack_thread = NULL;
+
+  netlink_batch_read_acks (0);
+
+  if (netlink_batch_count > netlink_batch_queued)
+    netlink_batch_ack_thread =
+        thread_add_read (zebrad.master, netlink_batch_ack_read, NULL,
+                         netlink_cmd.sock);
+
+  return 0;
+}
+
+/* Send the route messages in the batch buffer to the kernel. */
+static void
+netlink_batch_send (void)
+{
+  int status;
+  int save_errno;
+  int queued = netlink_batch_queued;
+  struct sockaddr_nl snl;
+  struct iovec iov = {
+    .iov_base = (void *) netlink_batch_buf,
+    .iov_len = netlink_batch_len
+  };
+  struct msghdr msg = {
+    .msg_name = (void *) &snl,
+    .msg_namelen = sizeof snl,
+    .msg_iov = &iov,
+    .msg_iovlen = 1,
+  };
+
+  if (!queued)
+    return;
+
+  memset (&snl, 0, sizeof snl);
+  snl.nl_family = AF_NETLINK;
+
+  if (IS_ZEBRA_DEBUG_KERNEL)
+    zlog_debug ("netlink_batch_send: %s %d route messages, %zu bytes",
+                netlink_cmd.name, queued, netlink_batch_len);
+
+  if (zserv_privs.change (ZPRIVS_RAISE))
+    zlog (NULL, LOG_ERR, "Can't raise privileges");
+  status = sendmsg (netlink_cmd.sock, &msg, 0);
+  save_errno = errno;
+  if (zserv_privs.change (ZPRIVS_LOWER))
+    zlog (NULL, LOG_ERR, "Can't lower privileges");
+
+  netlink_batch_len = 0;
+
+  if (status < 0)
+    {
+      zlog (NULL, LOG_ERR, "netlink_batch_send sendmsg() error: %s",
+            safe_strerror (save_errno));
+      netlink_batch_stats.send_failures++;
+
+      /*
+       * Complete the messages sent earlier before failing the messages
+       * of this batch, which are the newest in the ring.
+       */
+      netlink_batch_read_acks (1);
+      netlink_batch_queued = 0;
+      while (netlink_batch_count)
+        netlink_batch_complete (save_errno);
+      return;
+    }
+
+  netlink_batch_queued = 0;
+  netlink_batch_stats.batches++;
+  netlink_batch_stats.messages += queued;
+  if ((unsigned int) queued > netlink_batch_stats.max_batch_messages)
+    netlink_batch_stats.max_batch_messages = queued;
+
+  if (!netlink_batch_ack_thread)
+    netlink_batch_ack_thread =
+        thread_add_read (zebrad.master, netlink_batch_ack_read, NULL,
+                         netlink_cmd.sock);
+}
+
+static int
+netlink_batch_flush_timer (struct thread *thread)
+{
+  netlink_batch_flush_thread = NULL;
+  netlink_batch_send ();
+
+  return 0;
+}
+
+/* Send the route messages queued in the batch buffer right away. */
+void
+netlink_batch_flush (void)
+{
+  THREAD_OFF (netlink_batch_flush_thread);
+  netlink_batch_send ();
+}
+
+/*
+ * Send the queued route messages and wait for all of them to be
+ * acknowledged. This must be done before the command socket is used for
+ * a synchronous request, since the request reads the first reply on the
+ * socket as its own.
+ */
+void
+netlink_batch_sync (void)
+{
+  if (!netlink_batch_count)
+    return;
+
+  netlink_batch_flush ();
+  netlink_batch_read_acks (1);
+  THREAD_OFF (netlink_batch_ack_thread);
+}
+
+/* Queue a route message to the batch buffer. */
+static int
+netlink_batch_add (struct nlmsghdr *n, struct prefix *p)
+{
+  struct netlink_batch_msg *bmsg;
+
+  if (netlink_batch_queued >= NL_BATCH_MAX_MSGS ||
+      NLMSG_ALIGN (n->nlmsg_len) > NL_BATCH_BUF_SIZE - netlink_batch_len)
+    netlink_batch_flush ();
+
+  /* Bound the number of route messages waiting for the kernel */
+  if (netlink_batch_count >= NL_BATCH_MAX_INFLIGHT)
+    {
+      netlink_batch_flush ();
+      netlink_batch_read_acks (1);
+    }
+
+  n->nlmsg_seq = ++netlink_cmd.seq;
+
+  /* Request an acknowledgement by setting NLM_F_ACK */
+  n->nlmsg_flags |= NLM_F_ACK;
+
+  if (IS_ZEBRA_DEBUG_KERNEL)
+    zlog_debug ("netlink_batch_add: %s type %s(%u), seq=%u",
+                netlink_cmd.name, lookup (nlmsg_str, n->nlmsg_type),
+                n->nlmsg_type, n->nlmsg_seq);
+
+  memcpy (netlink_batch_buf + netlink_batch_len, n, n->nlmsg_len);
+  netlink_batch_len += NLMSG_ALIGN (n->nlmsg_len);
+
+  bmsg = &netlink_batch_msgs[(netlink_batch_head + netlink_batch_count) %
+                             NL_BATCH_MAX_INFLIGHT];
+  bmsg->seq = n->nlmsg_seq;
+  bmsg->cmd = n->nlmsg_type;
+  bmsg->table = ((struct rtmsg *) NLMSG_DATA (n))->rtm_table;
+  prefix_copy (&bmsg->p, p);
+  netlink_batch_count++;
+  netlink_batch_queued++;
+
+  if (!netlink_batch_flush_thread)
+    netlink_batch_flush_thread =
+        thread_add_timer_msec (zebrad.master, netlink_batch_flush_timer,
+                               NULL, NL_BATCH_FLUSH_MSEC);
+
+  return 0;
+}
+
+/*
+ * Enable or disable the batched route programming. When it is disabled,
+ * the route messages in flight are completed before returning.
+ */
+void
+netlink_batch_set_enabled (int enable)
+{
+  if (!enable)
+    netlink_batch_sync ();
+
+  netlink_batch_stats.enabled = enable;
+}
+
 /* Routing table change via netlink interface. */
 static int
 netlink_route (int cmd, int family, void *dest, int length, void *gate,
@@ -2228,6 +2821,10 @@ skip:
   memset (&snl, 0, sizeof snl);
   snl.nl_family = AF_NETLINK;
 
+  /* Queue the message to the batch, the kernel result comes later */
+  if (netlink_batch_stats.enabled)
+    return netlink_batch_add (&req.n, p);
+
   /* Talk to netlink socket. */
   return netlink_talk (&req.n, &netlink_cmd);
 }
@@ -40,6 +40,32 @@ nl_msg_type_to_str (uint16_t msg_type);
 extern const char *
 nl_rtproto_to_str (u_char rtproto);
 
+/* Statistics of the batched route programming */
+struct netlink_batch_stats
+{
+  int enabled;                            /* Batch mode is enabled */
+  unsigned long long batches;             /* Batches sent to the kernel */
+  unsigned long long messages;            /* Route messages sent in batches */
+  unsigned long long acks;                /* Route messages acknowledged */
+  unsigned long long errors;              /* Route messages failed */
+  unsigned long long send_failures;       /* Batches failed to send */
+  unsigned long long overruns;            /* Acknowledgement reads overrun */
+  unsigned long long unknown;             /* Acknowledgements lost */
+  unsigned long long resyncs;             /* Prefixes resynced */
+  unsigned int max_batch_messages;        /* Largest batch in messages */
+};
+
+extern struct netlink_batch_stats netlink_batch_stats;
+
+extern void
+netlink_batch_set_enabled (int enable);
+
+extern void
+netlink_batch_flush (void);
+
+extern void
+netlink_batch_sync (void);
+
 
 #endif /* HAVE_NETLINK */
 
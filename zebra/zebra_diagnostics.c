@@ -30,6 +30,9 @@
 #include "openvswitch/vlog.h"
 #include "zebra/rib.h"
 #include "zebra/rt.h"
+#ifdef HAVE_NETLINK
+#include "zebra/rt_netlink.h"
+#endif /* HAVE_NETLINK */
 #include "vswitch-idl.h"
 #include "openswitch-idl.h"
 #include "zebra/zebra_ovsdb_if.h"
@@ -176,7 +179,9 @@ parse_diag_dump_options(int argc, const char *argv[], char *return_status,
   if (strcmp("rib", argv[1]) &&
       strcmp("kernel-routes", argv[1]) &&
       strcmp("l3-port-cache", argv[1]) &&
-      strcmp("memory", argv[1]))
+      strcmp("memory", argv[1]) &&
+      strcmp("txn", argv[1]) &&
+      strcmp("route-pipeline", argv[1]))
     {
       sprintf(return_status, "Argument %s not supported", argv[1]);
       return 1;
@@ -290,6 +295,66 @@ zebra_memory_dump(struct ds *ds)
                                count * sizeof (rib_table_info_t)));
 }
 
+/*
+ * This function prints the batching and commit latency statistics of the
+ * route update transactions committed to OVSDB.
+ */
+static void
+zebra_txn_stats_dump(struct ds *ds)
+{
+  if(!ds)
+    {
+      VLOG_ERR("Invalid Entry\n");
+      return;
+    }
+
+  ds_put_format (ds, "Batch size target: %d rows\n",
+                 zebra_txn_stats.batch_rows_target);
+  ds_put_format (ds, "Last batch size: %d rows, max batch size: %d rows\n",
+                 zebra_txn_stats.last_batch_rows,
+                 zebra_txn_stats.max_batch_rows);
+  ds_put_format (ds, "Transactions committed: %llu, completed: %llu, "
+                 "rows committed: %llu\n", zebra_txn_stats.commits,
+                 zebra_txn_stats.completed, zebra_txn_stats.rows_committed);
+  ds_put_format (ds, "Transactions retried: %llu, dropped: %llu\n",
+                 zebra_txn_stats.retries, zebra_txn_stats.failures);
+  ds_put_format (ds, "Selected writes collapsed: %llu, suppressed: %llu\n",
+                 zebra_txn_stats.selected_writes_collapsed,
+                 zebra_txn_stats.selected_writes_suppressed);
+  ds_put_format (ds, "Commit latency: last %lld msec, max %lld msec, "
+                 "average %lld msec\n",
+                 zebra_txn_stats.last_commit_latency_msec,
+                 zebra_txn_stats.max_commit_latency_msec,
+                 zebra_txn_stats.completed ?
+                   (zebra_txn_stats.total_commit_latency_msec /
+                    (long long int)zebra_txn_stats.completed) : 0);
+}
+
+/*
+ * This function prints the state and the statistics of the OVSDB to RIB
+ * route pipeline.
+ */
+static void
+zebra_route_pipeline_stats_dump(struct ds *ds)
+{
+  if(!ds)
+    {
+      VLOG_ERR("Invalid Entry\n");
+      return;
+    }
+
+  ds_put_format (ds, "Route pipeline mode: %s\n",
+                 zebra_route_pipeline_stats.enabled ? "enabled" : "disabled");
+  ds_put_format (ds, "Routes submitted: %llu, parsed: %llu, invalid: %llu, "
+                 "linked: %llu\n", zebra_route_pipeline_stats.submitted,
+                 zebra_route_pipeline_stats.parsed,
+                 zebra_route_pipeline_stats.invalid,
+                 zebra_route_pipeline_stats.linked);
+  ds_put_format (ds, "Pipeline flushes: %llu, max backlog: %llu routes\n",
+                 zebra_route_pipeline_stats.flushes,
+                 zebra_route_pipeline_stats.max_backlog);
+}
+
 /*
  * Helper function to dump various zebra diagnostics, depending on the dump_option
  * passed.
@@ -333,6 +398,20 @@ zebrad_internals_dump(struct ds *ds, const char *dump_option)
       zebra_dump_formatted_string(ds, "\n-------- Zebra memory dump: --------\n");
       zebra_memory_dump(ds);
     }
+
+  if (!dump_option || !strcmp(dump_option, "txn"))
+    {
+      zebra_dump_formatted_string(ds, "\n-------- Zebra OVSDB transaction "
+                                  "dump: --------\n");
+      zebra_txn_stats_dump(ds);
+    }
+
+  if (!dump_option || !strcmp(dump_option, "route-pipeline"))
+    {
+      zebra_dump_formatted_string(ds, "\n-------- Zebra route pipeline "
+                                  "dump: --------\n");
+      zebra_route_pipeline_stats_dump(ds);
+    }
 }
 
 /* Callback handler function for dumping basic diagnostics for ops-zebra daemon.
@@ -472,6 +551,82 @@ zebra_unixctl_set_debug_level (struct unixctl_conn *conn, int argc OVS_UNUSED,
     unixctl_command_reply(conn, return_status);
 }
 
+/*
+ * ovs appctl function to display, enable or disable the OVSDB to RIB
+ * route pipeline mode.
+ */
+static void
+zebra_unixctl_route_pipeline (struct unixctl_conn *conn, int argc,
+                              const char *argv[], void *aux OVS_UNUSED)
+{
+  struct ds ds = DS_EMPTY_INITIALIZER;
+  char return_status[MAX_PROMPT_MSG_STR_LEN] = "";
+
+  if (argc > 1)
+    {
+      if (!strcmp(argv[1], "enable"))
+        zebra_route_pipeline_set_enabled(true);
+      else if (!strcmp(argv[1], "disable"))
+        zebra_route_pipeline_set_enabled(false);
+      else
+        {
+          sprintf(return_status, "Unsupported argument - %s", argv[1]);
+          unixctl_command_reply_error(conn, return_status);
+          return;
+        }
+    }
+
+  zebra_route_pipeline_stats_dump(&ds);
+  unixctl_command_reply(conn, ds_cstr(&ds));
+  ds_destroy(&ds);
+}
+
+#ifdef HAVE_NETLINK
+/*
+ * ovs appctl function to display, enable or disable the batched
+ * programming of the kernel routes.
+ */
+static void
+zebra_unixctl_netlink_batch (struct unixctl_conn *conn, int argc,
+                             const char *argv[], void *aux OVS_UNUSED)
+{
+  struct ds ds = DS_EMPTY_INITIALIZER;
+  char return_status[MAX_PROMPT_MSG_STR_LEN] = "";
+
+  if (argc > 1)
+    {
+      if (!strcmp(argv[1], "enable"))
+        netlink_batch_set_enabled(1);
+      else if (!strcmp(argv[1], "disable"))
+        netlink_batch_set_enabled(0);
+      else
+        {
+          sprintf(return_status, "Unsupported argument - %s", argv[1]);
+          unixctl_command_reply_error(conn, return_status);
+          return;
+        }
+    }
+
+  ds_put_format (&ds, "Netlink batch mode: %s\n",
+                 netlink_batch_stats.enabled ? "enabled" : "disabled");
+  ds_put_format (&ds, "Batches sent: %llu, route messages: %llu, "
+                 "max batch size: %u\n", netlink_batch_stats.batches,
+                 netlink_batch_stats.messages,
+                 netlink_batch_stats.max_batch_messages);
+  ds_put_format (&ds, "Route messages acknowledged: %llu, failed: %llu, "
+                 "batch send failures: %llu\n", netlink_batch_stats.acks,
+                 netlink_batch_stats.errors,
+                 netlink_batch_stats.send_failures);
+  ds_put_format (&ds, "Acknowledgement overruns: %llu, acknowledgements "
+                 "lost: %llu, prefixes resynced: %llu\n",
+                 netlink_batch_stats.overruns, netlink_batch_stats.unknown,
+                 netlink_batch_stats.resyncs);
+
+  unixctl_command_reply(conn, ds_cstr(&ds));
+  ds_destroy(&ds);
+}
+#endif /* HAVE_NETLINK */
+
 /* This function is invoked on appctl exit command to stop the daemon
  */
 static void
@@ -505,11 +660,18 @@ zebra_diagnostics_init()
   INIT_DIAG_DUMP_BASIC(zebra_diag_dump_basic_cb);
 
    /* Register ovs-appctl commands for this daemon. */
-  unixctl_command_register("zebra/dump", "rib|kernel-routes|l3-port-cache|memory",
-                           0, 1, zebra_unixctl_diag_dump, NULL);
+  unixctl_command_register("zebra/dump", "rib|kernel-routes|l3-port-cache|memory"
+                           "|txn|route-pipeline", 0, 1,
+                           zebra_unixctl_diag_dump, NULL);
   unixctl_command_register("zebra/debug", "event|packet|send|recv|detail|kernel"
                            "|rib|ribq|fpm|all|show|off", 1, 1,
                            zebra_unixctl_set_debug_level, NULL);
+  unixctl_command_register("zebra/route-pipeline", "[enable|disable]", 0, 1,
+                           zebra_unixctl_route_pipeline, NULL);
+#ifdef HAVE_NETLINK
+  unixctl_command_register("zebra/netlink-batch", "[enable|disable]", 0, 1,
+                           zebra_unixctl_netlink_batch, NULL);
+#endif /* HAVE_NETLINK */
 }
 
 /*
@@ -21,6 +21,7 @@
  */
 
 #include <zebra.h>
+#include <pthread.h>
 
 #include <lib/version.h>
 #include "getopt.h"
@@ -45,6 +46,7 @@
 #include "vswitch-idl.h"
 #include "uuid.h"
 #include "coverage.h"
+#include "sset.h"
 #include "hash.h"
 #include "jhash.h"
 #include "eventlog.h"
@@ -69,6 +71,15 @@ static zebra_ovsdb_t glob_zebra_ovs;
 extern struct zebra_t zebrad;
 
 COVERAGE_DEFINE(zebra_ovsdb_cnt);
+COVERAGE_DEFINE(zebra_route_rows_visited);
+COVERAGE_DEFINE(zebra_route_delta_delete);
+COVERAGE_DEFINE(zebra_route_full_reconcile);
+COVERAGE_DEFINE(zebra_txn_commit);
+COVERAGE_DEFINE(zebra_txn_retry);
+COVERAGE_DEFINE(zebra_txn_failure);
+COVERAGE_DEFINE(zebra_selected_write_collapsed);
+COVERAGE_DEFINE(zebra_selected_write_suppressed);
+COVERAGE_DEFINE(zebra_port_event_route_nodes_visited);
 VLOG_DEFINE_THIS_MODULE(zebra_ovsdb_if);
 
 struct ovsdb_idl *idl;
@@ -80,6 +91,89 @@ static struct ovsdb_idl_txn *zebra_txn = NULL;
 bool zebra_txn_updates = false;
 int  zebra_txn_count = 0;
 
+/*
+ * Number of row updates pending in the open transaction and the time
+ * at which the first of them was added.
+ */
+static int zebra_txn_pending_rows = 0;
+static long long int zebra_txn_open_msec = 0;
+
+/* Number of times the updates in the open transaction have been retried */
+static int zebra_txn_open_retries = 0;
+
+/*
+ * Journal of the selected flag updates done in the open transaction.
+ * The hashes are keyed by the route/next-hop row UUID string and the
+ * data is the final selected value for the row. The journal acts as a
+ * dirty set: repeated selected/unselected transitions of a row collapse
+ * into one entry, and only the final value is written into the row when
+ * the transaction is committed. The journal is also replayed into a new
+ * transaction in case the commit fails.
+ */
+static struct shash zebra_txn_route_journal =
+                             SHASH_INITIALIZER(&zebra_txn_route_journal);
+static struct shash zebra_txn_nexthop_journal =
+                             SHASH_INITIALIZER(&zebra_txn_nexthop_journal);
+
+/*
+ * Journal of the next-hops removed from routes in the open transaction.
+ * The hash is keyed by the route row UUID string and the data is an sset
+ * of the UUID strings of the next-hops removed from the route. A route
+ * left without next-hops is deleted, both in the open transaction and
+ * when the journal is replayed.
+ */
+static struct shash zebra_txn_nexthop_delete_journal =
+                      SHASH_INITIALIZER(&zebra_txn_nexthop_delete_journal);
+
+/*
+ * The rows inserted in a transaction have no stable UUID until OVSDB
+ * replies, so they cannot be replayed from a journal. Instead, the open
+ * transaction records which zebra caches its inserts and updates were
+ * derived from, and if the commit fails, the rows are rebuilt from these
+ * caches.
+ */
+#define ZEBRA_TXN_RESYNC_CONNECTED_ROUTES    0x01
+#define ZEBRA_TXN_RESYNC_ROUTER_ID           0x02
+
+static unsigned int zebra_txn_open_resync = 0;
+
+/*
+ * Rebuilds requested by the failed transactions. These are run once no
+ * committed transaction with rows from the same caches is waiting for
+ * the OVSDB reply, so that the rows inserted by the in-flight
+ * transactions are not inserted twice.
+ */
+static unsigned int zebra_txn_resync_pending = 0;
+static int zebra_txn_resync_pending_retries = 0;
+
+/* Number of times the rows being rebuilt have been retried */
+static int zebra_txn_resync_retries = 0;
+
+/*
+ * A committed route update transaction waiting for the OVSDB reply. If
+ * the commit fails, 'txn' is NULL and the journal is replayed after the
+ * next IDL run.
+ */
+struct zebra_txn_inflight
+{
+  struct ovsdb_idl_txn *txn;
+  long long int commit_msec;
+  int rows;
+  int retries;
+  unsigned int resync;
+  struct shash route_journal;
+  struct shash nexthop_journal;
+  struct shash nexthop_delete_journal;
+};
+
+/* List of the committed transactions waiting for the OVSDB reply */
+static struct list *zebra_txn_inflight_list = NULL;
+
+struct zebra_txn_stats zebra_txn_stats =
+{
+  .batch_rows_target = ZEBRA_TXN_BATCH_ROWS_INITIAL,
+};
+
 /*
  * Keep track if we are executing the reconfigure loop for
  * the first time.
@@ -98,7 +192,25 @@ static struct hash *zebra_route_hash;
 /* List of delete route */
 struct list *zebra_route_del_list;
 
+/* Timer thread for the periodic route consistency check */
+static struct thread *zebra_route_consistency_check_thread = NULL;
+
 static int zebra_ovspoll_enqueue (zebra_ovsdb_t *zovs_g);
+static void zebra_txn_mark_updated (void);
+static void zebra_txn_mark_resync (unsigned int resync);
+static void zebra_txn_record_nexthops_delete (const struct ovsrec_route *route,
+                                              const bool *nexthop_decision);
+static const bool *zebra_txn_get_route_selected (
+                                   const struct ovsrec_route *route);
+static const bool *zebra_txn_get_nexthop_selected (
+                                   const struct ovsrec_nexthop *nexthop);
+static void zebra_txn_set_route_selected (const struct ovsrec_route *route,
+                                          bool selected);
+static void zebra_txn_set_nexthop_selected (
+                                   const struct ovsrec_nexthop *nexthop,
+                                   bool selected);
+static void zebra_txn_run_inflight (void);
+static void zebra_route_pipeline_flush (void);
 static int zovs_read_cb (struct thread *thread);
 int zebra_add_route (bool is_ipv6, struct prefix *p, int type, safi_t safi,
                      const struct ovsrec_route *route);
@@ -253,6 +365,14 @@ struct shash zebra_cached_l3_ports;
  */
 struct shash zebra_updated_or_changed_l3_ports;
 
+/*
+ * Prefix tries of the subnets configured on the cached L3 ports, one per
+ * address family. The route node info is a 'struct sset' of the names of
+ * the L3 ports having an IP/IPv6 address in the subnet. The tries are used
+ * to resolve a next-hop address to its L3 port by longest prefix match.
+ */
+static struct route_table *zebra_l3_port_subnet_table[AFI_MAX];
+
 /*
  * This hash table stores the connected routes were programmed
  * by the zebra process in the previous incarnation. This hash table
@@ -276,6 +396,37 @@ bool zebra_if_port_active_state_changed;
  */
 bool zebra_if_port_updated_or_changed;
 
+/*
+ * The OVSDB next-hop rows do not carry a reference back to the route
+ * rows which use them, and a next-hop row can be shared by the routes
+ * of several prefixes. 'zebra_nexthop_to_route_hash' maps the UUID
+ * string of a next-hop row to a 'struct shash' of the route rows
+ * referencing it, keyed by the route UUID string, with a
+ * 'struct zebra_nexthop_route_entry' holding the route key programmed
+ * in the local RIB as data. 'zebra_route_to_nexthop_hash' maps the UUID
+ * string of a route row to a 'struct shash' of the same entries keyed by
+ * the next-hop UUID string, and owns them. A tracked change or deletion
+ * of a route or next-hop row is resolved through them without walking
+ * the route table or the local RIB.
+ */
+struct shash zebra_nexthop_to_route_hash;
+struct shash zebra_route_to_nexthop_hash;
+
+/*
+ * Reverse index from the L3 ports to the static routes resolving through
+ * them. 'zebra_l3_port_route_index' maps an L3 port name to a 'struct sset'
+ * of the prefix strings of the static routes having a next-hop on the port
+ * or in one of the port subnets. 'zebra_route_l3_port_index' maps a prefix
+ * string back to a 'struct sset' of the port names, so that the entries of
+ * a route can be removed when the route is re-resolved. The prefixes in
+ * 'zebra_l3_port_route_unresolved' are revisited on every port event; these
+ * are the newly added static routes and the routes with next-hops which are
+ * not in any of the L3 port subnets.
+ */
+struct shash zebra_l3_port_route_index;
+struct shash zebra_route_l3_port_index;
+struct sset zebra_l3_port_route_unresolved;
+
 /*
  * This function initializes all the L3 port nodes in the
  * L3 port hash to the desired port action.
@@ -859,6 +1010,107 @@ static void
 zebra_init_cached_l3_ports_hash (void)
 {
   shash_init(&zebra_cached_l3_ports);
+  zebra_l3_port_subnet_table[AFI_IP] = route_table_init();
+  zebra_l3_port_subnet_table[AFI_IP6] = route_table_init();
+}
+
+/*
+ * This function adds or removes the L3 port 'port_name' for the subnet of
+ * the IP/IPv6 address 'address' in the L3 port subnet trie.
+ */
+static void
+zebra_l3_port_subnet_update (const char *address, const char *port_name,
+                             bool if_add)
+{
+  struct route_table *table;
+  struct route_node *rn;
+  struct sset *ports;
+  struct prefix p;
+
+  if (!address || !port_name)
+    return;
+
+  memset(&p, 0, sizeof(struct prefix));
+  if (!str2prefix(address, &p))
+    {
+      VLOG_ERR("The conversion from address string to prefix structure "
+               "for address %s failed", address);
+      return;
+    }
+
+  apply_mask(&p);
+
+  table = zebra_l3_port_subnet_table[(p.family == AF_INET) ? AFI_IP
+                                                           : AFI_IP6];
+  if (!table)
+    return;
+
+  if (if_add)
+    {
+      rn = route_node_get(table, &p);
+
+      /*
+       * Keep one lock on the node for as long as it has info.
+       */
+      if (rn->info)
+        route_unlock_node(rn);
+      else
+        {
+          ports = xmalloc(sizeof(struct sset));
+          sset_init(ports);
+          rn->info = ports;
+        }
+
+      sset_add(rn->info, port_name);
+      return;
+    }
+
+  rn = route_node_lookup(table, &p);
+  if (!rn)
+    return;
+
+  ports = rn->info;
+  if (ports)
+    {
+      sset_find_and_delete(ports, port_name);
+
+      if (sset_is_empty(ports))
+        {
+          sset_destroy(ports);
+          free(ports);
+          rn->info = NULL;
+          route_unlock_node(rn);
+        }
+    }
+
+  route_unlock_node(rn);
+}
+
+/*
+ * This function adds or removes all the subnets of the primary and
+ * secondary IP/IPv6 addresses of an L3 port in the L3 port subnet trie.
+ */
+static void
+zebra_l3_port_subnet_table_update (struct zebra_l3_port* l3_port,
+                                   bool if_add)
+{
+  struct shash_node *node;
+
+  if (!l3_port || !l3_port->port_name)
+    return;
+
+  zebra_l3_port_subnet_update(l3_port->ip4_address, l3_port->port_name,
+                              if_add);
+  zebra_l3_port_subnet_update(l3_port->ip6_address, l3_port->port_name,
+                              if_add);
+
+  SHASH_FOR_EACH (node, &(l3_port->ip4_address_secondary))
+    zebra_l3_port_subnet_update((char*)node->data, l3_port->port_name,
+                                if_add);
+
+  SHASH_FOR_EACH (node, &(l3_port->ip6_address_secondary))
+    zebra_l3_port_subnet_update((char*)node->data, l3_port->port_name,
+                                if_add);
 }
 
 /*
@@ -1333,7 +1585,7 @@ zebra_add_connected_route_into_ovsdb_route_table (
   /*
    * Publish this route update to OVSDB
    */
-  zebra_txn_updates = true;
+  zebra_txn_mark_resync(ZEBRA_TXN_RESYNC_CONNECTED_ROUTES);
   free(prefix_str);
 }
 
@@ -1438,7 +1690,7 @@ zebra_delete_connected_route_from_ovsdb_route_table (
   if (route_row->n_nexthops)
     ovsrec_nexthop_delete(route_row->nexthops[0]);
   ovsrec_route_delete(route_row);
-  zebra_txn_updates = true;
+  zebra_txn_mark_resync(ZEBRA_TXN_RESYNC_CONNECTED_ROUTES);
 
   /*
    * Free the prefix and route uuid.
@@ -1965,7 +2217,7 @@ zebra_update_selected_status_connected_routes_in_l3_port (
                    route_row->nexthops[0]->ports[0]->name,
                    selected ? "true":"false");
 
-          ovsrec_nexthop_set_selected(route_row->nexthops[0], &selected, 1);
+          zebra_txn_set_nexthop_selected(route_row->nexthops[0], selected);
           zebra_ovs_update_selected_route(route_row, &selected);
         }
     }
@@ -2031,7 +2283,7 @@ zebra_update_selected_status_connected_routes_in_l3_port (
                    route_row->nexthops[0]->ports[0]->name,
                    selected ? "true":"false");
 
-          ovsrec_nexthop_set_selected(route_row->nexthops[0], &selected, 1);
+          zebra_txn_set_nexthop_selected(route_row->nexthops[0], selected);
           zebra_ovs_update_selected_route(route_row, &selected);
         }
     }
@@ -2059,7 +2311,7 @@ zebra_update_or_program_connected_route_after_zebra_restart (
   struct ovsrec_route *route_row = NULL;
   struct shash* route_uuid_hash;
   bool selected;
-  bool nexthop_selected;
+  const bool *nexthop_selected;
 
   /*
    * Sanity check on the IP address
@@ -2165,14 +2417,15 @@ zebra_update_or_program_connected_route_after_zebra_restart (
        * from the L3 port state.
        */
       selected = l3_port->if_active;
-      nexthop_selected = route_row->nexthops[0]->selected[0];
+      nexthop_selected = zebra_txn_get_nexthop_selected(
+                                         route_row->nexthops[0]);
 
-      if (nexthop_selected != selected)
+      if (!nexthop_selected || (*nexthop_selected != selected))
         {
           VLOG_DBG("Updating the slected bit on next-hop port %s to %s",
                    route_row->nexthops[0]->ports[0]->name,
                    selected?"True":"False");
-          ovsrec_nexthop_set_selected(route_row->nexthops[0], &selected, 1);
+          zebra_txn_set_nexthop_selected(route_row->nexthops[0], selected);
         }
 
       VLOG_DBG("Updating the selected bit on the connected route %s",
@@ -2366,7 +2619,7 @@ zebra_walk_l3_cache_and_restore_connected_routes_after_zebra_restart ()
       if (route_row->n_nexthops)
         ovsrec_nexthop_delete(route_row->nexthops[0]);
       ovsrec_route_delete(route_row);
-      zebra_txn_updates = true;
+      zebra_txn_mark_resync(ZEBRA_TXN_RESYNC_CONNECTED_ROUTES);
 
       /*
        * Cleanup this entry from the connected route hash
@@ -2558,6 +2811,11 @@ zebra_add_or_update_cached_l3_ports_hash (const struct ovsrec_port* ovsrec_port)
         {
           VLOG_DBG("Added L3 port to the hash successfully");
 
+          /*
+           * Add the subnets on the port to the L3 port subnet trie.
+           */
+          zebra_l3_port_subnet_table_update(l3_port, true);
+
           log_event("ZEBRA_PORT", EV_KV("port_msg", "%s",
                     "L3 port added"),
                     EV_KV("port_name", "%s", ovsrec_port->name));
@@ -2615,10 +2873,13 @@ zebra_add_or_update_cached_l3_ports_hash (const struct ovsrec_port* ovsrec_port)
                     EV_KV("port_name", "%s", ovsrec_port->name));
 
           /*
-           * Update the L3 port action with new IP/IPv6 address.
+           * Update the L3 port action with new IP/IPv6 address. The
+           * subnets of the port are replaced in the L3 port subnet trie.
            */
+          zebra_l3_port_subnet_table_update(l3_port, false);
           zebra_update_l3_port_cache_and_connected_routes(ovsrec_port, &l3_port,
                                                           true);
+          zebra_l3_port_subnet_table_update(l3_port, true);
 
           /*
            * Since the port IPv4/IPv6 address changed, then update the L3
@@ -2687,6 +2948,11 @@ zebra_remove_deleted_cached_l3_ports_hash (void)
                                                     &zebra_cached_l3_ports,
                                                     l3_port->port_name);
 
+          /*
+           * Remove the subnets on the port from the L3 port subnet trie.
+           */
+          zebra_l3_port_subnet_table_update(l3_port, false);
+
           if (!shash_add(&zebra_updated_or_changed_l3_ports,
                          l3_port->port_name,
                          l3_port))
@@ -2790,21 +3056,19 @@ zebra_search_port_name_in_l3_ports_hash (struct shash* port_hash,
  * This function finds if an IP/IPv6 addresses ocurrs in some subnet
  * of the IP/IPv6 addresses in the port nodes in the port hash.
  * A pointer to the L3 port node is returned from this function. The
- * addresses family is specified by 'afi'.
+ * addresses family is specified by 'afi'. The subnet is found by a
+ * longest prefix match in the L3 port subnet trie.
  */
 struct zebra_l3_port*
 zebra_search_nh_addr_in_l3_ports_hash (struct shash* port_hash,
                                        char* nexthop_str, afi_t afi)
 {
-  struct shash_node *node, *next;
-  struct shash_node *secondary_node, *secondary_next;
   int ret;
-  bool if_next_hop_address_match_found;
-  char* ip4_secondary_address;
-  char* ip6_secondary_address;
   struct zebra_l3_port* l3_port = NULL;
   struct prefix nexthop_prefix;
-  struct prefix port_ip_addr_prefix;
+  struct route_table *table;
+  struct route_node *rn;
+  const char *port_name;
 
   if (!port_hash)
     {
@@ -2828,262 +3092,43 @@ zebra_search_nh_addr_in_l3_ports_hash (struct shash* port_hash,
                nexthop_str);
       return(NULL);
     }
-  else
-    {
-      VLOG_DBG("The conversion from nexthop string to "
-                "prefix structure for nexthop %s passed",
-                nexthop_str);
-
-      if_next_hop_address_match_found = false;
-      SHASH_FOR_EACH_SAFE (node, next, port_hash)
-        {
-          if (!node)
-            {
-              VLOG_ERR("No node found in the L3 port "
-                       "hash\n");
-              continue;
-            }
-
-          if (!(node->data))
-            {
-              VLOG_ERR("No data found in the node\n");
-              continue;
-            }
-
-          l3_port = (struct zebra_l3_port*)node->data;
-
-          memset(&port_ip_addr_prefix, 0,
-                                 sizeof(struct prefix));
-
-          if ((afi == AFI_IP) && !((l3_port->ip4_address) ||
-              (shash_count(&(l3_port->ip4_address_secondary)))))
-            {
-              VLOG_ERR("Mismatch between address family "
-                       "and IPv4 address");
-              continue;
-            }
-
-          if ((afi == AFI_IP6) && !((l3_port->ip6_address) ||
-                (shash_count(&(l3_port->ip6_address_secondary)))))
-            {
-                VLOG_ERR("Mismatch between address family "
-                         "and IPv6 address");
-                continue;
-            }
-
-           if ((afi == AFI_IP) && ((l3_port->ip4_address) ||
-                (shash_count(&(l3_port->ip4_address_secondary)))))
-            {
-              ret = str2prefix(l3_port->ip4_address,
-                                  &port_ip_addr_prefix);
-
-              if (!ret)
-                {
-                  VLOG_ERR("The conversion from ipv4 "
-                           "address string to prefix "
-                           "structure for nexthop %s "
-                           "failed", l3_port->ip4_address);
-                  continue;
-                }
-              else
-                {
-                  VLOG_DBG("The conversion from ipv4 "
-                           "address string to prefix "
-                           "structure for nexthop %s "
-                           "passed", l3_port->ip4_address);
-                }
-
-              if (prefix_match(&port_ip_addr_prefix,
-                               &nexthop_prefix))
-                {
-                  VLOG_DBG("Got a match for the ip4 address "
-                            "%s and nexthop ip %s",
-                            l3_port->ip4_address, nexthop_str);
-                  if_next_hop_address_match_found = true;
-                  break;
-                }
-              else
-                {
-                  VLOG_DBG("No match for the ip4 address "
-                           "%s and nexthop ip %s",
-                           l3_port->ip4_address, nexthop_str);
-                }
-
-              VLOG_DBG("Walking the IPv4 secondary address "
-                       "hash to find if the nexthop occurs "
-                       "secondary subnet");
-
-              SHASH_FOR_EACH_SAFE (
-                  secondary_node, secondary_next,
-                  &(l3_port->ip4_address_secondary))
-                {
-                  if (!secondary_node)
-                    {
-                      VLOG_ERR("No node found in the L3 "
-                               "port hash\n");
-                      continue;
-                    }
-
-                  if (!(secondary_node->data))
-                    {
-                      VLOG_ERR("No node data found\n");
-                      continue;
-                    }
-
-                  ip4_secondary_address =
-                                 (char*)secondary_node->data;
-
-                  ret = str2prefix(ip4_secondary_address,
-                                          &port_ip_addr_prefix);
-
-                  if (!ret)
-                    {
-                      VLOG_ERR("The conversion from ipv4 "
-                               "address string to prefix "
-                               "structure for nexthop %s "
-                               "failed",
-                               ip4_secondary_address);
-                      continue;
-                    }
-                  else
-                    {
-                      VLOG_DBG("The conversion from ipv4 "
-                                "address string to prefix "
-                                "structure for nexthop %s "
-                                "passed",
-                                ip4_secondary_address);
-                    }
-
-                  if (prefix_match(&port_ip_addr_prefix,
-                                   &nexthop_prefix))
-                    {
-                      VLOG_DBG("Got a match for the ip4 address "
-                                 "%s and nexthop ip %s",
-                                 ip4_secondary_address, nexthop_str);
-                       if_next_hop_address_match_found = true;
-                       break;
-                    }
-                  else
-                    {
-                      VLOG_DBG("No match for the ip4 address "
-                                "%s and nexthop ip %s",
-                                ip4_secondary_address, nexthop_str);
-                    }
-                }
-
-                if (if_next_hop_address_match_found)
-                  break;
-
-            }
-
-          if ((afi == AFI_IP6) && ((l3_port->ip6_address) ||
-              (shash_count(&(l3_port->ip6_address_secondary)))))
-            {
-              ret = str2prefix(l3_port->ip6_address,
-                               &port_ip_addr_prefix);
-
-              if (!ret)
-                {
-                  VLOG_ERR("The conversion from ipv6 "
-                           "address string to prefix "
-                           "structure for nexthop %s "
-                           "failed", l3_port->ip6_address);
-                  continue;
-                }
-              else
-                {
-                  VLOG_DBG("The conversion from ipv6 "
-                           "address string to prefix "
-                           "structure for nexthop %s "
-                           "passed", l3_port->ip6_address);
-                }
-
-              if (prefix_match(&port_ip_addr_prefix,
-                               &nexthop_prefix))
-                {
-                  VLOG_DBG("Got a match for the ip6 address "
-                           "%s and nexthop ip %s",
-                           l3_port->ip6_address, nexthop_str);
-                  if_next_hop_address_match_found = true;
-                  break;
-                }
-              else
-                {
-                  VLOG_DBG("No match for the ip6 address "
-                            "%s and nexthop ip %s",
-                            l3_port->ip6_address, nexthop_str);
-                }
-
-              VLOG_DBG("Walking the IPv6 secondary address "
-                        "hash to find if the nexthop occurs "
-                        "secondary subnet");
-
-              SHASH_FOR_EACH_SAFE (
-                  secondary_node, secondary_next,
-                  &(l3_port->ip6_address_secondary))
-                {
-                  if (!secondary_node)
-                    {
-                      VLOG_ERR("No node found in the L3 "
-                               "port hash\n");
-                      continue;
-                    }
-
-                  if (!(secondary_node->data))
-                    {
-                      VLOG_ERR("No node data found\n");
-                      continue;
-                    }
 
-                  ip6_secondary_address =
-                                     (char*)secondary_node->data;
+  VLOG_DBG("The conversion from nexthop string to "
+            "prefix structure for nexthop %s passed",
+            nexthop_str);
 
-                  ret = str2prefix(ip6_secondary_address,
-                                            &port_ip_addr_prefix);
+  if (((afi == AFI_IP) && (nexthop_prefix.family != AF_INET)) ||
+      ((afi == AFI_IP6) && (nexthop_prefix.family != AF_INET6)))
+    {
+      VLOG_ERR("Mismatch between address family and nexthop %s",
+               nexthop_str);
+      return(NULL);
+    }
 
-                  if (!ret)
-                    {
-                      VLOG_ERR("The conversion from ipv4 "
-                               "address string to prefix "
-                               "structure for nexthop %s "
-                               "failed",
-                               ip6_secondary_address);
-                      continue;
-                    }
-                  else
-                    {
-                      VLOG_DBG("The conversion from ipv4 "
-                               "address string to prefix "
-                               "structure for nexthop %s "
-                               "passed",
-                               ip6_secondary_address);
-                    }
+  table = zebra_l3_port_subnet_table[afi];
+  if (!table)
+    return(NULL);
 
-                  if (prefix_match(&port_ip_addr_prefix,
-                                         &nexthop_prefix))
-                    {
-                      VLOG_DBG("Got a match for the ip6 address "
-                               "%s and nexthop ip %s",
-                               ip6_secondary_address, nexthop_str);
-                      if_next_hop_address_match_found = true;
-                      break;
-                    }
-                  else
-                    {
-                      VLOG_DBG("No match for the ip6 address "
-                               "%s and nexthop ip %s",
-                               ip6_secondary_address, nexthop_str);
-                    }
-                }
+  rn = route_node_match(table, &nexthop_prefix);
+  if (!rn)
+    {
+      VLOG_DBG("No L3 port subnet found for nexthop %s", nexthop_str);
+      return(NULL);
+    }
 
-                if (if_next_hop_address_match_found)
-                  break;
-            }
+  SSET_FOR_EACH (port_name, (struct sset *)rn->info)
+    {
+      l3_port = (struct zebra_l3_port *)shash_find_data(port_hash,
+                                                        port_name);
+      if (l3_port)
+        {
+          VLOG_DBG("Got a match for the L3 port %s and nexthop ip %s",
+                   port_name, nexthop_str);
+          break;
         }
     }
 
-  if (!if_next_hop_address_match_found)
-    return(NULL);
+  route_unlock_node(rn);
 
   return(l3_port);
 }
@@ -3314,387 +3359,710 @@ zebra_update_port_active_state (const struct ovsrec_interface *interface)
 }
 
 /*
- * This function adds work for the quagga back-end thread to revisit
- * a static route in case its resolving next-hop has changed admin
- * state or the resolving IP/IPv6 address changes or gets deleted.
- * This function also handles the clean-up of static routes in case
- * the interface gets converted into L2 or the L3 interface gets
- * deleted.
+ * This function records the static route 'prefix_str' as depending on
+ * the L3 port 'port_name' in the L3 port reverse index.
  */
 static void
-zebra_find_routes_with_updated_ports_state (
-                        afi_t afi, safi_t safi, u_int32_t id,
-                        const char* cleanup_reason)
+zebra_l3_port_route_index_add (const char *port_name, const char *prefix_str)
 {
-  struct route_table *table;
-  struct route_node *rn;
-  struct rib *rib;
-  struct nexthop *nexthop;
-  char prefix_str[256];
-  struct prefix *p = NULL;
-  char nexthop_str[256];
-  char ifname[IF_NAMESIZE + 1];
-  struct zebra_l3_port* l3_port = NULL;
-  bool if_revisit_route_node;
-  #ifdef VRF_ENABLE
-  const struct ovsrec_route *ovs_route = NULL;
-  #endif
+  struct sset *prefixes;
+  struct sset *ports;
 
-  table = vrf_table (afi, safi, id);
-  if (!table)
+  prefixes = shash_find_data(&zebra_l3_port_route_index, port_name);
+  if (!prefixes)
     {
-      VLOG_ERR("Table not found");
-      return;
+      prefixes = xmalloc(sizeof(struct sset));
+      sset_init(prefixes);
+      shash_add(&zebra_l3_port_route_index, port_name, prefixes);
     }
+  sset_add(prefixes, prefix_str);
 
-  /*
-   * returning from the function if the hash table
-   * 'zebra_updated_or_changed_l3_ports' is empty.
-   */
-  if (!zebra_get_if_port_updated_or_changed()
-      && !zebra_get_if_port_active_state_changed())
+  ports = shash_find_data(&zebra_route_l3_port_index, prefix_str);
+  if (!ports)
     {
-      VLOG_DBG("No change in L3 port configuration. No nexthops to delete");
-      return;
+      ports = xmalloc(sizeof(struct sset));
+      sset_init(ports);
+      shash_add(&zebra_route_l3_port_index, prefix_str, ports);
     }
+  sset_add(ports, port_name);
+}
 
-  VLOG_DBG("Cleaning-up/Populating %s routes in response to %s trigger",
-           (afi == AFI_IP) ? "IPv4" : "IPv6",cleanup_reason);
+/*
+ * This function removes all the L3 port reverse index entries of the
+ * static route 'prefix_str'.
+ */
+static void
+zebra_l3_port_route_index_remove (const char *prefix_str)
+{
+  struct sset *prefixes;
+  struct sset *ports;
+  const char *port_name;
 
-  for (rn = route_top (table); rn; rn = route_next (rn))
+  sset_find_and_delete(&zebra_l3_port_route_unresolved, prefix_str);
+
+  ports = shash_find_and_delete(&zebra_route_l3_port_index, prefix_str);
+  if (!ports)
+    return;
+
+  SSET_FOR_EACH (port_name, ports)
     {
-      /*
-       * Create a transaction for any IDL route updates to OVSDB from
-       * the zebra main thread.
-       */
-      zebra_create_txn();
+      prefixes = shash_find_data(&zebra_l3_port_route_index, port_name);
+      if (!prefixes)
+        continue;
 
-      if (!rn)
+      sset_find_and_delete(prefixes, prefix_str);
+
+      if (sset_is_empty(prefixes))
         {
-          VLOG_ERR("Route node is NULL");
-          continue;
+          shash_find_and_delete(&zebra_l3_port_route_index, port_name);
+          sset_destroy(prefixes);
+          free(prefixes);
         }
+    }
 
-      if_revisit_route_node = false;
+  sset_destroy(ports);
+  free(ports);
+}
 
-      p = &rn->p;
-      memset(prefix_str, 0, sizeof(prefix_str));
-      prefix2str(p, prefix_str, sizeof(prefix_str));
+/*
+ * This function marks a newly added static route for resolution into the
+ * L3 port reverse index on the next port event.
+ */
+static void
+zebra_l3_port_route_index_add_unresolved (struct prefix *p)
+{
+  char prefix_str[256];
 
-      VLOG_DBG("Prefix %s Family %d\n",prefix_str, PREFIX_FAMILY(p));
+  memset(prefix_str, 0, sizeof(prefix_str));
+  prefix2str(p, prefix_str, sizeof(prefix_str));
 
-      RNODE_FOREACH_RIB (rn, rib)
-        {
-          #ifdef VRF_ENABLE
-          if (rib->ovsdb_route_row_uuid_ptr)
-            {
-              ovs_route = ovsrec_route_get_for_uuid(idl,
-                          (const struct uuid*)rib->ovsdb_route_row_uuid_ptr);
+  sset_add(&zebra_l3_port_route_unresolved, prefix_str);
+}
 
-              if (!ovs_route) {
-                  VLOG_DBG("Route not found using route UUID");
-                  continue;
-              }
+/*
+ * This function collects into 'prefixes' the static routes of address
+ * family 'afi' which depend on the L3 ports changed in this IDL update,
+ * along with the static routes yet to be resolved to an L3 port.
+ */
+static void
+zebra_l3_port_route_index_collect (afi_t afi, struct sset *prefixes)
+{
+  struct shash_node *node;
+  struct zebra_l3_port* l3_port;
+  struct sset *port_prefixes;
+  const char *prefix_str;
+  int family = (afi == AFI_IP) ? AF_INET : AF_INET6;
+  struct prefix p;
 
-              if (!(zebra_is_route_in_my_vrf(ovs_route)))
-                continue;
-            }
-          #endif
+  SHASH_FOR_EACH (node, &zebra_cached_l3_ports)
+    {
+      l3_port = (struct zebra_l3_port*)node->data;
 
-          if (rib->type != ZEBRA_ROUTE_STATIC ||
-              !rib->nexthop)
-            {
-              VLOG_DBG("Not a static route or null next-hop");
-              continue;
-            }
+      if (!l3_port || (l3_port->port_action == ZEBRA_L3_PORT_NO_CHANGE))
+        continue;
 
-          for (nexthop = rib->nexthop; nexthop; nexthop = nexthop->next)
-            {
-              memset(nexthop_str, 0, sizeof(nexthop_str));
-              memset(ifname, 0, sizeof(ifname));
-              l3_port = NULL;
+      port_prefixes = shash_find_data(&zebra_l3_port_route_index,
+                                      l3_port->port_name);
+      if (!port_prefixes)
+        continue;
 
-              if (afi == AFI_IP)
-                {
-                  if (nexthop->type == NEXTHOP_TYPE_IPV4)
-                    inet_ntop(AF_INET, &nexthop->gate.ipv4,
-                              nexthop_str, sizeof(nexthop_str));
-                }
-              else if (afi == AFI_IP6)
-                {
-                  if (nexthop->type == NEXTHOP_TYPE_IPV6)
-                    inet_ntop(AF_INET6, &nexthop->gate.ipv6,
-                              nexthop_str, sizeof(nexthop_str));
-                }
+      SSET_FOR_EACH (prefix_str, port_prefixes)
+        {
+          if (str2prefix(prefix_str, &p) && (p.family == family))
+            sset_add(prefixes, prefix_str);
+        }
+    }
 
-              if ((nexthop->type == NEXTHOP_TYPE_IFNAME) ||
-                  (nexthop->type == NEXTHOP_TYPE_IPV4_IFNAME) ||
-                  (nexthop->type == NEXTHOP_TYPE_IPV6_IFNAME))
-                strncpy(ifname, nexthop->ifname, IF_NAMESIZE);
+  SSET_FOR_EACH (prefix_str, &zebra_l3_port_route_unresolved)
+    {
+      if (str2prefix(prefix_str, &p) && (p.family == family))
+        sset_add(prefixes, prefix_str);
+    }
+}
 
-              VLOG_DBG("Processing route %s for the next-hop IP %s or "
-                       "interface %s\n", prefix_str,
-                       nexthop_str[0] ? nexthop_str : "NONE",
-                       ifname[0] ? ifname : "NONE");
+/*
+ * This function finds the L3 port node through which a static route
+ * next-hop resolves, either by the next-hop port name or by the L3 port
+ * subnet having the next-hop IP/IPv6 address.
+ */
+static struct zebra_l3_port*
+zebra_nexthop_find_l3_port (afi_t afi, struct nexthop *nexthop,
+                            bool *if_resolvable)
+{
+  char nexthop_str[256];
+  struct zebra_l3_port* l3_port = NULL;
 
-              /*
-               * If 'ifname' is legal, then find the L3 port node having
-               * this name.
-               */
-              if (ifname[0])
-                {
-                  l3_port = zebra_search_port_name_in_l3_ports_hash(
-                                                         &zebra_cached_l3_ports,
-                                                         ifname);
-                }
+  memset(nexthop_str, 0, sizeof(nexthop_str));
+  *if_resolvable = false;
 
-              /*
-               * If 'nexthop' is legal, then walk the hash table of L3
-               * port nodes to find if the nexthop IP/IPv6 addresses occurs
-               * in the subnets configured on L3 interfaces.
-               */
-              if (nexthop_str[0])
-                {
-                  l3_port = zebra_search_nh_addr_in_l3_ports_hash(
-                                                 &zebra_cached_l3_ports,
-                                                 nexthop_str, afi);
-                }
+  if ((afi == AFI_IP) && (nexthop->type == NEXTHOP_TYPE_IPV4))
+    inet_ntop(AF_INET, &nexthop->gate.ipv4, nexthop_str,
+              sizeof(nexthop_str));
+  else if ((afi == AFI_IP6) && (nexthop->type == NEXTHOP_TYPE_IPV6))
+    inet_ntop(AF_INET6, &nexthop->gate.ipv6, nexthop_str,
+              sizeof(nexthop_str));
 
-              /*
-               * There is a possibility that in case of next-hop as IP/IPv6 address,
-               * we could have forward reference and we cannot find a L3 port node
-               * with that next-hop IP subnet. In that case mark this node for
-               * inspection by backend thread.
-               */
-              if (!l3_port)
-                {
-                  VLOG_DBG("Next-hop %s not found in L3 port cache",
-                            ifname[0] ? ifname :
-                                (nexthop_str[0] ? nexthop_str:"NONE"));
+  if (((nexthop->type == NEXTHOP_TYPE_IFNAME) ||
+       (nexthop->type == NEXTHOP_TYPE_IPV4_IFNAME) ||
+       (nexthop->type == NEXTHOP_TYPE_IPV6_IFNAME)) && nexthop->ifname)
+    {
+      *if_resolvable = true;
+      l3_port = zebra_search_port_name_in_l3_ports_hash(
+                                             &zebra_cached_l3_ports,
+                                             nexthop->ifname);
+    }
 
-                  /*
-                   * We should always be able to find a L3 port node, if the
-                   * next-hop is IP/IPv6 address.
-                   */
-                  if (ifname[0])
-                    assert(0);
+  if (nexthop_str[0])
+    {
+      *if_resolvable = true;
+      l3_port = zebra_search_nh_addr_in_l3_ports_hash(
+                                             &zebra_cached_l3_ports,
+                                             nexthop_str, afi);
+    }
 
-                  if (nexthop_str[0])
-                    {
-                      if_revisit_route_node = true;
-                      continue;
-                    }
-                }
-              else
-                {
-                  VLOG_DBG("Found L3 port node %s with action %s",
-                           l3_port->port_name,
-                           zebra_l3_port_cache_actions_str[l3_port->port_action]);
-                }
+  return(l3_port);
+}
 
-              switch (l3_port->port_action)
-                {
-                  /*
-                   * In case nothing changed in the L3 port node,
-                   * zebra is in sync with OVSDB and no action needs
-                   * to be taken
-                   */
-                  case ZEBRA_L3_PORT_NO_CHANGE:
-                    break;
+/*
+ * This function resolves the next-hops of the static routes of address
+ * family 'afi' which are not in the L3 port reverse index yet. Unlike
+ * the port event handling, this only updates the reverse index and does
+ * not act on the routes. The routes with next-hops outside of all the
+ * L3 port subnets are left to be revisited on every port event.
+ */
+static void
+zebra_l3_port_route_index_resolve (afi_t afi)
+{
+  struct route_table *table;
+  struct route_node *rn;
+  struct rib *rib;
+  struct nexthop *nexthop;
+  struct zebra_l3_port* l3_port;
+  struct sset prefixes;
+  const char *prefix_str;
+  struct prefix p;
+  bool if_resolvable;
+  bool if_unresolved;
 
-                  /*
-                   * We need to have the backend zebra thread to examine
-                   * the route node in the following cases:-
-                   * 1. A new L3 port node got added
-                   * 2. Some IP address got added on an L3 port
-                   * 3. Some admin or link state change happened on the
-                   *    L3 interface
-                   */
-                  case ZEBRA_L3_PORT_ADD:
-                  case ZEBRA_L3_PORT_UPADTE_IP_ADDR:
-                  case ZEBRA_L3_PORT_ACTIVE_STATE_CHANGE:
-                    if_revisit_route_node = true;
-                    break;
+  if (sset_is_empty(&zebra_l3_port_route_unresolved))
+    return;
 
-                  /*
-                   * We need to delete the static route configuration
-                   * and trigger a kernel cleanup for a route in case
-                   * of the following:-
-                   * 1. We get a "no routing" trigger on an interface
-                   *    and the interface becomes L2
-                   * 2. We get an interface delete like
-                   *    "no interface <blah>"
-                   */
-                  case ZEBRA_L3_PORT_L3_CHANGED_TO_L2:
-                  case ZEBRA_L3_PORT_DELETE:
+  table = vrf_table (afi, SAFI_UNICAST, 0);
+  if (!table)
+    return;
 
-                    /*
-                     * Add the route in deleted list
-                     */
-                    zebra_route_list_add_data(rn, rib, nexthop);
-
-                    if (ifname[0])
-                      {
-                        VLOG_DBG("The next-hop port %s found in the "
-                                 " deleted L3 port list", ifname);
-
-                        /*
-                         * Delete the static route from OVSDB
-                         */
-                        zebra_delete_route_nexthop_port_from_db(rib,
-                                                               ifname);
-                      }
-
-                    if (nexthop_str[0])
-                      {
-                        VLOG_DBG("The next-hop IP %s found in the "
-                                 " deleted L3 port list", nexthop_str);
-
-                        /*
-                         * Delete the static route from OVSDB
-                         */
-                        zebra_delete_route_nexthop_addr_from_db(rib,
-                                                             nexthop_str);
-                      }
-                    break;
-
-                  default:
-                    VLOG_ERR("Wrong L3 port action");
-                }
-            }
-        }
+  sset_init(&prefixes);
+  SSET_FOR_EACH (prefix_str, &zebra_l3_port_route_unresolved)
+    {
+      if (str2prefix(prefix_str, &p) &&
+          (p.family == ((afi == AFI_IP) ? AF_INET : AF_INET6)))
+        sset_add(&prefixes, prefix_str);
+    }
 
-      if (if_revisit_route_node)
+  SSET_FOR_EACH (prefix_str, &prefixes)
+    {
+      zebra_l3_port_route_index_remove(prefix_str);
+
+      memset(&p, 0, sizeof(struct prefix));
+      str2prefix(prefix_str, &p);
+      rn = route_node_lookup(table, &p);
+      if (!rn)
+        continue;
+
+      if_unresolved = false;
+      RNODE_FOREACH_RIB (rn, rib)
         {
-          VLOG_DBG("Adding route node with prefix %s for backend "
-                   "processing", prefix_str);
-          rib_queue_add(&zebrad, rn);
+          if (rib->type != ZEBRA_ROUTE_STATIC || !rib->nexthop)
+            continue;
+
+          for (nexthop = rib->nexthop; nexthop; nexthop = nexthop->next)
+            {
+              l3_port = zebra_nexthop_find_l3_port(afi, nexthop,
+                                                   &if_resolvable);
+              if (l3_port)
+                zebra_l3_port_route_index_add(l3_port->port_name,
+                                              prefix_str);
+              else if (if_resolvable)
+                if_unresolved = true;
+            }
         }
 
-        /*
-         * Since there are further routes to process for the
-         * main thread, we should try to see if there are
-         * MAX_ZEBRA_TXN_COUNT route updates to OVSDB at this time.
-         * In this case we should publish the route updates to OVSDB.
-         */
-        zebra_finish_txn(false);
+      route_unlock_node(rn);
+
+      if (if_unresolved)
+        sset_add(&zebra_l3_port_route_unresolved, prefix_str);
     }
 
-    /*
-     * Since there are no further routes to process for the
-     * main thread, we should submit all the outstanding
-     * route updates to OVSDB at this time.
-     */
-    zebra_finish_txn(true);
+  sset_destroy(&prefixes);
 }
 
 /*
- * End of function for handling port add, delete and update triggers
- * from OVSDB.
- ************************************************************************
+ * This function revisits a static route in case its resolving next-hop
+ * has changed admin state or the resolving IP/IPv6 address changes or
+ * gets deleted. The route's entries in the L3 port reverse index are
+ * updated as the next-hops are resolved.
  */
-
-/* Create a connection to the OVSDB at db_path and create a dB cache
- * for this daemon. */
 static void
-ovsdb_init (const char *db_path)
+zebra_update_route_node_for_ports_state (afi_t afi, struct route_node *rn)
 {
+  struct rib *rib;
+  struct nexthop *nexthop;
+  char prefix_str[256];
+  struct prefix *p = NULL;
+  char nexthop_str[256];
+  char ifname[IF_NAMESIZE + 1];
+  struct zebra_l3_port* l3_port = NULL;
+  bool if_revisit_route_node;
   #ifdef VRF_ENABLE
-  char lock_name[64] = {0};
-  char netns_name[UUID_LEN + 1];
+  const struct ovsrec_route *ovs_route = NULL;
   #endif
-  /* Initialize IDL through a new connection to the dB. */
-  idl = ovsdb_idl_create(db_path, &ovsrec_idl_class, false, true);
-  idl_seqno = ovsdb_idl_get_seqno(idl);
-
-  #ifdef VRF_ENABLE
-  zebra_get_my_netns_name(netns_name);
 
-  /* TODO "swns" to be defined later as a string in openswitch-idl.h*/
-  if (strncmp(netns_name, "swns", OVSDB_VRF_NAME_MAXLEN))
-    {
-      sprintf(lock_name, "%s_%d", "ops_zebra", getpid());
-    }
-  else
-    {
-      sprintf(lock_name, "%s", "ops_zebra");
-    }
-
-  ovsdb_idl_set_lock(idl, lock_name);
-  #else
-  ovsdb_idl_set_lock(idl, "ops_zebra");
-  #endif
+  if_revisit_route_node = false;
 
-  /* Cache OpenVSwitch table */
-  ovsdb_idl_add_table(idl, &ovsrec_table_system);
+  p = &rn->p;
+  memset(prefix_str, 0, sizeof(prefix_str));
+  prefix2str(p, prefix_str, sizeof(prefix_str));
 
-  ovsdb_idl_add_column(idl, &ovsrec_system_col_cur_cfg);
-  ovsdb_idl_add_column(idl, &ovsrec_system_col_hostname);
+  VLOG_DBG("Prefix %s Family %d\n",prefix_str, PREFIX_FAMILY(p));
 
-  /* Register for ROUTE table */
-  /* We need to register for columns to really get rows in the idl */
-  ovsdb_idl_add_table(idl, &ovsrec_table_route);
-  ovsdb_idl_add_column(idl, &ovsrec_route_col_prefix);
-  ovsdb_idl_add_column(idl, &ovsrec_route_col_address_family);
-  ovsdb_idl_add_column(idl, &ovsrec_route_col_distance);
-  ovsdb_idl_add_column(idl, &ovsrec_route_col_metric);
-  ovsdb_idl_add_column(idl, &ovsrec_route_col_from);
-  ovsdb_idl_add_column(idl, &ovsrec_route_col_sub_address_family);
-  ovsdb_idl_add_column(idl, &ovsrec_route_col_vrf);
-  ovsdb_idl_add_column(idl, &ovsrec_route_col_nexthops);
-  ovsdb_idl_omit_alert(idl, &ovsrec_route_col_nexthops);
+  COVERAGE_INC(zebra_port_event_route_nodes_visited);
 
   /*
-   * Register to the "selected" column in the route table to write
-   * to it. If selected is TRUE, this is a FIB entry
+   * The next-hops of the route are resolved again below. Drop the
+   * current reverse index entries for the route.
    */
-  ovsdb_idl_add_column(idl, &ovsrec_route_col_selected);
-  ovsdb_idl_omit_alert(idl, &ovsrec_route_col_selected);
+  zebra_l3_port_route_index_remove(prefix_str);
 
-  /* Register for NextHop table */
-  ovsdb_idl_add_table(idl, &ovsrec_table_nexthop);
-  ovsdb_idl_add_column(idl, &ovsrec_nexthop_col_ip_address);
-  ovsdb_idl_add_column(idl, &ovsrec_nexthop_col_ports);
-  ovsdb_idl_add_column(idl, &ovsrec_nexthop_col_status);
-  ovsdb_idl_add_column(idl, &ovsrec_nexthop_col_selected);
-  ovsdb_idl_omit_alert(idl, &ovsrec_nexthop_col_selected);
+  RNODE_FOREACH_RIB (rn, rib)
+    {
+      #ifdef VRF_ENABLE
+      if (rib->ovsdb_route_row_uuid_ptr)
+        {
+          ovs_route = ovsrec_route_get_for_uuid(idl,
+                      (const struct uuid*)rib->ovsdb_route_row_uuid_ptr);
 
-  /* Register for port table */
-  ovsdb_idl_add_table(idl, &ovsrec_table_port);
-  ovsdb_idl_add_column(idl, &ovsrec_port_col_name);
-  ovsdb_idl_add_column(idl, &ovsrec_port_col_ip6_address);
-  ovsdb_idl_add_column(idl, &ovsrec_port_col_ip4_address);
-  ovsdb_idl_add_column(idl, &ovsrec_port_col_ip4_address_secondary);
-  ovsdb_idl_add_column(idl, &ovsrec_port_col_ip6_address_secondary);
-  ovsdb_idl_add_column(idl, &ovsrec_port_col_interfaces);
+          if (!ovs_route) {
+              VLOG_DBG("Route not found using route UUID");
+              continue;
+          }
 
-  /*
-   * Adding the interface table so that we can listen to interface
-   * "up"/"down" notifications. We need to add two columns to the
-   * interface table:-
-   * 1. Interface name for finding which port corresponding to the
-   *    interface went "up"/"down".
-   * 2. Interface admin state.
-   */
-  ovsdb_idl_add_table(idl, &ovsrec_table_interface);
-  ovsdb_idl_add_column(idl, &ovsrec_interface_col_name);
-  ovsdb_idl_add_column(idl, &ovsrec_interface_col_admin_state);
-  ovsdb_idl_add_column(idl, &ovsrec_interface_col_type);
+          if (!(zebra_is_route_in_my_vrf(ovs_route)))
+            continue;
+        }
+      #endif
 
-  /* Register for the vrf table to find the if the port is L2/L3 */
-  ovsdb_idl_add_table(idl, &ovsrec_table_vrf);
-  ovsdb_idl_add_column(idl, &ovsrec_vrf_col_name);
-  ovsdb_idl_add_column(idl, &ovsrec_vrf_col_ports);
+      if (rib->type != ZEBRA_ROUTE_STATIC ||
+          !rib->nexthop)
+        {
+          VLOG_DBG("Not a static route or null next-hop");
+          continue;
+        }
 
-  /* Register for Active Router-ID column in the VRF table */
+      for (nexthop = rib->nexthop; nexthop; nexthop = nexthop->next)
+        {
+          memset(nexthop_str, 0, sizeof(nexthop_str));
+          memset(ifname, 0, sizeof(ifname));
+          l3_port = NULL;
+
+          if (afi == AFI_IP)
+            {
+              if (nexthop->type == NEXTHOP_TYPE_IPV4)
+                inet_ntop(AF_INET, &nexthop->gate.ipv4,
+                          nexthop_str, sizeof(nexthop_str));
+            }
+          else if (afi == AFI_IP6)
+            {
+              if (nexthop->type == NEXTHOP_TYPE_IPV6)
+                inet_ntop(AF_INET6, &nexthop->gate.ipv6,
+                          nexthop_str, sizeof(nexthop_str));
+            }
+
+          if ((nexthop->type == NEXTHOP_TYPE_IFNAME) ||
+              (nexthop->type == NEXTHOP_TYPE_IPV4_IFNAME) ||
+              (nexthop->type == NEXTHOP_TYPE_IPV6_IFNAME))
+            strncpy(ifname, nexthop->ifname, IF_NAMESIZE);
+
+          VLOG_DBG("Processing route %s for the next-hop IP %s or "
+                   "interface %s\n", prefix_str,
+                   nexthop_str[0] ? nexthop_str : "NONE",
+                   ifname[0] ? ifname : "NONE");
+
+          /*
+           * If 'ifname' is legal, then find the L3 port node having
+           * this name.
+           */
+          if (ifname[0])
+            {
+              l3_port = zebra_search_port_name_in_l3_ports_hash(
+                                                     &zebra_cached_l3_ports,
+                                                     ifname);
+            }
+
+          /*
+           * If 'nexthop' is legal, then walk the hash table of L3
+           * port nodes to find if the nexthop IP/IPv6 addresses occurs
+           * in the subnets configured on L3 interfaces.
+           */
+          if (nexthop_str[0])
+            {
+              l3_port = zebra_search_nh_addr_in_l3_ports_hash(
+                                             &zebra_cached_l3_ports,
+                                             nexthop_str, afi);
+            }
+
+          /*
+           * There is a possibility that in case of next-hop as IP/IPv6 address,
+           * we could have forward reference and we cannot find a L3 port node
+           * with that next-hop IP subnet. In that case mark this node for
+           * inspection by backend thread.
+           */
+          if (!l3_port)
+            {
+              VLOG_DBG("Next-hop %s not found in L3 port cache",
+                        ifname[0] ? ifname :
+                            (nexthop_str[0] ? nexthop_str:"NONE"));
+
+              /*
+               * We should always be able to find a L3 port node, if the
+               * next-hop is IP/IPv6 address.
+               */
+              if (ifname[0])
+                assert(0);
+
+              if (nexthop_str[0])
+                {
+                  sset_add(&zebra_l3_port_route_unresolved, prefix_str);
+                  if_revisit_route_node = true;
+                  continue;
+                }
+            }
+          else
+            {
+              VLOG_DBG("Found L3 port node %s with action %s",
+                       l3_port->port_name,
+                       zebra_l3_port_cache_actions_str[l3_port->port_action]);
+            }
+
+          /*
+           * Record the route against the resolving L3 port, unless the
+           * port is going away.
+           */
+          if ((l3_port->port_action != ZEBRA_L3_PORT_L3_CHANGED_TO_L2) &&
+              (l3_port->port_action != ZEBRA_L3_PORT_DELETE))
+            zebra_l3_port_route_index_add(l3_port->port_name, prefix_str);
+
+          switch (l3_port->port_action)
+            {
+              /*
+               * In case nothing changed in the L3 port node,
+               * zebra is in sync with OVSDB and no action needs
+               * to be taken
+               */
+              case ZEBRA_L3_PORT_NO_CHANGE:
+                break;
+
+              /*
+               * We need to have the backend zebra thread to examine
+               * the route node in the following cases:-
+               * 1. A new L3 port node got added
+               * 2. Some IP address got added on an L3 port
+               * 3. Some admin or link state change happened on the
+               *    L3 interface
+               */
+              case ZEBRA_L3_PORT_ADD:
+              case ZEBRA_L3_PORT_UPADTE_IP_ADDR:
+              case ZEBRA_L3_PORT_ACTIVE_STATE_CHANGE:
+                if_revisit_route_node = true;
+                break;
+
+              /*
+               * We need to delete the static route configuration
+               * and trigger a kernel cleanup for a route in case
+               * of the following:-
+               * 1. We get a "no routing" trigger on an interface
+               *    and the interface becomes L2
+               * 2. We get an interface delete like
+               *    "no interface <blah>"
+               */
+              case ZEBRA_L3_PORT_L3_CHANGED_TO_L2:
+              case ZEBRA_L3_PORT_DELETE:
+
+                /*
+                 * Add the route in deleted list
+                 */
+                zebra_route_list_add_data(rn, rib, nexthop);
+
+                if (ifname[0])
+                  {
+                    VLOG_DBG("The next-hop port %s found in the "
+                             " deleted L3 port list", ifname);
+
+                    /*
+                     * Delete the static route from OVSDB
+                     */
+                    zebra_delete_route_nexthop_port_from_db(rib,
+                                                           ifname);
+                  }
+
+                if (nexthop_str[0])
+                  {
+                    VLOG_DBG("The next-hop IP %s found in the "
+                             " deleted L3 port list", nexthop_str);
+
+                    /*
+                     * Delete the static route from OVSDB
+                     */
+                    zebra_delete_route_nexthop_addr_from_db(rib,
+                                                         nexthop_str);
+                  }
+                break;
+
+              default:
+                VLOG_ERR("Wrong L3 port action");
+            }
+        }
+    }
+
+  if (if_revisit_route_node)
+    {
+      VLOG_DBG("Adding route node with prefix %s for backend "
+               "processing", prefix_str);
+      rib_queue_add(&zebrad, rn);
+    }
+}
+
+/*
+ * This function adds work for the quagga back-end thread to revisit
+ * a static route in case its resolving next-hop has changed admin
+ * state or the resolving IP/IPv6 address changes or gets deleted.
+ * This function also handles the clean-up of static routes in case
+ * the interface gets converted into L2 or the L3 interface gets
+ * deleted. Only the static routes depending on the changed L3 ports,
+ * as found from the L3 port reverse index, are revisited.
+ */
+static void
+zebra_find_routes_with_updated_ports_state (
+                        afi_t afi, safi_t safi, u_int32_t id,
+                        const char* cleanup_reason)
+{
+  struct route_table *table;
+  struct route_node *rn;
+  struct sset prefixes;
+  const char *prefix_str;
+  struct prefix p;
+
+  table = vrf_table (afi, safi, id);
+  if (!table)
+    {
+      VLOG_ERR("Table not found");
+      return;
+    }
+
+  /*
+   * returning from the function if the hash table
+   * 'zebra_updated_or_changed_l3_ports' is empty.
+   */
+  if (!zebra_get_if_port_updated_or_changed()
+      && !zebra_get_if_port_active_state_changed())
+    {
+      VLOG_DBG("No change in L3 port configuration. No nexthops to delete");
+      return;
+    }
+
+  VLOG_DBG("Cleaning-up/Populating %s routes in response to %s trigger",
+           (afi == AFI_IP) ? "IPv4" : "IPv6",cleanup_reason);
+
+  sset_init(&prefixes);
+  zebra_l3_port_route_index_collect(afi, &prefixes);
+
+  VLOG_DBG("Revisiting %zu routes depending on the changed L3 ports",
+           sset_count(&prefixes));
+
+  SSET_FOR_EACH (prefix_str, &prefixes)
+    {
+      /*
+       * Create a transaction for any IDL route updates to OVSDB from
+       * the zebra main thread.
+       */
+      zebra_create_txn();
+
+      memset(&p, 0, sizeof(struct prefix));
+      rn = NULL;
+      if (str2prefix(prefix_str, &p))
+        rn = route_node_lookup(table, &p);
+
+      if (!rn)
+        {
+          VLOG_DBG("Route node for prefix %s not found", prefix_str);
+          zebra_l3_port_route_index_remove(prefix_str);
+        }
+      else
+        {
+          zebra_update_route_node_for_ports_state(afi, rn);
+          route_unlock_node(rn);
+        }
+
+        /*
+         * Since there are further routes to process for the
+         * main thread, we should try to see if there are
+         * enough route updates to fill a batch to OVSDB at this time.
+         * In this case we should publish the route updates to OVSDB.
+         */
+        zebra_finish_txn(false);
+    }
+
+    sset_destroy(&prefixes);
+
+    /*
+     * Since there are no further routes to process for the
+     * main thread, we should submit all the outstanding
+     * route updates to OVSDB at this time.
+     */
+    zebra_finish_txn(true);
+}
+
+/*
+ * End of function for handling port add, delete and update triggers
+ * from OVSDB.
+ ************************************************************************
+ */
+
+/* Create a connection to the OVSDB at db_path and create a dB cache
+ * for this daemon. */
+static void
+ovsdb_init (const char *db_path)
+{
+  #ifdef VRF_ENABLE
+  char lock_name[64] = {0};
+  char netns_name[UUID_LEN + 1];
+  #endif
+  /* Initialize IDL through a new connection to the dB. */
+  idl = ovsdb_idl_create(db_path, &ovsrec_idl_class, false, true);
+  idl_seqno = ovsdb_idl_get_seqno(idl);
+
+  #ifdef VRF_ENABLE
+  zebra_get_my_netns_name(netns_name);
+
+  /* TODO "swns" to be defined later as a string in openswitch-idl.h*/
+  if (strncmp(netns_name, "swns", OVSDB_VRF_NAME_MAXLEN))
+    {
+      sprintf(lock_name, "%s_%d", "ops_zebra", getpid());
+    }
+  else
+    {
+      sprintf(lock_name, "%s", "ops_zebra");
+    }
+
+  ovsdb_idl_set_lock(idl, lock_name);
+  #else
+  ovsdb_idl_set_lock(idl, "ops_zebra");
+  #endif
+
+  /* Cache OpenVSwitch table */
+  ovsdb_idl_add_table(idl, &ovsrec_table_system);
+
+  ovsdb_idl_add_column(idl, &ovsrec_system_col_cur_cfg);
+  ovsdb_idl_add_column(idl, &ovsrec_system_col_hostname);
+
+  /* Register for ROUTE table */
+  /* We need to register for columns to really get rows in the idl */
+  ovsdb_idl_add_table(idl, &ovsrec_table_route);
+  ovsdb_idl_add_column(idl, &ovsrec_route_col_prefix);
+  ovsdb_idl_add_column(idl, &ovsrec_route_col_address_family);
+  ovsdb_idl_add_column(idl, &ovsrec_route_col_distance);
+  ovsdb_idl_add_column(idl, &ovsrec_route_col_metric);
+  ovsdb_idl_add_column(idl, &ovsrec_route_col_from);
+  ovsdb_idl_add_column(idl, &ovsrec_route_col_sub_address_family);
+  ovsdb_idl_add_column(idl, &ovsrec_route_col_vrf);
+  ovsdb_idl_add_column(idl, &ovsrec_route_col_nexthops);
+  ovsdb_idl_omit_alert(idl, &ovsrec_route_col_nexthops);
+
+  /*
+   * Register to the "selected" column in the route table to write
+   * to it. If selected is TRUE, this is a FIB entry
+   */
+  ovsdb_idl_add_column(idl, &ovsrec_route_col_selected);
+  ovsdb_idl_omit_alert(idl, &ovsrec_route_col_selected);
+
+  /* Register for NextHop table */
+  ovsdb_idl_add_table(idl, &ovsrec_table_nexthop);
+  ovsdb_idl_add_column(idl, &ovsrec_nexthop_col_ip_address);
+  ovsdb_idl_add_column(idl, &ovsrec_nexthop_col_ports);
+  ovsdb_idl_add_column(idl, &ovsrec_nexthop_col_status);
+  ovsdb_idl_add_column(idl, &ovsrec_nexthop_col_selected);
+  ovsdb_idl_omit_alert(idl, &ovsrec_nexthop_col_selected);
+
+  /* Register for port table */
+  ovsdb_idl_add_table(idl, &ovsrec_table_port);
+  ovsdb_idl_add_column(idl, &ovsrec_port_col_name);
+  ovsdb_idl_add_column(idl, &ovsrec_port_col_ip6_address);
+  ovsdb_idl_add_column(idl, &ovsrec_port_col_ip4_address);
+  ovsdb_idl_add_column(idl, &ovsrec_port_col_ip4_address_secondary);
+  ovsdb_idl_add_column(idl, &ovsrec_port_col_ip6_address_secondary);
+  ovsdb_idl_add_column(idl, &ovsrec_port_col_interfaces);
+
+  /*
+   * Adding the interface table so that we can listen to interface
+   * "up"/"down" notifications. We need to add two columns to the
+   * interface table:-
+   * 1. Interface name for finding which port corresponding to the
+   *    interface went "up"/"down".
+   * 2. Interface admin state.
+   */
+  ovsdb_idl_add_table(idl, &ovsrec_table_interface);
+  ovsdb_idl_add_column(idl, &ovsrec_interface_col_name);
+  ovsdb_idl_add_column(idl, &ovsrec_interface_col_admin_state);
+  ovsdb_idl_add_column(idl, &ovsrec_interface_col_type);
+
+  /* Register for the vrf table to find the if the port is L2/L3 */
+  ovsdb_idl_add_table(idl, &ovsrec_table_vrf);
+  ovsdb_idl_add_column(idl, &ovsrec_vrf_col_name);
+  ovsdb_idl_add_column(idl, &ovsrec_vrf_col_ports);
+
+  /* Register for Active Router-ID column in the VRF table */
   ovsdb_idl_add_column(idl, &ovsrec_vrf_col_active_router_id);
   ovsdb_idl_omit_alert(idl, &ovsrec_vrf_col_active_router_id);
 
+  /*
+   * Track the changes to the route and next-hop rows so that each
+   * reconfigure run only visits the rows which were inserted, modified
+   * or deleted since the last run.
+   */
+  ovsdb_idl_track_add_column(idl, &ovsrec_route_col_prefix);
+  ovsdb_idl_track_add_column(idl, &ovsrec_route_col_address_family);
+  ovsdb_idl_track_add_column(idl, &ovsrec_route_col_distance);
+  ovsdb_idl_track_add_column(idl, &ovsrec_route_col_metric);
+  ovsdb_idl_track_add_column(idl, &ovsrec_route_col_from);
+  ovsdb_idl_track_add_column(idl, &ovsrec_route_col_sub_address_family);
+  ovsdb_idl_track_add_column(idl, &ovsrec_route_col_vrf);
+  ovsdb_idl_track_add_column(idl, &ovsrec_route_col_nexthops);
+  ovsdb_idl_track_add_column(idl, &ovsrec_nexthop_col_ip_address);
+  ovsdb_idl_track_add_column(idl, &ovsrec_nexthop_col_ports);
+  ovsdb_idl_track_add_column(idl, &ovsrec_nexthop_col_status);
+
   /*
    * Intialize the local L3 port hash.
    */
   zebra_init_cached_l3_ports_hash();
 
+  /*
+   * Intialize the next-hop to route reverse lookup hash.
+   */
+  shash_init(&zebra_nexthop_to_route_hash);
+  shash_init(&zebra_route_to_nexthop_hash);
+
+  /*
+   * Intialize the L3 port to static route reverse index.
+   */
+  shash_init(&zebra_l3_port_route_index);
+  shash_init(&zebra_route_l3_port_index);
+  sset_init(&zebra_l3_port_route_unresolved);
+
+  /*
+   * Intialize the list of the route update transactions waiting for
+   * the OVSDB reply.
+   */
+  zebra_txn_inflight_list = list_new();
 }
 
 /* This function lists all the OVS specific command line options
@@ -3852,43 +4220,8 @@ zebra_chk_for_system_configured (void)
     }
 }
 
-/* For each route row in OVSDB, walk all the nexthops and
- * return TRUE if any nexthop is modified
- */
-bool
-is_route_nh_rows_modified (const struct ovsrec_route *route)
-{
-  const struct ovsrec_nexthop *nexthop;
-  int index;
-
-  for(index=0; index < route->n_nexthops; index++)
-    {
-      nexthop = route->nexthops[index];
-      if ( (OVSREC_IDL_IS_ROW_INSERTED(nexthop, idl_seqno)) ||
-           (OVSREC_IDL_IS_ROW_MODIFIED(nexthop, idl_seqno)) )
-        return true;
-    }
-
-  return false;
-}
-
-/* Return true of any nexthop is deleted for route
- */
-bool
-is_rib_nh_rows_deleted (const struct ovsrec_route *route)
-{
-  const struct ovsrec_nexthop *nexthop;
-
-  nexthop = route->nexthops[0];
-  if ( ( nexthop != NULL ) &&
-       ( OVSREC_IDL_ANY_TABLE_ROWS_DELETED(nexthop, idl_seqno) ) )
-    return 1;
-
-  return 0;
-}
-
-static void
-print_key (struct zebra_route_key *rkey)
+static void
+print_key (struct zebra_route_key *rkey)
 
 {
   VLOG_DBG("prefix=0x%x", rkey->prefix.u.ipv4_addr.s_addr);
@@ -3947,71 +4280,99 @@ zebra_route_hash_alloc (void *p)
   return addr;
 }
 
-/* Add ovsdb routes to hash table */
-static void
-zebra_route_hash_add (const struct ovsrec_route *route)
+/*
+ * Fill the prefix part of the route key from the OVSDB route row. The
+ * next-hop part of the key is cleared. Returns the address family of
+ * the route or AF_UNSPEC if the route prefix is malformed.
+ */
+static int
+zebra_route_key_set_prefix (const struct ovsrec_route *route,
+                            struct zebra_route_key *rkey)
 {
-  struct zebra_route_key tmp_key;
-  struct zebra_route_key *add;
   int ret;
-  size_t i;
-  struct ovsrec_nexthop *nexthop;
   struct prefix p;
-  int addr_family;
+  int addr_family = AF_UNSPEC;
 
-  if (!route || !route->prefix)
-    return;
+  memset(rkey, 0, sizeof(struct zebra_route_key));
+
+  if (!route || !route->prefix || !route->address_family)
+    return AF_UNSPEC;
 
   ret = str2prefix(route->prefix, &p);
   if (ret <= 0)
     {
       VLOG_ERR("Malformed Dest address=%s", route->prefix);
-      return;
+      return AF_UNSPEC;
     }
 
-  memset(&tmp_key, 0, sizeof(struct zebra_route_key));
   if (strcmp(route->address_family,
              OVSREC_ROUTE_ADDRESS_FAMILY_IPV4) == 0)
     {
       addr_family = AF_INET;
-      tmp_key.prefix.u.ipv4_addr = p.u.prefix4;
+      rkey->prefix.u.ipv4_addr = p.u.prefix4;
     }
   else if (strcmp(route->address_family,
              OVSREC_ROUTE_ADDRESS_FAMILY_IPV6) == 0)
     {
       addr_family = AF_INET6;
-      tmp_key.prefix.u.ipv6_addr = p.u.prefix6;
+      rkey->prefix.u.ipv6_addr = p.u.prefix6;
     }
 
-  tmp_key.prefix_len = p.prefixlen;
+  rkey->prefix_len = p.prefixlen;
 
-  for (i = 0; i < route->n_nexthops; i++)
+  return addr_family;
+}
+
+/*
+ * Fill the next-hop part of the route key from the OVSDB next-hop row.
+ */
+static void
+zebra_route_key_set_nexthop (int addr_family,
+                             const struct ovsrec_nexthop *nexthop,
+                             struct zebra_route_key *rkey)
+{
+  /*
+   * Clear the next-hop specific entries in the 'zebra_route_key;
+   * structure since we are populating the next-hop interface address
+   * and next-hop interface conditionally.
+   */
+  memset(&(rkey->nexthop), 0, sizeof(struct ipv4v6_addr));
+  memset(&(rkey->ifname), 0, sizeof(rkey->ifname));
+
+  if (nexthop->ip_address)
     {
+      if (addr_family == AF_INET)
+        inet_pton(AF_INET, nexthop->ip_address,
+                  &rkey->nexthop.u.ipv4_addr);
+      else if (addr_family == AF_INET6)
+        inet_pton(AF_INET6, nexthop->ip_address,
+                  &rkey->nexthop.u.ipv6_addr);
+    }
 
-      /*
-       * Clear the next-hop specific entries in the 'zebra_route_key;
-       * structure since we are populating the next-hop interface address
-       * and next-hop interface conditionally.
-       */
-      memset(&(tmp_key.nexthop), 0, sizeof(struct ipv4v6_addr));
-      memset(&(tmp_key.ifname), 0, sizeof(tmp_key.ifname));
+  if (nexthop->ports)
+    strncpy(rkey->ifname, nexthop->ports[0]->name, IF_NAMESIZE);
+}
+
+/* Add ovsdb routes to hash table */
+static void
+zebra_route_hash_add (const struct ovsrec_route *route)
+{
+  struct zebra_route_key tmp_key;
+  struct zebra_route_key *add;
+  size_t i;
+  struct ovsrec_nexthop *nexthop;
+  int addr_family;
 
+  addr_family = zebra_route_key_set_prefix(route, &tmp_key);
+  if (addr_family == AF_UNSPEC)
+    return;
+
+  for (i = 0; i < route->n_nexthops; i++)
+    {
       nexthop = route->nexthops[i];
       if (nexthop)
         {
-          if (nexthop->ip_address)
-	    {
-              if (addr_family == AF_INET)
-                inet_pton(AF_INET, nexthop->ip_address,
-                          &tmp_key.nexthop.u.ipv4_addr);
-	      else if (addr_family == AF_INET6)
-                inet_pton(AF_INET6, nexthop->ip_address,
-                          &tmp_key.nexthop.u.ipv6_addr);
-            }
-
-          if (nexthop->ports)
-            strncpy(tmp_key.ifname, nexthop->ports[0]->name,
-                    IF_NAMESIZE);
+          zebra_route_key_set_nexthop(addr_family, nexthop, &tmp_key);
 
           VLOG_DBG("Hash insert prefix %s nexthop %s, interface %s",
                    route->prefix,
@@ -4067,11 +4428,10 @@ zebra_route_list_add_data (struct route_node *rnode, struct rib *rib_p,
   listnode_add(zebra_route_del_list, data);
 }
 
-/* Init link list and hash table */
+/* Init link list */
 static void
 zebra_route_del_init (void)
 {
-  zebra_route_hash_init();
   zebra_route_del_list = list_new();
   zebra_route_del_list->del = (void (*) (void *)) zebra_route_list_free_data;
 }
@@ -4149,12 +4509,72 @@ zebra_route_del_process (void)
     }
 }
 
-/* Free hash and link list memory */
+/* Free link list memory */
 static void
 zebra_route_del_finish (void)
 {
   list_free(zebra_route_del_list);
-  zebra_route_hash_finish();
+  zebra_route_del_list = NULL;
+}
+
+/*
+ * Fill the route key for a next-hop of a local RIB route. The next-hop
+ * address in string format is copied in 'nexthop_str'.
+ */
+static void
+zebra_route_key_from_rib_nexthop (afi_t afi, struct route_node *rn,
+                                  struct nexthop *nexthop,
+                                  struct zebra_route_key *rkey,
+                                  char *nexthop_str, size_t nexthop_str_len)
+{
+  memset(rkey, 0, sizeof (struct zebra_route_key));
+  memset(nexthop_str, 0, nexthop_str_len);
+
+  if (afi == AFI_IP)
+    {
+      rkey->prefix.u.ipv4_addr = rn->p.u.prefix4;
+      rkey->prefix_len = rn->p.prefixlen;
+      if (nexthop->type == NEXTHOP_TYPE_IPV4)
+        {
+          rkey->nexthop.u.ipv4_addr = nexthop->gate.ipv4;
+          inet_ntop(AF_INET, &nexthop->gate.ipv4,
+                    nexthop_str, nexthop_str_len);
+        }
+    }
+  else if (afi == AFI_IP6)
+    {
+      rkey->prefix.u.ipv6_addr = rn->p.u.prefix6;
+      rkey->prefix_len = rn->p.prefixlen;
+      if (nexthop->type == NEXTHOP_TYPE_IPV6)
+        {
+          rkey->nexthop.u.ipv6_addr = nexthop->gate.ipv6;
+          inet_ntop(AF_INET6, &nexthop->gate.ipv6,
+                    nexthop_str, nexthop_str_len);
+        }
+    }
+
+  if ((nexthop->type == NEXTHOP_TYPE_IFNAME) ||
+      (nexthop->type == NEXTHOP_TYPE_IPV4_IFNAME) ||
+      (nexthop->type == NEXTHOP_TYPE_IPV6_IFNAME))
+    strncpy(rkey->ifname, nexthop->ifname, IF_NAMESIZE);
+}
+
+/*
+ * Return true if the local RIB route is of a protocol type whose routes
+ * are owned by the OVSDB route table.
+ */
+static bool
+zebra_rib_is_ovsdb_owned_route (struct rib *rib)
+{
+  /* Ignore any routes other than static. OSPF and BGP routes.
+   * Other protocols are not supported currently.*/
+  if ((rib->type != ZEBRA_ROUTE_STATIC &&
+      rib->type != ZEBRA_ROUTE_BGP &&
+      rib->type != ZEBRA_ROUTE_OSPF) ||
+      !rib->nexthop)
+    return false;
+
+  return true;
 }
 
 /* Find routes not in ovsdb and add it to list.
@@ -4184,12 +4604,7 @@ zebra_find_ovsdb_deleted_routes (afi_t afi, safi_t safi, u_int32_t id)
 
       RNODE_FOREACH_RIB (rn, rib)
         {
-	  /* Ignore any routes other than static. OSPF and BGP routes.
-	   * Other protocols are not supported currently.*/
-          if ((rib->type != ZEBRA_ROUTE_STATIC &&
-              rib->type != ZEBRA_ROUTE_BGP &&
-              rib->type != ZEBRA_ROUTE_OSPF) ||
-              !rib->nexthop)
+          if (!zebra_rib_is_ovsdb_owned_route(rib))
             continue;
 
 	  /* Loop through the nexthops for each route and add it to
@@ -4197,37 +4612,9 @@ zebra_find_ovsdb_deleted_routes (afi_t afi, safi_t safi, u_int32_t id)
 	   */
           for (nexthop = rib->nexthop; nexthop; nexthop = nexthop->next)
 	    {
-              memset(&rkey, 0, sizeof (struct zebra_route_key));
-              memset(prefix_str, 0, sizeof(prefix_str));
-              memset(nexthop_str, 0, sizeof(nexthop_str));
-
-              if (afi == AFI_IP)
-	        {
-                  rkey.prefix.u.ipv4_addr = rn->p.u.prefix4;
-                  rkey.prefix_len = rn->p.prefixlen;
-                  if (nexthop->type == NEXTHOP_TYPE_IPV4)
-		    {
-                      rkey.nexthop.u.ipv4_addr = nexthop->gate.ipv4;
-                      inet_ntop(AF_INET, &nexthop->gate.ipv4,
-                                nexthop_str, sizeof(nexthop_str));
-                    }
-                }
-	      else if (afi == AFI_IP6)
-	        {
-                  rkey.prefix.u.ipv6_addr = rn->p.u.prefix6;
-                  rkey.prefix_len = rn->p.prefixlen;
-                  if (nexthop->type == NEXTHOP_TYPE_IPV6)
-		    {
-                      rkey.nexthop.u.ipv6_addr = nexthop->gate.ipv6;
-                      inet_ntop(AF_INET6, &nexthop->gate.ipv6,
-                                nexthop_str, sizeof(nexthop_str));
-                    }
-                }
-
-              if ((nexthop->type == NEXTHOP_TYPE_IFNAME) ||
-                  (nexthop->type == NEXTHOP_TYPE_IPV4_IFNAME) ||
-                  (nexthop->type == NEXTHOP_TYPE_IPV6_IFNAME))
-                strncpy(rkey.ifname, nexthop->ifname, IF_NAMESIZE);
+              zebra_route_key_from_rib_nexthop(afi, rn, nexthop, &rkey,
+                                               nexthop_str,
+                                               sizeof(nexthop_str));
 
               if (VLOG_IS_DBG_ENABLED())
                 print_key(&rkey);
@@ -4235,6 +4622,7 @@ zebra_find_ovsdb_deleted_routes (afi_t afi, safi_t safi, u_int32_t id)
               if (!hash_get(zebra_route_hash, &rkey, NULL))
 	        {
                   zebra_route_list_add_data(rn, rib, nexthop);
+                  memset(prefix_str, 0, sizeof(prefix_str));
                   prefix2str(&rn->p, prefix_str, sizeof(prefix_str));
                   VLOG_DBG("Delete route, prefix %s, nexthop %s, interface %s",
                            prefix_str[0] ? prefix_str : "NONE",
@@ -4246,12 +4634,85 @@ zebra_find_ovsdb_deleted_routes (afi_t afi, safi_t safi, u_int32_t id)
     }
 }
 
-/* Find deleted route in ovsdb and remove from route table */
+/*
+ * Find the local RIB next-hop matching the route key of a deleted OVSDB
+ * next-hop row and add it to the list of routes to be deleted. Only the
+ * route node for the prefix in the key is looked up.
+ */
+static void
+zebra_find_ovsdb_deleted_route_key (afi_t afi, safi_t safi, u_int32_t id,
+                                    struct zebra_route_key *deleted_key)
+{
+  struct route_table *table;
+  struct route_node *rn;
+  struct rib *rib;
+  struct nexthop *nexthop;
+  struct zebra_route_key rkey;
+  struct prefix p;
+  char nexthop_str[256];
+
+  table = vrf_table (afi, safi, id);
+
+  if (!table)
+    return;
+
+  memset(&p, 0, sizeof(struct prefix));
+  p.prefixlen = deleted_key->prefix_len;
+  if (afi == AFI_IP)
+    {
+      p.family = AF_INET;
+      p.u.prefix4 = deleted_key->prefix.u.ipv4_addr;
+    }
+  else
+    {
+      p.family = AF_INET6;
+      p.u.prefix6 = deleted_key->prefix.u.ipv6_addr;
+    }
+
+  rn = route_node_lookup(table, &p);
+  if (!rn)
+    return;
+
+  RNODE_FOREACH_RIB (rn, rib)
+    {
+      if (!zebra_rib_is_ovsdb_owned_route(rib))
+        continue;
+
+      for (nexthop = rib->nexthop; nexthop; nexthop = nexthop->next)
+        {
+          zebra_route_key_from_rib_nexthop(afi, rn, nexthop, &rkey,
+                                           nexthop_str, sizeof(nexthop_str));
+
+          if (zebra_route_key_cmp(&rkey, deleted_key))
+            {
+              VLOG_DBG("Delete route, nexthop %s, interface %s",
+                       nexthop_str[0] ? nexthop_str : "NONE",
+                       nexthop->ifname ? nexthop->ifname : "NONE");
+              zebra_route_list_add_data(rn, rib, nexthop);
+            }
+        }
+    }
+
+  route_unlock_node(rn);
+}
+
+/*
+ * Find deleted route in ovsdb and remove from route table. This walks
+ * the complete OVSDB route table and the complete local RIB, so it is
+ * only used as a consistency check after restart and periodically.
+ * Regular route deletions are handled from the tracked next-hop row
+ * deletions in zebra_apply_route_changes.
+ */
 static void
 zebra_route_delete (void)
 {
   const struct ovsrec_route *route_row;
 
+  COVERAGE_INC(zebra_route_full_reconcile);
+
+  zebra_route_pipeline_flush();
+
+  zebra_route_hash_init();
   zebra_route_del_init();
   /* Add ovsdb route and nexthop in hash */
   OVSREC_ROUTE_FOR_EACH (route_row, idl)
@@ -4264,6 +4725,34 @@ zebra_route_delete (void)
 
   zebra_route_del_process();
   zebra_route_del_finish();
+  zebra_route_hash_finish();
+}
+
+/*
+ * Timer callback to periodically reconcile the local RIB against the
+ * OVSDB route table.
+ */
+static int
+zebra_route_consistency_check (struct thread *thread)
+{
+  zebra_route_consistency_check_thread = NULL;
+
+  /*
+   * Skip the check if the IDL is not in sync with OVSDB or if zebra is
+   * in the middle of publishing its own route updates.
+   */
+  if (!zebra_txn_count && ovsdb_idl_is_alive(idl) &&
+      !zebra_first_run_after_restart)
+    {
+      VLOG_DBG("Running the periodic route consistency check");
+      zebra_route_delete();
+    }
+
+  zebra_route_consistency_check_thread =
+      thread_add_timer(glob_zebra_ovs.master, zebra_route_consistency_check,
+                       NULL, ZEBRA_ROUTE_CONSISTENCY_CHECK_INTERVAL);
+
+  return 0;
 }
 
 /* Convert OVSDB protocol string to Zebra constants
@@ -4347,6 +4836,12 @@ zebra_handle_static_route_change (const struct ovsrec_route *route)
    */
   apply_mask(&p);
 
+  /*
+   * Have the next port event resolve the next-hops of this route into
+   * the L3 port reverse index.
+   */
+  zebra_l3_port_route_index_add_unresolved(&p);
+
   /*
    * Extract the route's address-family
    */
@@ -4481,1941 +4976,3028 @@ zebra_handle_static_route_change (const struct ovsrec_route *route)
 }
 
 /*
- * This function handles route update from routing protocols
+ * OVSDB to RIB route pipeline. In the pipeline mode the protocol routes
+ * read from OVSDB are not added to the RIB inline. The main thread copies
+ * the route row into a pipeline entry and queues it to the pipeline worker
+ * thread, which parses and validates the prefix and the next-hops into a
+ * pre-built route descriptor. The worker wakes up the main thread through
+ * a pipe and the main thread links the descriptors into the RIB in slices
+ * of ZEBRA_ROUTE_PIPELINE_LINK_SLICE routes, so that a large BGP or OSPF
+ * route injection does not hold up the zebra event loop.
+ *
+ * The worker thread must not touch the IDL, the RIB or the quagga memory
+ * statistics, so it only works on the strings copied into the entry and
+ * allocates nothing.
+ */
+struct zebra_route_pipeline_nexthop
+{
+  char *ip_address;              /* Next-hop address string or NULL */
+  char *ifname;                  /* Next-hop port name or NULL */
+  int family;                    /* Family of the parsed address, 0 if
+                                    the address is not valid */
+  struct ipv4v6_addr addr;       /* Parsed next-hop address */
+};
+
+struct zebra_route_pipeline_entry
+{
+  struct zebra_route_pipeline_entry *next;
+  char *prefix_str;              /* Route prefix string from OVSDB */
+  bool is_ipv6;
+  int type;
+  safi_t safi;
+  u_char distance;
+  u_int32_t metric;
+  struct uuid route_uuid;        /* UUID of the OVSDB route row */
+  size_t n_nexthops;
+  struct zebra_route_pipeline_nexthop *nexthops;
+  bool valid;                    /* Prefix parsed by the worker */
+  struct prefix p;               /* Prefix parsed by the worker */
+};
+
+struct zebra_route_pipeline_queue
+{
+  struct zebra_route_pipeline_entry *head;
+  struct zebra_route_pipeline_entry *tail;
+  size_t count;
+};
+
+struct zebra_route_pipeline_stats zebra_route_pipeline_stats;
+
+/*
+ * The input and the output queues and the worker state are shared with
+ * the worker thread and protected by the pipeline mutex.
  */
+static pthread_mutex_t zebra_route_pipeline_mutex = PTHREAD_MUTEX_INITIALIZER;
+static pthread_cond_t zebra_route_pipeline_work_cond =
+                                                PTHREAD_COND_INITIALIZER;
+static pthread_cond_t zebra_route_pipeline_idle_cond =
+                                                PTHREAD_COND_INITIALIZER;
+static struct zebra_route_pipeline_queue zebra_route_pipeline_input;
+static struct zebra_route_pipeline_queue zebra_route_pipeline_output;
+static bool zebra_route_pipeline_worker_busy = false;
+static bool zebra_route_pipeline_stopping = false;
+
+/* Main thread only state */
+static bool zebra_route_pipeline_started = false;
+static pthread_t zebra_route_pipeline_thread;
+static int zebra_route_pipeline_fds[2] = { -1, -1 };
+static struct zebra_route_pipeline_queue zebra_route_pipeline_link_queue;
+static size_t zebra_route_pipeline_outstanding = 0;
+static struct thread *zebra_route_pipeline_read_thread = NULL;
+static struct thread *zebra_route_pipeline_link_thread = NULL;
+
 static void
-zebra_handle_proto_route_change (const struct ovsrec_route *route,
-                                 int from)
+zebra_route_pipeline_queue_append (struct zebra_route_pipeline_queue *queue,
+                                   struct zebra_route_pipeline_entry *entry)
 {
-  int safi = ovsdb_safi_to_zebra_safi(route->sub_address_family);
-  int ret;
-  struct prefix p;
+  entry->next = NULL;
 
-  VLOG_DBG("Route change for %s", route->prefix);
-  ret = str2prefix (route->prefix, &p);
-  if (ret <= 0)
+  if (queue->tail)
+    queue->tail->next = entry;
+  else
+    queue->head = entry;
+
+  queue->tail = entry;
+  queue->count++;
+}
+
+/*
+ * Move all the entries of the 'src' queue to the end of the 'dst' queue.
+ */
+static void
+zebra_route_pipeline_queue_splice (struct zebra_route_pipeline_queue *dst,
+                                   struct zebra_route_pipeline_queue *src)
+{
+  if (!src->head)
+    return;
+
+  if (dst->tail)
+    dst->tail->next = src->head;
+  else
+    dst->head = src->head;
+
+  dst->tail = src->tail;
+  dst->count += src->count;
+  memset(src, 0, sizeof(struct zebra_route_pipeline_queue));
+}
+
+static struct zebra_route_pipeline_entry *
+zebra_route_pipeline_queue_pop (struct zebra_route_pipeline_queue *queue)
+{
+  struct zebra_route_pipeline_entry *entry = queue->head;
+
+  if (!entry)
+    return NULL;
+
+  queue->head = entry->next;
+  if (!queue->head)
+    queue->tail = NULL;
+
+  queue->count--;
+  entry->next = NULL;
+
+  return entry;
+}
+
+static void
+zebra_route_pipeline_entry_free (struct zebra_route_pipeline_entry *entry)
+{
+  size_t i;
+
+  for (i = 0; i < entry->n_nexthops; i++)
     {
-      VLOG_ERR("Malformed Dest address=%s", route->prefix);
-      return;
+      free(entry->nexthops[i].ip_address);
+      free(entry->nexthops[i].ifname);
     }
 
-  apply_mask(&p);
+  free(entry->nexthops);
+  free(entry->prefix_str);
+  free(entry);
+}
 
-  /*
-   * Invoke internal zebra functions to add this route to RIB
-   */
-  if (!strcmp(route->address_family, OVSREC_ROUTE_ADDRESS_FAMILY_IPV4))
+/*
+ * Parse a prefix string into 'p'. This is the same conversion as
+ * str2prefix() followed by apply_mask(), but it does not allocate any
+ * memory so that it can be used from the pipeline worker thread.
+ */
+static bool
+zebra_route_pipeline_parse_prefix (const char *prefix_str, bool is_ipv6,
+                                   struct prefix *p)
+{
+  char addr_str[INET6_ADDRSTRLEN + 1];
+  const char *slash;
+  char *end;
+  size_t addr_len;
+  long prefix_len;
+  long max_len = is_ipv6 ? IPV6_MAX_BITLEN : IPV4_MAX_BITLEN;
+
+  memset(p, 0, sizeof(struct prefix));
+
+  slash = strchr(prefix_str, '/');
+  addr_len = slash ? (size_t)(slash - prefix_str) : strlen(prefix_str);
+  if (addr_len >= sizeof(addr_str))
+    return false;
+
+  memcpy(addr_str, prefix_str, addr_len);
+  addr_str[addr_len] = '\0';
+
+  if (slash)
     {
-      VLOG_DBG("Got ipv4 add route");
-      zebra_add_route(false, &p, from, safi, route);
+      prefix_len = strtol(slash + 1, &end, 10);
+      if (end == slash + 1 || *end != '\0' ||
+          prefix_len < 0 || prefix_len > max_len)
+        return false;
     }
-#ifdef HAVE_IPV6
-  else if (!strcmp(route->address_family, OVSREC_ROUTE_ADDRESS_FAMILY_IPV6))
+  else
+    prefix_len = max_len;
+
+  if (is_ipv6)
     {
-     VLOG_DBG("Got ipv6 add route");
-      zebra_add_route(true, &p, from, safi, route);
+      p->family = AF_INET6;
+      if (inet_pton(AF_INET6, addr_str, &p->u.prefix6) != 1)
+        return false;
     }
-#endif
+  else
+    {
+      p->family = AF_INET;
+      if (inet_pton(AF_INET, addr_str, &p->u.prefix4) != 1)
+        return false;
+    }
+
+  p->prefixlen = prefix_len;
+  apply_mask(p);
+
+  return true;
 }
 
 /*
- * This function handles the connected route notifications from OVSDB.
- * For the connected routes, we take one of the two actions:-
- *
- * 1. If we get a connected route add notification when zebra had not
- *    restarted, then zebra records the route's UUID in the
- *    corresponding L3 port node in the port cache.
- * 2. If the connected add notification during zebra restart, then
- *    we add the connected route's UUID in a hash table for post
- *    restart clean-up and updation of connected routes.
+ * Pipeline stage one, run on the worker thread. Parse the prefix and the
+ * next-hop addresses of the entry.
  */
 static void
-zebra_handle_connected_route_change (const struct ovsrec_route* route)
+zebra_route_pipeline_parse (struct zebra_route_pipeline_entry *entry)
 {
-  struct ovsrec_port* ovsrec_port;
-  struct zebra_l3_port* l3_port;
-  struct uuid* route_old_uuid;
-  struct shash* route_uuid_hash;
-  struct uuid* ovsrec_route_uuid = NULL;
-  bool is_v4;
+  struct zebra_route_pipeline_nexthop *nexthop;
+  size_t i;
 
-  /*
-   * If the connected route pointer is NULL, then return from this
-   * function.
-   */
-  if (!route)
+  entry->valid = zebra_route_pipeline_parse_prefix(entry->prefix_str,
+                                                   entry->is_ipv6,
+                                                   &entry->p);
+  if (!entry->valid)
     return;
 
-  /*
-   * If this route is not a connected route, then return from this
-   * function.
-   */
-  if (!(route->from) ||
-      ovsdb_proto_to_zebra_proto(route->from) != ZEBRA_ROUTE_CONNECT)
+  for (i = 0; i < entry->n_nexthops; i++)
     {
-      VLOG_DBG("This is not a connected route");
-      return;
-    }
+      nexthop = &entry->nexthops[i];
 
-  /*
-   * If the route does not have a valid next-hop or if the number
-   * of next-hops are greater than 1, then this is not a valid
-   * connected route.
-   */
-  if (!(route->n_nexthops) || (route->n_nexthops > 1))
-    {
-      VLOG_DBG("No valid next-hops for the connected route");
-      return;
-    }
+      if (nexthop->ifname || !nexthop->ip_address)
+        continue;
 
-  /*
-   * If the next-hop port is not avlid, then return from this function.
-   */
-  if (!(route->nexthops[0]->n_ports))
-    {
-      VLOG_DBG("No valid port next-hop for the connected route");
-      return;
+      if (inet_pton(AF_INET, nexthop->ip_address,
+                    &nexthop->addr.u.ipv4_addr) == 1)
+        nexthop->family = AF_INET;
+      else if (inet_pton(AF_INET6, nexthop->ip_address,
+                         &nexthop->addr.u.ipv6_addr) == 1)
+        nexthop->family = AF_INET6;
     }
+}
 
-  VLOG_DBG("Looking up the L3 cache for connected route's %s next-hop %s",
-           route->prefix, route->nexthops[0]->ports[0]->name);
+/*
+ * Wake up the main thread to link the parsed routes. Called with the
+ * pipeline mutex held.
+ */
+static void
+zebra_route_pipeline_wakeup (void)
+{
+  char byte = 0;
 
   /*
-   * Look up the L3 port node using the next-hop's port name
+   * The pipe is non-blocking. If it is full, the main thread has not
+   * drained the earlier wakeups yet and will see the new routes anyway.
    */
-  l3_port = zebra_search_port_name_in_l3_ports_hash(
-                                &zebra_cached_l3_ports,
-                                route->nexthops[0]->ports[0]->name);
+  if (write(zebra_route_pipeline_fds[1], &byte, 1) < 0 &&
+      errno != EAGAIN && errno != EWOULDBLOCK)
+    VLOG_ERR("Failed to wake up the route pipeline: %s",
+             ovs_strerror(errno));
+}
 
-  /*
-   * If we do not find a valid L3 port node, then return from this
-   * function.
-   */
-  if (!l3_port)
-    {
-      VLOG_DBG("Port %s not found in the hash",
-               route->nexthops[0]->ports[0]->name);
-      return;
-    }
+/*
+ * Pipeline worker thread. Take all the queued entries at once, parse
+ * them without holding the mutex and hand them over to the main thread.
+ */
+static void *
+zebra_route_pipeline_worker (void *arg OVS_UNUSED)
+{
+  struct zebra_route_pipeline_queue work;
+  struct zebra_route_pipeline_entry *entry;
+  unsigned long long invalid;
+  bool if_wakeup;
 
-  /*
-   * Find the IPv4 or IPv6 route UUID hash table.
-   */
-  if (!strcmp(route->address_family, OVSREC_ROUTE_ADDRESS_FAMILY_IPV4))
-    {
-      route_uuid_hash = &(l3_port->ip4_connected_routes_uuid);
-      is_v4 = true;
-    }
-  else
+  pthread_mutex_lock(&zebra_route_pipeline_mutex);
+
+  for (;;)
     {
-      route_uuid_hash = &(l3_port->ip6_connected_routes_uuid);
-      is_v4 = false;
-    }
+      while (!zebra_route_pipeline_input.head &&
+             !zebra_route_pipeline_stopping)
+        pthread_cond_wait(&zebra_route_pipeline_work_cond,
+                          &zebra_route_pipeline_mutex);
 
-  /*
-   * Find the connected route's uuid from the hash table.
-   */
-  route_old_uuid = (struct uuid*)shash_find_data(route_uuid_hash,
-                                                 route->prefix);
+      if (zebra_route_pipeline_stopping)
+        break;
 
-  /*
-   * In case of non-restart case, update connected route's UUID with the new
-   * UUID gotten from OVSDB.
-   */
-  if (!zebra_first_run_after_restart)
-    {
-      /*
-       * This is an error condition when the route's temporrary UUID is not
-       * found in the L3 port node.
-       */
-      if (!route_old_uuid)
+      work = zebra_route_pipeline_input;
+      memset(&zebra_route_pipeline_input, 0,
+             sizeof(struct zebra_route_pipeline_queue));
+      zebra_route_pipeline_worker_busy = true;
+
+      pthread_mutex_unlock(&zebra_route_pipeline_mutex);
+
+      invalid = 0;
+      for (entry = work.head; entry; entry = entry->next)
         {
-          VLOG_DBG("The connected route UUID does not exist in the L3 cache");
-          return;
+          zebra_route_pipeline_parse(entry);
+          if (!entry->valid)
+            invalid++;
         }
 
-      VLOG_DBG("         Old connected route UUID %s",
-              zebra_dump_ovsdb_uuid(route_old_uuid));
+      pthread_mutex_lock(&zebra_route_pipeline_mutex);
 
-      VLOG_DBG("         New connected route UUID %s",
-               zebra_dump_ovsdb_uuid(
-                (struct uuid*)&(OVSREC_IDL_GET_TABLE_ROW_UUID(route))));
+      zebra_route_pipeline_stats.parsed += work.count;
+      zebra_route_pipeline_stats.invalid += invalid;
 
       /*
-       * If the cached connected route's UUID is same as the connected route's
-       * UUID in OVSDB, then there is no need to update the UUID.
+       * The main thread drains the complete output queue when it is
+       * woken up, so it only needs a wakeup if the queue was empty.
        */
-      if (!memcmp(route_old_uuid, &OVSREC_IDL_GET_TABLE_ROW_UUID(route),
-                  sizeof(struct uuid)))
-        {
-          VLOG_DBG("The route's old UUID is same as the route's new UUID");
-          return;
-        }
+      if_wakeup = (zebra_route_pipeline_output.head == NULL);
+      zebra_route_pipeline_queue_splice(&zebra_route_pipeline_output, &work);
+      zebra_route_pipeline_worker_busy = false;
+      pthread_cond_broadcast(&zebra_route_pipeline_idle_cond);
 
-      /*
-       * Copy the uuid of the connected route in OVSDB for future references.
-       */
-      memcpy(route_old_uuid, &OVSREC_IDL_GET_TABLE_ROW_UUID(route),
-             sizeof(struct uuid));
+      if (if_wakeup)
+        zebra_route_pipeline_wakeup();
     }
-  else
-    {
-      /*
-       * In case this is a connected route notification after restart,
-       * store the UUID in a hash that will be used for cleaning up
-       * stale connected routes from OVCDB and program the new connected
-       * routes.
-       */
-      ovsrec_route_uuid = (struct uuid*)xmalloc(sizeof(struct uuid));
 
-      memcpy(ovsrec_route_uuid, &OVSREC_IDL_GET_TABLE_ROW_UUID(route),
-             sizeof(struct uuid));
+  pthread_mutex_unlock(&zebra_route_pipeline_mutex);
 
-      /*
-       * Add the connected route UUID into the clean-up cache
-       */
-      if (!shash_add(&connected_routes_hash_after_restart,
-                     route->prefix, ovsrec_route_uuid))
-        {
-          VLOG_ERR("Unable to add the route UUID for "
-                   "route %s to connected route hash after restart",
-                   route->prefix);
-          free(ovsrec_route_uuid);
-        }
-      else
-        {
-          VLOG_DBG("Successfully added the route UUID for "
-                   "route %s to connected route hash after restart",
-                   route->prefix);
-        }
-    }
+  return NULL;
 }
 
 /*
- * A route has been modified or added. Update the local RIB structures
- * accordingly.
+ * Pipeline stage two, run on the main thread. Build the RIB entry from
+ * the pre-built route descriptor and add it to the RIB.
  */
 static void
-zebra_handle_route_change (const struct ovsrec_route *route)
+zebra_route_pipeline_link_entry (struct zebra_route_pipeline_entry *entry)
 {
-  int from_protocol = ovsdb_proto_to_zebra_proto(route->from);
+  struct zebra_route_pipeline_nexthop *nexthop;
+  struct rib *rib;
+  struct uuid *route_uuid;
+  size_t i;
+
+  if (!entry->valid)
+    {
+      VLOG_ERR("Malformed Dest address=%s", entry->prefix_str);
+      return;
+    }
+
+  rib = XCALLOC (MTYPE_RIB, sizeof (struct rib));
+
+  rib->type = entry->type;
+  rib->flags = 0;
+  rib->uptime = time (NULL);
+  rib->nexthop_num = 0;
+
   /*
-   * OVSDB stores the almost everything as a string. Zebra uses integers.
-   * If we convert the string to integer initially, we can avoid multiple
-   * string operations further.
+   * Cache the route's UUID within for use when setting and unsetting
+   * the selected bits on the route
    */
-  switch (from_protocol)
+  route_uuid = (struct uuid*)xzalloc(sizeof(struct uuid));
+  memcpy(route_uuid, &entry->route_uuid, sizeof(struct uuid));
+  rib->ovsdb_route_row_uuid_ptr = (void*) route_uuid;
+
+  for (i = 0; i < entry->n_nexthops; i++)
     {
-    case ZEBRA_ROUTE_CONNECT:
-      VLOG_DBG("Processing a connected route for prefix %s\n",route->prefix);
-      log_event("ZEBRA_ROUTE_ADD", EV_KV("prefix", "%s", route->prefix),
-                EV_KV("protocol", "%s", route->from));
-      /* This is a directly connected route */
-      zebra_handle_connected_route_change(route);
-      break;
+      nexthop = &entry->nexthops[i];
 
-    case ZEBRA_ROUTE_STATIC:
-      VLOG_DBG("Adding a static route for prefix %s\n",route->prefix);
-      log_event("ZEBRA_ROUTE_ADD", EV_KV("prefix", "%s", route->prefix),
-                EV_KV("protocol", "%s", route->from));
-      /* This is a static route */
-      zebra_handle_static_route_change(route);
-      break;
+      if (nexthop->ifname)
+        {
+          log_event("ZEBRA_ROUTE_ADD_NEXTHOP_EVENTS", EV_KV("prefix", "%s",
+                    entry->prefix_str), EV_KV("nexthop", "%s",
+                    nexthop->ifname));
+          nexthop_ifname_add(rib, nexthop->ifname);
+        }
+      else if (nexthop->family == AF_INET)
+        {
+          log_event("ZEBRA_ROUTE_ADD_NEXTHOP_EVENTS", EV_KV("prefix", "%s",
+                    entry->prefix_str), EV_KV("nexthop", "%s",
+                    nexthop->ip_address));
+          nexthop_ipv4_add(rib, &nexthop->addr.u.ipv4_addr, NULL);
+        }
+      else if (nexthop->family == AF_INET6)
+        {
+          log_event("ZEBRA_ROUTE_ADD_NEXTHOP_EVENTS", EV_KV("prefix", "%s",
+                    entry->prefix_str), EV_KV("nexthop", "%s",
+                    nexthop->ip_address));
+          nexthop_ipv6_add(rib, &nexthop->addr.u.ipv6_addr);
+        }
+      else
+        VLOG_DBG("Invalid next-hop ip %s",
+                 nexthop->ip_address ? nexthop->ip_address : "NONE");
+    }
 
-    case ZEBRA_ROUTE_BGP:
-      VLOG_DBG("Adding a Protocol route for prefix %s protocol %s\n",
-                route->prefix, route->from);
-      log_event("ZEBRA_ROUTE_ADD", EV_KV("prefix", "%s", route->prefix),
-                EV_KV("protocol", "%s",route->from));
-      /* This is a protocol route */
-      zebra_handle_proto_route_change(route, from_protocol);
-      break;
+  rib->distance = entry->distance;
+  rib->metric = entry->metric;
+  rib->table = 0;
 
-   case ZEBRA_ROUTE_OSPF:
-      VLOG_DBG("Adding a Protocol route for prefix %s protocol %s\n",
-                route->prefix, route->from);
-      log_event("ZEBRA_ROUTE_ADD", EV_KV("prefix", "%s", route->prefix),
-                EV_KV("protocol", "%s",route->from));
-      /* This is a protocol route */
-      zebra_handle_proto_route_change(route, from_protocol);
+#ifdef HAVE_IPV6
+  if (entry->is_ipv6)
+    rib_add_ipv6_multipath((struct prefix_ipv6 *)&entry->p, rib,
+                           entry->safi);
+  else
+#endif
+    rib_add_ipv4_multipath((struct prefix_ipv4 *)&entry->p, rib,
+                           entry->safi);
+}
 
-    case ZEBRA_ROUTE_MAX:
-    default:
-      VLOG_ERR("Unknown protocol");
-    }
+/*
+ * Move the routes parsed by the worker to the main thread link queue.
+ */
+static void
+zebra_route_pipeline_collect (void)
+{
+  pthread_mutex_lock(&zebra_route_pipeline_mutex);
+  zebra_route_pipeline_queue_splice(&zebra_route_pipeline_link_queue,
+                                    &zebra_route_pipeline_output);
+  pthread_mutex_unlock(&zebra_route_pipeline_mutex);
 }
 
-/* route add/delete in ovsdb */
+static int zebra_route_pipeline_link_cb (struct thread *thread);
+
+/*
+ * Link up to 'max_routes' routes from the link queue into the RIB, or
+ * all of them if 'max_routes' is 0. If routes are left in the queue,
+ * schedule an event to link the next slice after the other pending
+ * events of the main thread have been served.
+ */
 static void
-zebra_apply_route_changes (void)
+zebra_route_pipeline_link (size_t max_routes)
 {
-  const struct ovsrec_route *route_first;
-  const struct ovsrec_route *route_row;
-  const struct ovsrec_nexthop *nh_first;
-  const struct ovsrec_nexthop *nh_row;
+  struct zebra_route_pipeline_entry *entry;
+  size_t linked = 0;
 
-  route_first = ovsrec_route_first(idl);
-  nh_first = ovsrec_nexthop_first(idl);
-  if (route_first == NULL)
+  while ((!max_routes || linked < max_routes) &&
+         (entry = zebra_route_pipeline_queue_pop(
+                                &zebra_route_pipeline_link_queue)))
     {
-      VLOG_DBG("No rows in ROUTE table");
-      /* Possible last row gets deleted */
-      zebra_route_delete();
-      return;
+      zebra_route_pipeline_link_entry(entry);
+      zebra_route_pipeline_entry_free(entry);
+      zebra_route_pipeline_outstanding--;
+      linked++;
     }
 
-  /*
-   * Check if anything changed in the route table and the next-hop table.
-   * If nothing changed then return from this function.
-   */
-  if ( (!OVSREC_IDL_ANY_TABLE_ROWS_MODIFIED(route_first, idl_seqno)) &&
-     (!OVSREC_IDL_ANY_TABLE_ROWS_DELETED(route_first, idl_seqno))  &&
-     (!OVSREC_IDL_ANY_TABLE_ROWS_INSERTED(route_first, idl_seqno)) &&
-     (!OVSREC_IDL_ANY_TABLE_ROWS_MODIFIED(nh_first, idl_seqno)) &&
-     (!OVSREC_IDL_ANY_TABLE_ROWS_DELETED(nh_first, idl_seqno))  &&
-     (!OVSREC_IDL_ANY_TABLE_ROWS_INSERTED(nh_first, idl_seqno)))
-    {
-      VLOG_DBG("No modification in ROUTE table");
-      return;
-    }
+  zebra_route_pipeline_stats.linked += linked;
 
-  if ( (OVSREC_IDL_ANY_TABLE_ROWS_MODIFIED(route_first, idl_seqno)) ||
-       (OVSREC_IDL_ANY_TABLE_ROWS_INSERTED(route_first, idl_seqno)) ||
-        (OVSREC_IDL_ANY_TABLE_ROWS_MODIFIED(nh_first, idl_seqno)) ||
-       (OVSREC_IDL_ANY_TABLE_ROWS_INSERTED(nh_first, idl_seqno)) )
-    {
-      VLOG_DBG("Some modification or inserts in ROUTE table");
+  if (zebra_route_pipeline_link_queue.head &&
+      !zebra_route_pipeline_link_thread)
+    zebra_route_pipeline_link_thread =
+        thread_add_event(glob_zebra_ovs.master, zebra_route_pipeline_link_cb,
+                         NULL, 0);
+}
 
-      OVSREC_ROUTE_FOR_EACH (route_row, idl)
-        {
-          if(!(route_row->nexthops))
-            {
-              VLOG_DBG("Null next hop array");
-              continue;
-            }
+static int
+zebra_route_pipeline_link_cb (struct thread *thread)
+{
+  zebra_route_pipeline_link_thread = NULL;
+  zebra_route_pipeline_link(ZEBRA_ROUTE_PIPELINE_LINK_SLICE);
 
-          nh_row = route_row->nexthops[0];
-          if (nh_row == NULL)
-            {
-              VLOG_DBG("Null next hop");
-              continue;
-            }
+  return 0;
+}
 
-          if ( (OVSREC_IDL_IS_ROW_INSERTED(route_row, idl_seqno)) ||
-               (OVSREC_IDL_IS_ROW_MODIFIED(route_row, idl_seqno)) ||
-               (is_route_nh_rows_modified(route_row)) )
-            {
-              VLOG_DBG("Row modification or inserts in ROUTE table "
-                       "for route %s\n", route_row->prefix);
-              zebra_handle_route_change(route_row);
-            }
-        }
+/*
+ * Read callback for the pipeline wakeup pipe.
+ */
+static int
+zebra_route_pipeline_read_cb (struct thread *thread)
+{
+  char buf[64];
 
-      /*
-       * If this is the first OVSDB reconfigure run after restart, then
-       * check if there is work queued for the zebra backend thread. If there
-       * is work to be done by worker thread, then delay the cleanup of the
-       * zebra routes from the kernel until the worker thread has processed
-       * all OVSDB route upadtes. If there are no OVSDB route updates for the
-       * backend zebra threads, then cleanup the kernel inline.
-       */
-      if (zebra_first_run_after_restart)
-        {
-          VLOG_DBG("The size of the internal rib queue is %u",
-                   zebrad.mq->size);
+  zebra_route_pipeline_read_thread = NULL;
 
-          if (zebrad.mq->size)
-            {
-              VLOG_DBG("Since there are entries in the queue to process. "
-                        "Set the kernel cleanup flag");
-              zebra_cleanup_kernel_after_restart = true;
-            }
-          else
-            {
-              VLOG_DBG("No routes within OVSDB route table for zebra to "
-                        "reprogram in kernel. Cleanup the kernel");
-              cleanup_kernel_routes_after_restart();
-            }
-        }
-    }
+  while (read(zebra_route_pipeline_fds[0], buf, sizeof(buf)) > 0)
+    ;
 
-  if ( (OVSREC_IDL_ANY_TABLE_ROWS_DELETED(route_first, idl_seqno) ) ||
-       (is_rib_nh_rows_deleted(route_first)) )
-    {
-      VLOG_DBG("Deletes in RIB table");
-      zebra_route_delete();
-    }
+  zebra_route_pipeline_collect();
+  zebra_route_pipeline_link(ZEBRA_ROUTE_PIPELINE_LINK_SLICE);
+
+  zebra_route_pipeline_read_thread =
+      thread_add_read(glob_zebra_ovs.master, zebra_route_pipeline_read_cb,
+                      NULL, zebra_route_pipeline_fds[0]);
+
+  return 0;
 }
 
 /*
- * This function handles the interface UP/DOWN events. This function
- * eventually marks the next-hops/routes as selected or unselected.
+ * Wait for the worker to parse all the queued routes and link all of
+ * them into the RIB. This is needed before any code which looks up the
+ * OVSDB owned routes in the RIB, for example to delete them, so that the
+ * route deletes are not applied ahead of the route adds still in the
+ * pipeline.
  */
 static void
-zebra_handle_interface_admin_state_changes (void)
+zebra_route_pipeline_flush (void)
 {
-  const struct ovsrec_interface *interface_row = NULL;
-  bool int_up = false;
-  struct smap user_config;
-  const char *admin_status;
+  if (!zebra_route_pipeline_outstanding)
+    return;
 
-  zebra_init_if_port_active_state_changed();
+  VLOG_DBG("Flushing %zu routes in the route pipeline",
+           zebra_route_pipeline_outstanding);
 
-  /*
-   * Check which interface admin state column got
-   * modified.
-   */
-  if (OVSREC_IDL_IS_COLUMN_MODIFIED(
-             ovsrec_interface_col_admin_state, idl_seqno))
-    {
-      OVSREC_INTERFACE_FOR_EACH (interface_row, idl)
-        {
-          /*
-           * Create a transaction for any IDL route updates to OVSDB
-           * from the zebra main thread for updating the selected bit
-           * pn the connected routes.
-           */
-          zebra_create_txn();
+  zebra_route_pipeline_stats.flushes++;
 
-          /*
-           * Check if the interface row changed.
-           */
-          if (OVSREC_IDL_IS_ROW_MODIFIED(interface_row, idl_seqno))
-            {
-              VLOG_DBG("Got a interface admin state modified for "
-                       "interface %s to state %s\n",
-                       interface_row->name,
-                       interface_row->admin_state);
-              log_event("ZEBRA_INTERFACE", EV_KV("interface_name", "%s",
-                        interface_row->name),EV_KV("admin_state", "%s",
-                        interface_row->admin_state));
+  pthread_mutex_lock(&zebra_route_pipeline_mutex);
+  while (zebra_route_pipeline_input.head || zebra_route_pipeline_worker_busy)
+    pthread_cond_wait(&zebra_route_pipeline_idle_cond,
+                      &zebra_route_pipeline_mutex);
+  zebra_route_pipeline_queue_splice(&zebra_route_pipeline_link_queue,
+                                    &zebra_route_pipeline_output);
+  pthread_mutex_unlock(&zebra_route_pipeline_mutex);
 
-              /*
-               * Update the L3 port cache with the interface's admin
-               * state.
-               */
-              zebra_update_port_active_state(interface_row);
-            }
+  zebra_route_pipeline_link(0);
+}
 
-          /*
-           * Since there are further routes to process for the
-           * main thread, we should try to see if there are
-           * MAX_ZEBRA_TXN_COUNT route updates to OVSDB at this time.
-           * In this case we should publish the route updates to OVSDB.
-           */
-          zebra_finish_txn(false);
-        }
+/*
+ * Create the wakeup pipe and start the pipeline worker thread.
+ */
+static bool
+zebra_route_pipeline_start (void)
+{
+  int error;
 
-      /*
-       * Since there are no further routes to process for the main thread,
-       * we should submit all the outstanding route updates to OVSDB at this
-       * time.
-       */
-      zebra_finish_txn(true);
+  if (zebra_route_pipeline_started)
+    return true;
+
+  if (!glob_zebra_ovs.master)
+    {
+      VLOG_ERR("Zebra event loop is not initialized, cannot start the "
+               "route pipeline");
+      return false;
     }
 
-  /*
-   * If some L3 port became active or iactive due to interface unshut or
-   * shut, then walk all zebra routes and mark the appropriate
-   * next-hops/routes as selected or unselected in the OVSDB.
-   */
-  zebra_find_routes_with_updated_ports_state(AFI_IP, SAFI_UNICAST, 0,
-                                        "L3 interface state change");
-  zebra_find_routes_with_updated_ports_state(AFI_IP6, SAFI_UNICAST, 0,
-                                        "L3 interface state change");
+  if (pipe(zebra_route_pipeline_fds) < 0)
+    {
+      VLOG_ERR("Failed to create the route pipeline pipe: %s",
+               ovs_strerror(errno));
+      return false;
+    }
 
-  zebra_cleanup_if_port_active_state_changed();
+  fcntl(zebra_route_pipeline_fds[0], F_SETFL, O_NONBLOCK);
+  fcntl(zebra_route_pipeline_fds[1], F_SETFL, O_NONBLOCK);
+
+  error = pthread_create(&zebra_route_pipeline_thread, NULL,
+                         zebra_route_pipeline_worker, NULL);
+  if (error)
+    {
+      VLOG_ERR("Failed to create the route pipeline thread: %s",
+               ovs_strerror(error));
+      close(zebra_route_pipeline_fds[0]);
+      close(zebra_route_pipeline_fds[1]);
+      zebra_route_pipeline_fds[0] = zebra_route_pipeline_fds[1] = -1;
+      return false;
+    }
+
+  zebra_route_pipeline_read_thread =
+      thread_add_read(glob_zebra_ovs.master, zebra_route_pipeline_read_cb,
+                      NULL, zebra_route_pipeline_fds[0]);
+
+  zebra_route_pipeline_started = true;
+  VLOG_INFO("Started the OVSDB to RIB route pipeline");
+
+  return true;
 }
 
 /*
- * Function to identify IPv4 router-id from the available port list.
- * It first checks if the current value of active_router_id is present in the
- * L3 port cache, if its present then it does not generate new router-id.
- * If new router-id to be generated then it first checks for any available
- * loopback interface and use that as router-id. If no loopback interface
- * available then it picks the first available L3 port IP4 address as
- * active router-id.
+ * Stop the pipeline worker thread. The pipeline must have been flushed.
  */
-char *
-zebra_ovsdb_get_router_id(char *active_router_id)
+static void
+zebra_route_pipeline_stop (void)
 {
-  struct shash_node *node, *next;
-  struct zebra_l3_port* l3_port = NULL;
-  char *int_ip_addr = NULL;
-  char *l3_ip4_address_prefix = NULL;
-  char *l3_ip4_address = NULL;
-  char *router_id = NULL;
-  bool found_loopback = false;
-  bool active_router_id_present = false;
-  int interface_index;
-  const struct ovsrec_port* ovsrec_port = NULL;
-  const struct ovsrec_interface* interface = NULL;
+  if (!zebra_route_pipeline_started)
+    return;
 
-  if (!shash_count(&zebra_cached_l3_ports))
+  pthread_mutex_lock(&zebra_route_pipeline_mutex);
+  zebra_route_pipeline_stopping = true;
+  pthread_cond_signal(&zebra_route_pipeline_work_cond);
+  pthread_mutex_unlock(&zebra_route_pipeline_mutex);
+
+  pthread_join(zebra_route_pipeline_thread, NULL);
+
+  THREAD_OFF(zebra_route_pipeline_read_thread);
+  THREAD_OFF(zebra_route_pipeline_link_thread);
+
+  close(zebra_route_pipeline_fds[0]);
+  close(zebra_route_pipeline_fds[1]);
+  zebra_route_pipeline_fds[0] = zebra_route_pipeline_fds[1] = -1;
+
+  zebra_route_pipeline_stopping = false;
+  zebra_route_pipeline_started = false;
+}
+
+/*
+ * Enable or disable the route pipeline mode. When the pipeline is
+ * disabled, the routes still in the pipeline are linked into the RIB
+ * before returning.
+ */
+void
+zebra_route_pipeline_set_enabled (bool enable)
+{
+  if (enable == zebra_route_pipeline_stats.enabled)
+    return;
+
+  if (enable)
     {
-      VLOG_ERR("The L3 port hash table is empty. Can not get the router id");
-      return NULL;
+      if (!zebra_route_pipeline_start())
+        return;
     }
-
-  /*
-   * Check if active_router_id present in current available L3 port cache
-   */
-  if (active_router_id != NULL)
+  else
     {
-      SHASH_FOR_EACH_SAFE (node, next, &zebra_cached_l3_ports)
-        {
-          if (!(node->data))
-            {
-              VLOG_DBG("No node data found\n");
-              continue;
-            }
+      zebra_route_pipeline_flush();
+      zebra_route_pipeline_stop();
+    }
 
-          l3_port = (struct zebra_l3_port*)node->data;
+  zebra_route_pipeline_stats.enabled = enable;
+  VLOG_INFO("Route pipeline mode %s", enable ? "enabled" : "disabled");
+}
 
-          if (l3_port->ip4_address != NULL)
-            {
-              l3_ip4_address_prefix = strdup(l3_port->ip4_address);
-              l3_ip4_address = strtok(l3_ip4_address_prefix, "/");
+/*
+ * Copy the route row into a pipeline entry and queue it to the worker.
+ */
+static void
+zebra_route_pipeline_submit (const struct ovsrec_route *route, int from,
+                             safi_t safi, bool is_ipv6)
+{
+  struct zebra_route_pipeline_entry *entry;
+  struct zebra_route_pipeline_nexthop *nexthop;
+  const struct ovsrec_nexthop *idl_nexthop;
+  size_t i;
 
-              if (l3_ip4_address != NULL &&
-                  strcmp (l3_ip4_address, active_router_id) == 0)
-                {
-                  VLOG_DBG("Active router id present in current L3 cache "
-                           "L3 port IPv4 = %s\n", l3_port->ip4_address);
-                  free(l3_ip4_address_prefix);
-                  active_router_id_present = true;
-                  break;
-                }
+  entry = xzalloc(sizeof(struct zebra_route_pipeline_entry));
+  entry->prefix_str = xstrdup(route->prefix);
+  entry->is_ipv6 = is_ipv6;
+  entry->type = from;
+  entry->safi = safi;
+  entry->distance = route->distance ? route->distance[0] : 0;
+  entry->metric = route->metric ? route->metric[0] : 0;
+  memcpy(&entry->route_uuid, &OVSREC_IDL_GET_TABLE_ROW_UUID(route),
+         sizeof(struct uuid));
 
-              free(l3_ip4_address_prefix);
-            }
-          else if (shash_count(&(l3_port->ip4_address_secondary)))
-            {
-               SHASH_FOR_EACH_SAFE (node, next,
-                                    &(l3_port->ip4_address_secondary))
-                {
-                  if (!(node->data))
-                    {
-                      VLOG_DBG("No node data found\n");
-                      continue;
-                    }
-                  l3_ip4_address_prefix = strdup((char *)node->data);
-                  l3_ip4_address = strtok(l3_ip4_address_prefix, "/");
-                  if (l3_ip4_address != NULL &&
-                      strcmp (l3_ip4_address, active_router_id) == 0)
-                    {
-                      VLOG_DBG("Active router id present in current L3 cache "
-                               "L3 port secondary IPv4 = %s\n", l3_ip4_address_prefix);
-                      free(l3_ip4_address_prefix);
-                      active_router_id_present = true;
-                      break;
-                    }
+  entry->nexthops = xcalloc(route->n_nexthops ? route->n_nexthops : 1,
+                            sizeof(struct zebra_route_pipeline_nexthop));
 
-                  free(l3_ip4_address_prefix);
-                }
-            }
-          if (active_router_id_present)
-            break;
-        }
+  for (i = 0; i < route->n_nexthops; i++)
+    {
+      idl_nexthop = route->nexthops[i];
+
+      /* If invalid next-hop then do not process that */
+      if (!idl_nexthop)
+        continue;
+
+      nexthop = &entry->nexthops[entry->n_nexthops++];
+
+      if (idl_nexthop->n_ports)
+        nexthop->ifname = xstrdup(idl_nexthop->ports[0]->name);
+      else if (idl_nexthop->ip_address)
+        nexthop->ip_address = xstrdup(idl_nexthop->ip_address);
     }
 
-  /*
-   * If active_router_id present in current L3 port cache then no chnages are required
-   * return NULL value
-   */
-  if(active_router_id_present)
-      return NULL;
+  zebra_route_pipeline_outstanding++;
+  zebra_route_pipeline_stats.submitted++;
+  if (zebra_route_pipeline_outstanding > zebra_route_pipeline_stats.max_backlog)
+    zebra_route_pipeline_stats.max_backlog = zebra_route_pipeline_outstanding;
+
+  pthread_mutex_lock(&zebra_route_pipeline_mutex);
+  zebra_route_pipeline_queue_append(&zebra_route_pipeline_input, entry);
+  pthread_cond_signal(&zebra_route_pipeline_work_cond);
+  pthread_mutex_unlock(&zebra_route_pipeline_mutex);
+}
+
+/*
+ * This function handles route update from routing protocols
+ */
+static void
+zebra_handle_proto_route_change (const struct ovsrec_route *route,
+                                 int from)
+{
+  int safi = ovsdb_safi_to_zebra_safi(route->sub_address_family);
+  int ret;
+  struct prefix p;
+
+  VLOG_DBG("Route change for %s", route->prefix);
 
   /*
-   * Find Loopback interface if present
+   * In the pipeline mode the route is parsed on the pipeline worker and
+   * linked into the RIB later by the main thread. The routes read on the
+   * first run after restart are added inline, since the kernel cleanup
+   * after restart depends on them being queued for the RIB right away.
    */
-  SHASH_FOR_EACH_SAFE (node, next, &zebra_cached_l3_ports)
+  if (zebra_route_pipeline_stats.enabled && !zebra_first_run_after_restart)
     {
-      if (!(node->data))
-        {
-          VLOG_DBG("No node data found\n");
-          continue;
-        }
-
-      l3_port = (struct zebra_l3_port*)node->data;
+      if (!strcmp(route->address_family, OVSREC_ROUTE_ADDRESS_FAMILY_IPV4))
+        zebra_route_pipeline_submit(route, from, safi, false);
+#ifdef HAVE_IPV6
+      else if (!strcmp(route->address_family,
+                       OVSREC_ROUTE_ADDRESS_FAMILY_IPV6))
+        zebra_route_pipeline_submit(route, from, safi, true);
+#endif
+      return;
+    }
 
-      if (l3_port->ip4_address != NULL ||
-          shash_count(&(l3_port->ip4_address_secondary)))
-        {
-          /*
-           * Get Port from UUID
-           */
-          ovsrec_port = ovsrec_port_get_for_uuid(idl,
-                            (const struct uuid *)&(l3_port->ovsrec_port_uuid));
-          if (!ovsrec_port)
-            {
-              VLOG_ERR("The port pointer is NULL");
-              continue;
-            }
-
-          if (ovsrec_port->n_interfaces)
-            {
-              /*
-               * Get the first available Loopback interface
-               */
-              for (interface_index = 0;
-                   interface_index < ovsrec_port->n_interfaces;
-                   ++interface_index)
-                {
-                  interface = ovsrec_port->interfaces[interface_index];
-
-                  if (!interface)
-                    {
-                      VLOG_DBG("The interface pointer in port is NULL");
-                      continue;
-                    }
-
-                  if (interface->type &&
-                      !strcmp(interface->type, OVSREC_INTERFACE_TYPE_LOOPBACK))
-                    {
-                      VLOG_DBG("Found a loopback interface %s ",
-                                interface->name);
-                      found_loopback = true;
-                      break;    /* break from interfaces loop */
-                    }
-                }
-
-              if (found_loopback)
-                {
-                  break;   /* break from ports loop */
-                }
-            }
-        }
-    }
-
-  /*
-   * If loopback interface is not available then get the any first available L3 port
-   */
-  if (!found_loopback)
+  ret = str2prefix (route->prefix, &p);
+  if (ret <= 0)
     {
-      SHASH_FOR_EACH_SAFE (node, next, &zebra_cached_l3_ports)
-        {
-          if (!(node->data))
-            {
-              VLOG_DBG("No node data found\n");
-              continue;
-            }
-
-          l3_port = (struct zebra_l3_port*)node->data;
-
-          if (l3_port->ip4_address != NULL ||
-              shash_count(&(l3_port->ip4_address_secondary)))
-              break;
-        }
+      VLOG_ERR("Malformed Dest address=%s", route->prefix);
+      return;
     }
 
+  apply_mask(&p);
+
   /*
-   * Get the IPv4 address or secondary IPv4 address from the selected port
+   * Invoke internal zebra functions to add this route to RIB
    */
-  if (l3_port != NULL)
+  if (!strcmp(route->address_family, OVSREC_ROUTE_ADDRESS_FAMILY_IPV4))
     {
-      VLOG_DBG("L3 port selected for router ID is %s ipaddr = %s\n",
-              l3_port->port_name, l3_port->ip4_address);
-      if (l3_port->ip4_address != NULL)
-        {
-          int_ip_addr = strdup(l3_port->ip4_address);
-        }
-      else
-        {
-          SHASH_FOR_EACH_SAFE (node, next,
-                                &(l3_port->ip4_address_secondary))
-            {
-              if (!(node->data))
-                {
-                  VLOG_DBG("No node data found\n");
-                  continue;
-                }
-              int_ip_addr = strdup((char*)node->data);
-              break;
-            }
-        }
+      VLOG_DBG("Got ipv4 add route");
+      zebra_add_route(false, &p, from, safi, route);
     }
-
-  /*
-   * Form the new active router-id
-   */
-  if (int_ip_addr != NULL)
+#ifdef HAVE_IPV6
+  else if (!strcmp(route->address_family, OVSREC_ROUTE_ADDRESS_FAMILY_IPV6))
     {
-      router_id = strtok(int_ip_addr, "/");
+     VLOG_DBG("Got ipv6 add route");
+      zebra_add_route(true, &p, from, safi, route);
     }
-
-  VLOG_DBG("Identified router ID is %s\n", router_id);
-
-  return router_id;
+#endif
 }
 
 /*
- * Funtion to update the VRF table active_router_id in OVSDB.
- * If there are any updates for the port list cache, then this function
- * identifies router-id based on the current list of L3 portsto the
- * VRF table's active_router_id column based on current list of L3 ports.
+ * This function handles the connected route notifications from OVSDB.
+ * For the connected routes, we take one of the two actions:-
+ *
+ * 1. If we get a connected route add notification when zebra had not
+ *    restarted, then zebra records the route's UUID in the
+ *    corresponding L3 port node in the port cache.
+ * 2. If the connected add notification during zebra restart, then
+ *    we add the connected route's UUID in a hash table for post
+ *    restart clean-up and updation of connected routes.
  */
 static void
-zebra_ovsdb_update_active_router_id(void)
+zebra_handle_connected_route_change (const struct ovsrec_route* route)
 {
-  const struct ovsrec_vrf *ovs_vrf = NULL;
-  char *router_id = NULL;
+  struct ovsrec_port* ovsrec_port;
+  struct zebra_l3_port* l3_port;
+  struct uuid* route_old_uuid;
+  struct shash* route_uuid_hash;
+  struct uuid* ovsrec_route_uuid = NULL;
+  bool is_v4;
 
-  if (!zebra_get_if_port_updated_or_changed())
+  /*
+   * If the connected route pointer is NULL, then return from this
+   * function.
+   */
+  if (!route)
+    return;
+
+  /*
+   * If this route is not a connected route, then return from this
+   * function.
+   */
+  if (!(route->from) ||
+      ovsdb_proto_to_zebra_proto(route->from) != ZEBRA_ROUTE_CONNECT)
     {
-      VLOG_DBG("No L3 port changes, no need to update active router ID");
+      VLOG_DBG("This is not a connected route");
       return;
     }
 
   /*
-   * Update active router id for the Default VRF
+   * If the route does not have a valid next-hop or if the number
+   * of next-hops are greater than 1, then this is not a valid
+   * connected route.
    */
-  OVSREC_VRF_FOR_EACH(ovs_vrf, idl)
+  if (!(route->n_nexthops) || (route->n_nexthops > 1))
     {
-      /*
-       * Create a transaction for an active router id update to OVSDB from
-       * the zebra main thread.
-       */
-      zebra_create_txn();
-
-      if (!strcmp(ovs_vrf->name, DEFAULT_VRF_NAME))
-        {
-          /*
-           *  TODO Currently we are only suporting default VRF,
-           *       we need to expand this logic for all VRFs
-           */
-
-          router_id = zebra_ovsdb_get_router_id(ovs_vrf->active_router_id);
-
-          VLOG_DBG("For VRF %s Zebra identified active_router_id = %s",
-                    ovs_vrf->name, router_id);
-          if (router_id != NULL)
-            {
-              /*
-               * TODO: For each VRF check for user configured router-id,
-               *       if it is already present then do not use ZEBRA identified
-               *       router-id, instead update the user configured router-id as
-               *       active_router_id. Routing deamons will pick the
-               *       active_router_id and use it as the protocol specific
-               *       router-id. Below is the sample code which need to be
-               *       added once user configurable router-id support is available.
-               *
-               *       if (!ovs_vrf->router_id &&
-               *           strcmp(ovs_vrf->router_id, ovs_vrf->active_router_id) != 0){
-               *          ovsrec_vrf_set_active_router_id(ovs_vrf, ovs_vrf->router_id);
-               *       }
-               */
-              /* Set the active router id */
-              ovsrec_vrf_set_active_router_id(ovs_vrf, router_id);
-              zebra_txn_updates = true;
-              free(router_id);
-            }
-
-          zebra_finish_txn(false);
-        }
+      VLOG_DBG("No valid next-hops for the connected route");
+      return;
     }
 
-  zebra_finish_txn(true);
-}
-
-/*
- * This function handles the port add/delete events. THis function
- * eventually deletes the next-hops or routes if the resolving
- * interface is deleted or chnaged to L2.
- */
-static void
-zebra_handle_port_add_delete_changes (void)
-{
-  const struct ovsrec_port *first_port_row = NULL;
-
-  first_port_row = ovsrec_port_first(idl);
-  if (!first_port_row)
+  /*
+   * If the next-hop port is not avlid, then return from this function.
+   */
+  if (!(route->nexthops[0]->n_ports))
     {
-      VLOG_DBG("There are no port rows in the port table.");
-
-      /*
-       * TODO: Cleanup all static routes created by zebra in kernel
-       */
+      VLOG_DBG("No valid port next-hop for the connected route");
       return;
     }
 
-  zebra_init_if_port_updated_or_changed();
+  VLOG_DBG("Looking up the L3 cache for connected route's %s next-hop %s",
+           route->prefix, route->nexthops[0]->ports[0]->name);
 
   /*
-   * Initialize the delete list
+   * Look up the L3 port node using the next-hop's port name
    */
-  zebra_route_del_list = list_new();
-  zebra_route_del_list->del = (void (*) (void *))
-                                      zebra_route_list_free_data;
+  l3_port = zebra_search_port_name_in_l3_ports_hash(
+                                &zebra_cached_l3_ports,
+                                route->nexthops[0]->ports[0]->name);
 
   /*
-   * Walk through all the port in the IDL and update the L3 port
-   * hash.
+   * If we do not find a valid L3 port node, then return from this
+   * function.
    */
-  OVSREC_PORT_FOR_EACH (first_port_row, idl)
+  if (!l3_port)
     {
-      /*
-       * Create a transaction for any IDL route updates to OVSDB from
-       * the zebra main thread for the connected routes.
-       */
-      zebra_create_txn();
-
-      if (first_port_row)
-        {
-          VLOG_DBG("Got a port name %s (%s)(%s) (%s)\n",
-                   first_port_row->name,
-                   OVSREC_IDL_IS_ROW_INSERTED(
-                            first_port_row, idl_seqno) ? "I" : "",
-                   OVSREC_IDL_IS_ROW_MODIFIED(
-                            first_port_row, idl_seqno) ? "M" : "",
-                   zebra_if_ovsrec_port_is_l3(first_port_row) ?
-                                                       "L3" : "L2");
-
-          /*
-           * Update the hash bucket for maintaining the configured L3
-           * ports.
-           */
-          zebra_add_or_update_cached_l3_ports_hash(first_port_row);
-        }
-
-      /*
-       * Since there are further routes to process for the
-       * main thread, we should try to see if there are
-       * MAX_ZEBRA_TXN_COUNT route updates to OVSDB at this time.
-       * In this case we should publish the route updates to OVSDB.
-       */
-      zebra_finish_txn(false);
-    }
+      VLOG_DBG("Port %s not found in the hash",
+               route->nexthops[0]->ports[0]->name);
+      return;
+    }
 
   /*
-   * Since there are no further routes to process for the main thread,
-   * we should submit all the outstanding route updates to OVSDB at this
-   * time.
+   * Find the IPv4 or IPv6 route UUID hash table.
    */
-  zebra_finish_txn(true);
+  if (!strcmp(route->address_family, OVSREC_ROUTE_ADDRESS_FAMILY_IPV4))
+    {
+      route_uuid_hash = &(l3_port->ip4_connected_routes_uuid);
+      is_v4 = true;
+    }
+  else
+    {
+      route_uuid_hash = &(l3_port->ip6_connected_routes_uuid);
+      is_v4 = false;
+    }
 
   /*
-   * Check if any L3 ports got deleted in order to trigger cleanup
-   * of static routes.
+   * Find the connected route's uuid from the hash table.
    */
-  zebra_check_for_deleted_l3_ports();
+  route_old_uuid = (struct uuid*)shash_find_data(route_uuid_hash,
+                                                 route->prefix);
 
   /*
-   * Walk the zebra route table and find which nexthops need to be
-   * deleted from the kernel and OVSDB.
+   * In case of non-restart case, update connected route's UUID with the new
+   * UUID gotten from OVSDB.
    */
-  zebra_find_routes_with_updated_ports_state(AFI_IP, SAFI_UNICAST, 0,
-                                       "L3 port delete/no routing");
-  zebra_find_routes_with_updated_ports_state(AFI_IP6, SAFI_UNICAST, 0,
-                                       "L3 port delete/no routing");
+  if (!zebra_first_run_after_restart)
+    {
+      /*
+       * This is an error condition when the route's temporrary UUID is not
+       * found in the L3 port node.
+       */
+      if (!route_old_uuid)
+        {
+          VLOG_DBG("The connected route UUID does not exist in the L3 cache");
+          return;
+        }
 
-  /*
-   * Delte the next-hops which have been marked for deletion from
-   * he kernel and the OVSDB.
-   */
-  zebra_route_del_process();
-  list_free(zebra_route_del_list);
+      VLOG_DBG("         Old connected route UUID %s",
+              zebra_dump_ovsdb_uuid(route_old_uuid));
 
-  /*
-   * Find out which ports got deleted from the L3 port hash.
-   */
-  zebra_remove_deleted_cached_l3_ports_hash();
+      VLOG_DBG("         New connected route UUID %s",
+               zebra_dump_ovsdb_uuid(
+                (struct uuid*)&(OVSREC_IDL_GET_TABLE_ROW_UUID(route))));
 
-  /*
-   * If debug logging is enabled, then dump the L3 port cache.
-   */
-  if (VLOG_IS_DBG_ENABLED())
+      /*
+       * If the cached connected route's UUID is same as the connected route's
+       * UUID in OVSDB, then there is no need to update the UUID.
+       */
+      if (!memcmp(route_old_uuid, &OVSREC_IDL_GET_TABLE_ROW_UUID(route),
+                  sizeof(struct uuid)))
+        {
+          VLOG_DBG("The route's old UUID is same as the route's new UUID");
+          return;
+        }
+
+      /*
+       * Copy the uuid of the connected route in OVSDB for future references.
+       */
+      memcpy(route_old_uuid, &OVSREC_IDL_GET_TABLE_ROW_UUID(route),
+             sizeof(struct uuid));
+    }
+  else
     {
-      zebra_l3_port_walk_cache_and_print(NULL,
-                                         &zebra_cached_l3_ports, true);
-      zebra_l3_port_walk_cache_and_print(NULL,
-                                         &zebra_updated_or_changed_l3_ports,
-                                         false);
+      /*
+       * In case this is a connected route notification after restart,
+       * store the UUID in a hash that will be used for cleaning up
+       * stale connected routes from OVCDB and program the new connected
+       * routes.
+       */
+      ovsrec_route_uuid = (struct uuid*)xmalloc(sizeof(struct uuid));
+
+      memcpy(ovsrec_route_uuid, &OVSREC_IDL_GET_TABLE_ROW_UUID(route),
+             sizeof(struct uuid));
+
+      /*
+       * Add the connected route UUID into the clean-up cache
+       */
+      if (!shash_add(&connected_routes_hash_after_restart,
+                     route->prefix, ovsrec_route_uuid))
+        {
+          VLOG_ERR("Unable to add the route UUID for "
+                   "route %s to connected route hash after restart",
+                   route->prefix);
+          free(ovsrec_route_uuid);
+        }
+      else
+        {
+          VLOG_DBG("Successfully added the route UUID for "
+                   "route %s to connected route hash after restart",
+                   route->prefix);
+        }
     }
+}
 
+/*
+ * A route has been modified or added. Update the local RIB structures
+ * accordingly.
+ */
+static void
+zebra_handle_route_change (const struct ovsrec_route *route)
+{
+  int from_protocol = ovsdb_proto_to_zebra_proto(route->from);
   /*
-   * Update Active Router-ID
+   * OVSDB stores the almost everything as a string. Zebra uses integers.
+   * If we convert the string to integer initially, we can avoid multiple
+   * string operations further.
    */
-  zebra_ovsdb_update_active_router_id();
+  switch (from_protocol)
+    {
+    case ZEBRA_ROUTE_CONNECT:
+      VLOG_DBG("Processing a connected route for prefix %s\n",route->prefix);
+      log_event("ZEBRA_ROUTE_ADD", EV_KV("prefix", "%s", route->prefix),
+                EV_KV("protocol", "%s", route->from));
+      /* This is a directly connected route */
+      zebra_handle_connected_route_change(route);
+      break;
 
-  /*
-   * Clean-up all the connected routes from the L3 cache containing
-   * the deleted L3 port ports.
-   */
-  zebra_delete_connected_routes_from_deleted_l3_port_cache();
+    case ZEBRA_ROUTE_STATIC:
+      VLOG_DBG("Adding a static route for prefix %s\n",route->prefix);
+      log_event("ZEBRA_ROUTE_ADD", EV_KV("prefix", "%s", route->prefix),
+                EV_KV("protocol", "%s", route->from));
+      /* This is a static route */
+      zebra_handle_static_route_change(route);
+      break;
 
-  /*
-   * Walk and delete all L3 port nodes which not not L3 anymore
-   */
-  zebra_cleanup_if_port_updated_or_changed();
+    case ZEBRA_ROUTE_BGP:
+      VLOG_DBG("Adding a Protocol route for prefix %s protocol %s\n",
+                route->prefix, route->from);
+      log_event("ZEBRA_ROUTE_ADD", EV_KV("prefix", "%s", route->prefix),
+                EV_KV("protocol", "%s",route->from));
+      /* This is a protocol route */
+      zebra_handle_proto_route_change(route, from_protocol);
+      break;
+
+   case ZEBRA_ROUTE_OSPF:
+      VLOG_DBG("Adding a Protocol route for prefix %s protocol %s\n",
+                route->prefix, route->from);
+      log_event("ZEBRA_ROUTE_ADD", EV_KV("prefix", "%s", route->prefix),
+                EV_KV("protocol", "%s",route->from));
+      /* This is a protocol route */
+      zebra_handle_proto_route_change(route, from_protocol);
+
+    case ZEBRA_ROUTE_MAX:
+    default:
+      VLOG_ERR("Unknown protocol");
+    }
 }
 
 /*
- * This function does pre-restart intialization when zebra process
- * comes up from a shutdown state.
+ * This function queues the local RIB next-hop which was programmed for
+ * the next-hop entry for deletion from the local RIB. The next-hop is
+ * looked up in the RIB, so the route adds still in the route pipeline,
+ * which may include the one of this next-hop, are linked first.
  */
 static void
-zebra_pre_restart_setup()
+zebra_nexthop_route_entry_queue_delete (
+                            struct zebra_nexthop_route_entry *nh_entry)
 {
-  /*
-   * Intialize the hash table for storing the connected routes
-   * and their UUIds immediately after zebra restarts.
-   */
-  shash_init(&connected_routes_hash_after_restart);
+  COVERAGE_INC(zebra_route_delta_delete);
+
+  zebra_route_pipeline_flush();
+
+  if (VLOG_IS_DBG_ENABLED())
+    print_key(&nh_entry->rkey);
+
+  if (nh_entry->addr_family == AF_INET)
+    zebra_find_ovsdb_deleted_route_key(AFI_IP, SAFI_UNICAST, 0,
+                                       &nh_entry->rkey);
+  else if (nh_entry->addr_family == AF_INET6)
+    zebra_find_ovsdb_deleted_route_key(AFI_IP6, SAFI_UNICAST, 0,
+                                       &nh_entry->rkey);
 }
 
 /*
- * This function does post-restart clean-up when zebra process
- * comes up from a shutdown state.
+ * This function returns true if one of the next-hops of the route row
+ * maps to the route key 'rkey' in the local RIB.
  */
-static void
-zebra_post_restart_cleanup()
+static bool
+zebra_route_has_route_key (const struct ovsrec_route *route, int addr_family,
+                           const struct zebra_route_key *rkey)
 {
-  /*
-   * After reading all configuration set this flag to false for
-   * clean-up of the connected routes in the OVSDB dues to zebra
-   * restart.
-   */
-  zebra_first_run_after_restart = false;
+  struct zebra_route_key route_rkey;
+  size_t index;
 
-  /*
-   * Call the function which does the actual connected routes
-   * cleanup, updation and insertion into OVSDB after zebra
-   * restart.
-   */
-  zebra_walk_l3_cache_and_restore_connected_routes_after_zebra_restart();
+  if (zebra_route_key_set_prefix(route, &route_rkey) != addr_family)
+    return false;
+
+  for (index = 0; index < route->n_nexthops; index++)
+    {
+      if (!route->nexthops[index])
+        continue;
+
+      zebra_route_key_set_nexthop(addr_family, route->nexthops[index],
+                                  &route_rkey);
+      if (zebra_route_key_cmp(&route_rkey, rkey))
+        return true;
+    }
+
+  return false;
 }
 
-/* Check if any changes are there to the idl and update
- * the local structures accordingly.
+/*
+ * This function removes the route row 'route_uuid_str' from the routes
+ * of the next-hop row 'nexthop_uuid_str' in the next-hop to route
+ * reverse lookup hash.
  */
 static void
-zebra_reconfigure (struct ovsdb_idl *idl)
+zebra_nexthop_to_route_hash_unlink (const char *nexthop_uuid_str,
+                                    const char *route_uuid_str)
 {
-  unsigned int new_idl_seqno = ovsdb_idl_get_seqno(idl);
-  COVERAGE_INC(zebra_ovsdb_cnt);
+  struct shash *routes;
 
-  if (new_idl_seqno == idl_seqno)
+  routes = shash_find_data(&zebra_nexthop_to_route_hash, nexthop_uuid_str);
+  if (!routes)
+    return;
+
+  shash_find_and_delete(routes, route_uuid_str);
+
+  if (shash_is_empty(routes))
     {
-      VLOG_DBG("No config change for zebra in ovs\n");
-      return;
+      shash_find_and_delete(&zebra_nexthop_to_route_hash, nexthop_uuid_str);
+      shash_destroy(routes);
+      free(routes);
     }
+}
 
-  /* Apply all ovsdb notifications */
-  if (zebra_first_run_after_restart)
-    {
-      VLOG_DBG("Zebra restarted. Cleanup the stale routes from kernel");
+/*
+ * This function records the route row against each of its next-hop rows
+ * in the next-hop to route reverse lookup hash, along with the route key
+ * programmed in the local RIB for the next-hop. The local RIB next-hops
+ * of the route for the next-hop rows which were modified in place or
+ * which the route no longer references are queued for deletion.
+ */
+static void
+zebra_nexthop_to_route_hash_update (const struct ovsrec_route *route)
+{
+  const struct ovsrec_nexthop *nexthop;
+  struct zebra_nexthop_route_entry *nh_entry;
+  struct shash *old_nexthops;
+  struct shash *nexthops;
+  struct shash *routes;
+  struct shash_node *node;
+  struct zebra_route_key rkey;
+  char route_uuid_str[UUID_LEN + 1];
+  char nexthop_uuid_str[UUID_LEN + 1];
+  int addr_family;
+  size_t index;
 
-      /*
-       * Dump the zebra internal shadow table containing the routes
-       * learned from the kernel.
-       */
-      if (VLOG_IS_DBG_ENABLED())
-        {
-          VLOG_DBG("Printing shadow internal route table for kernel"
-                   "cleanup after zebra restart\n");
+  addr_family = zebra_route_key_set_prefix(route, &rkey);
+  if (addr_family == AF_UNSPEC)
+    return;
 
-          zebra_dump_internal_route_table(NULL,
-                                          vrf_shadow_table(AFI_IP,
-                                                           SAFI_UNICAST,
-                                                           0));
-          zebra_dump_internal_route_table(NULL,
-                                          vrf_shadow_table(AFI_IP6,
-                                                           SAFI_UNICAST,
-                                                           0));
-        }
+  snprintf(route_uuid_str, UUID_LEN + 1, UUID_FMT,
+           UUID_ARGS(&OVSREC_IDL_GET_TABLE_ROW_UUID(route)));
 
-      zebra_pre_restart_setup();
-      zebra_handle_port_add_delete_changes();
-      zebra_handle_interface_admin_state_changes();
-      zebra_apply_route_changes();
-      zebra_post_restart_cleanup();
-    }
-  else
+  old_nexthops = shash_find_and_delete(&zebra_route_to_nexthop_hash,
+                                       route_uuid_str);
+
+  nexthops = xmalloc(sizeof(struct shash));
+  shash_init(nexthops);
+
+  for (index = 0; index < route->n_nexthops; index++)
     {
-      VLOG_DBG("Second run for the zebra config changes");
+      nexthop = route->nexthops[index];
 
-      zebra_apply_route_changes();
-      zebra_handle_port_add_delete_changes();
-      zebra_handle_interface_admin_state_changes();
-    }
+      if (!nexthop)
+        continue;
 
-  /* update the seq. number */
-  idl_seqno = new_idl_seqno;
-}
+      zebra_route_key_set_nexthop(addr_family, nexthop, &rkey);
 
-/* Wrapper function that checks for idl updates and reconfigures the daemon
- */
-static void
-zebra_ovs_run (void)
-{
-  if (zebra_txn_count)
-    {
-      VLOG_DBG("Processing an on-going transaction so bypass IDL read");
-      return;
-    }
-  else
-    {
-      if (zebra_txn)
+      snprintf(nexthop_uuid_str, UUID_LEN + 1, UUID_FMT,
+               UUID_ARGS(&OVSREC_IDL_GET_TABLE_ROW_UUID(nexthop)));
+
+      if (shash_find(nexthops, nexthop_uuid_str))
+        continue;
+
+      nh_entry = old_nexthops ? (struct zebra_nexthop_route_entry*)
+                 shash_find_and_delete(old_nexthops, nexthop_uuid_str) : NULL;
+      if (!nh_entry)
         {
-          VLOG_DBG("Release the transaction object");
-          ovsdb_idl_txn_destroy(zebra_txn);
+          nh_entry = (struct zebra_nexthop_route_entry*)xzalloc(
+                                  sizeof(struct zebra_nexthop_route_entry));
+          memcpy(&nh_entry->route_uuid,
+                 &OVSREC_IDL_GET_TABLE_ROW_UUID(route), sizeof(struct uuid));
+          memcpy(&nh_entry->nexthop_uuid,
+                 &OVSREC_IDL_GET_TABLE_ROW_UUID(nexthop), sizeof(struct uuid));
+
+          routes = shash_find_data(&zebra_nexthop_to_route_hash,
+                                   nexthop_uuid_str);
+          if (!routes)
+            {
+              routes = xmalloc(sizeof(struct shash));
+              shash_init(routes);
+              shash_add(&zebra_nexthop_to_route_hash, nexthop_uuid_str,
+                        routes);
+            }
+          shash_add(routes, route_uuid_str, nh_entry);
         }
-      zebra_txn = NULL;
+      else if (((nh_entry->addr_family != addr_family) ||
+                !zebra_route_key_cmp(&nh_entry->rkey, &rkey)) &&
+               !zebra_route_has_route_key(route, nh_entry->addr_family,
+                                          &nh_entry->rkey))
+        {
+          VLOG_DBG("Next-hop %s modified for route %s",
+                   nexthop_uuid_str, route->prefix);
+          zebra_nexthop_route_entry_queue_delete(nh_entry);
+        }
+
+      memcpy(&nh_entry->rkey, &rkey, sizeof(struct zebra_route_key));
+      nh_entry->addr_family = addr_family;
+      shash_add(nexthops, nexthop_uuid_str, nh_entry);
     }
 
-  ovsdb_idl_run(idl);
-  unixctl_server_run(appctl);
-#ifdef VRF_ENABLE
-  /* Check if zebra_vrf is set; */
-  if (!zebra_vrf || !strlen(zebra_vrf))
+  /*
+   * The next-hop rows left are no longer referenced by the route. They
+   * are not necessarily deleted, since other routes can still share them.
+   */
+  if (old_nexthops)
     {
-      zebra_vrf = zebra_get_my_vrf_name();
-      VLOG_DBG("zebra_ovs_run for vrf %s", zebra_vrf);
-      if (!zebra_vrf)
+      SHASH_FOR_EACH (node, old_nexthops)
         {
-          VLOG_ERR("Can't retrieve vrf name");
-          return;
+          nh_entry = (struct zebra_nexthop_route_entry*)node->data;
+
+          if (!zebra_route_has_route_key(route, nh_entry->addr_family,
+                                         &nh_entry->rkey))
+            {
+              VLOG_DBG("Next-hop %s removed from route %s",
+                       node->name, route->prefix);
+              zebra_nexthop_route_entry_queue_delete(nh_entry);
+            }
+
+          zebra_nexthop_to_route_hash_unlink(node->name, route_uuid_str);
+          free(nh_entry);
         }
+      shash_destroy(old_nexthops);
+      free(old_nexthops);
     }
-#endif
 
-  if (ovsdb_idl_is_lock_contended(idl))
+  if (shash_is_empty(nexthops))
     {
-      static struct vlog_rate_limit rl = VLOG_RATE_LIMIT_INIT(1, 1);
-
-      VLOG_ERR_RL(&rl, "another zebra process is running, "
-                  "disabling this process until it goes away");
+      shash_destroy(nexthops);
+      free(nexthops);
       return;
     }
-  else if (!ovsdb_idl_has_lock(idl))
-    return;
 
-  zebra_chk_for_system_configured();
-
-  if (system_configured)
-    {
-      zebra_reconfigure(idl);
-
-      daemonize_complete();
-      vlog_enable_async();
-      VLOG_INFO_ONCE("%s (OpenSwitch zebra) %s", program_name, VERSION);
-    }
+  shash_add(&zebra_route_to_nexthop_hash, route_uuid_str, nexthops);
 }
 
+/*
+ * This function removes a deleted route row from the next-hop to route
+ * reverse lookup hash and queues the local RIB next-hops which were
+ * programmed for it for deletion. The next-hop rows of the route may
+ * still be referenced by other routes, so they are not deleted along
+ * with the route.
+ */
 static void
-zebra_ovs_wait (void)
+zebra_route_to_nexthop_hash_remove (const struct ovsrec_route *route)
 {
-  ovsdb_idl_wait(idl);
-  unixctl_server_wait(appctl);
-}
+  struct zebra_nexthop_route_entry *nh_entry;
+  struct shash *nexthops;
+  struct shash_node *node;
+  char route_uuid_str[UUID_LEN + 1];
 
-/* Callback function to handle read events
- * In the event of an update to the idl cache, this callback is triggered.
- * In this event, the changes are processed in the daemon and the cb
- * functions are re-registered.
- */
-static int
-zovs_read_cb (struct thread *thread)
-{
-  zebra_ovsdb_t *zovs_g;
-  if (!thread)
-    {
-      VLOG_ERR("NULL thread in read cb function\n");
-      return -1;
-    }
-  zovs_g = THREAD_ARG(thread);
-  if (!zovs_g)
+  snprintf(route_uuid_str, UUID_LEN + 1, UUID_FMT,
+           UUID_ARGS(&OVSREC_IDL_GET_TABLE_ROW_UUID(route)));
+
+  nexthops = shash_find_and_delete(&zebra_route_to_nexthop_hash,
+                                   route_uuid_str);
+  if (!nexthops)
     {
-      VLOG_ERR("NULL args in read cb function\n");
-      return -1;
+      VLOG_DBG("No next-hops found for the deleted route %s",
+               route_uuid_str);
+      return;
     }
 
-  zovs_g->read_cb_count++;
-
-  zebra_ovs_clear_fds();
-  zebra_ovs_run();
-  zebra_ovs_wait();
-
-  if (0 != zebra_ovspoll_enqueue(zovs_g))
+  SHASH_FOR_EACH (node, nexthops)
     {
-      /*
-       * Could not enqueue the events.
-       * Retry in 1 sec
-       */
-      thread_add_timer(zovs_g->master,
-                       zovs_read_cb, zovs_g, 1);
+      nh_entry = (struct zebra_nexthop_route_entry*)node->data;
+      zebra_nexthop_route_entry_queue_delete(nh_entry);
+      zebra_nexthop_to_route_hash_unlink(node->name, route_uuid_str);
+      free(nh_entry);
     }
-  return 1;
+
+  shash_destroy(nexthops);
+  free(nexthops);
 }
 
-/* Add the list of OVS poll fd to the master thread of the daemon
+/*
+ * This function removes a deleted next-hop row from the next-hop to
+ * route reverse lookup hash and queues the local RIB next-hops which
+ * were programmed for it in each of its routes for deletion.
  */
-static int
-zebra_ovspoll_enqueue (zebra_ovsdb_t *zovs_g)
+static void
+zebra_nexthop_to_route_hash_remove (const struct ovsrec_nexthop *nexthop)
 {
-  struct poll_loop *loop = poll_loop();
-  struct poll_node *node;
-  long int timeout;
-  int retval = -1;
+  struct zebra_nexthop_route_entry *nh_entry;
+  struct shash *routes;
+  struct shash *nexthops;
+  struct shash_node *node;
+  char nexthop_uuid_str[UUID_LEN + 1];
 
-  /* Populate with all the fds events. */
-  HMAP_FOR_EACH (node, hmap_node, &loop->poll_nodes)
-    {
-      thread_add_read(zovs_g->master,
-                      zovs_read_cb,
-                      zovs_g, node->pollfd.fd);
-      /*
-       * If we successfully connected to OVS return 0.
-       * Else return -1 so that we try to reconnect.
-       * */
-      retval = 0;
-    }
+  snprintf(nexthop_uuid_str, UUID_LEN + 1, UUID_FMT,
+           UUID_ARGS(&OVSREC_IDL_GET_TABLE_ROW_UUID(nexthop)));
 
-  /* Populate the timeout event */
-  if (loop->timeout_when == LLONG_MIN)
+  routes = shash_find_and_delete(&zebra_nexthop_to_route_hash,
+                                 nexthop_uuid_str);
+  if (!routes)
     {
-      thread_add_timer(zovs_g->master,
-		       zovs_read_cb, zovs_g,
-		       0);
+      VLOG_DBG("No route found for the deleted next-hop %s",
+               nexthop_uuid_str);
+      return;
     }
-  else
+
+  SHASH_FOR_EACH (node, routes)
     {
-      timeout = loop->timeout_when - time_msec();
-      if (timeout > 0 && loop->timeout_when > 0 &&
-          loop->timeout_when < LLONG_MAX)
-        {
-          /* Convert msec to sec */
-          timeout = (timeout + 999)/1000;
+      nh_entry = (struct zebra_nexthop_route_entry*)node->data;
+      zebra_nexthop_route_entry_queue_delete(nh_entry);
 
-          thread_add_timer(zovs_g->master,
-                           zovs_read_cb, zovs_g,
-                           timeout);
+      nexthops = shash_find_data(&zebra_route_to_nexthop_hash, node->name);
+      if (nexthops)
+        {
+          shash_find_and_delete(nexthops, nexthop_uuid_str);
+          if (shash_is_empty(nexthops))
+            {
+              shash_find_and_delete(&zebra_route_to_nexthop_hash,
+                                    node->name);
+              shash_destroy(nexthops);
+              free(nexthops);
+            }
         }
+      free(nh_entry);
     }
 
-  return retval;
+  shash_destroy(routes);
+  free(routes);
 }
 
-/* Initialize and integrate the ovs poll loop with the daemon */
-void
-zebra_ovsdb_init_poll_loop (struct zebra_t *zebrad)
+/*
+ * This function processes one inserted or modified OVSDB route row. The
+ * route is processed only once per reconfigure run even if both the
+ * route row and some of its next-hop rows changed.
+ */
+static void
+zebra_apply_tracked_route_change (const struct ovsrec_route *route_row,
+                                  struct shash *processed_routes)
 {
-  if (!glob_zebra_ovs.enabled)
+  char route_uuid_str[UUID_LEN + 1];
+
+  snprintf(route_uuid_str, UUID_LEN + 1, UUID_FMT,
+           UUID_ARGS(&OVSREC_IDL_GET_TABLE_ROW_UUID(route_row)));
+
+  if (!shash_add_once(processed_routes, route_uuid_str, route_row))
+    return;
+
+  COVERAGE_INC(zebra_route_rows_visited);
+
+  zebra_nexthop_to_route_hash_update(route_row);
+
+  if (!(route_row->nexthops))
     {
-      VLOG_ERR("OVS not enabled for zebra. Return\n");
+      VLOG_DBG("Null next hop array");
       return;
     }
-  glob_zebra_ovs.master = zebrad->master;
 
-  zebra_ovs_clear_fds();
-  zebra_ovs_run();
-  zebra_ovs_wait();
-  zebra_ovspoll_enqueue(&glob_zebra_ovs);
-}
+  if (route_row->nexthops[0] == NULL)
+    {
+      VLOG_DBG("Null next hop");
+      return;
+    }
 
-static void
-ovsdb_exit (void)
-{
-  ovsdb_idl_destroy(idl);
+  VLOG_DBG("Row modification or inserts in ROUTE table "
+           "for route %s\n", route_row->prefix);
+  zebra_handle_route_change(route_row);
 }
 
-/* When the daemon is ready to shut, delete the idl cache
- * This happens with the ovs-appctl exit command.
+/*
+ * This function processes all the OVSDB route rows referencing a next-hop
+ * row which was modified in place, since the next-hop row can be shared
+ * by the routes of several prefixes. Returns false if no referencing
+ * route is known.
  */
-void
-zebra_ovsdb_exit (void)
+static bool
+zebra_apply_tracked_nexthop_change (const struct ovsrec_nexthop *nexthop,
+                                    struct shash *processed_routes)
 {
-  #ifdef VRF_ENABLE
-  free(zebra_vrf);
-  zebra_vrf = NULL;
-  #endif
-  log_event("ZEBRA_OVSDB_EXIT",NULL);
-  ovsdb_exit();
+  struct zebra_nexthop_route_entry *nh_entry;
+  const struct ovsrec_route **route_rows;
+  const struct ovsrec_route *route_row;
+  struct shash *routes;
+  struct shash_node *node;
+  char nexthop_uuid_str[UUID_LEN + 1];
+  size_t n_route_rows = 0;
+  size_t index;
+
+  snprintf(nexthop_uuid_str, UUID_LEN + 1, UUID_FMT,
+           UUID_ARGS(&OVSREC_IDL_GET_TABLE_ROW_UUID(nexthop)));
+
+  routes = shash_find_data(&zebra_nexthop_to_route_hash, nexthop_uuid_str);
+  if (!routes)
+    return false;
+
+  /*
+   * Processing a route updates the reverse lookup hash, so the routes
+   * are collected before any of them is processed.
+   */
+  route_rows = xmalloc(shash_count(routes) *
+                       sizeof(const struct ovsrec_route *));
+  SHASH_FOR_EACH (node, routes)
+    {
+      nh_entry = (struct zebra_nexthop_route_entry*)node->data;
+      route_row = ovsrec_route_get_for_uuid(idl, &nh_entry->route_uuid);
+      if (route_row)
+        route_rows[n_route_rows++] = route_row;
+    }
+
+  for (index = 0; index < n_route_rows; index++)
+    zebra_apply_tracked_route_change(route_rows[index], processed_routes);
+
+  free(route_rows);
+
+  return n_route_rows > 0;
 }
 
 /*
- * This is a helper function which deletes the OVSDB next-hop entries from the
- * route. The next-hops which are marked as true in bool array will be deleted
- * from OVSDB. If the number of next-hops for the route becomes 0, then the route
- * itself is deleted from the OVSDB.
+ * route add/delete in ovsdb. Only the route and next-hop rows tracked
+ * by the IDL as changed since the last run are visited, so the cost of
+ * this function is proportional to the number of changed rows rather
+ * than to the size of the route table. Deleted next-hop rows are mapped
+ * to the local RIB next-hops through the next-hop to route hash.
  */
 static void
-zebra_route_delete_nexthops (struct ovsrec_route *route, bool *nexthop_decision,
-                             size_t number_next_hops)
+zebra_apply_route_changes (void)
 {
-  struct ovsrec_nexthop **nexthops = NULL;
-  size_t i, n;
+  const struct ovsrec_route *route_row;
+  const struct ovsrec_nexthop *nh_row;
+  struct shash processed_routes;
+  bool routes_changed = false;
 
-  if (!nexthop_decision)
+  /*
+   * Check if anything changed in the route table and the next-hop table.
+   * If nothing changed then return from this function.
+   */
+  if (!ovsrec_route_track_get_first(idl) &&
+      !ovsrec_nexthop_track_get_first(idl))
     {
-      VLOG_ERR("The next-hop decision array in NULL");
+      VLOG_DBG("No modification in ROUTE table");
       return;
     }
 
-  if (route->n_nexthops != number_next_hops)
+  shash_init(&processed_routes);
+  zebra_route_del_init();
+
+  OVSREC_ROUTE_FOR_EACH_TRACKED (route_row, idl)
     {
-        VLOG_ERR("The number of route nexthops %u is not same as decision"
-                 " array's length %u", route->n_nexthops, number_next_hops);
-        return;
+      /*
+       * The next-hop rows of a deleted route can still be shared by
+       * other routes, so the deleted route is removed from the local RIB
+       * through the route keys recorded for it.
+       */
+      if (ovsrec_route_is_deleted(route_row))
+        {
+          zebra_route_to_nexthop_hash_remove(route_row);
+          continue;
+        }
+
+      routes_changed = true;
+      zebra_apply_tracked_route_change(route_row, &processed_routes);
     }
 
-  nexthops = xmalloc(sizeof(struct ovsrec_nexthop *) * (route->n_nexthops));
-  for (i = n = 0; i < route->n_nexthops; i++)
-    {
-        if (!nexthop_decision[i])
-          nexthops[n++] = route->nexthops[i];
-    }
-
-  ovsrec_route_set_nexthops(route, nexthops, n);
-  zebra_txn_updates = true;
-
-  /*
-   * If the route does not have any next-hops left, then delete this route.
-   */
-  if (n == 0)
+  OVSREC_NEXTHOP_FOR_EACH_TRACKED (nh_row, idl)
     {
-      VLOG_DBG("Need to delete the OVSDB route for prefix %s", route->prefix);
-      log_event("ZEBRA_ROUTE_DEL", EV_KV("prefix", "%s",route->prefix));
-      ovsrec_route_delete(route);
-      zebra_txn_updates = true;
-    }
-
-  free(nexthops);
-}
+      if (ovsrec_nexthop_is_deleted(nh_row))
+        {
+          zebra_nexthop_to_route_hash_remove(nh_row);
+          continue;
+        }
 
+      /*
+       * A newly inserted next-hop row is always accompanied by a change
+       * in the nexthops column of its route row, which was handled above.
+       */
+      if (ovsrec_nexthop_is_new(nh_row))
+        continue;
 
-/*
- * This function takes a zebra rib entry and the next-hop port and deletes the
- * corresponding next-hop port from OVSDB.
- */
-void zebra_delete_route_nexthop_addr_from_db (struct rib *route,
-                                              char* nexthop_str)
-{
-  struct ovsrec_route *route_row = NULL;
-  struct ovsrec_nexthop *nh_row;
-  int port_index;
-  int next_hop_index;
-  bool *found_nexthop_addr;
+      if (!zebra_apply_tracked_nexthop_change(nh_row, &processed_routes))
+        {
+          VLOG_DBG("No route row found for the modified next-hop");
+          continue;
+        }
 
-  if (!route || !nexthop_str)
-    {
-      VLOG_ERR("The route's rib entry or next-hop address in null");
-      return;
+      routes_changed = true;
     }
 
-  if (route && (route->ovsdb_route_row_uuid_ptr))
-    {
-      route_row = (struct ovsrec_route*)ovsrec_route_get_for_uuid(idl,
-                     (const struct uuid*)route->ovsdb_route_row_uuid_ptr);
-
-      if (!route_row) {
-        VLOG_DBG("Route not found using UUID");
-        return;
-      }
-
-      #ifdef VRF_ENABLE
-      if (!(zebra_is_route_in_my_vrf(route_row)))
-        return;
-      #endif
-      VLOG_DBG("Cached OVSDB Route Entry: Prefix %s family %s "
-               "from %s priv %p", route_row->prefix,
-               route_row->address_family, route_row->from,
-               route_row->protocol_private);
-
-      VLOG_DBG("Walk route next-hops to find the next-hop "
-               " corresponding to the next-hop address %s",
-               nexthop_str);
-
-      /*
-       * This bool array stores the decision as to which next-hop rows
-       * need to be deleted. If a next-hop need to be deleted, then the
-       * bool array entry will be set to true.
-       */
-      found_nexthop_addr =
-              (bool *)xmalloc(sizeof(bool) * (route_row->n_nexthops));
-      memset(found_nexthop_addr, 0, sizeof(bool) * (route_row->n_nexthops));
+  VLOG_DBG("Processed %zu changed routes in ROUTE table",
+           shash_count(&processed_routes));
+  shash_destroy(&processed_routes);
 
+  if (routes_changed)
+    {
       /*
-       * Walk all next-hops to find which next-hop address needs to
-       * be deleted from OVSDB.
+       * If this is the first OVSDB reconfigure run after restart, then
+       * check if there is work queued for the zebra backend thread. If there
+       * is work to be done by worker thread, then delay the cleanup of the
+       * zebra routes from the kernel until the worker thread has processed
+       * all OVSDB route upadtes. If there are no OVSDB route updates for the
+       * backend zebra threads, then cleanup the kernel inline.
        */
-      for (next_hop_index = 0; next_hop_index < route_row->n_nexthops;
-           ++next_hop_index)
+      if (zebra_first_run_after_restart)
         {
-          nh_row = route_row->nexthops[next_hop_index];
-          VLOG_DBG("Inspecting the next-hop with address %s",
-                    nh_row->ip_address);
+          VLOG_DBG("The size of the internal rib queue is %u",
+                   zebrad.mq->size);
 
-          if (!(nh_row->ip_address))
+          if (zebrad.mq->size)
             {
-              continue;
+              VLOG_DBG("Since there are entries in the queue to process. "
+                        "Set the kernel cleanup flag");
+              zebra_cleanup_kernel_after_restart = true;
             }
-
-          /*
-           * Check if the nexthop_str is same as the next-hop IP
-           * address.
-           */
-          if (strcmp(nexthop_str, nh_row->ip_address) == 0)
+          else
             {
-              VLOG_DBG("Found the nexthop match");
-              found_nexthop_addr[next_hop_index] = true;
-              log_event("ZEBRA_NEXTHOP_STATE", EV_KV("nexthop_port", "%s",
-                        nexthop_str), EV_KV("msg", "%s", "to be deleted"));
+              VLOG_DBG("No routes within OVSDB route table for zebra to "
+                        "reprogram in kernel. Cleanup the kernel");
+              cleanup_kernel_routes_after_restart();
             }
         }
-
-      /*
-       * Delete the next-hop rows which are marked as true in the
-       * bool array.
-       */
-      zebra_route_delete_nexthops(route_row, found_nexthop_addr,
-                                  route_row->n_nexthops);
-
-      /*
-       * Free the allocated bool array.
-       */
-      free(found_nexthop_addr);
     }
-  else
+
+  if (listcount(zebra_route_del_list))
     {
-      VLOG_DBG("Cannot delete the next-hop address from OVSDB");
+      VLOG_DBG("Deletes in RIB table");
+      zebra_route_del_process();
     }
+
+  zebra_route_del_finish();
+
+  /*
+   * Resolve the newly added static routes into the L3 port reverse
+   * index, so that the next port event revisits only the routes
+   * depending on the changed ports.
+   */
+  zebra_l3_port_route_index_resolve(AFI_IP);
+  zebra_l3_port_route_index_resolve(AFI_IP6);
 }
 
 /*
- * This function takes a zebra rib entry and the next-hop port and deletes
- * the corresponding next-hop port from OVSDB.
+ * This function handles the interface UP/DOWN events. This function
+ * eventually marks the next-hops/routes as selected or unselected.
  */
-void zebra_delete_route_nexthop_port_from_db (struct rib *route,
-                                              char* port_name)
+static void
+zebra_handle_interface_admin_state_changes (void)
 {
-  struct ovsrec_route *route_row = NULL;
-  struct ovsrec_nexthop *nh_row;
-  int port_index;
-  int next_hop_index;
-  bool* found_port = NULL;
+  const struct ovsrec_interface *interface_row = NULL;
+  bool int_up = false;
+  struct smap user_config;
+  const char *admin_status;
 
-  if (!route || !port_name)
-    {
-      VLOG_ERR("The route's rib entry or port name in null");
-      return;
-    }
+  zebra_init_if_port_active_state_changed();
 
-  if (route && (route->ovsdb_route_row_uuid_ptr))
+  /*
+   * Check which interface admin state column got
+   * modified.
+   */
+  if (OVSREC_IDL_IS_COLUMN_MODIFIED(
+             ovsrec_interface_col_admin_state, idl_seqno))
     {
-      route_row = (struct ovsrec_route *)ovsrec_route_get_for_uuid(idl,
-                    (const struct uuid*)route->ovsdb_route_row_uuid_ptr);
-
-      if (!route_row) {
-        VLOG_DBG("Route not found using UUID");
-        return;
-      }
-
-      #ifdef VRF_ENABLE
-      if (!(zebra_is_route_in_my_vrf(route_row)))
-        return;
-      #endif
-      VLOG_DBG("Cached OVSDB Route Entry: Prefix %s family %s "
-               "from %s priv %p", route_row->prefix,
-               route_row->address_family, route_row->from,
-               route_row->protocol_private);
-
-      VLOG_DBG("Finding the nexthop row corresponding to the port %s",
-               port_name);
-
-      /*
-       * This bool array stores the decision as to which next-hop rows
-       * need to be deleted. If a next-hop need to be deleted, then the
-       * bool array entry will be set to true.
-       */
-      found_port = (bool *)xmalloc(sizeof(bool) * (route_row->n_nexthops));
-      memset(found_port, 0, sizeof(bool) * (route_row->n_nexthops));
-
-      /*
-       * Walk all next-hops to find which next-hop port needs to
-       * be deleted from OVSDB.
-       */
-      for (next_hop_index = 0; next_hop_index < route_row->n_nexthops;
-           ++next_hop_index)
+      OVSREC_INTERFACE_FOR_EACH (interface_row, idl)
         {
-          nh_row = route_row->nexthops[next_hop_index];
+          /*
+           * Create a transaction for any IDL route updates to OVSDB
+           * from the zebra main thread for updating the selected bit
+           * pn the connected routes.
+           */
+          zebra_create_txn();
 
           /*
-           * If the nexthop does not have a valid ip address or
-           * port, then cleanup this port.
+           * Check if the interface row changed.
            */
-          if (!(nh_row->ip_address) && !(nh_row->n_ports))
-            {
-              VLOG_DBG("The next-hop IP and port are NULL. "
-                        "Delete this port from OVSDB");
-              found_port[next_hop_index] = true;
-            }
-          else if (nh_row->ports && nh_row->ports[0]
-                       && nh_row->ports[0]->name)
+          if (OVSREC_IDL_IS_ROW_MODIFIED(interface_row, idl_seqno))
             {
+              VLOG_DBG("Got a interface admin state modified for "
+                       "interface %s to state %s\n",
+                       interface_row->name,
+                       interface_row->admin_state);
+              log_event("ZEBRA_INTERFACE", EV_KV("interface_name", "%s",
+                        interface_row->name),EV_KV("admin_state", "%s",
+                        interface_row->admin_state));
+
               /*
-               * Check the first port in the port list to see if the port_name
-               * is the same as the first port entry.
+               * Update the L3 port cache with the interface's admin
+               * state.
                */
-              VLOG_DBG("Inspecting port %s to see if same as %s",
-                        nh_row->ports[0]->name, port_name);
-
-              if (strcmp(nh_row->ports[0]->name, port_name) == 0) {
-                  found_port[next_hop_index] = true;
-                  log_event("ZEBRA_NEXTHOP_STATE", EV_KV("nexthop_port", "%s",
-                            port_name), EV_KV("msg", "%s", "to be deleted"));
-              }
+              zebra_update_port_active_state(interface_row);
             }
+
+          /*
+           * Since there are further routes to process for the
+           * main thread, we should try to see if there are
+           * enough route updates to fill a batch to OVSDB at this time.
+           * In this case we should publish the route updates to OVSDB.
+           */
+          zebra_finish_txn(false);
         }
 
       /*
-       * Delete the next-hop rows which are marked as true in the
-       * bool array.
+       * Since there are no further routes to process for the main thread,
+       * we should submit all the outstanding route updates to OVSDB at this
+       * time.
        */
-      zebra_route_delete_nexthops(route_row, found_port,
-                                  route_row->n_nexthops);
+      zebra_finish_txn(true);
+    }
 
-      /*
-       * Free the allocated bool array.
-       */
-      free(found_port);
-    }
-  else
-    {
-      VLOG_DBG("Cannot delete the next-hop port from OVSDB");
-    }
-}
-
-/* Update the selected column in the route row in OVSDB
- */
-int
-zebra_ovs_update_selected_route (const struct ovsrec_route *ovs_route,
-                                 bool *selected)
-{
-  if (ovs_route)
-    {
-      /*
-       * Found the route entry. Update the selected column.
-       * ECMP: Update only if it is different.
-       */
-      VLOG_DBG("Updating selected flag for route %s", ovs_route->prefix);
-      if ( (ovs_route->selected != NULL) &&
-          (ovs_route->selected[0] == *selected) )
-        {
-          VLOG_DBG("No change in selected flag previous %s and new %s",
-                    ovs_route->selected[0] ? "true" : "false",
-                    *selected ? "true" : "false");
-          return 0;
-        }
-
-      log_event("ZEBRA_ROUTE", EV_KV("routemsg", "%s",
-                *selected ? "Route selected":"Route unselected"),
-                EV_KV("prefix", "%s", ovs_route->prefix));
-      /*
-       * Update the selected bit, and mark it to commit into DB.
-       */
-      ovsrec_route_set_selected(ovs_route, selected, 1);
-      zebra_txn_updates = true;
-      VLOG_DBG("Route update successful");
+  /*
+   * If some L3 port became active or iactive due to interface unshut or
+   * shut, then walk all zebra routes and mark the appropriate
+   * next-hops/routes as selected or unselected in the OVSDB.
+   */
+  zebra_find_routes_with_updated_ports_state(AFI_IP, SAFI_UNICAST, 0,
+                                        "L3 interface state change");
+  zebra_find_routes_with_updated_ports_state(AFI_IP6, SAFI_UNICAST, 0,
+                                        "L3 interface state change");
 
-    }
-  return 0;
+  zebra_cleanup_if_port_active_state_changed();
 }
 
 /*
- * When zebra is ready to update the kernel with the selected route,
- * update the DB with the same information. This function will take care
- * of updating the DB
+ * Function to identify IPv4 router-id from the available port list.
+ * It first checks if the current value of active_router_id is present in the
+ * L3 port cache, if its present then it does not generate new router-id.
+ * If new router-id to be generated then it first checks for any available
+ * loopback interface and use that as router-id. If no loopback interface
+ * available then it picks the first available L3 port IP4 address as
+ * active router-id.
  */
-static int
-zebra_update_selected_route_to_db (struct route_node *rn, struct rib *route,
-                                   int action)
+char *
+zebra_ovsdb_get_router_id(char *active_router_id)
 {
-  char prefix_str[256];
-  const struct ovsrec_route *ovs_route = NULL;
-  bool selected = (action == ZEBRA_RT_INSTALL) ? true:false;
-  struct prefix *p = NULL;
-  rib_table_info_t *info = NULL;
+  struct shash_node *node, *next;
+  struct zebra_l3_port* l3_port = NULL;
+  char *int_ip_addr = NULL;
+  char *l3_ip4_address_prefix = NULL;
+  char *l3_ip4_address = NULL;
+  char *router_id = NULL;
+  bool found_loopback = false;
+  bool active_router_id_present = false;
+  int interface_index;
+  const struct ovsrec_port* ovsrec_port = NULL;
+  const struct ovsrec_interface* interface = NULL;
+
+  if (!shash_count(&zebra_cached_l3_ports))
+    {
+      VLOG_ERR("The L3 port hash table is empty. Can not get the router id");
+      return NULL;
+    }
 
   /*
-   * Fetch the rib entry from the DB and update the selected field based
-   * on action:
-   * action == ZEBRA_RT_INSTALL => selected = 1
-   * action == ZEBRA_RT_UNINSTALL => selected = 0
-   *
-   * If the 'route' has a valid 'ovsdb_route_row_uuid_ptr' pointer,
-   * then look-up the 'ovsrec_route' structure directly from
-   * 'ovsdb_route_row_uuid_ptr' pointer. Otherwise iterate through the
-   * OVSDB route to find out the relevant 'ovsrec_route' structure.
+   * Check if active_router_id present in current available L3 port cache
    */
-  if (route->ovsdb_route_row_uuid_ptr)
+  if (active_router_id != NULL)
     {
-      ovs_route = ovsrec_route_get_for_uuid(idl,
-                     (const struct uuid*)route->ovsdb_route_row_uuid_ptr);
+      SHASH_FOR_EACH_SAFE (node, next, &zebra_cached_l3_ports)
+        {
+          if (!(node->data))
+            {
+              VLOG_DBG("No node data found\n");
+              continue;
+            }
 
-      if (!ovs_route) {
-        VLOG_DBG("Route not found using UUID");
-        return 0;
-      }
+          l3_port = (struct zebra_l3_port*)node->data;
 
-      #ifdef VRF_ENABLE
-      if (!(zebra_is_route_in_my_vrf(ovs_route)))
-        return 0;
-      #endif
+          if (l3_port->ip4_address != NULL)
+            {
+              l3_ip4_address_prefix = strdup(l3_port->ip4_address);
+              l3_ip4_address = strtok(l3_ip4_address_prefix, "/");
 
-      VLOG_DBG("Cached OVSDB Route Entry: Prefix %s family %s "
-               "from %s priv %p for setting selected to %s", ovs_route->prefix,
-               ovs_route->address_family, ovs_route->from,
-               ovs_route->protocol_private,
-               selected ? "true" : "false");
+              if (l3_ip4_address != NULL &&
+                  strcmp (l3_ip4_address, active_router_id) == 0)
+                {
+                  VLOG_DBG("Active router id present in current L3 cache "
+                           "L3 port IPv4 = %s\n", l3_port->ip4_address);
+                  free(l3_ip4_address_prefix);
+                  active_router_id_present = true;
+                  break;
+                }
+
+              free(l3_ip4_address_prefix);
+            }
+          else if (shash_count(&(l3_port->ip4_address_secondary)))
+            {
+               SHASH_FOR_EACH_SAFE (node, next,
+                                    &(l3_port->ip4_address_secondary))
+                {
+                  if (!(node->data))
+                    {
+                      VLOG_DBG("No node data found\n");
+                      continue;
+                    }
+                  l3_ip4_address_prefix = strdup((char *)node->data);
+                  l3_ip4_address = strtok(l3_ip4_address_prefix, "/");
+                  if (l3_ip4_address != NULL &&
+                      strcmp (l3_ip4_address, active_router_id) == 0)
+                    {
+                      VLOG_DBG("Active router id present in current L3 cache "
+                               "L3 port secondary IPv4 = %s\n", l3_ip4_address_prefix);
+                      free(l3_ip4_address_prefix);
+                      active_router_id_present = true;
+                      break;
+                    }
+
+                  free(l3_ip4_address_prefix);
+                }
+            }
+          if (active_router_id_present)
+            break;
+        }
     }
-  else
-    {
-      p = &rn->p;
-      info = rib_table_info(rn->table);
-      memset(prefix_str, 0, sizeof(prefix_str));
-      prefix2str(p, prefix_str, sizeof(prefix_str));
 
-      VLOG_DBG("Prefix %s Family %d\n",prefix_str, PREFIX_FAMILY(p));
+  /*
+   * If active_router_id present in current L3 port cache then no chnages are required
+   * return NULL value
+   */
+  if(active_router_id_present)
+      return NULL;
 
-      switch (PREFIX_FAMILY (p))
+  /*
+   * Find Loopback interface if present
+   */
+  SHASH_FOR_EACH_SAFE (node, next, &zebra_cached_l3_ports)
+    {
+      if (!(node->data))
         {
-	case AF_INET:
-
-	  VLOG_DBG("Walk the OVSDB route DB to find the relevant row for"
-		   " prefix %s\n", prefix_str);
+          VLOG_DBG("No node data found\n");
+          continue;
+        }
 
-	  OVSREC_ROUTE_FOR_EACH (ovs_route, idl)
-	    {
-              #ifdef VRF_ENABLE
-              if (!(zebra_is_route_in_my_vrf(ovs_route)))
-                continue;
-              #endif
+      l3_port = (struct zebra_l3_port*)node->data;
 
-	      VLOG_DBG("DB Entry: Prefix %s family %s from %s",
-		       ovs_route->prefix, ovs_route->address_family,
-		       ovs_route->from);
+      if (l3_port->ip4_address != NULL ||
+          shash_count(&(l3_port->ip4_address_secondary)))
+        {
+          /*
+           * Get Port from UUID
+           */
+          ovsrec_port = ovsrec_port_get_for_uuid(idl,
+                            (const struct uuid *)&(l3_port->ovsrec_port_uuid));
+          if (!ovsrec_port)
+            {
+              VLOG_ERR("The port pointer is NULL");
+              continue;
+            }
 
-	      if (!strcmp(ovs_route->address_family,
-			  OVSREC_ROUTE_ADDRESS_FAMILY_IPV4))
-		{
-		  if (!strcmp(ovs_route->prefix, prefix_str))
-		    {
-		      if (route->type ==
-			  ovsdb_proto_to_zebra_proto(ovs_route->from))
-			{
-			  if (info->safi ==
-			      ovsdb_safi_to_zebra_safi(
-					ovs_route->sub_address_family))
-			    break;
-			}
-		    }
-		}
-	    }
-	  break;
-#ifdef HAVE_IPV6
-	case AF_INET6:
+          if (ovsrec_port->n_interfaces)
+            {
+              /*
+               * Get the first available Loopback interface
+               */
+              for (interface_index = 0;
+                   interface_index < ovsrec_port->n_interfaces;
+                   ++interface_index)
+                {
+                  interface = ovsrec_port->interfaces[interface_index];
 
-          VLOG_DBG("Walk the OVSDB route DB to find the relevant row for"
-		   " prefix %s\n", prefix_str);
+                  if (!interface)
+                    {
+                      VLOG_DBG("The interface pointer in port is NULL");
+                      continue;
+                    }
 
-          OVSREC_ROUTE_FOR_EACH (ovs_route, idl)
-	    {
-              #ifdef VRF_ENABLE
-              if (!(zebra_is_route_in_my_vrf(ovs_route)))
-                continue;
-              #endif
-
-	      VLOG_DBG("DB Entry: Prefix %s family %s from %s",
-		       ovs_route->prefix, ovs_route->address_family,
-		       ovs_route->from);
+                  if (interface->type &&
+                      !strcmp(interface->type, OVSREC_INTERFACE_TYPE_LOOPBACK))
+                    {
+                      VLOG_DBG("Found a loopback interface %s ",
+                                interface->name);
+                      found_loopback = true;
+                      break;    /* break from interfaces loop */
+                    }
+                }
 
-	      if (!strcmp(ovs_route->address_family,
-				  OVSREC_ROUTE_ADDRESS_FAMILY_IPV6))
-		{
-		  if (!strcmp(ovs_route->prefix, prefix_str))
-		    {
-		      if (route->type ==
-			      ovsdb_proto_to_zebra_proto(ovs_route->from))
-			{
-			  if (info->safi ==
-			      ovsdb_safi_to_zebra_safi(
-					ovs_route->sub_address_family))
-			    break;
-			}
-		    }
-		}
-	    }
-          break;
-#endif
-          default:
-          /* Unsupported protocol family! */
-          VLOG_ERR("Unsupported protocol in route update");
-          return 0;
-	}
+              if (found_loopback)
+                {
+                  break;   /* break from ports loop */
+                }
+            }
+        }
     }
 
-  if (ovs_route)
+  /*
+   * If loopback interface is not available then get the any first available L3 port
+   */
+  if (!found_loopback)
     {
-        VLOG_DBG("Updating the selected flag for the non-private routes. "
-                 "Setting selected %s for prefix %s",
-                 selected ? "true":"false", ovs_route->prefix);
-        zebra_ovs_update_selected_route(ovs_route, &selected);
-    }
-  return 0;
-}
+      SHASH_FOR_EACH_SAFE (node, next, &zebra_cached_l3_ports)
+        {
+          if (!(node->data))
+            {
+              VLOG_DBG("No node data found\n");
+              continue;
+            }
 
-/*
- * This function takes a zebra rn, zebra rib entry, the next-hop
- * port or IP/IPv6 address and the selected bit. The function then
- * looks for the corresponding next-hop row for the port or next-hop
- * IP/IPv6 addresses  in the OVSDB and marks the selected bit for
- * OVSDB next-hop row as true or false depending on the selected value.
- *
- * If all the next-hops are marked as unselected in the OVSDB, then the
- * OSVDB route's selected bit is also marked as false. If a next-hop is
- * marked as selected and this is the first next-hop for the route to be
- * marked selected, then the route's selected bit is also marked as true.
- */
-void zebra_update_selected_nh (struct route_node *rn, struct rib *route,
-                               char* port_name, char* nh_addr, int selected)
-{
-  struct ovsrec_route *route_row = NULL;
-  struct ovsrec_nexthop *nh_row;
-  struct ovsrec_nexthop *cand_nh_row;
-  int next_hop_index;
-  bool is_selected = (ZEBRA_NH_INSTALL == selected) ? true : false;
-  int number_of_selected_nh = 0;
+          l3_port = (struct zebra_l3_port*)node->data;
+
+          if (l3_port->ip4_address != NULL ||
+              shash_count(&(l3_port->ip4_address_secondary)))
+              break;
+        }
+    }
 
   /*
-   * If the zebra route node rib entry are NULL and both of port_name
-   * and nh_addr are NULL, then return from the function.
+   * Get the IPv4 address or secondary IPv4 address from the selected port
    */
-  if (!rn || !route || (!port_name && !nh_addr))
+  if (l3_port != NULL)
     {
-      VLOG_ERR("The route node or route's rib entry in null");
-      return;
+      VLOG_DBG("L3 port selected for router ID is %s ipaddr = %s\n",
+              l3_port->port_name, l3_port->ip4_address);
+      if (l3_port->ip4_address != NULL)
+        {
+          int_ip_addr = strdup(l3_port->ip4_address);
+        }
+      else
+        {
+          SHASH_FOR_EACH_SAFE (node, next,
+                                &(l3_port->ip4_address_secondary))
+            {
+              if (!(node->data))
+                {
+                  VLOG_DBG("No node data found\n");
+                  continue;
+                }
+              int_ip_addr = strdup((char*)node->data);
+              break;
+            }
+        }
     }
 
-  if (route->ovsdb_route_row_uuid_ptr)
+  /*
+   * Form the new active router-id
+   */
+  if (int_ip_addr != NULL)
     {
-      route_row = (struct ovsrec_route *)ovsrec_route_get_for_uuid(idl,
-                     (const struct uuid*)route->ovsdb_route_row_uuid_ptr);
-
-      if (!route_row) {
-        VLOG_DBG("Route not found using UUID");
-        return;
-      }
+      router_id = strtok(int_ip_addr, "/");
+    }
 
-      #ifdef VRF_ENABLE
-      if (!(zebra_is_route_in_my_vrf(route_row)))
-        return;
-      #endif
-      VLOG_DBG("Cached OVSDB Route Entry: Prefix %s family %s "
-               "from %s priv %p for setting %s to %s", route_row->prefix,
-               route_row->address_family, route_row->from,
-               route_row->protocol_private, port_name ? port_name : nh_addr,
-               is_selected ? "true" : "false");
+  VLOG_DBG("Identified router ID is %s\n", router_id);
 
+  return router_id;
+}
 
-      cand_nh_row = NULL; /* reference to the candidate next-hop row which
-                             matches the port or next-hop address. */
-      number_of_selected_nh = 0; /* counter to keep track of the number of
-                                    next-hops whose selected bit is set to
-                                    true. */
+/*
+ * Function to publish the VRF table active_router_id in OVSDB. This
+ * function identifies router-id based on the current list of L3 ports
+ * and writes it to the VRF table's active_router_id column.
+ */
+static void
+zebra_ovsdb_publish_active_router_id(void)
+{
+  const struct ovsrec_vrf *ovs_vrf = NULL;
+  char *router_id = NULL;
 
+  /*
+   * Update active router id for the Default VRF
+   */
+  OVSREC_VRF_FOR_EACH(ovs_vrf, idl)
+    {
       /*
-       * Walk all next-hops to find which next-hop needs to
-       * selected or unselected in OVSDB.
+       * Create a transaction for an active router id update to OVSDB from
+       * the zebra main thread.
        */
-      for (next_hop_index = 0; next_hop_index < route_row->n_nexthops;
-           ++next_hop_index)
-        {
-          nh_row = route_row->nexthops[next_hop_index];
-
-          /*
-           * Check if the port_name matches the next-hop port.
-           */
-          if (port_name && nh_row->ports && nh_row->ports[0]
-              && nh_row->ports[0]->name)
-            {
-              if (strcmp(nh_row->ports[0]->name, port_name) == 0)
-                {
-                  VLOG_DBG("Found a match with the nh port %s",
-                            nh_row->ports[0]->name);
-                  cand_nh_row = nh_row;
-                }
-            }
+      zebra_create_txn();
 
+      if (!strcmp(ovs_vrf->name, DEFAULT_VRF_NAME))
+        {
           /*
-           * Check if the nh_addr matches the next-hop IP/IPv6 address.
+           *  TODO Currently we are only suporting default VRF,
+           *       we need to expand this logic for all VRFs
            */
-          if (nh_addr && nh_row->ip_address)
-            {
-              if (strcmp(nh_row->ip_address, nh_addr) == 0)
-                {
-                  VLOG_DBG("Found a match with the nh address %s",
-                            nh_row->ip_address);
-                  cand_nh_row = nh_row;
-                }
-            }
 
-          /*
-           * If the selected field for the next-hop is set to true
-           * increment the counter number_of_selected_nh.
-           */
-          if (((!cand_nh_row) || (cand_nh_row != nh_row)) &&
-              ((nh_row->selected) && (nh_row->selected[0] == true)))
-            {
-              ++number_of_selected_nh;
-            }
-        }
+          router_id = zebra_ovsdb_get_router_id(ovs_vrf->active_router_id);
 
-      if (cand_nh_row)
-        {
-          if (!(cand_nh_row->selected))
-            {
-              /*
-               * If the selected pointer is null, update the selected
-               * with the is_selected boolean.
-               */
-              VLOG_DBG("Changing the next-hop selected flag from %s to %s",
-                       !cand_nh_row->selected ? "true" : "false",
-                       is_selected ? "true" : "false");
-              log_event("ZEBRA_NEXTHOP_STATE_CHANGE", EV_KV("nexthop_port", "%s",
-                        cand_nh_row->ip_address), EV_KV("old_state", "%s",
-                        !cand_nh_row->selected ? "true" : "false"),
-                        EV_KV("new_state","%s", is_selected ? "true" : "false"));
-              ovsrec_nexthop_set_selected(cand_nh_row, &is_selected, 1);
-              zebra_txn_updates = true;
-            }
-          else
+          VLOG_DBG("For VRF %s Zebra identified active_router_id = %s",
+                    ovs_vrf->name, router_id);
+          if (router_id != NULL)
             {
               /*
-               * If the selected pointer is not null, update the selected
-               * with the is_selected boolean if the selected value and the
-               * is_selected values are different.
+               * TODO: For each VRF check for user configured router-id,
+               *       if it is already present then do not use ZEBRA identified
+               *       router-id, instead update the user configured router-id as
+               *       active_router_id. Routing deamons will pick the
+               *       active_router_id and use it as the protocol specific
+               *       router-id. Below is the sample code which need to be
+               *       added once user configurable router-id support is available.
+               *
+               *       if (!ovs_vrf->router_id &&
+               *           strcmp(ovs_vrf->router_id, ovs_vrf->active_router_id) != 0){
+               *          ovsrec_vrf_set_active_router_id(ovs_vrf, ovs_vrf->router_id);
+               *       }
                */
-              if (cand_nh_row->selected[0] != is_selected)
-                {
-                  VLOG_DBG("Changing the next-hop selected flag from %s to %s",
-                           cand_nh_row->selected[0] ? "true" : "false",
-                           is_selected ? "true" : "false");
-                  log_event("ZEBRA_NEXTHOP_STATE_CHANGE", EV_KV("nexthop_port", "%s",
-                            cand_nh_row->ip_address), EV_KV("old_state", "%s",
-                            cand_nh_row->selected[0] ? "true" : "false"),
-                            EV_KV("new_state","%s", is_selected ? "true" : "false"));
-                  ovsrec_nexthop_set_selected(cand_nh_row, &is_selected, 1);
-                  zebra_txn_updates = true;
-                }
+              /* Set the active router id */
+              ovsrec_vrf_set_active_router_id(ovs_vrf, router_id);
+              zebra_txn_mark_resync(ZEBRA_TXN_RESYNC_ROUTER_ID);
+              free(router_id);
             }
 
-          if (is_selected)
-            {
-              /*
-               * If at least one next-hop is selected, then mark the
-               * route as selected. if 'number_of_selected_nh' is zero,
-               * we have at least one next-hop that is selected.
-               */
-              if (!number_of_selected_nh)
-                {
-                  VLOG_DBG("The route has at least one active next-hop. "
-                           "Set the selected bit on the route.");
-                  zebra_update_selected_route_to_db(rn, route,
-                                                    ZEBRA_RT_INSTALL);
-                }
-            }
-          else
-            {
-              /*
-               * If no next-hop is selected, then mark the route as
-               * unselected. If 'number_of_selected_nh' is one, then
-               * we should mark the route as unselected as no next-hops
-               * that are selected.
-               */
-              if (!number_of_selected_nh)
-                {
-                  VLOG_DBG("The route has no active next-hops. "
-                           "Unset the selected bit on the route.");
-                  zebra_update_selected_route_to_db(rn, route,
-                                                    ZEBRA_RT_UNINSTALL);
-                }
-            }
+          zebra_finish_txn(false);
         }
     }
-  else
-    {
-      VLOG_DBG("Cannot update the selected flag for the next-hop");
-    }
+
+  zebra_finish_txn(true);
 }
 
 /*
- * This function sets the selected flag on the route and next-hops
- * based on the 'action' variable. The OVSDB route entry is references
- * from the 'rib' data structure from zebra. This function should not
- * be called in cases when there are route entry deletions in the
- * OVSDB route table. The OVSDB route table entry is garbage collected
- * and hence the related pointer should not be referenced.
+ * Funtion to update the VRF table active_router_id in OVSDB.
+ * If there are any updates for the port list cache, then this function
+ * identifies router-id based on the current list of L3 portsto the
+ * VRF table's active_router_id column based on current list of L3 ports.
  */
-void
-zebra_update_selected_route_nexthops_to_db (struct route_node *rn,
-                                            struct rib *route,
-                                            int action)
+static void
+zebra_ovsdb_update_active_router_id(void)
 {
-  char prefix_str[256];
-  const struct ovsrec_route *ovs_route = NULL;
-  bool selected = (action == ZEBRA_NH_INSTALL) ? true:false;
-  struct prefix *p = NULL;
-  rib_table_info_t *info = NULL;
-  struct nexthop *nexthop;
-  char nexthop_str[256];
-
-  if (!rn)
+  if (!zebra_get_if_port_updated_or_changed())
     {
-      VLOG_DBG("The route node is NULL");
+      VLOG_DBG("No L3 port changes, no need to update active router ID");
       return;
     }
 
-  if (!route)
+  zebra_ovsdb_publish_active_router_id();
+}
+
+/*
+ * This function handles the port add/delete events. THis function
+ * eventually deletes the next-hops or routes if the resolving
+ * interface is deleted or chnaged to L2.
+ */
+static void
+zebra_handle_port_add_delete_changes (void)
+{
+  const struct ovsrec_port *first_port_row = NULL;
+
+  first_port_row = ovsrec_port_first(idl);
+  if (!first_port_row)
     {
-      VLOG_DBG("The route rib entry is NULL");
+      VLOG_DBG("There are no port rows in the port table.");
+
+      /*
+       * TODO: Cleanup all static routes created by zebra in kernel
+       */
       return;
     }
 
-  p = &rn->p;
-  info = rib_table_info(rn->table);
-  memset(prefix_str, 0, sizeof(prefix_str));
-  prefix2str(p, prefix_str, sizeof(prefix_str));
+  zebra_init_if_port_updated_or_changed();
 
-  VLOG_DBG("Prefix %s Family %d selected = %s\n",prefix_str, PREFIX_FAMILY(p),
-           selected ? "true":"false");
+  /*
+   * Initialize the delete list
+   */
+  zebra_route_del_list = list_new();
+  zebra_route_del_list->del = (void (*) (void *))
+                                      zebra_route_list_free_data;
 
-  switch (PREFIX_FAMILY (p))
+  /*
+   * Walk through all the port in the IDL and update the L3 port
+   * hash.
+   */
+  OVSREC_PORT_FOR_EACH (first_port_row, idl)
     {
       /*
-       * Case when the address family is IPv4.
+       * Create a transaction for any IDL route updates to OVSDB from
+       * the zebra main thread for the connected routes.
        */
-	  case AF_INET:
+      zebra_create_txn();
 
-        /*
-         * Walk all the next-hops of the 'rib' entry and set/un-set
-         * the selected flag on the next-hop.
-         */
-        nexthop = route->nexthop;
-        while (nexthop)
-          {
-            memset(nexthop_str, 0, sizeof(nexthop_str));
-            switch (nexthop->type)
-              {
-                /*
-                 * Case when the next-hop is of IP address.
-                 */
-                case NEXTHOP_TYPE_IPV4:
-                  if (inet_ntop(AF_INET, &nexthop->gate.ipv4,
-                                nexthop_str, sizeof(nexthop_str)))
-                    {
-                      /*
-                       * If the next-hop should be marked as selected, then
-                       * check whether the next-hop address is active or not.
-                       */
-                      if (action == ZEBRA_NH_INSTALL)
-                        {
-                          /*
-                           * If the next-hop address is not active, then mark
-                           * the next-hop as unselected in OVSDB. If the next-hop
-                           * address is active, then mark the next-hop and route
-                           * selected.
-                           */
-                          if (!zebra_nh_addr_active_in_cached_l3_ports_hash(
-                                                         nexthop_str, AFI_IP))
-                            {
-                              zebra_update_selected_nh(rn, route, NULL, nexthop_str,
-                                                       ZEBRA_NH_UNINSTALL);
-                            }
-                          else
-                            {
-                              zebra_update_selected_nh(rn, route, NULL, nexthop_str,
-                                                       ZEBRA_NH_INSTALL);
-                            }
-                        }
-                      else
-                        {
-                          /*
-                           * In case, the next-hop is to be marked as unselected,
-                           * then mark the next-hop and route as unselected in
-                           * OVSDB roue table.
-                           */
-                          zebra_update_selected_nh(rn, route, NULL,
-                                                 nexthop_str, ZEBRA_NH_UNINSTALL);
-                        }
-                    }
-                  break;
+      if (first_port_row)
+        {
+          VLOG_DBG("Got a port name %s (%s)(%s) (%s)\n",
+                   first_port_row->name,
+                   OVSREC_IDL_IS_ROW_INSERTED(
+                            first_port_row, idl_seqno) ? "I" : "",
+                   OVSREC_IDL_IS_ROW_MODIFIED(
+                            first_port_row, idl_seqno) ? "M" : "",
+                   zebra_if_ovsrec_port_is_l3(first_port_row) ?
+                                                       "L3" : "L2");
 
-                /*
-                 * Case when the next-hop is of port type.
-                 */
-                case NEXTHOP_TYPE_IFNAME:
+          /*
+           * Update the hash bucket for maintaining the configured L3
+           * ports.
+           */
+          zebra_add_or_update_cached_l3_ports_hash(first_port_row);
+        }
 
-                  /*
-                   * If the next-hop should be marked as selected, then
-                   * check whether the next-hop port is active or not.
-                   */
-                  if (action == ZEBRA_NH_INSTALL)
-                    {
-                      /*
-                       * If the next-hop port is not active, then mark
-                       * the next-hop as unselected in OVSDB. If the next-hop
-                       * port is active, then mark the next-hop and route
-                       * selected.
-                       */
-                      if (!zebra_nh_port_active_in_cached_l3_ports_hash(
-                                                              nexthop->ifname))
-                        {
-                          zebra_update_selected_nh(rn, route, nexthop->ifname,
-                                                   NULL, ZEBRA_NH_UNINSTALL);
-                        }
-                      else
-                        {
-                          zebra_update_selected_nh(rn, route, nexthop->ifname,
-                                                   NULL, ZEBRA_NH_INSTALL);
-                        }
-                    }
-                  else
-                    {
-                      /*
-                       * In case, the next-hop is to be marked as unselected,
-                       * then mark the next-hop and route as unselected in
-                       * OVSDB roue table.
-                       */
-                      zebra_update_selected_nh(rn, route, nexthop->ifname,
-                                               NULL, ZEBRA_NH_UNINSTALL);
-                    }
-                  break;
+      /*
+       * Since there are further routes to process for the
+       * main thread, we should try to see if there are
+       * enough route updates to fill a batch to OVSDB at this time.
+       * In this case we should publish the route updates to OVSDB.
+       */
+      zebra_finish_txn(false);
+    }
 
-                /*
-                 * Case when the next-hop type is unregnizable.
-                 */
-                default:
-                  VLOG_ERR("Unrecognizable next-hop");
-                  break;
-              }
+  /*
+   * Since there are no further routes to process for the main thread,
+   * we should submit all the outstanding route updates to OVSDB at this
+   * time.
+   */
+  zebra_finish_txn(true);
 
-            nexthop = nexthop->next;
-          }
-        break;
+  /*
+   * Check if any L3 ports got deleted in order to trigger cleanup
+   * of static routes.
+   */
+  zebra_check_for_deleted_l3_ports();
 
-#ifdef HAVE_IPV6
-      /*
-       * Case when the address family is IPv6.
-       */
-	  case AF_INET6:
+  /*
+   * Walk the zebra route table and find which nexthops need to be
+   * deleted from the kernel and OVSDB.
+   */
+  zebra_find_routes_with_updated_ports_state(AFI_IP, SAFI_UNICAST, 0,
+                                       "L3 port delete/no routing");
+  zebra_find_routes_with_updated_ports_state(AFI_IP6, SAFI_UNICAST, 0,
+                                       "L3 port delete/no routing");
 
-        /*
-         * Walk all the next-hops of the 'rib' entry and set/un-set
-         * the selected flag on the next-hop.
-         */
-        nexthop = route->nexthop;
+  /*
+   * Delte the next-hops which have been marked for deletion from
+   * he kernel and the OVSDB.
+   */
+  zebra_route_del_process();
+  list_free(zebra_route_del_list);
+
+  /*
+   * Find out which ports got deleted from the L3 port hash.
+   */
+  zebra_remove_deleted_cached_l3_ports_hash();
+
+  /*
+   * If debug logging is enabled, then dump the L3 port cache.
+   */
+  if (VLOG_IS_DBG_ENABLED())
+    {
+      zebra_l3_port_walk_cache_and_print(NULL,
+                                         &zebra_cached_l3_ports, true);
+      zebra_l3_port_walk_cache_and_print(NULL,
+                                         &zebra_updated_or_changed_l3_ports,
+                                         false);
+    }
+
+  /*
+   * Update Active Router-ID
+   */
+  zebra_ovsdb_update_active_router_id();
+
+  /*
+   * Clean-up all the connected routes from the L3 cache containing
+   * the deleted L3 port ports.
+   */
+  zebra_delete_connected_routes_from_deleted_l3_port_cache();
+
+  /*
+   * Walk and delete all L3 port nodes which not not L3 anymore
+   */
+  zebra_cleanup_if_port_updated_or_changed();
+}
+
+/*
+ * This function does pre-restart intialization when zebra process
+ * comes up from a shutdown state.
+ */
+static void
+zebra_pre_restart_setup()
+{
+  /*
+   * Intialize the hash table for storing the connected routes
+   * and their UUIds immediately after zebra restarts.
+   */
+  shash_init(&connected_routes_hash_after_restart);
+}
+
+/*
+ * This function does post-restart clean-up when zebra process
+ * comes up from a shutdown state.
+ */
+static void
+zebra_post_restart_cleanup()
+{
+  /*
+   * After reading all configuration set this flag to false for
+   * clean-up of the connected routes in the OVSDB dues to zebra
+   * restart.
+   */
+  zebra_first_run_after_restart = false;
+
+  /*
+   * Call the function which does the actual connected routes
+   * cleanup, updation and insertion into OVSDB after zebra
+   * restart.
+   */
+  zebra_walk_l3_cache_and_restore_connected_routes_after_zebra_restart();
+}
+
+/* Check if any changes are there to the idl and update
+ * the local structures accordingly.
+ */
+static void
+zebra_reconfigure (struct ovsdb_idl *idl)
+{
+  unsigned int new_idl_seqno = ovsdb_idl_get_seqno(idl);
+  COVERAGE_INC(zebra_ovsdb_cnt);
+
+  if (new_idl_seqno == idl_seqno)
+    {
+      VLOG_DBG("No config change for zebra in ovs\n");
+      return;
+    }
+
+  /* Apply all ovsdb notifications */
+  if (zebra_first_run_after_restart)
+    {
+      VLOG_DBG("Zebra restarted. Cleanup the stale routes from kernel");
+
+      /*
+       * Dump the zebra internal shadow table containing the routes
+       * learned from the kernel.
+       */
+      if (VLOG_IS_DBG_ENABLED())
+        {
+          VLOG_DBG("Printing shadow internal route table for kernel"
+                   "cleanup after zebra restart\n");
+
+          zebra_dump_internal_route_table(NULL,
+                                          vrf_shadow_table(AFI_IP,
+                                                           SAFI_UNICAST,
+                                                           0));
+          zebra_dump_internal_route_table(NULL,
+                                          vrf_shadow_table(AFI_IP6,
+                                                           SAFI_UNICAST,
+                                                           0));
+        }
+
+      zebra_pre_restart_setup();
+      zebra_handle_port_add_delete_changes();
+      zebra_handle_interface_admin_state_changes();
+      zebra_apply_route_changes();
+      zebra_post_restart_cleanup();
+    }
+  else
+    {
+      VLOG_DBG("Second run for the zebra config changes");
+
+      zebra_apply_route_changes();
+      zebra_handle_port_add_delete_changes();
+      zebra_handle_interface_admin_state_changes();
+    }
+
+  /* update the seq. number */
+  idl_seqno = new_idl_seqno;
+
+  /* All the tracked row changes have been consumed by this run */
+  ovsdb_idl_track_clear(idl);
+}
+
+/* Wrapper function that checks for idl updates and reconfigures the daemon
+ */
+static void
+zebra_ovs_run (void)
+{
+  if (zebra_txn_count)
+    {
+      VLOG_DBG("Processing an on-going transaction so bypass IDL read");
+      return;
+    }
+  else
+    {
+      if (zebra_txn)
+        {
+          VLOG_DBG("Release the transaction object");
+          ovsdb_idl_txn_destroy(zebra_txn);
+        }
+      zebra_txn = NULL;
+    }
+
+  ovsdb_idl_run(idl);
+  unixctl_server_run(appctl);
+#ifdef VRF_ENABLE
+  /* Check if zebra_vrf is set; */
+  if (!zebra_vrf || !strlen(zebra_vrf))
+    {
+      zebra_vrf = zebra_get_my_vrf_name();
+      VLOG_DBG("zebra_ovs_run for vrf %s", zebra_vrf);
+      if (!zebra_vrf)
+        {
+          VLOG_ERR("Can't retrieve vrf name");
+          return;
+        }
+    }
+#endif
+
+  if (ovsdb_idl_is_lock_contended(idl))
+    {
+      static struct vlog_rate_limit rl = VLOG_RATE_LIMIT_INIT(1, 1);
+
+      VLOG_ERR_RL(&rl, "another zebra process is running, "
+                  "disabling this process until it goes away");
+      return;
+    }
+  else if (!ovsdb_idl_has_lock(idl))
+    return;
+
+  /*
+   * Check the route update transactions waiting for the OVSDB reply
+   * and retry the failed ones.
+   */
+  zebra_txn_run_inflight();
+
+  zebra_chk_for_system_configured();
+
+  if (system_configured)
+    {
+      zebra_reconfigure(idl);
+
+      daemonize_complete();
+      vlog_enable_async();
+      VLOG_INFO_ONCE("%s (OpenSwitch zebra) %s", program_name, VERSION);
+    }
+}
+
+static void
+zebra_ovs_wait (void)
+{
+  ovsdb_idl_wait(idl);
+  unixctl_server_wait(appctl);
+}
+
+/* Callback function to handle read events
+ * In the event of an update to the idl cache, this callback is triggered.
+ * In this event, the changes are processed in the daemon and the cb
+ * functions are re-registered.
+ */
+static int
+zovs_read_cb (struct thread *thread)
+{
+  zebra_ovsdb_t *zovs_g;
+  if (!thread)
+    {
+      VLOG_ERR("NULL thread in read cb function\n");
+      return -1;
+    }
+  zovs_g = THREAD_ARG(thread);
+  if (!zovs_g)
+    {
+      VLOG_ERR("NULL args in read cb function\n");
+      return -1;
+    }
+
+  zovs_g->read_cb_count++;
+
+  zebra_ovs_clear_fds();
+  zebra_ovs_run();
+  zebra_ovs_wait();
+
+  if (0 != zebra_ovspoll_enqueue(zovs_g))
+    {
+      /*
+       * Could not enqueue the events.
+       * Retry in 1 sec
+       */
+      thread_add_timer(zovs_g->master,
+                       zovs_read_cb, zovs_g, 1);
+    }
+  return 1;
+}
+
+/* Add the list of OVS poll fd to the master thread of the daemon
+ */
+static int
+zebra_ovspoll_enqueue (zebra_ovsdb_t *zovs_g)
+{
+  struct poll_loop *loop = poll_loop();
+  struct poll_node *node;
+  long int timeout;
+  int retval = -1;
+
+  /* Populate with all the fds events. */
+  HMAP_FOR_EACH (node, hmap_node, &loop->poll_nodes)
+    {
+      thread_add_read(zovs_g->master,
+                      zovs_read_cb,
+                      zovs_g, node->pollfd.fd);
+      /*
+       * If we successfully connected to OVS return 0.
+       * Else return -1 so that we try to reconnect.
+       * */
+      retval = 0;
+    }
+
+  /* Populate the timeout event */
+  if (loop->timeout_when == LLONG_MIN)
+    {
+      thread_add_timer(zovs_g->master,
+		       zovs_read_cb, zovs_g,
+		       0);
+    }
+  else
+    {
+      timeout = loop->timeout_when - time_msec();
+      if (timeout > 0 && loop->timeout_when > 0 &&
+          loop->timeout_when < LLONG_MAX)
+        {
+          /* Convert msec to sec */
+          timeout = (timeout + 999)/1000;
+
+          thread_add_timer(zovs_g->master,
+                           zovs_read_cb, zovs_g,
+                           timeout);
+        }
+    }
+
+  return retval;
+}
+
+/* Initialize and integrate the ovs poll loop with the daemon */
+void
+zebra_ovsdb_init_poll_loop (struct zebra_t *zebrad)
+{
+  if (!glob_zebra_ovs.enabled)
+    {
+      VLOG_ERR("OVS not enabled for zebra. Return\n");
+      return;
+    }
+  glob_zebra_ovs.master = zebrad->master;
+
+  zebra_ovs_clear_fds();
+  zebra_ovs_run();
+  zebra_ovs_wait();
+  zebra_ovspoll_enqueue(&glob_zebra_ovs);
+
+  zebra_route_consistency_check_thread =
+      thread_add_timer(glob_zebra_ovs.master, zebra_route_consistency_check,
+                       NULL, ZEBRA_ROUTE_CONSISTENCY_CHECK_INTERVAL);
+}
+
+static void
+ovsdb_exit (void)
+{
+  ovsdb_idl_destroy(idl);
+}
+
+/* When the daemon is ready to shut, delete the idl cache
+ * This happens with the ovs-appctl exit command.
+ */
+void
+zebra_ovsdb_exit (void)
+{
+  #ifdef VRF_ENABLE
+  free(zebra_vrf);
+  zebra_vrf = NULL;
+  #endif
+  log_event("ZEBRA_OVSDB_EXIT",NULL);
+  zebra_route_pipeline_set_enabled(false);
+  ovsdb_exit();
+}
+
+/*
+ * This is a helper function which deletes the OVSDB next-hop entries from the
+ * route. The next-hops which are marked as true in bool array will be deleted
+ * from OVSDB. If the number of next-hops for the route becomes 0, then the route
+ * itself is deleted from the OVSDB.
+ */
+static void
+zebra_route_delete_nexthops (struct ovsrec_route *route, bool *nexthop_decision,
+                             size_t number_next_hops)
+{
+  struct ovsrec_nexthop **nexthops = NULL;
+  size_t i, n;
+
+  if (!nexthop_decision)
+    {
+      VLOG_ERR("The next-hop decision array in NULL");
+      return;
+    }
+
+  if (route->n_nexthops != number_next_hops)
+    {
+        VLOG_ERR("The number of route nexthops %u is not same as decision"
+                 " array's length %u", route->n_nexthops, number_next_hops);
+        return;
+    }
+
+  nexthops = xmalloc(sizeof(struct ovsrec_nexthop *) * (route->n_nexthops));
+  for (i = n = 0; i < route->n_nexthops; i++)
+    {
+        if (!nexthop_decision[i])
+          nexthops[n++] = route->nexthops[i];
+    }
+
+  zebra_txn_record_nexthops_delete(route, nexthop_decision);
+  ovsrec_route_set_nexthops(route, nexthops, n);
+
+  /*
+   * If the route does not have any next-hops left, then delete this route.
+   */
+  if (n == 0)
+    {
+      VLOG_DBG("Need to delete the OVSDB route for prefix %s", route->prefix);
+      log_event("ZEBRA_ROUTE_DEL", EV_KV("prefix", "%s",route->prefix));
+      ovsrec_route_delete(route);
+      zebra_txn_mark_updated();
+    }
+
+  free(nexthops);
+}
+
+
+/*
+ * This function takes a zebra rib entry and the next-hop port and deletes the
+ * corresponding next-hop port from OVSDB.
+ */
+void zebra_delete_route_nexthop_addr_from_db (struct rib *route,
+                                              char* nexthop_str)
+{
+  struct ovsrec_route *route_row = NULL;
+  struct ovsrec_nexthop *nh_row;
+  int port_index;
+  int next_hop_index;
+  bool *found_nexthop_addr;
+
+  if (!route || !nexthop_str)
+    {
+      VLOG_ERR("The route's rib entry or next-hop address in null");
+      return;
+    }
+
+  if (route && (route->ovsdb_route_row_uuid_ptr))
+    {
+      route_row = (struct ovsrec_route*)ovsrec_route_get_for_uuid(idl,
+                     (const struct uuid*)route->ovsdb_route_row_uuid_ptr);
+
+      if (!route_row) {
+        VLOG_DBG("Route not found using UUID");
+        return;
+      }
+
+      #ifdef VRF_ENABLE
+      if (!(zebra_is_route_in_my_vrf(route_row)))
+        return;
+      #endif
+      VLOG_DBG("Cached OVSDB Route Entry: Prefix %s family %s "
+               "from %s priv %p", route_row->prefix,
+               route_row->address_family, route_row->from,
+               route_row->protocol_private);
+
+      VLOG_DBG("Walk route next-hops to find the next-hop "
+               " corresponding to the next-hop address %s",
+               nexthop_str);
+
+      /*
+       * This bool array stores the decision as to which next-hop rows
+       * need to be deleted. If a next-hop need to be deleted, then the
+       * bool array entry will be set to true.
+       */
+      found_nexthop_addr =
+              (bool *)xmalloc(sizeof(bool) * (route_row->n_nexthops));
+      memset(found_nexthop_addr, 0, sizeof(bool) * (route_row->n_nexthops));
+
+      /*
+       * Walk all next-hops to find which next-hop address needs to
+       * be deleted from OVSDB.
+       */
+      for (next_hop_index = 0; next_hop_index < route_row->n_nexthops;
+           ++next_hop_index)
+        {
+          nh_row = route_row->nexthops[next_hop_index];
+          VLOG_DBG("Inspecting the next-hop with address %s",
+                    nh_row->ip_address);
+
+          if (!(nh_row->ip_address))
+            {
+              continue;
+            }
+
+          /*
+           * Check if the nexthop_str is same as the next-hop IP
+           * address.
+           */
+          if (strcmp(nexthop_str, nh_row->ip_address) == 0)
+            {
+              VLOG_DBG("Found the nexthop match");
+              found_nexthop_addr[next_hop_index] = true;
+              log_event("ZEBRA_NEXTHOP_STATE", EV_KV("nexthop_port", "%s",
+                        nexthop_str), EV_KV("msg", "%s", "to be deleted"));
+            }
+        }
+
+      /*
+       * Delete the next-hop rows which are marked as true in the
+       * bool array.
+       */
+      zebra_route_delete_nexthops(route_row, found_nexthop_addr,
+                                  route_row->n_nexthops);
+
+      /*
+       * Free the allocated bool array.
+       */
+      free(found_nexthop_addr);
+    }
+  else
+    {
+      VLOG_DBG("Cannot delete the next-hop address from OVSDB");
+    }
+}
+
+/*
+ * This function takes a zebra rib entry and the next-hop port and deletes
+ * the corresponding next-hop port from OVSDB.
+ */
+void zebra_delete_route_nexthop_port_from_db (struct rib *route,
+                                              char* port_name)
+{
+  struct ovsrec_route *route_row = NULL;
+  struct ovsrec_nexthop *nh_row;
+  int port_index;
+  int next_hop_index;
+  bool* found_port = NULL;
+
+  if (!route || !port_name)
+    {
+      VLOG_ERR("The route's rib entry or port name in null");
+      return;
+    }
+
+  if (route && (route->ovsdb_route_row_uuid_ptr))
+    {
+      route_row = (struct ovsrec_route *)ovsrec_route_get_for_uuid(idl,
+                    (const struct uuid*)route->ovsdb_route_row_uuid_ptr);
+
+      if (!route_row) {
+        VLOG_DBG("Route not found using UUID");
+        return;
+      }
+
+      #ifdef VRF_ENABLE
+      if (!(zebra_is_route_in_my_vrf(route_row)))
+        return;
+      #endif
+      VLOG_DBG("Cached OVSDB Route Entry: Prefix %s family %s "
+               "from %s priv %p", route_row->prefix,
+               route_row->address_family, route_row->from,
+               route_row->protocol_private);
+
+      VLOG_DBG("Finding the nexthop row corresponding to the port %s",
+               port_name);
+
+      /*
+       * This bool array stores the decision as to which next-hop rows
+       * need to be deleted. If a next-hop need to be deleted, then the
+       * bool array entry will be set to true.
+       */
+      found_port = (bool *)xmalloc(sizeof(bool) * (route_row->n_nexthops));
+      memset(found_port, 0, sizeof(bool) * (route_row->n_nexthops));
+
+      /*
+       * Walk all next-hops to find which next-hop port needs to
+       * be deleted from OVSDB.
+       */
+      for (next_hop_index = 0; next_hop_index < route_row->n_nexthops;
+           ++next_hop_index)
+        {
+          nh_row = route_row->nexthops[next_hop_index];
+
+          /*
+           * If the nexthop does not have a valid ip address or
+           * port, then cleanup this port.
+           */
+          if (!(nh_row->ip_address) && !(nh_row->n_ports))
+            {
+              VLOG_DBG("The next-hop IP and port are NULL. "
+                        "Delete this port from OVSDB");
+              found_port[next_hop_index] = true;
+            }
+          else if (nh_row->ports && nh_row->ports[0]
+                       && nh_row->ports[0]->name)
+            {
+              /*
+               * Check the first port in the port list to see if the port_name
+               * is the same as the first port entry.
+               */
+              VLOG_DBG("Inspecting port %s to see if same as %s",
+                        nh_row->ports[0]->name, port_name);
+
+              if (strcmp(nh_row->ports[0]->name, port_name) == 0) {
+                  found_port[next_hop_index] = true;
+                  log_event("ZEBRA_NEXTHOP_STATE", EV_KV("nexthop_port", "%s",
+                            port_name), EV_KV("msg", "%s", "to be deleted"));
+              }
+            }
+        }
+
+      /*
+       * Delete the next-hop rows which are marked as true in the
+       * bool array.
+       */
+      zebra_route_delete_nexthops(route_row, found_port,
+                                  route_row->n_nexthops);
+
+      /*
+       * Free the allocated bool array.
+       */
+      free(found_port);
+    }
+  else
+    {
+      VLOG_DBG("Cannot delete the next-hop port from OVSDB");
+    }
+}
+
+/* Update the selected column in the route row in OVSDB
+ */
+int
+zebra_ovs_update_selected_route (const struct ovsrec_route *ovs_route,
+                                 bool *selected)
+{
+  const bool *route_selected;
+
+  if (ovs_route)
+    {
+      /*
+       * Found the route entry. Update the selected column.
+       * ECMP: Update only if it is different.
+       */
+      VLOG_DBG("Updating selected flag for route %s", ovs_route->prefix);
+      route_selected = zebra_txn_get_route_selected(ovs_route);
+      if ( (route_selected != NULL) &&
+          (route_selected[0] == *selected) )
+        {
+          VLOG_DBG("No change in selected flag previous %s and new %s",
+                    route_selected[0] ? "true" : "false",
+                    *selected ? "true" : "false");
+          return 0;
+        }
+
+      log_event("ZEBRA_ROUTE", EV_KV("routemsg", "%s",
+                *selected ? "Route selected":"Route unselected"),
+                EV_KV("prefix", "%s", ovs_route->prefix));
+      /*
+       * Update the selected bit, and mark it to commit into DB.
+       */
+      zebra_txn_set_route_selected(ovs_route, *selected);
+      VLOG_DBG("Route update successful");
+
+    }
+  return 0;
+}
+
+/*
+ * When zebra is ready to update the kernel with the selected route,
+ * update the DB with the same information. This function will take care
+ * of updating the DB
+ */
+static int
+zebra_update_selected_route_to_db (struct route_node *rn, struct rib *route,
+                                   int action)
+{
+  char prefix_str[256];
+  const struct ovsrec_route *ovs_route = NULL;
+  bool selected = (action == ZEBRA_RT_INSTALL) ? true:false;
+  struct prefix *p = NULL;
+  rib_table_info_t *info = NULL;
+
+  /*
+   * Fetch the rib entry from the DB and update the selected field based
+   * on action:
+   * action == ZEBRA_RT_INSTALL => selected = 1
+   * action == ZEBRA_RT_UNINSTALL => selected = 0
+   *
+   * If the 'route' has a valid 'ovsdb_route_row_uuid_ptr' pointer,
+   * then look-up the 'ovsrec_route' structure directly from
+   * 'ovsdb_route_row_uuid_ptr' pointer. Otherwise iterate through the
+   * OVSDB route to find out the relevant 'ovsrec_route' structure.
+   */
+  if (route->ovsdb_route_row_uuid_ptr)
+    {
+      ovs_route = ovsrec_route_get_for_uuid(idl,
+                     (const struct uuid*)route->ovsdb_route_row_uuid_ptr);
+
+      if (!ovs_route) {
+        VLOG_DBG("Route not found using UUID");
+        return 0;
+      }
+
+      #ifdef VRF_ENABLE
+      if (!(zebra_is_route_in_my_vrf(ovs_route)))
+        return 0;
+      #endif
+
+      VLOG_DBG("Cached OVSDB Route Entry: Prefix %s family %s "
+               "from %s priv %p for setting selected to %s", ovs_route->prefix,
+               ovs_route->address_family, ovs_route->from,
+               ovs_route->protocol_private,
+               selected ? "true" : "false");
+    }
+  else
+    {
+      p = &rn->p;
+      info = rib_table_info(rn->table);
+      memset(prefix_str, 0, sizeof(prefix_str));
+      prefix2str(p, prefix_str, sizeof(prefix_str));
+
+      VLOG_DBG("Prefix %s Family %d\n",prefix_str, PREFIX_FAMILY(p));
+
+      switch (PREFIX_FAMILY (p))
+        {
+	case AF_INET:
+
+	  VLOG_DBG("Walk the OVSDB route DB to find the relevant row for"
+		   " prefix %s\n", prefix_str);
+
+	  OVSREC_ROUTE_FOR_EACH (ovs_route, idl)
+	    {
+              #ifdef VRF_ENABLE
+              if (!(zebra_is_route_in_my_vrf(ovs_route)))
+                continue;
+              #endif
+
+	      VLOG_DBG("DB Entry: Prefix %s family %s from %s",
+		       ovs_route->prefix, ovs_route->address_family,
+		       ovs_route->from);
+
+	      if (!strcmp(ovs_route->address_family,
+			  OVSREC_ROUTE_ADDRESS_FAMILY_IPV4))
+		{
+		  if (!strcmp(ovs_route->prefix, prefix_str))
+		    {
+		      if (route->type ==
+			  ovsdb_proto_to_zebra_proto(ovs_route->from))
+			{
+			  if (info->safi ==
+			      ovsdb_safi_to_zebra_safi(
+					ovs_route->sub_address_family))
+			    break;
+			}
+		    }
+		}
+	    }
+	  break;
+#ifdef HAVE_IPV6
+	case AF_INET6:
+
+          VLOG_DBG("Walk the OVSDB route DB to find the relevant row for"
+		   " prefix %s\n", prefix_str);
+
+          OVSREC_ROUTE_FOR_EACH (ovs_route, idl)
+	    {
+              #ifdef VRF_ENABLE
+              if (!(zebra_is_route_in_my_vrf(ovs_route)))
+                continue;
+              #endif
+
+	      VLOG_DBG("DB Entry: Prefix %s family %s from %s",
+		       ovs_route->prefix, ovs_route->address_family,
+		       ovs_route->from);
+
+	      if (!strcmp(ovs_route->address_family,
+				  OVSREC_ROUTE_ADDRESS_FAMILY_IPV6))
+		{
+		  if (!strcmp(ovs_route->prefix, prefix_str))
+		    {
+		      if (route->type ==
+			      ovsdb_proto_to_zebra_proto(ovs_route->from))
+			{
+			  if (info->safi ==
+			      ovsdb_safi_to_zebra_safi(
+					ovs_route->sub_address_family))
+			    break;
+			}
+		    }
+		}
+	    }
+          break;
+#endif
+          default:
+          /* Unsupported protocol family! */
+          VLOG_ERR("Unsupported protocol in route update");
+          return 0;
+	}
+    }
+
+  if (ovs_route)
+    {
+        VLOG_DBG("Updating the selected flag for the non-private routes. "
+                 "Setting selected %s for prefix %s",
+                 selected ? "true":"false", ovs_route->prefix);
+        zebra_ovs_update_selected_route(ovs_route, &selected);
+    }
+  return 0;
+}
+
+/*
+ * This function takes a zebra rn, zebra rib entry, the next-hop
+ * port or IP/IPv6 address and the selected bit. The function then
+ * looks for the corresponding next-hop row for the port or next-hop
+ * IP/IPv6 addresses  in the OVSDB and marks the selected bit for
+ * OVSDB next-hop row as true or false depending on the selected value.
+ *
+ * If all the next-hops are marked as unselected in the OVSDB, then the
+ * OSVDB route's selected bit is also marked as false. If a next-hop is
+ * marked as selected and this is the first next-hop for the route to be
+ * marked selected, then the route's selected bit is also marked as true.
+ */
+void zebra_update_selected_nh (struct route_node *rn, struct rib *route,
+                               char* port_name, char* nh_addr, int selected)
+{
+  struct ovsrec_route *route_row = NULL;
+  struct ovsrec_nexthop *nh_row;
+  struct ovsrec_nexthop *cand_nh_row;
+  const bool *nh_selected;
+  int next_hop_index;
+  bool is_selected = (ZEBRA_NH_INSTALL == selected) ? true : false;
+  int number_of_selected_nh = 0;
+
+  /*
+   * If the zebra route node rib entry are NULL and both of port_name
+   * and nh_addr are NULL, then return from the function.
+   */
+  if (!rn || !route || (!port_name && !nh_addr))
+    {
+      VLOG_ERR("The route node or route's rib entry in null");
+      return;
+    }
+
+  if (route->ovsdb_route_row_uuid_ptr)
+    {
+      route_row = (struct ovsrec_route *)ovsrec_route_get_for_uuid(idl,
+                     (const struct uuid*)route->ovsdb_route_row_uuid_ptr);
+
+      if (!route_row) {
+        VLOG_DBG("Route not found using UUID");
+        return;
+      }
+
+      #ifdef VRF_ENABLE
+      if (!(zebra_is_route_in_my_vrf(route_row)))
+        return;
+      #endif
+      VLOG_DBG("Cached OVSDB Route Entry: Prefix %s family %s "
+               "from %s priv %p for setting %s to %s", route_row->prefix,
+               route_row->address_family, route_row->from,
+               route_row->protocol_private, port_name ? port_name : nh_addr,
+               is_selected ? "true" : "false");
+
+
+      cand_nh_row = NULL; /* reference to the candidate next-hop row which
+                             matches the port or next-hop address. */
+      number_of_selected_nh = 0; /* counter to keep track of the number of
+                                    next-hops whose selected bit is set to
+                                    true. */
+
+      /*
+       * Walk all next-hops to find which next-hop needs to
+       * selected or unselected in OVSDB.
+       */
+      for (next_hop_index = 0; next_hop_index < route_row->n_nexthops;
+           ++next_hop_index)
+        {
+          nh_row = route_row->nexthops[next_hop_index];
+
+          /*
+           * Check if the port_name matches the next-hop port.
+           */
+          if (port_name && nh_row->ports && nh_row->ports[0]
+              && nh_row->ports[0]->name)
+            {
+              if (strcmp(nh_row->ports[0]->name, port_name) == 0)
+                {
+                  VLOG_DBG("Found a match with the nh port %s",
+                            nh_row->ports[0]->name);
+                  cand_nh_row = nh_row;
+                }
+            }
+
+          /*
+           * Check if the nh_addr matches the next-hop IP/IPv6 address.
+           */
+          if (nh_addr && nh_row->ip_address)
+            {
+              if (strcmp(nh_row->ip_address, nh_addr) == 0)
+                {
+                  VLOG_DBG("Found a match with the nh address %s",
+                            nh_row->ip_address);
+                  cand_nh_row = nh_row;
+                }
+            }
+
+          /*
+           * If the selected field for the next-hop is set to true
+           * increment the counter number_of_selected_nh.
+           */
+          nh_selected = zebra_txn_get_nexthop_selected(nh_row);
+          if (((!cand_nh_row) || (cand_nh_row != nh_row)) &&
+              ((nh_selected) && (nh_selected[0] == true)))
+            {
+              ++number_of_selected_nh;
+            }
+        }
+
+      if (cand_nh_row)
+        {
+          nh_selected = zebra_txn_get_nexthop_selected(cand_nh_row);
+          if (!nh_selected)
+            {
+              /*
+               * If the selected pointer is null, update the selected
+               * with the is_selected boolean.
+               */
+              VLOG_DBG("Changing the next-hop selected flag from %s to %s",
+                       !nh_selected ? "true" : "false",
+                       is_selected ? "true" : "false");
+              log_event("ZEBRA_NEXTHOP_STATE_CHANGE", EV_KV("nexthop_port", "%s",
+                        cand_nh_row->ip_address), EV_KV("old_state", "%s",
+                        !nh_selected ? "true" : "false"),
+                        EV_KV("new_state","%s", is_selected ? "true" : "false"));
+              zebra_txn_set_nexthop_selected(cand_nh_row, is_selected);
+            }
+          else
+            {
+              /*
+               * If the selected pointer is not null, update the selected
+               * with the is_selected boolean if the selected value and the
+               * is_selected values are different.
+               */
+              if (nh_selected[0] != is_selected)
+                {
+                  VLOG_DBG("Changing the next-hop selected flag from %s to %s",
+                           nh_selected[0] ? "true" : "false",
+                           is_selected ? "true" : "false");
+                  log_event("ZEBRA_NEXTHOP_STATE_CHANGE", EV_KV("nexthop_port", "%s",
+                            cand_nh_row->ip_address), EV_KV("old_state", "%s",
+                            nh_selected[0] ? "true" : "false"),
+                            EV_KV("new_state","%s", is_selected ? "true" : "false"));
+                  zebra_txn_set_nexthop_selected(cand_nh_row, is_selected);
+                }
+            }
+
+          if (is_selected)
+            {
+              /*
+               * If at least one next-hop is selected, then mark the
+               * route as selected. if 'number_of_selected_nh' is zero,
+               * we have at least one next-hop that is selected.
+               */
+              if (!number_of_selected_nh)
+                {
+                  VLOG_DBG("The route has at least one active next-hop. "
+                           "Set the selected bit on the route.");
+                  zebra_update_selected_route_to_db(rn, route,
+                                                    ZEBRA_RT_INSTALL);
+                }
+            }
+          else
+            {
+              /*
+               * If no next-hop is selected, then mark the route as
+               * unselected. If 'number_of_selected_nh' is one, then
+               * we should mark the route as unselected as no next-hops
+               * that are selected.
+               */
+              if (!number_of_selected_nh)
+                {
+                  VLOG_DBG("The route has no active next-hops. "
+                           "Unset the selected bit on the route.");
+                  zebra_update_selected_route_to_db(rn, route,
+                                                    ZEBRA_RT_UNINSTALL);
+                }
+            }
+        }
+    }
+  else
+    {
+      VLOG_DBG("Cannot update the selected flag for the next-hop");
+    }
+}
+
+/*
+ * This function sets the selected flag on the route and next-hops
+ * based on the 'action' variable. The OVSDB route entry is references
+ * from the 'rib' data structure from zebra. This function should not
+ * be called in cases when there are route entry deletions in the
+ * OVSDB route table. The OVSDB route table entry is garbage collected
+ * and hence the related pointer should not be referenced.
+ */
+void
+zebra_update_selected_route_nexthops_to_db (struct route_node *rn,
+                                            struct rib *route,
+                                            int action)
+{
+  char prefix_str[256];
+  const struct ovsrec_route *ovs_route = NULL;
+  bool selected = (action == ZEBRA_NH_INSTALL) ? true:false;
+  struct prefix *p = NULL;
+  rib_table_info_t *info = NULL;
+  struct nexthop *nexthop;
+  char nexthop_str[256];
+
+  if (!rn)
+    {
+      VLOG_DBG("The route node is NULL");
+      return;
+    }
+
+  if (!route)
+    {
+      VLOG_DBG("The route rib entry is NULL");
+      return;
+    }
+
+  p = &rn->p;
+  info = rib_table_info(rn->table);
+  memset(prefix_str, 0, sizeof(prefix_str));
+  prefix2str(p, prefix_str, sizeof(prefix_str));
+
+  VLOG_DBG("Prefix %s Family %d selected = %s\n",prefix_str, PREFIX_FAMILY(p),
+           selected ? "true":"false");
+
+  switch (PREFIX_FAMILY (p))
+    {
+      /*
+       * Case when the address family is IPv4.
+       */
+	  case AF_INET:
+
+        /*
+         * Walk all the next-hops of the 'rib' entry and set/un-set
+         * the selected flag on the next-hop.
+         */
+        nexthop = route->nexthop;
+        while (nexthop)
+          {
+            memset(nexthop_str, 0, sizeof(nexthop_str));
+            switch (nexthop->type)
+              {
+                /*
+                 * Case when the next-hop is of IP address.
+                 */
+                case NEXTHOP_TYPE_IPV4:
+                  if (inet_ntop(AF_INET, &nexthop->gate.ipv4,
+                                nexthop_str, sizeof(nexthop_str)))
+                    {
+                      /*
+                       * If the next-hop should be marked as selected, then
+                       * check whether the next-hop address is active or not.
+                       */
+                      if (action == ZEBRA_NH_INSTALL)
+                        {
+                          /*
+                           * If the next-hop address is not active, then mark
+                           * the next-hop as unselected in OVSDB. If the next-hop
+                           * address is active, then mark the next-hop and route
+                           * selected.
+                           */
+                          if (!zebra_nh_addr_active_in_cached_l3_ports_hash(
+                                                         nexthop_str, AFI_IP))
+                            {
+                              zebra_update_selected_nh(rn, route, NULL, nexthop_str,
+                                                       ZEBRA_NH_UNINSTALL);
+                            }
+                          else
+                            {
+                              zebra_update_selected_nh(rn, route, NULL, nexthop_str,
+                                                       ZEBRA_NH_INSTALL);
+                            }
+                        }
+                      else
+                        {
+                          /*
+                           * In case, the next-hop is to be marked as unselected,
+                           * then mark the next-hop and route as unselected in
+                           * OVSDB roue table.
+                           */
+                          zebra_update_selected_nh(rn, route, NULL,
+                                                 nexthop_str, ZEBRA_NH_UNINSTALL);
+                        }
+                    }
+                  break;
+
+                /*
+                 * Case when the next-hop is of port type.
+                 */
+                case NEXTHOP_TYPE_IFNAME:
+
+                  /*
+                   * If the next-hop should be marked as selected, then
+                   * check whether the next-hop port is active or not.
+                   */
+                  if (action == ZEBRA_NH_INSTALL)
+                    {
+                      /*
+                       * If the next-hop port is not active, then mark
+                       * the next-hop as unselected in OVSDB. If the next-hop
+                       * port is active, then mark the next-hop and route
+                       * selected.
+                       */
+                      if (!zebra_nh_port_active_in_cached_l3_ports_hash(
+                                                              nexthop->ifname))
+                        {
+                          zebra_update_selected_nh(rn, route, nexthop->ifname,
+                                                   NULL, ZEBRA_NH_UNINSTALL);
+                        }
+                      else
+                        {
+                          zebra_update_selected_nh(rn, route, nexthop->ifname,
+                                                   NULL, ZEBRA_NH_INSTALL);
+                        }
+                    }
+                  else
+                    {
+                      /*
+                       * In case, the next-hop is to be marked as unselected,
+                       * then mark the next-hop and route as unselected in
+                       * OVSDB roue table.
+                       */
+                      zebra_update_selected_nh(rn, route, nexthop->ifname,
+                                               NULL, ZEBRA_NH_UNINSTALL);
+                    }
+                  break;
+
+                /*
+                 * Case when the next-hop type is unregnizable.
+                 */
+                default:
+                  VLOG_ERR("Unrecognizable next-hop");
+                  break;
+              }
+
+            nexthop = nexthop->next;
+          }
+        break;
+
+#ifdef HAVE_IPV6
+      /*
+       * Case when the address family is IPv6.
+       */
+	  case AF_INET6:
+
+        /*
+         * Walk all the next-hops of the 'rib' entry and set/un-set
+         * the selected flag on the next-hop.
+         */
+        nexthop = route->nexthop;
         while (nexthop)
           {
             switch (nexthop->type)
@@ -6464,290 +8046,969 @@ zebra_update_selected_route_nexthops_to_db (struct route_node *rn,
                     }
                   break;
 
-                /*
-                 * Case when the next-hop is of port type.
-                 */
-                case NEXTHOP_TYPE_IFNAME:
+                /*
+                 * Case when the next-hop is of port type.
+                 */
+                case NEXTHOP_TYPE_IFNAME:
+
+                  /*
+                   * If the next-hop should be marked as selected, then
+                   * check whether the next-hop port is active or not.
+                   */
+                  if (action == ZEBRA_NH_INSTALL)
+                    {
+                      /*
+                       * If the next-hop port is not active, then mark
+                       * the next-hop as unselected in OVSDB. If the next-hop
+                       * port is active, then mark the next-hop and route
+                       * selected.
+                       */
+                      if (!zebra_nh_port_active_in_cached_l3_ports_hash(
+                                                              nexthop->ifname))
+                        {
+                          zebra_update_selected_nh(rn, route, nexthop->ifname,
+                                                   NULL, ZEBRA_NH_UNINSTALL);
+                        }
+                      else
+                        {
+                          zebra_update_selected_nh(rn, route, nexthop->ifname,
+                                                   NULL, ZEBRA_NH_INSTALL);
+                        }
+                    }
+                  else
+                    {
+                      /*
+                       * In case, the next-hop is to be marked as unselected,
+                       * then mark the next-hop and route as unselected in
+                       * OVSDB roue table.
+                       */
+                       zebra_update_selected_nh(rn, route, nexthop->ifname,
+                                                NULL, ZEBRA_NH_UNINSTALL);
+                    }
+                  break;
+
+                /*
+                 * Case when the next-hop type is unregnizable.
+                 */
+                default:
+                  VLOG_ERR("Unrecognizable next-hop");
+                  break;
+              }
+
+            nexthop = nexthop->next;
+          }
+        break;
+#endif
+
+      /*
+       * Case when the address family is unregnizable.
+       */
+      default:
+        VLOG_ERR("Unrecognizable address family");
+        break;
+    }
+}
+
+/*
+ * Function to add ipv4/6 route from protocols, with one or multiple nexthops.
+ */
+int
+zebra_add_route (bool is_ipv6, struct prefix *p, int type, safi_t safi,
+                 const struct ovsrec_route *route)
+{
+  struct rib *rib;
+  int flags = 0;
+  u_int32_t vrf_id = 0;
+  struct ovsrec_nexthop *idl_nexthop;
+  struct in_addr ipv4_dest_addr;
+  struct in6_addr ipv6_dest_addr;
+  struct uuid* route_uuid = NULL;
+  int count;
+  int rc = 1;
+
+  /* Allocate new rib. */
+  rib = XCALLOC (MTYPE_RIB, sizeof (struct rib));
+
+  /* Type, flags, nexthop_num. */
+  rib->type = type;
+  rib->flags = flags;
+  rib->uptime = time (NULL);
+  rib->nexthop_num = 0; /* Start with zero */
+
+  /*
+   * Cache the route's UUID within for use when setting and unsetting
+   * the selected bits on the route
+   */
+  route_uuid = (struct uuid*)xzalloc(sizeof(struct uuid));
+
+  /*
+   * Copy the uuid of the ovsrec_port row for future references.
+   */
+  memcpy(route_uuid, &OVSREC_IDL_GET_TABLE_ROW_UUID(route),
+         sizeof(struct uuid));
+
+  rib->ovsdb_route_row_uuid_ptr = (void*) route_uuid;
+
+  VLOG_DBG("Processing prefix %s for %d next-hops",
+           route->prefix, route->n_nexthops);
+
+  for (count = 0; count < route->n_nexthops; count++)
+    {
+      idl_nexthop = route->nexthops[count];
+
+      /* If invalid next-hop then do not process that */
+      if ((idl_nexthop == NULL))
+        {
+          VLOG_DBG("Found next-hop number %d is NULL");
+          continue;
+        }
+
+      /* If next hop is port */
+      if(idl_nexthop->ports != NULL)
+        {
+          VLOG_DBG("Processing %d-next-hop %s", count,
+                   idl_nexthop->ports[0]->name);
+
+          log_event("ZEBRA_ROUTE_ADD_NEXTHOP_EVENTS", EV_KV("prefix", "%s",
+                   route->prefix),EV_KV("nexthop", "%s",
+                   idl_nexthop->ports[0]->name));
+
+          nexthop_ifname_add(rib, idl_nexthop->ports[0]->name);
+        }
+      else
+        {
+          memset(&ipv4_dest_addr, 0, sizeof(struct in_addr));
+          memset(&ipv6_dest_addr, 0, sizeof(struct in6_addr));
+
+          /*
+           * Check if next-hop is ipv4 or ipv6
+           */
+          if (inet_pton(AF_INET, idl_nexthop->ip_address,
+                        &ipv4_dest_addr) != 1)
+            {
+              if (inet_pton(AF_INET6, idl_nexthop->ip_address,
+                            &ipv6_dest_addr) != 1)
+                {
+                  VLOG_DBG("Invalid next-hop ip %s",idl_nexthop->ip_address);
+                  continue;
+                }
+              else
+                {
+                  VLOG_DBG("Processing %d-next-hop ipv6 %s",
+                           count, idl_nexthop->ip_address);
+                  log_event("ZEBRA_ROUTE_ADD_NEXTHOP_EVENTS", EV_KV("prefix", "%s",
+                            route->prefix),EV_KV("nexthop", "%s",
+                            idl_nexthop->ip_address));
+                  nexthop_ipv6_add(rib, &ipv6_dest_addr);
+                }
+            }
+          else
+            {
+              VLOG_DBG("Processing ipv4 %d-next-hop ipv4 %s",
+                       count, idl_nexthop->ip_address);
+              log_event("ZEBRA_ROUTE_ADD_NEXTHOP_EVENTS", EV_KV("prefix", "%s",
+                        route->prefix),EV_KV("nexthop", "%s",
+                        idl_nexthop->ip_address));
+              nexthop_ipv4_add(rib, &ipv4_dest_addr, NULL);
+            }
+        }
+    }
+
+  /* Distance. */
+  if (route->distance != NULL)
+    rib->distance = route->distance[0];
+  else
+    rib->distance = 0;
 
-                  /*
-                   * If the next-hop should be marked as selected, then
-                   * check whether the next-hop port is active or not.
-                   */
-                  if (action == ZEBRA_NH_INSTALL)
-                    {
-                      /*
-                       * If the next-hop port is not active, then mark
-                       * the next-hop as unselected in OVSDB. If the next-hop
-                       * port is active, then mark the next-hop and route
-                       * selected.
-                       */
-                      if (!zebra_nh_port_active_in_cached_l3_ports_hash(
-                                                              nexthop->ifname))
-                        {
-                          zebra_update_selected_nh(rn, route, nexthop->ifname,
-                                                   NULL, ZEBRA_NH_UNINSTALL);
-                        }
-                      else
-                        {
-                          zebra_update_selected_nh(rn, route, nexthop->ifname,
-                                                   NULL, ZEBRA_NH_INSTALL);
-                        }
-                    }
-                  else
-                    {
-                      /*
-                       * In case, the next-hop is to be marked as unselected,
-                       * then mark the next-hop and route as unselected in
-                       * OVSDB roue table.
-                       */
-                       zebra_update_selected_nh(rn, route, nexthop->ifname,
-                                                NULL, ZEBRA_NH_UNINSTALL);
-                    }
-                  break;
+  /* TODO: What about weight in Nexthop, metric and weight are same?? */
+  /* Metric. */
+  if (route->metric != NULL)
+    rib->metric = route->metric[0];
+  else
+    rib->metric = 0;
 
-                /*
-                 * Case when the next-hop type is unregnizable.
-                 */
-                default:
-                  VLOG_ERR("Unrecognizable next-hop");
-                  break;
-              }
+  /* Table */
+  rib->table = vrf_id;
+
+  if (is_ipv6)
+    {
+      /* Set rc, incase of no ipv6 */
+#ifdef HAVE_IPV6
+      rc = rib_add_ipv6_multipath((struct prefix_ipv6 *)p, rib, safi);
+#endif
+    }
+  else
+    rc = rib_add_ipv4_multipath((struct prefix_ipv4 *)p, rib, safi);
+
+  return rc;
+}
+
+/*
+** Function to create transaction for submitting rib updates to DB.
+** Create only if not created already by main thread.
+*/
+int
+zebra_create_txn (void)
+{
+  if (zebra_txn == NULL)
+    {
+      zebra_txn = ovsdb_idl_txn_create(idl);
+      if (!zebra_txn)
+        {
+          VLOG_ERR("%s: Transaction creation failed" , __func__);
+          return 1;
+        }
+      else
+        {
+          VLOG_DBG("Created a transaction for route updates to OVSDB");
+        }
+    }
+
+  /* Else txn already there, continue the updates and commit */
+  return 0;
+}
+
+/*
+ * This function marks that a row update has been added to the open
+ * transaction. The time of the first update is remembered so that the
+ * updates are not held back for longer than ZEBRA_TXN_MAX_HOLD_MSEC.
+ */
+static void
+zebra_txn_mark_updated (void)
+{
+  if (!zebra_txn_pending_rows)
+    zebra_txn_open_msec = time_msec();
+
+  ++zebra_txn_pending_rows;
+  zebra_txn_updates = true;
+}
+
+/*
+ * This function marks that a row update derived from the zebra caches
+ * in 'resync' has been added to the open transaction. If the transaction
+ * fails, the rows are rebuilt from these caches.
+ */
+static void
+zebra_txn_mark_resync (unsigned int resync)
+{
+  zebra_txn_open_resync |= resync;
+  zebra_txn_mark_updated();
+}
+
+/*
+ * This function records the next-hops of a route row marked as true in
+ * the bool array into the next-hop delete journal of the open transaction.
+ */
+static void
+zebra_txn_record_nexthops_delete (const struct ovsrec_route *route,
+                                  const bool *nexthop_decision)
+{
+  char uuid_str[UUID_LEN + 1];
+  struct sset *nexthops;
+  size_t i;
+
+  snprintf(uuid_str, sizeof(uuid_str), UUID_FMT,
+           UUID_ARGS(&OVSREC_IDL_GET_TABLE_ROW_UUID(route)));
+
+  nexthops = shash_find_data(&zebra_txn_nexthop_delete_journal, uuid_str);
+  if (!nexthops)
+    {
+      nexthops = xmalloc(sizeof(struct sset));
+      sset_init(nexthops);
+      shash_add(&zebra_txn_nexthop_delete_journal, uuid_str, nexthops);
+    }
+
+  for (i = 0; i < route->n_nexthops; i++)
+    {
+      if (!nexthop_decision[i])
+        continue;
+
+      snprintf(uuid_str, sizeof(uuid_str), UUID_FMT,
+               UUID_ARGS(&OVSREC_IDL_GET_TABLE_ROW_UUID(route->nexthops[i])));
+      sset_add(nexthops, uuid_str);
+    }
+
+  zebra_txn_mark_updated();
+}
+
+/*
+ * This function frees a next-hop delete journal.
+ */
+static void
+zebra_txn_nexthop_delete_journal_destroy (struct shash *journal)
+{
+  struct shash_node *jnode;
+
+  SHASH_FOR_EACH (jnode, journal)
+    sset_destroy(jnode->data);
+
+  shash_destroy_free_data(journal);
+}
+
+/*
+ * This function returns the selected value of the row 'uuid_str' last
+ * committed before the in-flight transaction at 'stop', or before the
+ * open transaction if 'stop' is NULL. OVSDB has not replied to the
+ * in-flight transactions yet, so the IDL row still shows 'idl_selected',
+ * the value from before them. The failed transactions are skipped, their
+ * values are replayed into a newer transaction.
+ */
+static const bool *
+zebra_txn_committed_selected (struct listnode *stop, bool is_route,
+                              const char *uuid_str, const bool *idl_selected)
+{
+  struct zebra_txn_inflight *inflight;
+  struct listnode *node;
+  const bool *selected = idl_selected;
+  const bool *value;
+
+  for (node = listhead(zebra_txn_inflight_list); node && (node != stop);
+       node = listnextnode(node))
+    {
+      inflight = listgetdata(node);
+      if (!inflight->txn)
+        continue;
+
+      value = shash_find_data(is_route ? &inflight->route_journal
+                                       : &inflight->nexthop_journal,
+                              uuid_str);
+      if (value)
+        selected = value;
+    }
+
+  return selected;
+}
+
+/*
+ * This function returns the selected value of the row 'uuid' as seen by
+ * the open transaction: the value pending in its journal, else the value
+ * of the newest in-flight transaction, else the value of the IDL row.
+ */
+static const bool *
+zebra_txn_get_selected (bool is_route, const struct uuid *uuid,
+                        const bool *idl_selected)
+{
+  struct shash *journal = is_route ? &zebra_txn_route_journal
+                                   : &zebra_txn_nexthop_journal;
+  char uuid_str[UUID_LEN + 1];
+  const bool *selected;
+
+  if (!shash_count(journal) &&
+      (!zebra_txn_inflight_list || !listcount(zebra_txn_inflight_list)))
+    return idl_selected;
+
+  snprintf(uuid_str, sizeof(uuid_str), UUID_FMT, UUID_ARGS(uuid));
+
+  selected = shash_find_data(journal, uuid_str);
+  if (selected)
+    return selected;
+
+  return zebra_txn_committed_selected(NULL, is_route, uuid_str,
+                                      idl_selected);
+}
+
+/*
+ * This function records the final selected value for the row 'uuid'
+ * into the journal of the open transaction. If the row already has a
+ * pending value, then the earlier transition is collapsed into this one.
+ */
+static void
+zebra_txn_journal_record (struct shash *journal, const struct uuid *uuid,
+                          bool selected)
+{
+  char uuid_str[UUID_LEN + 1];
+  bool *value;
+
+  snprintf(uuid_str, sizeof(uuid_str), UUID_FMT, UUID_ARGS(uuid));
+
+  value = shash_find_data(journal, uuid_str);
+  if (value)
+    {
+      COVERAGE_INC(zebra_selected_write_collapsed);
+      ++zebra_txn_stats.selected_writes_collapsed;
+      *value = selected;
+      return;
+    }
+
+  value = xmalloc(sizeof(bool));
+  *value = selected;
+  shash_add(journal, uuid_str, value);
+  zebra_txn_mark_updated();
+}
+
+/*
+ * This function returns the selected flag of a route row as seen by the
+ * open transaction.
+ */
+static const bool *
+zebra_txn_get_route_selected (const struct ovsrec_route *route)
+{
+  return zebra_txn_get_selected(true, &OVSREC_IDL_GET_TABLE_ROW_UUID(route),
+                                route->selected);
+}
+
+/*
+ * This function returns the selected flag of a next-hop row as seen by
+ * the open transaction.
+ */
+static const bool *
+zebra_txn_get_nexthop_selected (const struct ovsrec_nexthop *nexthop)
+{
+  return zebra_txn_get_selected(false,
+                                &OVSREC_IDL_GET_TABLE_ROW_UUID(nexthop),
+                                nexthop->selected);
+}
+
+/*
+ * This function marks the selected flag of a route row to be updated in
+ * the open transaction.
+ */
+static void
+zebra_txn_set_route_selected (const struct ovsrec_route *route,
+                              bool selected)
+{
+  zebra_txn_journal_record(&zebra_txn_route_journal,
+                           &OVSREC_IDL_GET_TABLE_ROW_UUID(route), selected);
+}
+
+/*
+ * This function marks the selected flag of a next-hop row to be updated
+ * in the open transaction.
+ */
+static void
+zebra_txn_set_nexthop_selected (const struct ovsrec_nexthop *nexthop,
+                                bool selected)
+{
+  zebra_txn_journal_record(&zebra_txn_nexthop_journal,
+                           &OVSREC_IDL_GET_TABLE_ROW_UUID(nexthop), selected);
+}
+
+/*
+ * This function writes the final selected values in the journal of the
+ * open transaction into the route and next-hop rows. The rows which
+ * already have the final value in OVSDB, or in a transaction waiting for
+ * the OVSDB reply, are not written and are dropped from the journal, so
+ * that the journal only holds the values written by the transaction.
+ */
+static void
+zebra_txn_flush_selected (void)
+{
+  const struct ovsrec_route *route;
+  const struct ovsrec_nexthop *nexthop;
+  struct shash_node *jnode, *jnext;
+  struct uuid uuid;
+  const bool *committed;
+  bool *selected;
+
+  SHASH_FOR_EACH_SAFE (jnode, jnext, &zebra_txn_route_journal)
+    {
+      route = NULL;
+      if (uuid_from_string(&uuid, jnode->name))
+        route = ovsrec_route_get_for_uuid(idl, &uuid);
+      selected = jnode->data;
+
+      if (!route)
+        {
+          free(shash_delete(&zebra_txn_route_journal, jnode));
+          continue;
+        }
+
+      committed = zebra_txn_committed_selected(NULL, true, jnode->name,
+                                               route->selected);
+      if (committed && (*committed == *selected))
+        {
+          COVERAGE_INC(zebra_selected_write_suppressed);
+          ++zebra_txn_stats.selected_writes_suppressed;
+          free(shash_delete(&zebra_txn_route_journal, jnode));
+          continue;
+        }
+
+      ovsrec_route_set_selected(route, selected, 1);
+    }
+
+  SHASH_FOR_EACH_SAFE (jnode, jnext, &zebra_txn_nexthop_journal)
+    {
+      nexthop = NULL;
+      if (uuid_from_string(&uuid, jnode->name))
+        nexthop = ovsrec_nexthop_get_for_uuid(idl, &uuid);
+      selected = jnode->data;
+
+      if (!nexthop)
+        {
+          free(shash_delete(&zebra_txn_nexthop_journal, jnode));
+          continue;
+        }
+
+      committed = zebra_txn_committed_selected(NULL, false, jnode->name,
+                                               nexthop->selected);
+      if (committed && (*committed == *selected))
+        {
+          COVERAGE_INC(zebra_selected_write_suppressed);
+          ++zebra_txn_stats.selected_writes_suppressed;
+          free(shash_delete(&zebra_txn_nexthop_journal, jnode));
+          continue;
+        }
+
+      ovsrec_nexthop_set_selected(nexthop, selected, 1);
+    }
+}
+
+/*
+ * This function frees a committed transaction along with its journal.
+ */
+static void
+zebra_txn_inflight_free (struct zebra_txn_inflight *inflight)
+{
+  if (inflight->txn)
+    ovsdb_idl_txn_destroy(inflight->txn);
+
+  shash_destroy_free_data(&inflight->route_journal);
+  shash_destroy_free_data(&inflight->nexthop_journal);
+  zebra_txn_nexthop_delete_journal_destroy(&inflight->nexthop_delete_journal);
+  free(inflight);
+}
+
+/*
+ * This function adapts the batch target to the observed commit latency.
+ * If OVSDB is slow to acknowledge the commits, then the route updates
+ * are grouped in larger transactions to avoid commit storms. If OVSDB
+ * acknowledges the commits quickly, then the route updates are published
+ * in smaller transactions to reduce the route selection lag.
+ */
+static void
+zebra_txn_adapt_batch_size (long long int latency)
+{
+  int target = zebra_txn_stats.batch_rows_target;
+
+  if (latency >= ZEBRA_TXN_COMMIT_LATENCY_HIGH_MSEC)
+    target = MIN(target * 2, ZEBRA_TXN_BATCH_ROWS_MAX);
+  else if (latency <= ZEBRA_TXN_COMMIT_LATENCY_LOW_MSEC)
+    target = MAX(target / 2, ZEBRA_TXN_BATCH_ROWS_MIN);
+
+  if (target != zebra_txn_stats.batch_rows_target)
+    {
+      VLOG_DBG("Changing the route update batch size from %d to %d rows "
+               "for commit latency %lld msec",
+               zebra_txn_stats.batch_rows_target, target, latency);
+      zebra_txn_stats.batch_rows_target = target;
+    }
+}
+
+/*
+ * This function handles the completion status of a committed transaction.
+ * It returns true if the transaction is done with, and false if the
+ * transaction failed and its journal needs to be replayed.
+ */
+static bool
+zebra_txn_inflight_complete (struct zebra_txn_inflight *inflight,
+                             enum ovsdb_idl_txn_status status)
+{
+  long long int latency;
+
+  VLOG_DBG("The transaction error code is %s for committing %d route "
+           "updates", ovsdb_idl_txn_status_to_string(status), inflight->rows);
+
+  if ((status == TXN_SUCCESS) || (status == TXN_UNCHANGED))
+    {
+      latency = time_msec() - inflight->commit_msec;
+
+      ++zebra_txn_stats.completed;
+      zebra_txn_stats.last_commit_latency_msec = latency;
+      zebra_txn_stats.total_commit_latency_msec += latency;
+      if (latency > zebra_txn_stats.max_commit_latency_msec)
+        zebra_txn_stats.max_commit_latency_msec = latency;
+
+      if (status == TXN_SUCCESS)
+        zebra_txn_adapt_batch_size(latency);
 
-            nexthop = nexthop->next;
-          }
-        break;
-#endif
+      VLOG_DBG("Successfully committed a transaction to OVSDB");
+      return true;
+    }
 
-      /*
-       * Case when the address family is unregnizable.
-       */
-      default:
-        VLOG_ERR("Unrecognizable address family");
-        break;
+  VLOG_ERR("Route update failed. The transaction error is %s",
+           ovsdb_idl_txn_status_to_string(status));
+
+  if (inflight->txn)
+    ovsdb_idl_txn_destroy(inflight->txn);
+  inflight->txn = NULL;
+
+  if (inflight->retries >= ZEBRA_TXN_MAX_RETRIES)
+    {
+      VLOG_ERR("Dropping %d route updates after %d retries",
+               inflight->rows, inflight->retries);
+      COVERAGE_INC(zebra_txn_failure);
+      ++zebra_txn_stats.failures;
+      return true;
     }
+
+  return false;
 }
 
 /*
- * Function to add ipv4/6 route from protocols, with one or multiple nexthops.
+ * This function checks if the selected flag of the row 'uuid_str' has
+ * been written again after the transaction at 'node'. The newer value
+ * is then the one that should be published to OVSDB.
  */
-int
-zebra_add_route (bool is_ipv6, struct prefix *p, int type, safi_t safi,
-                 const struct ovsrec_route *route)
+static bool
+zebra_txn_journal_has_newer (struct listnode *node, bool is_route,
+                             const char *uuid_str)
 {
-  struct rib *rib;
-  int flags = 0;
-  u_int32_t vrf_id = 0;
-  struct ovsrec_nexthop *idl_nexthop;
-  struct in_addr ipv4_dest_addr;
-  struct in6_addr ipv6_dest_addr;
-  struct uuid* route_uuid = NULL;
-  int count;
-  int rc = 1;
+  struct zebra_txn_inflight *inflight;
 
-  /* Allocate new rib. */
-  rib = XCALLOC (MTYPE_RIB, sizeof (struct rib));
+  if (shash_find(is_route ? &zebra_txn_route_journal
+                          : &zebra_txn_nexthop_journal, uuid_str))
+    return true;
 
-  /* Type, flags, nexthop_num. */
-  rib->type = type;
-  rib->flags = flags;
-  rib->uptime = time (NULL);
-  rib->nexthop_num = 0; /* Start with zero */
+  for (node = listnextnode(node); node; node = listnextnode(node))
+    {
+      inflight = listgetdata(node);
+      if (shash_find(is_route ? &inflight->route_journal
+                              : &inflight->nexthop_journal, uuid_str))
+        return true;
+    }
 
-  /*
-   * Cache the route's UUID within for use when setting and unsetting
-   * the selected bits on the route
-   */
-  route_uuid = (struct uuid*)xzalloc(sizeof(struct uuid));
+  return false;
+}
 
-  /*
-   * Copy the uuid of the ovsrec_port row for future references.
-   */
-  memcpy(route_uuid, &OVSREC_IDL_GET_TABLE_ROW_UUID(route),
-         sizeof(struct uuid));
+/*
+ * This function replays the next-hop delete journal of a failed
+ * transaction into the open transaction. The next-hops still referenced
+ * by the route rows are removed again, and the routes left without
+ * next-hops are deleted.
+ */
+static void
+zebra_txn_replay_nexthops_delete (struct shash *journal)
+{
+  const struct ovsrec_route *route;
+  struct shash_node *jnode;
+  char uuid_str[UUID_LEN + 1];
+  struct uuid uuid;
+  bool *nexthop_decision;
+  bool found;
+  size_t i;
 
-  rib->ovsdb_route_row_uuid_ptr = (void*) route_uuid;
+  SHASH_FOR_EACH (jnode, journal)
+    {
+      if (!uuid_from_string(&uuid, jnode->name))
+        continue;
 
-  VLOG_DBG("Processing prefix %s for %d next-hops",
-           route->prefix, route->n_nexthops);
+      route = ovsrec_route_get_for_uuid(idl, &uuid);
+      if (!route || !route->n_nexthops)
+        continue;
 
-  for (count = 0; count < route->n_nexthops; count++)
-    {
-      idl_nexthop = route->nexthops[count];
+      nexthop_decision = xzalloc(sizeof(bool) * route->n_nexthops);
+      found = false;
 
-      /* If invalid next-hop then do not process that */
-      if ((idl_nexthop == NULL))
+      for (i = 0; i < route->n_nexthops; i++)
         {
-          VLOG_DBG("Found next-hop number %d is NULL");
-          continue;
+          snprintf(uuid_str, sizeof(uuid_str), UUID_FMT,
+                   UUID_ARGS(&OVSREC_IDL_GET_TABLE_ROW_UUID(
+                                                    route->nexthops[i])));
+          if (sset_contains(jnode->data, uuid_str))
+            found = nexthop_decision[i] = true;
         }
 
-      /* If next hop is port */
-      if(idl_nexthop->ports != NULL)
-        {
-          VLOG_DBG("Processing %d-next-hop %s", count,
-                   idl_nexthop->ports[0]->name);
+      if (found)
+        zebra_route_delete_nexthops((struct ovsrec_route *)route,
+                                    nexthop_decision, route->n_nexthops);
 
-          log_event("ZEBRA_ROUTE_ADD_NEXTHOP_EVENTS", EV_KV("prefix", "%s",
-                   route->prefix),EV_KV("nexthop", "%s",
-                   idl_nexthop->ports[0]->name));
+      free(nexthop_decision);
+    }
+}
 
-          nexthop_ifname_add(rib, idl_nexthop->ports[0]->name);
-        }
-      else
-        {
-          memset(&ipv4_dest_addr, 0, sizeof(struct in_addr));
-          memset(&ipv6_dest_addr, 0, sizeof(struct in6_addr));
+/*
+ * This function replays the journal of a failed transaction into the
+ * open transaction. The rows deleted from OVSDB in the meantime, and the
+ * rows which already have the journaled value in OVSDB or in an older
+ * transaction waiting for the OVSDB reply, are skipped. The rows
+ * inserted by the failed transaction are rebuilt later by
+ * zebra_txn_resync().
+ */
+static void
+zebra_txn_replay (struct listnode *node, struct zebra_txn_inflight *inflight)
+{
+  const struct ovsrec_route *route;
+  const struct ovsrec_nexthop *nexthop;
+  struct shash_node *jnode;
+  struct uuid uuid;
+  const bool *committed;
+  bool *selected;
 
-          /*
-           * Check if next-hop is ipv4 or ipv6
-           */
-          if (inet_pton(AF_INET, idl_nexthop->ip_address,
-                        &ipv4_dest_addr) != 1)
-            {
-              if (inet_pton(AF_INET6, idl_nexthop->ip_address,
-                            &ipv6_dest_addr) != 1)
-                {
-                  VLOG_DBG("Invalid next-hop ip %s",idl_nexthop->ip_address);
-                  continue;
-                }
-              else
-                {
-                  VLOG_DBG("Processing %d-next-hop ipv6 %s",
-                           count, idl_nexthop->ip_address);
-                  log_event("ZEBRA_ROUTE_ADD_NEXTHOP_EVENTS", EV_KV("prefix", "%s",
-                            route->prefix),EV_KV("nexthop", "%s",
-                            idl_nexthop->ip_address));
-                  nexthop_ipv6_add(rib, &ipv6_dest_addr);
-                }
-            }
-          else
-            {
-              VLOG_DBG("Processing ipv4 %d-next-hop ipv4 %s",
-                       count, idl_nexthop->ip_address);
-              log_event("ZEBRA_ROUTE_ADD_NEXTHOP_EVENTS", EV_KV("prefix", "%s",
-                        route->prefix),EV_KV("nexthop", "%s",
-                        idl_nexthop->ip_address));
-              nexthop_ipv4_add(rib, &ipv4_dest_addr, NULL);
-            }
-        }
+  if (inflight->resync)
+    {
+      zebra_txn_resync_pending |= inflight->resync;
+      zebra_txn_resync_pending_retries =
+                          MAX(zebra_txn_resync_pending_retries,
+                              inflight->retries + 1);
     }
 
-  /* Distance. */
-  if (route->distance != NULL)
-    rib->distance = route->distance[0];
-  else
-    rib->distance = 0;
+  if (zebra_create_txn())
+    return;
 
-  /* TODO: What about weight in Nexthop, metric and weight are same?? */
-  /* Metric. */
-  if (route->metric != NULL)
-    rib->metric = route->metric[0];
-  else
-    rib->metric = 0;
+  VLOG_DBG("Retrying %d route updates, retry %d", inflight->rows,
+           inflight->retries + 1);
+  COVERAGE_INC(zebra_txn_retry);
+  ++zebra_txn_stats.retries;
 
-  /* Table */
-  rib->table = vrf_id;
+  zebra_txn_replay_nexthops_delete(&inflight->nexthop_delete_journal);
 
-  if (is_ipv6)
+  SHASH_FOR_EACH (jnode, &inflight->route_journal)
     {
-      /* Set rc, incase of no ipv6 */
-#ifdef HAVE_IPV6
-      rc = rib_add_ipv6_multipath((struct prefix_ipv6 *)p, rib, safi);
-#endif
+      if (zebra_txn_journal_has_newer(node, true, jnode->name)
+          || !uuid_from_string(&uuid, jnode->name))
+        continue;
+
+      route = ovsrec_route_get_for_uuid(idl, &uuid);
+      selected = jnode->data;
+      if (!route)
+        continue;
+
+      committed = zebra_txn_committed_selected(node, true, jnode->name,
+                                               route->selected);
+      if (committed && (*committed == *selected))
+        continue;
+
+      zebra_txn_set_route_selected(route, *selected);
     }
-  else
-    rc = rib_add_ipv4_multipath((struct prefix_ipv4 *)p, rib, safi);
 
-  return rc;
+  SHASH_FOR_EACH (jnode, &inflight->nexthop_journal)
+    {
+      if (zebra_txn_journal_has_newer(node, false, jnode->name)
+          || !uuid_from_string(&uuid, jnode->name))
+        continue;
+
+      nexthop = ovsrec_nexthop_get_for_uuid(idl, &uuid);
+      selected = jnode->data;
+      if (!nexthop)
+        continue;
+
+      committed = zebra_txn_committed_selected(node, false, jnode->name,
+                                               nexthop->selected);
+      if (committed && (*committed == *selected))
+        continue;
+
+      zebra_txn_set_nexthop_selected(nexthop, *selected);
+    }
+
+  zebra_txn_open_retries = MAX(zebra_txn_open_retries,
+                               inflight->retries + 1);
 }
 
 /*
-** Function to create transaction for submitting rib updates to DB.
-** Create only if not created already by main thread.
-*/
-int
-zebra_create_txn (void)
+ * This function rebuilds the rows inserted or updated from the zebra
+ * caches by the failed transactions. The connected routes are reconciled
+ * against the L3 port cache the same way as after a zebra restart: the
+ * existing connected routes are adopted, the missing ones are inserted
+ * and the stale ones are deleted.
+ */
+static void
+zebra_txn_resync (void)
 {
-  if (zebra_txn == NULL)
+  const struct ovsrec_route *route;
+  struct zebra_l3_port *l3_port;
+  struct shash_node *node;
+  unsigned int resync = zebra_txn_resync_pending;
+
+  zebra_txn_resync_pending = 0;
+  zebra_txn_resync_retries = zebra_txn_resync_pending_retries;
+  zebra_txn_resync_pending_retries = 0;
+
+  VLOG_DBG("Rebuilding the%s%s rows of the failed route update "
+           "transactions",
+           (resync & ZEBRA_TXN_RESYNC_CONNECTED_ROUTES) ?
+                                            " connected route" : "",
+           (resync & ZEBRA_TXN_RESYNC_ROUTER_ID) ? " active router-id" : "");
+
+  if (resync & ZEBRA_TXN_RESYNC_CONNECTED_ROUTES)
     {
-      zebra_txn = ovsdb_idl_txn_create(idl);
-      if (!zebra_txn)
+      SHASH_FOR_EACH (node, &zebra_cached_l3_ports)
         {
-          VLOG_ERR("%s: Transaction creation failed" , __func__);
-          return 1;
+          l3_port = node->data;
+          shash_clear_free_data(&(l3_port->ip4_connected_routes_uuid));
+          shash_clear_free_data(&(l3_port->ip6_connected_routes_uuid));
+        }
+
+      shash_clear_free_data(&connected_routes_hash_after_restart);
+
+      OVSREC_ROUTE_FOR_EACH (route, idl)
+        {
+          if (!route->from || !route->prefix ||
+              ovsdb_proto_to_zebra_proto(route->from) != ZEBRA_ROUTE_CONNECT ||
+              (route->n_nexthops != 1) || !(route->nexthops[0]->n_ports))
+            continue;
+
+          shash_add(&connected_routes_hash_after_restart, route->prefix,
+                    xmemdup(&OVSREC_IDL_GET_TABLE_ROW_UUID(route),
+                            sizeof(struct uuid)));
+        }
+
+      zebra_walk_l3_cache_and_restore_connected_routes_after_zebra_restart();
+    }
+
+  if (resync & ZEBRA_TXN_RESYNC_ROUTER_ID)
+    zebra_ovsdb_publish_active_router_id();
+
+  zebra_txn_resync_retries = 0;
+}
+
+/*
+ * This function is called after every IDL run. It checks the status of
+ * the committed transactions waiting for the OVSDB reply, and replays the
+ * updates of the failed transactions into a new transaction.
+ */
+static void
+zebra_txn_run_inflight (void)
+{
+  struct zebra_txn_inflight *inflight;
+  struct listnode *node, *nnode;
+  enum ovsdb_idl_txn_status status;
+  bool replayed = false;
+
+  if (!zebra_txn_inflight_list || !listcount(zebra_txn_inflight_list))
+    return;
+
+  for (ALL_LIST_ELEMENTS (zebra_txn_inflight_list, node, nnode, inflight))
+    {
+      if (inflight->txn)
+        {
+          status = ovsdb_idl_txn_commit(inflight->txn);
+          if (status == TXN_INCOMPLETE)
+            continue;
+
+          if (!zebra_txn_inflight_complete(inflight, status))
+            {
+              zebra_txn_replay(node, inflight);
+              replayed = true;
+            }
         }
       else
         {
-          VLOG_DBG("Created a transaction for route updates to OVSDB");
+          zebra_txn_replay(node, inflight);
+          replayed = true;
         }
+
+      list_delete_node(zebra_txn_inflight_list, node);
+      zebra_txn_inflight_free(inflight);
     }
 
-  /* Else txn already there, continue the updates and commit */
-  return 0;
+  if (zebra_txn_resync_pending)
+    {
+      for (ALL_LIST_ELEMENTS (zebra_txn_inflight_list, node, nnode, inflight))
+        if (inflight->resync & zebra_txn_resync_pending)
+          break;
+
+      if (!node)
+        {
+          zebra_txn_resync();
+          replayed = true;
+        }
+    }
+
+  if (replayed)
+    zebra_finish_txn(true);
+}
+
+/*
+ * This function commits the open transaction. The transaction, along
+ * with its journal, is kept until OVSDB replies to the commit.
+ */
+static void
+zebra_txn_commit (void)
+{
+  struct zebra_txn_inflight *inflight;
+  enum ovsdb_idl_txn_status status;
+
+  /*
+   * Write the final selected values before the journal is handed over
+   * to the in-flight entry.
+   */
+  zebra_txn_flush_selected();
+
+  inflight = xzalloc(sizeof(struct zebra_txn_inflight));
+  inflight->txn = zebra_txn;
+  inflight->rows = zebra_txn_pending_rows;
+  inflight->retries = MAX(zebra_txn_open_retries, zebra_txn_resync_retries);
+  inflight->resync = zebra_txn_open_resync;
+  shash_init(&inflight->route_journal);
+  shash_init(&inflight->nexthop_journal);
+  shash_init(&inflight->nexthop_delete_journal);
+  shash_swap(&inflight->route_journal, &zebra_txn_route_journal);
+  shash_swap(&inflight->nexthop_journal, &zebra_txn_nexthop_journal);
+  shash_swap(&inflight->nexthop_delete_journal,
+             &zebra_txn_nexthop_delete_journal);
+
+  VLOG_DBG("Committing %d route updates in %d batches, batch target "
+           "is %d rows", zebra_txn_pending_rows, zebra_txn_count,
+           zebra_txn_stats.batch_rows_target);
+
+  COVERAGE_INC(zebra_txn_commit);
+  ++zebra_txn_stats.commits;
+  zebra_txn_stats.rows_committed += zebra_txn_pending_rows;
+  zebra_txn_stats.last_batch_rows = zebra_txn_pending_rows;
+  if (zebra_txn_pending_rows > zebra_txn_stats.max_batch_rows)
+    zebra_txn_stats.max_batch_rows = zebra_txn_pending_rows;
+
+  inflight->commit_msec = time_msec();
+  status = ovsdb_idl_txn_commit(zebra_txn);
+
+  /*
+   * The transaction is owned by the in-flight entry from here on. Reset
+   * the state of the open transaction in any case, the failed updates
+   * are replayed from the journal.
+   */
+  zebra_txn = NULL;
+  zebra_txn_count = 0;
+  zebra_txn_pending_rows = 0;
+  zebra_txn_open_retries = 0;
+  zebra_txn_open_resync = 0;
+
+  if ((status == TXN_INCOMPLETE)
+      || !zebra_txn_inflight_complete(inflight, status))
+    listnode_add(zebra_txn_inflight_list, inflight);
+  else
+    zebra_txn_inflight_free(inflight);
 }
 
 /*
 ** Function to commit the idl transaction if there are any updates to be
-** submitted to DB.
+** submitted to DB. The transaction is committed at the last batch of
+** updates, or once the number of pending row updates reaches the adaptive
+** batch target, or once the updates have been held for
+** ZEBRA_TXN_MAX_HOLD_MSEC.
 */
 int
 zebra_finish_txn (bool if_last_batch)
 {
-  enum ovsdb_idl_txn_status status;
-
   if (zebra_txn_updates)
     {
       ++zebra_txn_count;
       zebra_txn_updates = false;
     }
 
-  if (!if_last_batch && (zebra_txn_count < MAX_ZEBRA_TXN_COUNT))
+  if (!if_last_batch &&
+      (!zebra_txn_count ||
+       ((zebra_txn_pending_rows < zebra_txn_stats.batch_rows_target) &&
+        (time_msec() - zebra_txn_open_msec < ZEBRA_TXN_MAX_HOLD_MSEC))))
     {
       VLOG_DBG("This is not the last batch of updates. Number of "
-               " transactions are %d", zebra_txn_count);
+               "pending row updates are %d", zebra_txn_pending_rows);
       return(0);
     }
 
   /* Commit txn if any updates to be submitted to DB */
-  if (zebra_txn_count && (if_last_batch ||
-                            (zebra_txn_count >= MAX_ZEBRA_TXN_COUNT)))
+  if (zebra_txn_count)
     {
-      if (zebra_txn)
-        {
-          status =  ovsdb_idl_txn_commit(zebra_txn);
-
-          VLOG_DBG("The transaction error code is %s for committing "
-                   "route batch %d",
-                   ovsdb_idl_txn_status_to_string(status),
-                   zebra_txn_count);
-
-          if (!((status == TXN_SUCCESS) || (status == TXN_UNCHANGED)
-                    || (status == TXN_INCOMPLETE)))
-            {
-	          /*
-	           * TODO: In case of commit failure, retry.
-	           */
-	          VLOG_ERR("Route update failed. The transaction error is %s",
-		               ovsdb_idl_txn_status_to_string(status));
-            }
-	      else
-            {
-              VLOG_DBG("Successfully committed a transaction to OVSDB");
-
-              /*
-               * Reset the transaction counter
-               */
-              zebra_txn_count = 0;
-            }
-        }
-      else
+      if (!zebra_txn)
         {
           VLOG_ERR("Commiting NULL txn");
           return(1);
         }
+
+      zebra_txn_commit();
+      return(0);
     }
 
-  /* Finally in any case destory */
+  /* Nothing to commit, release the transaction */
   if (zebra_txn)
     ovsdb_idl_txn_destroy(zebra_txn);
 
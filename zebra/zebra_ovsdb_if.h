@@ -60,7 +60,31 @@
 #define OVSREC_IDL_GET_TABLE_ROW_UUID(ovsrec_row_struct) \
                              (ovsrec_row_struct->header_.uuid)
 
-#define MAX_ZEBRA_TXN_COUNT 100
+/*
+ * Adaptive OVSDB transaction batching. The route updates are committed
+ * once the number of pending row updates in the open transaction reaches
+ * the current batch target, or once the transaction has been held open
+ * for ZEBRA_TXN_MAX_HOLD_MSEC. The batch target grows when the observed
+ * commit latency is high and shrinks when it is low.
+ */
+#define ZEBRA_TXN_BATCH_ROWS_MIN             32
+#define ZEBRA_TXN_BATCH_ROWS_MAX             4096
+#define ZEBRA_TXN_BATCH_ROWS_INITIAL         256
+#define ZEBRA_TXN_MAX_HOLD_MSEC              100
+#define ZEBRA_TXN_COMMIT_LATENCY_LOW_MSEC    20
+#define ZEBRA_TXN_COMMIT_LATENCY_HIGH_MSEC   200
+
+/*
+ * Number of times a failed route update transaction is replayed into
+ * a new transaction before the updates are dropped.
+ */
+#define ZEBRA_TXN_MAX_RETRIES                3
+
+/*
+ * Interval in seconds between the full reconciliation walks of the local
+ * RIB against the OVSDB route table.
+ */
+#define ZEBRA_ROUTE_CONSISTENCY_CHECK_INTERVAL 300
 
 extern bool zebra_cleanup_kernel_after_restart;
 extern char* zebra_l3_port_cache_actions_str[];
@@ -82,6 +106,66 @@ struct zebra_route_key
   /* OPS_TODO: add vrf support */
 };
 
+/*
+ * Next-hop to route reverse lookup entry. There is one entry for each
+ * pair of an OVSDB route row and a next-hop row it references, since a
+ * next-hop row can be shared by the routes of several prefixes.
+ */
+struct zebra_nexthop_route_entry
+{
+  struct uuid route_uuid;        /* UUID of the OVSDB route row */
+  struct uuid nexthop_uuid;      /* UUID of the OVSDB next-hop row */
+  struct zebra_route_key rkey;   /* Route key programmed in the local RIB */
+  int addr_family;               /* Address family of the route */
+};
+
+/*
+ * Statistics for the route update transactions committed to OVSDB.
+ */
+struct zebra_txn_stats
+{
+  int batch_rows_target;                  /* Current adaptive batch size */
+  int last_batch_rows;                    /* Rows in the last commit */
+  int max_batch_rows;                     /* Largest commit in rows */
+  unsigned long long commits;             /* Transactions committed */
+  unsigned long long rows_committed;      /* Row updates committed */
+  unsigned long long completed;           /* Commits acknowledged by OVSDB */
+  unsigned long long retries;             /* Failed commits replayed */
+  unsigned long long failures;            /* Commits dropped after retries */
+  unsigned long long selected_writes_collapsed;  /* Selected flag transitions
+                                                    collapsed in a batch */
+  unsigned long long selected_writes_suppressed; /* Selected flag writes
+                                                    matching OVSDB */
+  long long int last_commit_latency_msec; /* Latency of the last commit */
+  long long int max_commit_latency_msec;  /* Largest commit latency */
+  long long int total_commit_latency_msec;/* Sum of all commit latencies */
+};
+
+extern struct zebra_txn_stats zebra_txn_stats;
+
+/*
+ * Maximum number of pre-built route descriptors linked into the RIB by
+ * the main thread in one event loop iteration in the route pipeline mode.
+ */
+#define ZEBRA_ROUTE_PIPELINE_LINK_SLICE      256
+
+/*
+ * Statistics for the OVSDB to RIB route pipeline.
+ */
+struct zebra_route_pipeline_stats
+{
+  bool enabled;                           /* Pipeline mode is enabled */
+  unsigned long long submitted;           /* Routes queued to the worker */
+  unsigned long long parsed;              /* Routes parsed by the worker */
+  unsigned long long invalid;             /* Routes with a malformed prefix */
+  unsigned long long linked;              /* Routes linked into the RIB */
+  unsigned long long flushes;             /* Synchronous pipeline flushes */
+  unsigned long long max_backlog;         /* Largest number of routes
+                                             queued and not yet linked */
+};
+
+extern struct zebra_route_pipeline_stats zebra_route_pipeline_stats;
+
 struct zebra_route_del_data
 {
   struct route_node *rnode;
@@ -183,5 +267,6 @@ zebra_ovs_update_selected_route (const struct ovsrec_route *ovs_route,
 void cleanup_kernel_routes_after_restart();
 extern int zebra_create_txn (void);
 extern int zebra_finish_txn (bool);
+extern void zebra_route_pipeline_set_enabled (bool);
 
 #endif /* ZEBRA_OVSDB_IF_H */
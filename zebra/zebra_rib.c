@@ -2212,7 +2212,7 @@ meta_queue_process (struct work_queue *dummy, void *data)
       /*
        * Since there are further routes to process for this
        * worker thread, we should try to see if there are i
-       * MAX_ZEBRA_TXN_COUNT route updates to OVSDB at this time.
+       * enough route updates to fill a batch to OVSDB at this time.
        * In this case we should publish the route updates to OVSDB.
        */
       zebra_finish_txn(false);